@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+# This script compares reading and writing vectors, quaternions, transforms and
+# map object models a field at a time with reading them with fixed layouts
+
+import argparse
+import random
+import time
+
+from palworld_save_tools.archive import UUID, FArchiveReader, FArchiveWriter
+from palworld_save_tools.rawdata import map_model
+
+
+def best_of(repeat: int, func):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+
+def vector_dict_per_field(reader: FArchiveReader):
+    return {"x": reader.double(), "y": reader.double(), "z": reader.double()}
+
+
+def quat_dict_per_field(reader: FArchiveReader):
+    return {
+        "x": reader.double(),
+        "y": reader.double(),
+        "z": reader.double(),
+        "w": reader.double(),
+    }
+
+
+def ftransform_per_field(reader: FArchiveReader):
+    return {
+        "rotation": quat_dict_per_field(reader),
+        "translation": vector_dict_per_field(reader),
+        "scale3d": vector_dict_per_field(reader),
+    }
+
+
+def write_ftransform_per_field(writer: FArchiveWriter, value):
+    for part in ("rotation", "translation", "scale3d"):
+        for axis in value[part].values():
+            writer.double(axis)
+
+
+def map_model_per_field(m_bytes: bytes):
+    reader = FArchiveReader(m_bytes)
+    data = {}
+    data["instance_id"] = reader.guid()
+    data["concrete_model_instance_id"] = reader.guid()
+    data["base_camp_id_belong_to"] = reader.guid()
+    data["group_id_belong_to"] = reader.guid()
+    data["hp"] = {"current": reader.i32(), "max": reader.i32()}
+    data["initital_transform_cache"] = ftransform_per_field(reader)
+    data["repair_work_id"] = reader.guid()
+    data["owner_spawner_level_object_instance_id"] = reader.guid()
+    data["owner_instance_id"] = reader.guid()
+    data["build_player_uid"] = reader.guid()
+    data["interact_restrict_type"] = reader.byte()
+    data["stage_instance_id_belong_to"] = {
+        "id": reader.guid(),
+        "valid": reader.u32() > 0,
+    }
+    data["created_at"] = reader.i64()
+    return data
+
+
+def random_transform(rng: random.Random):
+    def axes(names):
+        return {name: rng.uniform(-1e5, 1e5) for name in names}
+
+    return {
+        "rotation": axes("xyzw"),
+        "translation": axes("xyz"),
+        "scale3d": axes("xyz"),
+    }
+
+
+def random_map_model(rng: random.Random) -> bytes:
+    def guid():
+        return UUID(rng.randbytes(16))
+
+    return map_model.encode_bytes(
+        {
+            "instance_id": guid(),
+            "concrete_model_instance_id": guid(),
+            "base_camp_id_belong_to": guid(),
+            "group_id_belong_to": guid(),
+            "hp": {"current": 100, "max": 100},
+            "initital_transform_cache": random_transform(rng),
+            "repair_work_id": guid(),
+            "owner_spawner_level_object_instance_id": guid(),
+            "owner_instance_id": guid(),
+            "build_player_uid": guid(),
+            "interact_restrict_type": 1,
+            "stage_instance_id_belong_to": {"id": guid(), "valid": False},
+            "created_at": rng.getrandbits(62),
+        }
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmarks per-field and fixed layout reads and writes"
+    )
+    parser.add_argument("--count", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    transforms = [random_transform(rng) for _ in range(args.count)]
+    writer = FArchiveWriter()
+    for transform in transforms:
+        writer.ftransform(transform)
+    data = writer.bytes()
+    models = [random_map_model(rng) for _ in range(args.count // 10)]
+    # Bypass the blob memo, so every run decodes
+    decode_model = getattr(map_model.decode_bytes, "__wrapped__", None)
+    if decode_model is None:
+        decode_model = map_model.decode_bytes
+    parent = FArchiveReader(b"")
+
+    def read_all(read, per_record: int):
+        reader = FArchiveReader(data)
+        for _ in range(len(data) // per_record):
+            read(reader)
+
+    def write_all(write):
+        writer = FArchiveWriter()
+        for transform in transforms:
+            write(writer, transform)
+        writer.bytes()
+
+    cases = [
+        (
+            "vector_dict",
+            len(data) // 24,
+            lambda: read_all(vector_dict_per_field, 24),
+            lambda: read_all(FArchiveReader.vector_dict, 24),
+        ),
+        (
+            "quat_dict",
+            len(data) // 32,
+            lambda: read_all(quat_dict_per_field, 32),
+            lambda: read_all(FArchiveReader.quat_dict, 32),
+        ),
+        (
+            "ftransform",
+            len(transforms),
+            lambda: read_all(ftransform_per_field, 80),
+            lambda: read_all(FArchiveReader.ftransform, 80),
+        ),
+        (
+            "write ftransform",
+            len(transforms),
+            lambda: write_all(write_ftransform_per_field),
+            lambda: write_all(FArchiveWriter.ftransform),
+        ),
+        (
+            "map_model",
+            len(models),
+            lambda: [map_model_per_field(m) for m in models],
+            lambda: [decode_model(parent, m) for m in models],
+        ),
+    ]
+    print(
+        f"{'record':<18} {'count':>9} {'per field':>10} {'layout':>10} "
+        f"{'records/s':>12} {'speedup':>8}"
+    )
+    for name, count, per_field, layout in cases:
+        per_field_time = best_of(args.repeat, per_field)
+        layout_time = best_of(args.repeat, layout)
+        print(
+            f"{name:<18} {count:>9,} {per_field_time * 1000:>8.1f}ms "
+            f"{layout_time * 1000:>8.1f}ms {count / layout_time:>12,.0f} "
+            f"{per_field_time / layout_time:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# This script compares decoding foliage instances one at a time with decoding them in batches per grid cell
+
+import argparse
+import os
+import time
+
+from palworld_save_tools.archive import FArchiveReader
+from palworld_save_tools.index import IndexedGvas
+from palworld_save_tools.palsav import decompress_sav_to_gvas
+from palworld_save_tools.paltypes import PALWORLD_TYPE_HINTS
+from palworld_save_tools.rawdata import foliage_model_instance
+
+DEFAULT_INPUT = os.path.join(
+    os.path.dirname(__file__), "..", "tests", "testdata", "Level.sav"
+)
+
+
+def best_of(repeat: int, func):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+
+def grid_cell_blobs(sav_path: str) -> list[list[bytes]]:
+    with open(sav_path, "rb") as f:
+        gvas, _ = decompress_sav_to_gvas(f.read())
+    indexed = IndexedGvas(gvas, PALWORLD_TYPE_HINTS)
+    cells = []
+    for i, entry in enumerate(indexed.entries):
+        if entry["path"] != ".worldSaveData.FoliageGridSaveDataMap":
+            continue
+        if entry["kind"] != "property":
+            continue
+        for child in indexed.children.get(i, []):
+            cell = indexed.decode(indexed.entries[child])
+            blobs = []
+            for model in cell["value"]["ModelMap"]["value"]:
+                for instance in model["value"]["InstanceDataMap"]["value"]:
+                    blobs.append(bytes(instance["value"]["RawData"]["value"]["values"]))
+            cells.append(blobs)
+    return cells
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmarks per-instance and batch decoding of foliage instances"
+    )
+    parser.add_argument(
+        "file", nargs="?", default=DEFAULT_INPUT, help="Level.sav (default: test data)"
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    cells = grid_cell_blobs(args.file)
+    count = sum(len(blobs) for blobs in cells)
+    reader = FArchiveReader(b"")
+    # Bypass the blob memo, so every run decodes
+    decode_bytes = getattr(
+        foliage_model_instance.decode_bytes,
+        "__wrapped__",
+        foliage_model_instance.decode_bytes,
+    )
+    modes = {
+        "per instance": lambda: [
+            decode_bytes(reader, b) for blobs in cells for b in blobs
+        ],
+        "batch": lambda: [
+            foliage_model_instance.decode_batch(reader, blobs, use_numpy=False)
+            for blobs in cells
+        ],
+    }
+    if foliage_model_instance.numpy is not None:
+        modes["batch numpy"] = lambda: [
+            foliage_model_instance.decode_batch(reader, blobs, use_numpy=True)
+            for blobs in cells
+        ]
+    print(f"{count:,} instances in {len(cells):,} grid cells")
+    print(f"{'mode':<14} {'time':>10} {'instances/s':>14} {'speedup':>8}")
+    baseline = None
+    for mode, func in modes.items():
+        elapsed = best_of(args.repeat, func)
+        if baseline is None:
+            baseline = elapsed
+        print(
+            f"{mode:<14} {elapsed * 1000:>8.1f}ms {count / elapsed:>14,.0f} "
+            f"{baseline / elapsed:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+# This script compares the memory and speed of decoded trees that hold each
+# property in a dict with trees of compact property nodes
+
+import argparse
+import gc
+import json
+import time
+import tracemalloc
+
+from palworld_save_tools.gvas import GvasFile
+from palworld_save_tools.json_tools import CustomEncoder
+from palworld_save_tools.palsav import decompress_sav_to_gvas
+from palworld_save_tools.paltypes import PALWORLD_CUSTOM_PROPERTIES, PALWORLD_TYPE_HINTS
+from palworld_save_tools.synthetic import WorldSize, generate_gvas
+
+
+def best_of(repeat: int, func):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+
+def retained_bytes(read) -> int:
+    gc.collect()
+    tracemalloc.start()
+    try:
+        tree = read()
+        gc.collect()
+        size, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del tree
+    return size
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmarks dict and compact node property trees"
+    )
+    parser.add_argument(
+        "filenames",
+        nargs="*",
+        help=".sav files to read (default: a synthetic world)",
+    )
+    parser.add_argument("--scale", type=float, default=5.0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--no-custom-properties",
+        action="store_true",
+        help="Do not decode RawData blobs, for saves their decoders cannot read",
+    )
+    args = parser.parse_args()
+
+    custom_properties = {} if args.no_custom_properties else PALWORLD_CUSTOM_PROPERTIES
+    saves = []
+    if args.filenames:
+        for filename in args.filenames:
+            with open(filename, "rb") as f:
+                gvas, _ = decompress_sav_to_gvas(f.read())
+            saves.append((filename, gvas))
+    else:
+        size = WorldSize().scaled(args.scale)
+        saves.append((f"synthetic x{args.scale:g}", generate_gvas(size)))
+
+    print(
+        f"{'save':<32} {'tree':<8} {'MB held':>8} {'read':>9} {'write':>9} "
+        f"{'JSON':>9}"
+    )
+    for name, gvas in saves:
+        results = {}
+        for tree, compact in (("dict", False), ("compact", True)):
+
+            def read():
+                return GvasFile.read(
+                    gvas, PALWORLD_TYPE_HINTS, custom_properties, compact=compact
+                )
+
+            held = retained_bytes(read)
+            read_time = best_of(args.repeat, read)
+            gvas_file = read()
+            dumped = json.dumps(gvas_file.dump(), cls=CustomEncoder)
+            json_time = best_of(
+                args.repeat, lambda: json.dumps(gvas_file.dump(), cls=CustomEncoder)
+            )
+            # Custom property encoders replace decoded values in place, so the
+            # first write is timed on its own
+            start = time.perf_counter()
+            written = gvas_file.write(custom_properties)
+            write_time = time.perf_counter() - start
+            if written != gvas:
+                raise Exception(f"{name} does not write back the same as a {tree}")
+            results[tree] = dumped
+            print(
+                f"{name[-32:]:<32} {tree:<8} {held / (1024 * 1024):>8.1f} "
+                f"{read_time * 1000:>7.1f}ms {write_time * 1000:>7.1f}ms "
+                f"{json_time * 1000:>7.1f}ms"
+            )
+        if results["dict"] != results["compact"]:
+            raise Exception(f"{name} dumps differently when compact")
+
+
+if __name__ == "__main__":
+    main()
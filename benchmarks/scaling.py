@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+# This script times reading and writing synthetic world saves of growing size and fits how each stage scales
+
+import argparse
+import gc
+import json
+import math
+import time
+from typing import Any
+
+from palworld_save_tools.gvas import GvasFile
+from palworld_save_tools.paltypes import PALWORLD_CUSTOM_PROPERTIES, PALWORLD_TYPE_HINTS
+from palworld_save_tools.synthetic import WorldSize, generate_gvas
+
+DEFAULT_SCALES = [1.0, 10.0, 100.0]
+STAGES = ("read", "write")
+
+
+def best_of(repeat: int, func) -> float:
+    best = None
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+
+def fit_power_law(sizes: list[float], times: list[float]) -> tuple[float, float]:
+    """
+    Fits time = coefficient * size ** exponent by least squares on the
+    logarithms. An exponent close to 1 means the stage scales linearly.
+    """
+    xs = [math.log(s) for s in sizes]
+    ys = [math.log(t) for t in times]
+    mean_x = sum(xs) / len(xs)
+    mean_y = sum(ys) / len(ys)
+    var_x = sum((x - mean_x) ** 2 for x in xs)
+    if var_x == 0:
+        raise Exception("At least two different sizes are needed to fit a curve")
+    exponent = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / var_x
+    return math.exp(mean_y - exponent * mean_x), exponent
+
+
+def benchmark_scale(size: WorldSize, repeat: int) -> dict[str, Any]:
+    gvas = generate_gvas(size)
+
+    def read():
+        return GvasFile.read(gvas, PALWORLD_TYPE_HINTS, PALWORLD_CUSTOM_PROPERTIES)
+
+    def write():
+        # Encoders replace decoded values in place, so each run needs a fresh tree
+        gvas_file = read()
+        start = time.perf_counter()
+        written = gvas_file.write(PALWORLD_CUSTOM_PROPERTIES)
+        timings.append(time.perf_counter() - start)
+        if written != gvas:
+            raise Exception("Written save differs from the generated save")
+
+    timings: list[float] = []
+    result = {"gvas_size": len(gvas), "read": best_of(repeat, read)}
+    for _ in range(repeat):
+        write()
+    result["write"] = min(timings)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmarks reading and writing synthetic world saves at several scales"
+    )
+    parser.add_argument(
+        "--scales",
+        type=float,
+        nargs="+",
+        default=DEFAULT_SCALES,
+        help="Multiples of the default world size (default: 1 10 100)",
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", "-o", help="Write the results to this JSON file")
+    args = parser.parse_args()
+
+    base = WorldSize()
+    results: dict[str, Any] = {"scales": {}, "fits": {}}
+    print(f"{'scale':>8} {'GVAS bytes':>14} {'read':>10} {'write':>10}")
+    for scale in args.scales:
+        result = benchmark_scale(base.scaled(scale), args.repeat)
+        results["scales"][str(scale)] = result
+        print(
+            f"{scale:>8g} {result['gvas_size']:>14,} "
+            f"{result['read'] * 1000:>8.1f}ms {result['write'] * 1000:>8.1f}ms"
+        )
+    if len(args.scales) > 1:
+        sizes = [r["gvas_size"] for r in results["scales"].values()]
+        for stage in STAGES:
+            times = [r[stage] for r in results["scales"].values()]
+            coefficient, exponent = fit_power_law(sizes, times)
+            results["fits"][stage] = {"coefficient": coefficient, "exponent": exponent}
+            print(
+                f"{stage}: time ~ size^{exponent:.2f} "
+                f"({sizes[-1] / times[-1] / 1e6:.1f} MB/s at the largest scale)"
+            )
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+# This script compares the rawdata codecs generated from schemas with the
+# hand-written field by field codecs they replaced
+
+import argparse
+import random
+import time
+from typing import Any
+
+from palworld_save_tools.archive import (
+    UUID,
+    FArchiveReader,
+    FArchiveWriter,
+    instance_id_reader,
+    instance_id_writer,
+    uuid_reader,
+    uuid_writer,
+)
+from palworld_save_tools.rawdata import group, item_container_slots, map_model
+
+
+def best_of(repeat: int, func):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+
+def read_vector(reader: FArchiveReader) -> dict[str, Any]:
+    return {"x": reader.double(), "y": reader.double(), "z": reader.double()}
+
+
+def read_transform(reader: FArchiveReader) -> dict[str, Any]:
+    return {
+        "rotation": {
+            "x": reader.double(),
+            "y": reader.double(),
+            "z": reader.double(),
+            "w": reader.double(),
+        },
+        "translation": read_vector(reader),
+        "scale3d": read_vector(reader),
+    }
+
+
+def write_transform(writer: FArchiveWriter, value: dict[str, Any]) -> None:
+    for part in ("rotation", "translation", "scale3d"):
+        for axis in value[part].values():
+            writer.double(axis)
+
+
+def decode_map_model(reader: FArchiveReader) -> dict[str, Any]:
+    data: dict[str, Any] = {}
+    data["instance_id"] = reader.guid()
+    data["concrete_model_instance_id"] = reader.guid()
+    data["base_camp_id_belong_to"] = reader.guid()
+    data["group_id_belong_to"] = reader.guid()
+    data["hp"] = {"current": reader.i32(), "max": reader.i32()}
+    data["initital_transform_cache"] = read_transform(reader)
+    data["repair_work_id"] = reader.guid()
+    data["owner_spawner_level_object_instance_id"] = reader.guid()
+    data["owner_instance_id"] = reader.guid()
+    data["build_player_uid"] = reader.guid()
+    data["interact_restrict_type"] = reader.byte()
+    data["stage_instance_id_belong_to"] = {
+        "id": reader.guid(),
+        "valid": reader.u32() > 0,
+    }
+    data["created_at"] = reader.i64()
+    if not reader.eof():
+        data["unknown_data"] = [int(b) for b in reader.read_to_end()]
+    return data
+
+
+def encode_map_model(writer: FArchiveWriter, p: dict[str, Any]) -> None:
+    writer.guid(p["instance_id"])
+    writer.guid(p["concrete_model_instance_id"])
+    writer.guid(p["base_camp_id_belong_to"])
+    writer.guid(p["group_id_belong_to"])
+    writer.i32(p["hp"]["current"])
+    writer.i32(p["hp"]["max"])
+    write_transform(writer, p["initital_transform_cache"])
+    writer.guid(p["repair_work_id"])
+    writer.guid(p["owner_spawner_level_object_instance_id"])
+    writer.guid(p["owner_instance_id"])
+    writer.guid(p["build_player_uid"])
+    writer.byte(p["interact_restrict_type"])
+    writer.guid(p["stage_instance_id_belong_to"]["id"])
+    writer.u32(1 if p["stage_instance_id_belong_to"]["valid"] else 0)
+    writer.i64(p["created_at"])
+    if "unknown_data" in p:
+        writer.write(bytes(p["unknown_data"]))
+
+
+def decode_slot(reader: FArchiveReader) -> dict[str, Any]:
+    return {
+        "slot_index": reader.i32(),
+        "count": reader.i32(),
+        "item": {
+            "static_id": reader.fstring(),
+            "dynamic_id": {
+                "created_world_id": reader.guid(),
+                "local_id_in_created_world": reader.guid(),
+            },
+        },
+        "trailing_bytes": [int(b) for b in reader.read_to_end()],
+    }
+
+
+def encode_slot(writer: FArchiveWriter, p: dict[str, Any]) -> None:
+    writer.i32(p["slot_index"])
+    writer.i32(p["count"])
+    writer.fstring(p["item"]["static_id"])
+    writer.guid(p["item"]["dynamic_id"]["created_world_id"])
+    writer.guid(p["item"]["dynamic_id"]["local_id_in_created_world"])
+    writer.write(bytes(p["trailing_bytes"]))
+
+
+def player_info_reader(reader: FArchiveReader) -> dict[str, Any]:
+    return {
+        "player_uid": reader.guid(),
+        "player_info": {
+            "last_online_real_time": reader.i64(),
+            "player_name": reader.fstring(),
+        },
+    }
+
+
+def player_info_writer(writer: FArchiveWriter, p: dict[str, Any]) -> None:
+    writer.guid(p["player_uid"])
+    writer.i64(p["player_info"]["last_online_real_time"])
+    writer.fstring(p["player_info"]["player_name"])
+
+
+def decode_guild(reader: FArchiveReader) -> dict[str, Any]:
+    group_data = {
+        "group_type": "EPalGroupType::Guild",
+        "group_id": reader.guid(),
+        "group_name": reader.fstring(),
+        "individual_character_handle_ids": reader.tarray(instance_id_reader),
+        "org_type": reader.byte(),
+    }
+    group_data |= {
+        "leading_bytes": reader.byte_list(4),
+        "base_ids": reader.tarray(uuid_reader),
+        "unknown_1": reader.i32(),
+        "base_camp_level": reader.i32(),
+        "map_object_instance_ids_base_camp_points": reader.tarray(uuid_reader),
+        "guild_name": reader.fstring(),
+        "last_guild_name_modifier_player_uid": reader.guid(),
+        "unknown_2": reader.byte_list(20),
+        "players": reader.tarray(player_info_reader),
+        "trailing_bytes": reader.byte_list(4),
+    }
+    return group_data
+
+
+def encode_guild(writer: FArchiveWriter, p: dict[str, Any]) -> None:
+    writer.guid(p["group_id"])
+    writer.fstring(p["group_name"])
+    writer.tarray(instance_id_writer, p["individual_character_handle_ids"])
+    writer.byte(p["org_type"])
+    writer.write(bytes(p["leading_bytes"]))
+    writer.tarray(uuid_writer, p["base_ids"])
+    writer.i32(p["unknown_1"])
+    writer.i32(p["base_camp_level"])
+    writer.tarray(uuid_writer, p["map_object_instance_ids_base_camp_points"])
+    writer.fstring(p["guild_name"])
+    writer.guid(p["last_guild_name_modifier_player_uid"])
+    writer.write(bytes(p["unknown_2"]))
+    writer.tarray(player_info_writer, p["players"])
+    writer.write(bytes(p["trailing_bytes"]))
+
+
+def random_guid(rng: random.Random) -> UUID:
+    return UUID(rng.randbytes(16))
+
+
+def random_map_model(rng: random.Random) -> dict[str, Any]:
+    def axes(names):
+        return {name: rng.uniform(-1e5, 1e5) for name in names}
+
+    return {
+        "instance_id": random_guid(rng),
+        "concrete_model_instance_id": random_guid(rng),
+        "base_camp_id_belong_to": random_guid(rng),
+        "group_id_belong_to": random_guid(rng),
+        "hp": {"current": 100, "max": 100},
+        "initital_transform_cache": {
+            "rotation": axes("xyzw"),
+            "translation": axes("xyz"),
+            "scale3d": axes("xyz"),
+        },
+        "repair_work_id": random_guid(rng),
+        "owner_spawner_level_object_instance_id": random_guid(rng),
+        "owner_instance_id": random_guid(rng),
+        "build_player_uid": random_guid(rng),
+        "interact_restrict_type": 1,
+        "stage_instance_id_belong_to": {"id": random_guid(rng), "valid": False},
+        "created_at": rng.getrandbits(62),
+    }
+
+
+def random_slot(rng: random.Random) -> dict[str, Any]:
+    return {
+        "slot_index": rng.randrange(50),
+        "count": rng.randrange(1, 1000),
+        "item": {
+            "static_id": rng.choice(["Stone", "Wood", "PalSphere", "Berries"]),
+            "dynamic_id": {
+                "created_world_id": random_guid(rng),
+                "local_id_in_created_world": random_guid(rng),
+            },
+        },
+        "trailing_bytes": [0, 0, 0, 0],
+    }
+
+
+def random_guild(rng: random.Random) -> dict[str, Any]:
+    return {
+        "group_type": "EPalGroupType::Guild",
+        "group_id": random_guid(rng),
+        "group_name": "Guild",
+        "individual_character_handle_ids": [
+            {"guid": random_guid(rng), "instance_id": random_guid(rng)}
+            for _ in range(30)
+        ],
+        "org_type": 0,
+        "leading_bytes": [0, 0, 0, 0],
+        "base_ids": [random_guid(rng) for _ in range(3)],
+        "unknown_1": 0,
+        "base_camp_level": 10,
+        "map_object_instance_ids_base_camp_points": [
+            random_guid(rng) for _ in range(3)
+        ],
+        "guild_name": "Guild",
+        "last_guild_name_modifier_player_uid": random_guid(rng),
+        "unknown_2": [0] * 20,
+        "players": [
+            {
+                "player_uid": random_guid(rng),
+                "player_info": {
+                    "last_online_real_time": rng.getrandbits(62),
+                    "player_name": f"Player {i}",
+                },
+            }
+            for i in range(4)
+        ],
+        "trailing_bytes": [0, 0, 0, 0],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmarks schema generated and hand-written rawdata codecs"
+    )
+    parser.add_argument("--count", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    codecs = [
+        (
+            "map_model",
+            [random_map_model(rng) for _ in range(args.count)],
+            (decode_map_model, encode_map_model),
+            (map_model.MAP_MODEL.read, map_model.MAP_MODEL.write),
+        ),
+        (
+            "item_container_slots",
+            [random_slot(rng) for _ in range(args.count)],
+            (decode_slot, encode_slot),
+            (
+                item_container_slots.ITEM_CONTAINER_SLOT.read,
+                item_container_slots.ITEM_CONTAINER_SLOT.write,
+            ),
+        ),
+        (
+            "group (guild)",
+            [random_guild(rng) for _ in range(args.count // 20)],
+            (decode_guild, encode_guild),
+            (
+                lambda reader: group.GROUP.read(reader, "EPalGroupType::Guild"),
+                lambda writer, p: group.GROUP.write(writer, p, "EPalGroupType::Guild"),
+            ),
+        ),
+    ]
+    print(
+        f"{'codec':<28} {'count':>7} {'hand-written':>13} {'schema':>10} "
+        f"{'records/s':>11} {'speedup':>8}"
+    )
+    for name, values, hand_written, schema in codecs:
+        blobs = []
+        for value in values:
+            writer = FArchiveWriter()
+            hand_written[1](writer, value)
+            blobs.append(writer.bytes())
+
+        def decode_all(decode):
+            for blob in blobs:
+                decode(FArchiveReader(blob))
+
+        def encode_all(encode):
+            for value in values:
+                writer = FArchiveWriter()
+                encode(writer, value)
+                writer.bytes()
+
+        for blob, value in zip(blobs, values):
+            writer = FArchiveWriter()
+            schema[1](writer, schema[0](FArchiveReader(blob)))
+            if writer.bytes() != blob:
+                raise Exception(f"{name} schema does not round trip")
+        for operation, run, index in (
+            ("decode", decode_all, 0),
+            ("encode", encode_all, 1),
+        ):
+            hand_written_time = best_of(args.repeat, lambda: run(hand_written[index]))
+            schema_time = best_of(args.repeat, lambda: run(schema[index]))
+            print(
+                f"{name + ' ' + operation:<28} {len(values):>7,} "
+                f"{hand_written_time * 1000:>11.1f}ms {schema_time * 1000:>8.1f}ms "
+                f"{len(values) / schema_time:>11,.0f} "
+                f"{hand_written_time / schema_time:>7.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+# This script compares reading saves with the generic property reader and with
+# readers generated by a StructSpecializer for the struct paths they repeat
+
+import argparse
+import json
+import time
+
+from palworld_save_tools.gvas import GvasFile
+from palworld_save_tools.json_tools import CustomEncoder
+from palworld_save_tools.palsav import decompress_sav_to_gvas
+from palworld_save_tools.paltypes import PALWORLD_CUSTOM_PROPERTIES, PALWORLD_TYPE_HINTS
+from palworld_save_tools.specializer import DEFAULT_THRESHOLD, StructSpecializer
+from palworld_save_tools.synthetic import WorldSize, generate_gvas
+
+
+def best_of(repeat: int, func):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmarks generic and specialized struct readers"
+    )
+    parser.add_argument(
+        "filenames",
+        nargs="*",
+        help=".sav files to read (default: a synthetic world)",
+    )
+    parser.add_argument("--scale", type=float, default=5.0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--threshold", type=int, default=DEFAULT_THRESHOLD)
+    parser.add_argument(
+        "--no-custom-properties",
+        action="store_true",
+        help="Do not decode RawData blobs, for saves their decoders cannot read",
+    )
+    args = parser.parse_args()
+
+    custom_properties = {} if args.no_custom_properties else PALWORLD_CUSTOM_PROPERTIES
+    saves = []
+    if args.filenames:
+        for filename in args.filenames:
+            with open(filename, "rb") as f:
+                gvas, _ = decompress_sav_to_gvas(f.read())
+            saves.append((filename, gvas))
+    else:
+        size = WorldSize().scaled(args.scale)
+        saves.append((f"synthetic x{args.scale:g}", generate_gvas(size)))
+
+    print(
+        f"{'save':<32} {'MB':>7} {'generic':>10} {'specialized':>12} "
+        f"{'MB/s':>8} {'speedup':>8}"
+    )
+    for name, gvas in saves:
+        specializers = []
+
+        def read_specialized():
+            specializer = StructSpecializer(threshold=args.threshold)
+            specializers.append(specializer)
+            return GvasFile.read(
+                gvas, PALWORLD_TYPE_HINTS, custom_properties, specializer=specializer
+            )
+
+        def read_generic():
+            return GvasFile.read(gvas, PALWORLD_TYPE_HINTS, custom_properties)
+
+        specialized = json.dumps(read_specialized().dump(), cls=CustomEncoder)
+        if specialized != json.dumps(read_generic().dump(), cls=CustomEncoder):
+            raise Exception(f"{name} reads differently when specialized")
+        generic_time = best_of(args.repeat, read_generic)
+        specialized_time = best_of(args.repeat, read_specialized)
+        mb = len(gvas) / (1024 * 1024)
+        print(
+            f"{name[-32:]:<32} {mb:>7.1f} {generic_time * 1000:>8.1f}ms "
+            f"{specialized_time * 1000:>10.1f}ms {mb / specialized_time:>8.1f} "
+            f"{generic_time / specialized_time:>7.2f}x"
+        )
+        specializer = specializers[-1]
+        fallbacks = sum(specializer.fallbacks.values())
+        print(f"  {len(specializer.sources)} paths specialized, {fallbacks} fallbacks")
+        for path, count in specializer.fallbacks.most_common(3):
+            print(f"  {count:>8} {path}")
+
+
+if __name__ == "__main__":
+    main()
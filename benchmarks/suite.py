@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+# This script times each stage of a SAV > JSON > SAV round trip over the test saves and compares the results with a baseline
+
+import argparse
+import glob
+import json
+import os
+import platform
+import sys
+import time
+from typing import Any, Callable, Optional
+
+try:
+    import resource
+except ImportError:
+    # Not available on Windows, peak RSS is not reported there
+    resource = None  # type: ignore[assignment]
+
+from palworld_save_tools.gvas import GvasFile
+from palworld_save_tools.json_tools import CustomEncoder
+from palworld_save_tools.palsav import compress_gvas_to_sav, decompress_sav_to_gvas
+from palworld_save_tools.paltypes import PALWORLD_CUSTOM_PROPERTIES, PALWORLD_TYPE_HINTS
+
+RESULTS_VERSION = 1
+# Files are named relative to the repository, so results compare across runs
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+DEFAULT_INPUTS = os.path.join(ROOT, "tests", "testdata", "**", "*.sav")
+DEFAULT_THRESHOLD = 0.1
+# Stages faster than this are too noisy to flag as regressions
+DEFAULT_MIN_TIME = 0.005
+
+
+def peak_rss() -> Optional[int]:
+    """Returns the peak resident set size of the process in bytes"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class DecoderTimer:
+    """
+    Wraps custom property decoders and encoders to time each of them.
+    Decoders call each other through reader.property, so the time of a nested
+    decoder is subtracted from its caller and each path reports only its own
+    time.
+    """
+
+    totals: dict[str, float]
+    stack: list[float]
+
+    def __init__(self):
+        self.totals = {}
+        self.stack = []
+
+    def wrap(self, name: str, func: Callable) -> Callable:
+        def timed(*args, **kwargs):
+            self.stack.append(0.0)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                nested = self.stack.pop()
+                self.totals[name] = self.totals.get(name, 0.0) + elapsed - nested
+                if self.stack:
+                    self.stack[-1] += elapsed
+
+        return timed
+
+    def custom_properties(self) -> dict[str, tuple[Callable, Callable]]:
+        return {
+            path: (
+                self.wrap(f"decode {path}", decode),
+                self.wrap(f"encode {path}", encode),
+            )
+            for path, (decode, encode) in PALWORLD_CUSTOM_PROPERTIES.items()
+        }
+
+
+class StageRecorder:
+    """
+    Records the time of each stage, the peak RSS of the process when it ended
+    and the number of memory blocks it left allocated
+    """
+
+    results: dict[str, dict[str, Any]]
+    size: int
+
+    def __init__(self, size: int):
+        self.results = {}
+        self.size = size
+
+    def run(self, stage: str, func: Callable[[], Any]) -> Any:
+        blocks = sys.getallocatedblocks()
+        start = time.perf_counter()
+        try:
+            result = func()
+        except Exception as e:
+            raise Exception(f"{stage} failed: {e!r}") from e
+        elapsed = time.perf_counter() - start
+        self.add(stage, elapsed, sys.getallocatedblocks() - blocks)
+        return result
+
+    def add(self, stage: str, elapsed: float, blocks: Optional[int] = None) -> None:
+        previous = self.results.get(stage)
+        if previous is not None and previous["seconds"] <= elapsed:
+            return
+        self.results[stage] = {
+            "seconds": elapsed,
+            "mb_per_s": self.size / elapsed / 1e6 if elapsed > 0 else None,
+            "peak_rss": peak_rss(),
+            "allocated_blocks": blocks,
+        }
+
+
+def benchmark_file(file_name: str, repeat: int) -> dict[str, Any]:
+    """
+    Runs the round trip repeat times and keeps the fastest run of each stage.
+    Throughput is relative to the size of the decompressed GVAS data for every
+    stage, so stages can be compared with each other.
+    """
+    with open(file_name, "rb") as f:
+        data = f.read()
+    try:
+        gvas, save_type = decompress_sav_to_gvas(data)
+    except Exception as e:
+        raise Exception(f"decompress failed: {e!r}") from e
+    recorder = StageRecorder(len(gvas))
+    for _ in range(repeat):
+        timer = DecoderTimer()
+        custom_properties = timer.custom_properties()
+        gvas, save_type = recorder.run(
+            "decompress", lambda: decompress_sav_to_gvas(data)
+        )
+        gvas_file = recorder.run(
+            "read",
+            lambda: GvasFile.read(gvas, PALWORLD_TYPE_HINTS, custom_properties),
+        )
+        dumped = recorder.run("dump", gvas_file.dump)
+        encoded = recorder.run(
+            "json_encode", lambda: json.dumps(dumped, cls=CustomEncoder)
+        )
+        loaded = recorder.run("json_decode", lambda: json.loads(encoded))
+        written = recorder.run(
+            "write", lambda: GvasFile.load(loaded).write(custom_properties)
+        )
+        recorder.run("compress", lambda: compress_gvas_to_sav(written, save_type))
+        for name, elapsed in timer.totals.items():
+            recorder.add(name, elapsed)
+        del gvas_file, dumped, encoded, loaded, written
+    return {
+        "sav_size": len(data),
+        "gvas_size": len(gvas),
+        "save_type": save_type,
+        "stages": recorder.results,
+    }
+
+
+def compare(
+    results: dict[str, Any],
+    baseline: dict[str, Any],
+    threshold: float,
+    min_time: float,
+) -> list[str]:
+    """
+    Returns a line for each stage that took more than threshold (e.g. 0.1 for
+    10%) longer than in the baseline, and for a peak RSS of the whole run that
+    much higher
+    """
+    regressions = []
+    rss, base_rss = results.get("peak_rss"), baseline.get("peak_rss")
+    if rss is not None and base_rss is not None and rss > base_rss * (1 + threshold):
+        regressions.append(
+            f"peak RSS: {rss / 1e6:.1f}MB, baseline {base_rss / 1e6:.1f}MB "
+            f"(+{rss / base_rss - 1:.0%})"
+        )
+    for file_name, result in results["files"].items():
+        base = baseline["files"].get(file_name)
+        if base is None or "stages" not in result or "stages" not in base:
+            continue
+        for stage, metrics in result["stages"].items():
+            base_metrics = base["stages"].get(stage)
+            if base_metrics is None:
+                continue
+            seconds, base_seconds = metrics["seconds"], base_metrics["seconds"]
+            if base_seconds >= min_time and seconds > base_seconds * (1 + threshold):
+                regressions.append(
+                    f"{file_name} {stage}: {seconds * 1000:.1f}ms, baseline "
+                    f"{base_seconds * 1000:.1f}ms (+{seconds / base_seconds - 1:.0%})"
+                )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmarks each stage of converting saves to JSON and back"
+    )
+    parser.add_argument("files", nargs="*", help=".sav files (default: test data)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", "-o", help="Write the results to this JSON file")
+    parser.add_argument(
+        "--baseline", help="Compare with results previously written with --output"
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help=f"Fraction by which a stage may be slower than the baseline (default: {DEFAULT_THRESHOLD})",
+    )
+    parser.add_argument(
+        "--min-time",
+        type=float,
+        default=DEFAULT_MIN_TIME,
+        help=f"Ignore stages that took less than this many seconds in the baseline (default: {DEFAULT_MIN_TIME})",
+    )
+    args = parser.parse_args()
+
+    files = args.files or sorted(glob.glob(DEFAULT_INPUTS, recursive=True))
+    results: dict[str, Any] = {
+        "version": RESULTS_VERSION,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "files": {},
+    }
+    for file_name in files:
+        name = os.path.relpath(file_name, ROOT)
+        try:
+            result = benchmark_file(file_name, args.repeat)
+        except Exception as e:
+            print(f"{name}: {e}")
+            results["files"][name] = {"error": str(e)}
+            continue
+        results["files"][name] = result
+        print(f"{name} ({result['gvas_size']:,} bytes decompressed)")
+        print(
+            f"  {'stage':<72} {'time':>10} {'MB/s':>8} {'peak RSS':>10} {'blocks':>10}"
+        )
+        for stage, metrics in result["stages"].items():
+            mb_per_s = metrics["mb_per_s"]
+            rss = metrics["peak_rss"]
+            blocks = metrics["allocated_blocks"]
+            print(
+                f"  {stage[-72:]:<72} {metrics['seconds'] * 1000:>8.1f}ms "
+                f"{'-' if mb_per_s is None else f'{mb_per_s:.1f}':>8} "
+                f"{'-' if rss is None else f'{rss / 1e6:.0f}MB':>10} "
+                f"{'-' if blocks is None else f'{blocks:,}':>10}"
+            )
+    results["peak_rss"] = peak_rss()
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold, args.min_time)
+        if regressions:
+            print(f"{len(regressions)} regression(s) over {args.threshold:.0%}:")
+            for regression in regressions:
+                print(f"  {regression}")
+            exit(1)
+        print(f"No regressions over {args.threshold:.0%}")
+
+
+if __name__ == "__main__":
+    main()
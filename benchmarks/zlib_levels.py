@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+# This script reports the time and size tradeoffs of the zlib presets used for PLZ saves
+
+import argparse
+import glob
+import os
+import time
+
+from palworld_save_tools.compressor import SaveType
+from palworld_save_tools.compressor.zlib import ZLIB_PRESETS, Zlib, ZlibOptions
+
+DEFAULT_INPUTS = os.path.join(
+    os.path.dirname(__file__), "..", "tests", "testdata", "**", "*.sav"
+)
+
+
+def best_of(repeat: int, func):
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmarks zlib presets against PLZ compressed saves"
+    )
+    parser.add_argument("files", nargs="*", help="PLZ .sav files (default: test data)")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    files = args.files or sorted(glob.glob(DEFAULT_INPUTS, recursive=True))
+    z_lib = Zlib()
+    print(
+        f"{'file':<48} {'preset':<8} {'size':>12} {'ratio':>7} {'compress':>10} {'MB/s':>8} {'decompress':>10}"
+    )
+    for file_name in files:
+        with open(file_name, "rb") as f:
+            data = f.read()
+        if data[8:11] != b"PlZ":
+            continue
+        gvas, save_type = z_lib.decompress(data)
+        if save_type != SaveType.PLZ.value:
+            continue
+        for preset in ZLIB_PRESETS:
+            options = ZlibOptions.preset(preset)
+            compress_time, sav = best_of(
+                args.repeat, lambda: z_lib.compress(gvas, save_type, options)
+            )
+            decompress_time, (roundtrip, _) = best_of(
+                args.repeat, lambda: z_lib.decompress(sav)
+            )
+            if roundtrip != gvas:
+                raise Exception(f"{file_name}: {preset} preset did not roundtrip")
+            print(
+                f"{os.path.relpath(file_name)[-48:]:<48} {preset:<8} {len(sav):>12,} "
+                f"{len(sav) / len(gvas):>7.3f} {compress_time * 1000:>8.1f}ms "
+                f"{len(gvas) / compress_time / 1e6:>8.1f} {decompress_time * 1000:>8.1f}ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
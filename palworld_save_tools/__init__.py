@@ -1,9 +1,21 @@
+import logging
+
+# Library code logs through the "palworld_save_tools" logger and stays quiet
+# unless the application configures logging
+logging.getLogger(__name__).addHandler(logging.NullHandler())
+
 from . import (
     commands,
     compressor,
     archive,
+    cache,
+    diff,
+    export,
     gvas,
+    index,
     json_tools,
     palsav,
-    paltypes
+    paltypes,
+    patch,
+    probe
 )
\ No newline at end of file
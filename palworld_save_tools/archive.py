@@ -1,23 +1,44 @@
+import ctypes
 import io
+import logging
 import math
+import mmap
 import os
 import struct
 import sys
 import uuid
 from typing import Any, Callable, Optional, Sequence, Union
 
+from palworld_save_tools.blob_memo import BlobMemo
+from palworld_save_tools.encode_cache import EncodeCache
+from palworld_save_tools.nodes import (
+    ArrayNode,
+    BoolNode,
+    EnumValueNode,
+    MapNode,
+    PropertyNode,
+    SetNode,
+    StructNode,
+    ValueNode,
+)
+from palworld_save_tools.path_filter import PathFilter
+from palworld_save_tools.profiler import PropertyProfiler
+from palworld_save_tools.progress import Progress
+from palworld_save_tools.specializer import StructSpecializer
+
 # Alias stdlib types to avoid name conflicts
 _float = float
 _bytes = bytes
 
+logger = logging.getLogger(__name__)
+
 try:
     from recordclass import as_dataclass
 except ImportError:
     pass
 
 if os.getenv("FORCE_STDLIB_ONLY") or "recordclass" not in sys.modules:
-    if os.getenv("DEBUG"):
-        print("Using stdlib-compatible UUID class")
+    logger.debug("Using stdlib-compatible UUID class")
 
     class UUID:
         """Wrapper around uuid.UUID to delay evaluation of UUIDs until necessary"""
@@ -106,9 +127,12 @@ if os.getenv("FORCE_STDLIB_ONLY") or "recordclass" not in sys.modules:
         def __hash__(self) -> int:
             return hash(str(self))
 
+        def __reduce__(self) -> tuple[type, tuple[bytes]]:
+            # Pickle only the raw bytes, the parsed forms are rebuilt lazily
+            return (UUID, (self.raw_bytes,))
+
 else:
-    if os.getenv("DEBUG"):
-        print("Using recordclass-based UUID class")
+    logger.debug("Using recordclass-based UUID class")
 
     @as_dataclass(hashable=True, fast_new=True)
     class UUID:  # type: ignore[no-redef]
@@ -208,12 +232,97 @@ def uuid_reader(reader: "FArchiveReader") -> UUID:
     return UUID(b)
 
 
+class FixedLayout:
+    """
+    A record of fixed size fields, given as (name, struct format character)
+    pairs, that FArchiveReader.fixed reads with one read and one unpack and
+    FArchiveWriter.fixed writes with one pack, instead of a call per field.
+    Fields are little-endian without padding, "16s" reads the raw bytes of a
+    Guid. Bytes fields named in exact, such as those reader.byte_list reads,
+    raise when the data is short instead of taking what is left.
+    """
+
+    __slots__ = (
+        "fields",
+        "names",
+        "format",
+        "size",
+        "unpack",
+        "pack",
+        "has_floats",
+        "parts",
+        "partial",
+    )
+    fields: tuple[tuple[str, str], ...]
+    names: tuple[str, ...]
+    format: str
+    size: int
+    unpack: Callable[[_bytes], tuple[Any, ...]]
+    pack: Callable[..., _bytes]
+    has_floats: bool
+    parts: tuple[struct.Struct, ...]
+    # Whether each field takes what is left of short data
+    partial: tuple[bool, ...]
+
+    def __init__(
+        self, fields: Sequence[tuple[str, str]], exact: Sequence[str] = ()
+    ) -> None:
+        self.fields = tuple(fields)
+        self.names = tuple(name for name, _ in fields)
+        self.format = "<" + "".join(code for _, code in fields)
+        packer = struct.Struct(self.format)
+        self.size = packer.size
+        self.unpack = packer.unpack
+        self.pack = packer.pack
+        self.has_floats = any(code in ("e", "f", "d") for _, code in fields)
+        self.parts = tuple(struct.Struct("<" + code) for _, code in fields)
+        self.partial = tuple(
+            code.endswith("s") and name not in exact for name, code in fields
+        )
+
+    def unpack_short(self, data: _bytes) -> tuple[Any, ...]:
+        """
+        Unpacks data shorter than size as reading it a field at a time would:
+        bytes fields not in exact, such as Guids, take what is left and other
+        fields raise struct.error
+        """
+        values = []
+        offset = 0
+        for part, partial in zip(self.parts, self.partial):
+            if partial:
+                values.append(data[offset : offset + part.size])
+            else:
+                values.append(part.unpack_from(data, offset)[0])
+            offset += part.size
+        return tuple(values)
+
+    def __repr__(self) -> str:
+        return f"FixedLayout({self.fields!r})"
+
+
+VECTOR_LAYOUT = FixedLayout([("x", "d"), ("y", "d"), ("z", "d")])
+QUAT_LAYOUT = FixedLayout([("x", "d"), ("y", "d"), ("z", "d"), ("w", "d")])
+FTRANSFORM_LAYOUT = FixedLayout(
+    [(f"rotation.{name}", code) for name, code in QUAT_LAYOUT.fields]
+    + [(f"translation.{name}", code) for name, code in VECTOR_LAYOUT.fields]
+    + [(f"scale3d.{name}", code) for name, code in VECTOR_LAYOUT.fields]
+)
+
+
 class FArchiveReader:
     data: io.BytesIO
     size: int
+    owns_data: bool
     type_hints: dict[str, str]
     custom_properties: dict[str, tuple[Callable, Callable]]
     debug: bool
+    path_filter: Optional[PathFilter]
+    blob_memo: Optional[BlobMemo]
+    encode_cache: Optional[EncodeCache]
+    profiler: Optional[PropertyProfiler]
+    progress: Optional[Progress]
+    specializer: Optional[StructSpecializer]
+    compact: bool
 
     def __init__(
         self,
@@ -222,20 +331,71 @@ class FArchiveReader:
         custom_properties: dict[str, tuple[Callable, Callable]] = {},
         debug: bool = os.environ.get("DEBUG", "0") == "1",
         allow_nan: bool = True,
+        path_filter: Optional[PathFilter] = None,
+        blob_memo: Optional[BlobMemo] = None,
+        encode_cache: Optional[EncodeCache] = None,
+        profiler: Optional[PropertyProfiler] = None,
+        progress: Optional[Progress] = None,
+        specializer: Optional[StructSpecializer] = None,
+        compact: bool = False,
     ):
-        self.data = io.BytesIO(data)
-        self.size = len(data)
+        self.data, self.size, self.owns_data = FArchiveReader.open_buffer(data)
         self.type_hints = type_hints
         self.custom_properties = custom_properties
         self.debug = debug
         self.allow_nan = allow_nan
+        self.path_filter = path_filter if path_filter else None
+        self.blob_memo = blob_memo
+        self.encode_cache = encode_cache
+        self.profiler = profiler
+        self.progress = progress
+        # Specialized readers do not skip, time or record properties
+        if (
+            self.path_filter is not None
+            or encode_cache is not None
+            or profiler is not None
+        ):
+            specializer = None
+        self.specializer = specializer
+        self.compact = compact
 
     def __enter__(self):
         self.data.seek(0)
         return self
 
     def __exit__(self, type, value, traceback):
-        self.data.close()
+        if self.owns_data:
+            self.data.close()
+
+    @staticmethod
+    def open_buffer(data) -> tuple[Any, int, bool]:
+        """
+        Returns a seekable stream over data, its size and whether the reader
+        owns (and closes) the stream. Only two kinds of memoryview are read in
+        place without copying: one starting at the beginning of a writable
+        mmap, such as the ones returned by OozLib.decompress_into with
+        use_mmap, and one covering a whole bytes object. Everything else,
+        including bytearrays, views of a bytearray and views at an offset or
+        of part of their object, is copied into an io.BytesIO.
+        """
+        if isinstance(data, memoryview):
+            size = data.nbytes
+            if (
+                isinstance(data.obj, mmap.mmap)
+                and FArchiveReader.view_offset(data) == 0
+            ):
+                data.obj.seek(0)
+                return data.obj, size, False
+            if isinstance(data.obj, bytes) and size == len(data.obj):
+                data = data.obj
+        return io.BytesIO(data), len(data), True
+
+    @staticmethod
+    def view_offset(view: memoryview) -> Optional[int]:
+        if view.readonly or not view.contiguous or view.nbytes == 0:
+            return None
+        start = ctypes.addressof(ctypes.c_char.from_buffer(view))
+        return start - ctypes.addressof(ctypes.c_char.from_buffer(view.obj))
 
     def internal_copy(self, data, debug: bool) -> "FArchiveReader":
         return FArchiveReader(
@@ -244,13 +404,16 @@ class FArchiveReader:
             self.custom_properties,
             debug=debug,
             allow_nan=self.allow_nan,
+            blob_memo=self.blob_memo,
+            specializer=self.specializer,
+            compact=self.compact,
         )
 
     def get_type_or(self, path: str, default: str):
         if path in self.type_hints:
             return self.type_hints[path]
         else:
-            print(f"Struct type for {path} not found, assuming {default}")
+            logger.warning("Struct type for %s not found, assuming %s", path, default)
             return default
 
     def eof(self) -> bool:
@@ -288,8 +451,11 @@ class FArchiveReader:
         except Exception as e:
             try:
                 escaped = data.decode(encoding, errors="surrogatepass")
-                print(
-                    f"Error decoding {encoding} string of length {size}, data loss may occur! {bytes(data)!r}"
+                logger.warning(
+                    "Error decoding %s string of length %d, data loss may occur! %r",
+                    encoding,
+                    size,
+                    bytes(data),
                 )
                 return escaped
             except Exception as e:
@@ -368,6 +534,23 @@ class FArchiveReader:
             return UUID(self.data.read(16))
         return None
 
+    def fixed(self, layout: FixedLayout) -> tuple[Any, ...]:
+        """Reads the fields of layout in one read and unpack"""
+        data = self.data.read(layout.size)
+        if len(data) == layout.size:
+            values = layout.unpack(data)
+        else:
+            values = layout.unpack_short(data)
+        if self.allow_nan or not layout.has_floats:
+            return values
+        return tuple(
+            None if value == math.inf or value == -math.inf else value
+            for value in values
+        )
+
+    def fixed_dict(self, layout: FixedLayout) -> dict[str, Any]:
+        return dict(zip(layout.names, self.fixed(layout)))
+
     def tarray(self, type_reader: Callable[["FArchiveReader"], Any]) -> list[Any]:
         count = self.u32()
         array = []
@@ -376,109 +559,137 @@ class FArchiveReader:
         return array
 
     def properties_until_end(self, path: str = "") -> dict[str, Any]:
-        properties = {}
+        specializer = self.specializer
+        if specializer is not None:
+            return specializer.read(self, path)
+        return self.remaining_properties(path, {})
+
+    def remaining_properties(
+        self, path: str, properties: dict[str, Any]
+    ) -> dict[str, Any]:
+        """Reads properties into properties up to the None that ends them"""
+        path_filter = self.path_filter
         while True:
             name = self.fstring()
             if name == "None":
                 break
             type_name = self.fstring()
             size = self.u64()
-            properties[name] = self.property(type_name, size, f"{path}.{name}")
+            property_path = f"{path}.{name}"
+            if path_filter is not None and not path_filter.wants(property_path):
+                properties[name] = self.skipped_property(type_name, size)
+            else:
+                properties[name] = self.property(type_name, size, property_path)
         return properties
 
+    def skipped_property(self, type_name: str, size: int) -> dict[str, Any]:
+        """
+        Reads a property without decoding it. Only the tag header in front of
+        the value is parsed to find where the property ends, the tag header and
+        value are kept as raw bytes so the property is written back unchanged.
+        """
+        start = self.data.tell()
+        if type_name == "StructProperty":
+            self.fstring()
+            self.skip(16)
+        elif type_name == "MapProperty":
+            self.fstring()
+            self.fstring()
+        elif type_name in (
+            "ArrayProperty",
+            "SetProperty",
+            "EnumProperty",
+            "ByteProperty",
+        ):
+            self.fstring()
+        elif type_name == "BoolProperty":
+            self.skip(1)
+        if self.data.read(1)[0]:
+            self.skip(16)
+        header_size = self.data.tell() - start
+        self.data.seek(start)
+        return {
+            "skipped_bytes": self.read(header_size + size),
+            "size": size,
+            "type": type_name,
+        }
+
     def property(
         self, type_name: str, size: int, path: str, nested_caller_path: str = ""
-    ) -> dict[str, Any]:
-        value = {}
+    ) -> Union[dict[str, Any], PropertyNode]:
+        value: Any = {}
+        start = self.data.tell() if self.encode_cache is not None else 0
+        profiler = self.profiler
+        if profiler is not None:
+            token = profiler.enter("read", path, self.data.tell())
+        progress = self.progress
+        if progress is not None:
+            progress.countdown -= 1
+            if progress.countdown <= 0:
+                progress.update(self.data.tell())
+        compact = self.compact
         if path in self.custom_properties and (
             path is not nested_caller_path or nested_caller_path == ""
         ):
             value = self.custom_properties[path][0](self, type_name, size, path)
+            if isinstance(value, PropertyNode):
+                # Decoders that read the property as usual and replace its value
+                # return a node, custom properties are few and kept as dicts
+                value = value.to_dict()
             value["custom_type"] = path
+            value["type"] = type_name
         elif type_name == "StructProperty":
             value = self.struct(path)
-        elif type_name == "IntProperty":
-            value = {
-                "id": self.optional_guid(),
-                "value": self.i32(),
-            }
-        elif type_name == "UInt16Property":
-            value = {
-                "id": self.optional_guid(),
-                "value": self.u16(),
-            }
-        elif type_name == "UInt32Property":
-            value = {
-                "id": self.optional_guid(),
-                "value": self.u32(),
-            }
-        elif type_name == "UInt64Property":
-            value = {
-                "id": self.optional_guid(),
-                "value": self.u64(),
-            }
-        elif type_name == "Int64Property":
-            value = {
-                "id": self.optional_guid(),
-                "value": self.i64(),
-            }
-        elif type_name == "FixedPoint64Property":
-            value = {
-                "id": self.optional_guid(),
-                "value": self.i32(),
-            }
-        elif type_name == "FloatProperty":
-            value = {
-                "id": self.optional_guid(),
-                "value": self.float(),
-            }
-        elif type_name == "StrProperty":
-            value = {
-                "id": self.optional_guid(),
-                "value": self.fstring(),
-            }
-        elif type_name == "NameProperty":
-            value = {
-                "id": self.optional_guid(),
-                "value": self.fstring(),
-            }
-        elif type_name == "EnumProperty":
-            enum_type = self.fstring()
-            _id = self.optional_guid()
-            enum_value = self.fstring()
-            value = {
-                "id": _id,
-                "value": {
-                    "type": enum_type,
-                    "value": enum_value,
-                },
-            }
+        elif type_name in VALUE_READERS:
+            if compact:
+                _id = self.optional_guid()
+                value = ValueNode(_id, VALUE_READERS[type_name](self), type_name)
+            else:
+                value = {
+                    "id": self.optional_guid(),
+                    "value": VALUE_READERS[type_name](self),
+                    "type": type_name,
+                }
         elif type_name == "BoolProperty":
-            value = {
-                "value": self.bool(),
-                "id": self.optional_guid(),
-            }
-        elif type_name == "ByteProperty":
+            if compact:
+                value = BoolNode(self.bool(), self.optional_guid())
+            else:
+                value = {
+                    "value": self.bool(),
+                    "id": self.optional_guid(),
+                    "type": type_name,
+                }
+        elif type_name == "EnumProperty" or type_name == "ByteProperty":
             enum_type = self.fstring()
             _id = self.optional_guid()
-            if enum_type == "None":
+            if type_name == "ByteProperty" and enum_type == "None":
                 enum_value = self.byte()
             else:
                 enum_value = self.fstring()
-            value = {
-                "id": _id,
-                "value": {
-                    "type": enum_type,
-                    "value": enum_value,
-                },
-            }
+            if compact:
+                value = ValueNode(_id, EnumValueNode(enum_type, enum_value), type_name)
+            else:
+                value = {
+                    "id": _id,
+                    "value": {
+                        "type": enum_type,
+                        "value": enum_value,
+                    },
+                    "type": type_name,
+                }
         elif type_name == "ArrayProperty":
             array_type = self.fstring()
-            value = {
-                "array_type": array_type,
-                "id": self.optional_guid(),
-                "value": self.array_property(array_type, size - 4, path),
-            }
+            _id = self.optional_guid()
+            array = self.array_property(array_type, size - 4, path)
+            if compact:
+                value = ArrayNode(array_type, _id, array)
+            else:
+                value = {
+                    "array_type": array_type,
+                    "id": _id,
+                    "value": array,
+                    "type": type_name,
+                }
         elif type_name == "MapProperty":
             key_type = self.fstring()
             value_type = self.fstring()
@@ -505,30 +716,56 @@ class FArchiveReader:
                         "value": value,
                     }
                 )
-            value = {
-                "key_type": key_type,
-                "value_type": value_type,
-                "key_struct_type": key_struct_type,
-                "value_struct_type": value_struct_type,
-                "id": _id,
-                "value": values,
-            }
+            if compact:
+                value = MapNode(
+                    key_type,
+                    value_type,
+                    key_struct_type,
+                    value_struct_type,
+                    _id,
+                    values,
+                )
+            else:
+                value = {
+                    "key_type": key_type,
+                    "value_type": value_type,
+                    "key_struct_type": key_struct_type,
+                    "value_struct_type": value_struct_type,
+                    "id": _id,
+                    "value": values,
+                    "type": type_name,
+                }
         elif type_name == "SetProperty":
             set_type = self.fstring()
             _id = self.optional_guid()
             self.u32()
             count = self.u32()
-
-            value = {
-                "set_type": set_type,
-                "id": _id,
-                "value": [self.properties_until_end() for _ in range(count)],
-            }
+            elements = [self.properties_until_end() for _ in range(count)]
+            if compact:
+                value = SetNode(set_type, _id, elements)
+            else:
+                value = {
+                    "set_type": set_type,
+                    "id": _id,
+                    "value": elements,
+                    "type": type_name,
+                }
         else:
             raise Exception(f"Unknown type: {type_name} ({path})")
-        value["type"] = type_name
+        if self.encode_cache is not None:
+            self.record_encoded(value, start, size, path)
+        if profiler is not None:
+            profiler.leave(token, self.data.tell(), "custom_type" in value)
         return value
 
+    def record_encoded(
+        self, value: dict[str, Any], start: int, size: int, path: str
+    ) -> None:
+        end = self.data.tell()
+        if self.encode_cache.wants(path, "custom_type" in value, end - start):
+            self.data.seek(start)
+            self.encode_cache.record(value, self.data.read(end - start), size)
+
     def prop_value(self, type_name: str, struct_type_name: str, path: str):
         if type_name == "StructProperty":
             return self.struct_value(struct_type_name, path)
@@ -547,16 +784,19 @@ class FArchiveReader:
         else:
             raise Exception(f"Unknown property value type: {type_name} ({path})")
 
-    def struct(self, path: str) -> dict[str, Any]:
+    def struct(self, path: str) -> Union[dict[str, Any], StructNode]:
         struct_type = self.fstring()
         struct_id = self.guid()
         _id = self.optional_guid()
         value = self.struct_value(struct_type, path)
+        if self.compact:
+            return StructNode(struct_type, struct_id, _id, value)
         return {
             "struct_type": struct_type,
             "struct_id": struct_id,
             "id": _id,
             "value": value,
+            "type": "StructProperty",
         }
 
     def struct_value(self, struct_type: str, path: str = ""):
@@ -577,7 +817,7 @@ class FArchiveReader:
             }
         else:
             if self.debug:
-                print(f"Assuming struct type: {struct_type} ({path})")
+                logger.debug("Assuming struct type: %s (%s)", struct_type, path)
             return self.properties_until_end(path)
 
     def array_property(self, array_type: str, size: int, path: str):
@@ -670,37 +910,50 @@ class FArchiveReader:
                 return (self.float(), self.float(), self.float())
 
     def vector(self) -> tuple[Optional[_float], Optional[_float], Optional[_float]]:
-        return (self.double(), self.double(), self.double())
+        return self.fixed(VECTOR_LAYOUT)  # type: ignore[return-value]
 
     def vector_dict(self) -> dict[str, Optional[_float]]:
-        return {
-            "x": self.double(),
-            "y": self.double(),
-            "z": self.double(),
-        }
+        x, y, z = self.fixed(VECTOR_LAYOUT)
+        return {"x": x, "y": y, "z": z}
 
     def quat(
         self,
     ) -> tuple[Optional[_float], Optional[_float], Optional[_float], Optional[_float]]:
-        return (self.double(), self.double(), self.double(), self.double())
+        return self.fixed(QUAT_LAYOUT)  # type: ignore[return-value]
 
     def quat_dict(self) -> dict[str, Optional[_float]]:
-        return {
-            "x": self.double(),
-            "y": self.double(),
-            "z": self.double(),
-            "w": self.double(),
-        }
+        x, y, z, w = self.fixed(QUAT_LAYOUT)
+        return {"x": x, "y": y, "z": z, "w": w}
 
     def ftransform(self) -> dict[str, dict[str, Optional[_float]]]:
+        rx, ry, rz, rw, tx, ty, tz, sx, sy, sz = self.fixed(FTRANSFORM_LAYOUT)
         return {
-            "rotation": self.quat_dict(),
-            "translation": self.vector_dict(),
-            "scale3d": self.vector_dict(),
+            "rotation": {"x": rx, "y": ry, "z": rz, "w": rw},
+            "translation": {"x": tx, "y": ty, "z": tz},
+            "scale3d": {"x": sx, "y": sy, "z": sz},
         }
 
 
+# Readers of the value of the property types that are an optional Guid and a value
+VALUE_READERS: dict[str, Callable[[FArchiveReader], Any]] = {
+    "IntProperty": FArchiveReader.i32,
+    "UInt16Property": FArchiveReader.u16,
+    "UInt32Property": FArchiveReader.u32,
+    "UInt64Property": FArchiveReader.u64,
+    "Int64Property": FArchiveReader.i64,
+    "FixedPoint64Property": FArchiveReader.i32,
+    "FloatProperty": FArchiveReader.float,
+    "StrProperty": FArchiveReader.fstring,
+    "NameProperty": FArchiveReader.fstring,
+}
+
+
 def uuid_writer(writer, s: Union[str, uuid.UUID, UUID]):
+    writer.write(uuid_bytes(s))
+
+
+def uuid_bytes(s: Union[str, uuid.UUID, UUID]) -> bytes:
+    """Returns the 16 bytes a Guid is written as"""
     if isinstance(s, str):
         s = uuid.UUID(s)
     if isinstance(s, uuid.UUID):
@@ -727,7 +980,7 @@ def uuid_writer(writer, s: Union[str, uuid.UUID, UUID]):
         )
     elif isinstance(s, UUID):
         ub = s.raw_bytes
-    writer.write(ub)
+    return ub
 
 
 def instance_id_writer(writer, d):
@@ -740,15 +993,28 @@ class FArchiveWriter:
     size: int
     custom_properties: dict[str, tuple[Callable, Callable]]
     debug: bool
+    encode_cache: Optional[EncodeCache]
+    profiler: Optional[PropertyProfiler]
+    progress: Optional[Progress]
 
     def __init__(
         self,
         custom_properties: dict[str, tuple[Callable, Callable]] = {},
         debug: bool = os.environ.get("DEBUG", "0") == "1",
+        encode_cache: Optional[EncodeCache] = None,
+        profiler: Optional[PropertyProfiler] = None,
+        progress: Optional[Progress] = None,
     ):
         self.data = io.BytesIO()
         self.custom_properties = custom_properties
         self.debug = debug
+        self.encode_cache = encode_cache
+        self.profiler = profiler
+        self.progress = progress
+        if progress is not None:
+            # Until bytes() hands them over, what this writer holds counts
+            # towards the progress of the write
+            progress.writers.append(self)
 
     def __enter__(self):
         self.data.seek(0)
@@ -758,9 +1024,16 @@ class FArchiveWriter:
         self.data.close()
 
     def copy(self) -> "FArchiveWriter":
-        return FArchiveWriter(self.custom_properties)
+        return FArchiveWriter(
+            self.custom_properties,
+            encode_cache=self.encode_cache,
+            profiler=self.profiler,
+            progress=self.progress,
+        )
 
     def bytes(self) -> bytes:
+        if self.progress is not None:
+            self.progress.release(self)
         pos = self.data.tell()
         self.data.seek(0)
         b = self.data.read()
@@ -834,6 +1107,12 @@ class FArchiveWriter:
             self.bool(True)
             uuid_writer(self, u)
 
+    def fixed(self, layout: FixedLayout, values: Sequence[Any]):
+        """Writes the fields of layout in one pack, None floats as NaN"""
+        if layout.has_floats and None in values:
+            values = [math.nan if value is None else value for value in values]
+        self.data.write(layout.pack(*values))
+
     def tarray(
         self, type_writer: Callable[["FArchiveWriter", Any], None], array: list[Any]
     ):
@@ -842,12 +1121,22 @@ class FArchiveWriter:
             type_writer(self, array[i])
 
     def properties(self, properties: dict[str, Any]):
+        profiler = self.profiler
         for key in properties:
             self.fstring(key)
+            if profiler is not None:
+                profiler.push_path(f"{profiler.paths[-1]}.{key}")
             self.property(properties[key])
+            if profiler is not None:
+                profiler.pop_path()
         self.fstring("None")
 
     def property(self, property: dict[str, Any]):
+        progress = self.progress
+        if progress is not None:
+            progress.countdown -= 1
+            if progress.countdown <= 0:
+                progress.update(progress.written())
         # write type_name
         self.fstring(property["type"])
         nested_writer = self.copy()
@@ -860,7 +1149,26 @@ class FArchiveWriter:
         self.write(buf)
 
     def property_inner(self, property_type: str, property: dict[str, Any]) -> int:
-        if "custom_type" in property:
+        profiler = self.profiler
+        if profiler is not None:
+            # Custom encoders remove custom_type, so it is checked up front
+            custom = "custom_type" in property
+            token = profiler.enter("write", profiler.paths[-1], self.data.tell())
+        cached = (
+            self.encode_cache.lookup(property)
+            if self.encode_cache is not None
+            else None
+        )
+        if cached is not None:
+            raw, size = cached
+            self.write(raw)
+        elif "skipped_bytes" in property:
+            skipped_bytes = property["skipped_bytes"]
+            if isinstance(skipped_bytes, str):
+                skipped_bytes = _bytes.fromhex(skipped_bytes)
+            self.write(skipped_bytes)
+            size = property["size"]
+        elif "custom_type" in property:
             if property["custom_type"] in self.custom_properties:
                 size = self.custom_properties[property["custom_type"]][1](
                     self, property_type, property
@@ -936,15 +1244,24 @@ class FArchiveWriter:
             map_writer = self.copy()
             map_writer.u32(0)
             map_writer.u32(len(property["value"]))
+            if profiler is not None:
+                key_path = profiler.paths[-1] + ".Key"
+                value_path = profiler.paths[-1] + ".Value"
             for entry in property["value"]:
+                if profiler is not None:
+                    profiler.push_path(key_path)
                 map_writer.prop_value(
                     property["key_type"], property["key_struct_type"], entry["key"]
                 )
+                if profiler is not None:
+                    profiler.paths[-1] = value_path
                 map_writer.prop_value(
                     property["value_type"],
                     property["value_struct_type"],
                     entry["value"],
                 )
+                if profiler is not None:
+                    profiler.pop_path()
             map_buf = map_writer.bytes()
             size = len(map_buf)
             self.write(map_buf)
@@ -954,9 +1271,13 @@ class FArchiveWriter:
             set_writer = self.copy()
             set_writer.u32(0)
             set_writer.u32(len(property["value"]))
-
+            # Set elements are read with paths starting from the root
+            if profiler is not None:
+                profiler.push_path("")
             for element in property["value"]:
                 set_writer.properties(element)
+            if profiler is not None:
+                profiler.pop_path()
 
             set_bytes = set_writer.bytes()
             self.write(set_bytes)
@@ -964,6 +1285,8 @@ class FArchiveWriter:
             size = len(set_bytes)
         else:
             raise Exception(f"Unknown property type: {property_type}")
+        if profiler is not None:
+            profiler.leave(token, self.data.tell(), custom)
         return size
 
     def struct(self, property: dict[str, Any]) -> int:
@@ -990,7 +1313,7 @@ class FArchiveWriter:
             self.float(value["a"])
         else:
             if self.debug:
-                print(f"Assuming struct type: {struct_type}")
+                logger.debug("Assuming struct type: %s", struct_type)
             return self.properties(value)
 
     def prop_value(self, type_name: str, struct_type_name: str, value):
@@ -1018,8 +1341,14 @@ class FArchiveWriter:
             self.fstring(value["prop_name"])
             self.fstring(value["prop_type"])
             nested_writer = self.copy()
+            if self.profiler is not None:
+                self.profiler.push_path(
+                    f"{self.profiler.paths[-1]}.{value['prop_name']}"
+                )
             for i in range(count):
                 nested_writer.struct_value(value["type_name"], value["values"][i])
+            if self.profiler is not None:
+                self.profiler.pop_path()
             data_buf = nested_writer.bytes()
             self.u64(len(data_buf))
             self.fstring(value["type_name"])
@@ -1130,14 +1459,10 @@ class FArchiveWriter:
             self.double(z)
 
     def vector(self, x: Optional[_float], y: Optional[_float], z: Optional[_float]):
-        self.double(x)
-        self.double(y)
-        self.double(z)
+        self.fixed(VECTOR_LAYOUT, (x, y, z))
 
     def vector_dict(self, value: dict[str, Optional[_float]]):
-        self.double(value["x"])
-        self.double(value["y"])
-        self.double(value["z"])
+        self.fixed(VECTOR_LAYOUT, (value["x"], value["y"], value["z"]))
 
     def quat(
         self,
@@ -1146,18 +1471,27 @@ class FArchiveWriter:
         z: Optional[_float],
         w: Optional[_float],
     ):
-        self.double(x)
-        self.double(y)
-        self.double(z)
-        self.double(w)
+        self.fixed(QUAT_LAYOUT, (x, y, z, w))
 
     def quat_dict(self, value: dict[str, Optional[_float]]):
-        self.double(value["x"])
-        self.double(value["y"])
-        self.double(value["z"])
-        self.double(value["w"])
+        self.fixed(QUAT_LAYOUT, (value["x"], value["y"], value["z"], value["w"]))
 
     def ftransform(self, value: dict[str, dict[str, Optional[_float]]]):
-        self.quat_dict(value["rotation"])
-        self.vector_dict(value["translation"])
-        self.vector_dict(value["scale3d"])
+        rotation = value["rotation"]
+        translation = value["translation"]
+        scale3d = value["scale3d"]
+        self.fixed(
+            FTRANSFORM_LAYOUT,
+            (
+                rotation["x"],
+                rotation["y"],
+                rotation["z"],
+                rotation["w"],
+                translation["x"],
+                translation["y"],
+                translation["z"],
+                scale3d["x"],
+                scale3d["y"],
+                scale3d["z"],
+            ),
+        )
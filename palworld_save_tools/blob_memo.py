@@ -0,0 +1,170 @@
+import functools
+import gc
+import hashlib
+import logging
+import os
+import pickle
+import tempfile
+from collections import OrderedDict
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+# Bump when a decoder changes in a way that makes memoized results stale
+BLOB_MEMO_VERSION = 1
+DEFAULT_BLOB_MEMO_SIZE = 256 * 1024 * 1024
+# Smaller blobs, such as item slots, decode faster than a memo hit returns
+MIN_MEMO_BLOB_SIZE = 64
+
+
+class BlobMemo:
+    """
+    Remembers what the rawdata decode_bytes functions returned for each blob,
+    keyed by a hash of the blob bytes, so re-reading a world in which most
+    RawData blobs are unchanged only decodes the ones that changed.
+
+    Results are stored pickled and unpickled on every hit, so callers are free
+    to modify what they get back. The memo is bounded by the size of the
+    pickled results, least recently used results are evicted first. It can be
+    saved to and loaded from a file to carry it across processes; like any
+    pickle, only load files no one else can write to.
+
+    A memo should only be shared between reads with the same type hints,
+    custom properties and compact setting, as the decoders of nested blobs
+    depend on them.
+    """
+
+    max_size: int
+    size: int
+    hits: int
+    misses: int
+    entries: OrderedDict[tuple[Any, ...], bytes]
+
+    def __init__(self, max_size: int = DEFAULT_BLOB_MEMO_SIZE):
+        self.max_size = max_size
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.entries = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    @staticmethod
+    def key(name: str, blob: bytes, args: tuple[Any, ...]) -> tuple[Any, ...]:
+        return (name, args, hashlib.blake2b(blob, digest_size=16).digest())
+
+    def get(self, key: tuple[Any, ...]) -> tuple[bool, Any]:
+        payload = self.entries.get(key)
+        if payload is None:
+            self.misses += 1
+            return False, None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return True, pickle.loads(payload)
+
+    def put(self, key: tuple[Any, ...], value: Any) -> None:
+        payload = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        if len(payload) > self.max_size:
+            return
+        previous = self.entries.pop(key, None)
+        if previous is not None:
+            self.size -= len(previous)
+        self.entries[key] = payload
+        self.size += len(payload)
+        self.evict()
+
+    def evict(self) -> None:
+        while self.size > self.max_size:
+            _, evicted = self.entries.popitem(last=False)
+            self.size -= len(evicted)
+
+    def clear(self) -> None:
+        self.entries.clear()
+        self.size = 0
+
+    def save(self, path: str) -> None:
+        """Writes the memo to path, replacing it atomically"""
+        fd, tmp_path = tempfile.mkstemp(
+            dir=os.path.dirname(os.path.abspath(path)), suffix=".tmp"
+        )
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(
+                    (BLOB_MEMO_VERSION, list(self.entries.items())),
+                    f,
+                    pickle.HIGHEST_PROTOCOL,
+                )
+            os.replace(tmp_path, path)
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    @staticmethod
+    def load(path: str, max_size: int = DEFAULT_BLOB_MEMO_SIZE) -> "BlobMemo":
+        """
+        Loads a memo saved with save. Returns an empty memo if the file does not
+        exist, is unreadable or was written by another version.
+        """
+        memo = BlobMemo(max_size)
+        enabled = gc.isenabled()
+        gc.disable()
+        try:
+            with open(path, "rb") as f:
+                version, entries = pickle.load(f)
+        except FileNotFoundError:
+            return memo
+        except Exception as e:
+            logger.warning("Discarding unreadable blob memo %s: %s", path, e)
+            return memo
+        finally:
+            if enabled:
+                gc.enable()
+        if version != BLOB_MEMO_VERSION:
+            return memo
+        # Oldest first, so the most recently used survive a smaller max_size
+        for key, payload in entries:
+            memo.entries[key] = payload
+            memo.size += len(payload)
+        memo.evict()
+        return memo
+
+
+def memoize_blob(decode_bytes: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    Decorates a rawdata decode_bytes(parent_reader, blob, *args) function to
+    look its result up in parent_reader.blob_memo first. Without a memo on the
+    reader, or for blobs smaller than MIN_MEMO_BLOB_SIZE, the function is
+    called as is.
+
+    With a profiler on the reader, each call is also timed as a path named
+    after the function and its extra arguments, such as
+    map_concrete_model.decode_bytes (ItemBooth).
+    """
+    name = f"{decode_bytes.__module__}.{decode_bytes.__qualname__}"
+    short_name = (
+        f"{decode_bytes.__module__.rsplit('.', 1)[-1]}.{decode_bytes.__qualname__}"
+    )
+
+    @functools.wraps(decode_bytes)
+    def wrapper(parent_reader, blob, *args):
+        profiler = parent_reader.profiler
+        if profiler is not None:
+            span = f"{short_name} ({', '.join(map(str, args))})" if args else short_name
+            token = profiler.enter("read", span, 0)
+        memo: Optional[BlobMemo] = parent_reader.blob_memo
+        if memo is None or len(blob) < MIN_MEMO_BLOB_SIZE:
+            value = decode_bytes(parent_reader, blob, *args)
+        else:
+            # Raw fallbacks return the blob as given, so only the key uses bytes
+            key = BlobMemo.key(name, bytes(blob), args + (parent_reader.allow_nan,))
+            found, value = memo.get(key)
+            if not found:
+                value = decode_bytes(parent_reader, blob, *args)
+                memo.put(key, value)
+        if profiler is not None:
+            profiler.leave(token, len(blob), True)
+        return value
+
+    return wrapper
@@ -0,0 +1,229 @@
+import gc
+import hashlib
+import logging
+import os
+import pickle
+import tempfile
+from typing import Any, Callable, Optional
+
+from palworld_save_tools.blob_memo import DEFAULT_BLOB_MEMO_SIZE, BlobMemo
+from palworld_save_tools.gvas import GvasFile
+from palworld_save_tools.path_filter import PathFilter
+from palworld_save_tools.progress import Progress
+from palworld_save_tools.specializer import StructSpecializer
+
+logger = logging.getLogger(__name__)
+
+# Bump when the decoders change in a way that makes cached trees stale
+CACHE_VERSION = 1
+DEFAULT_CACHE_SIZE = 1 << 30
+GVAS_SUFFIX = ".gvas"
+TREE_SUFFIX = ".pickle"
+MEMO_SUFFIX = ".memo"
+CACHE_SUFFIXES = (GVAS_SUFFIX, TREE_SUFFIX, MEMO_SUFFIX)
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=20).hexdigest()
+
+
+def options_key(
+    type_hints: dict[str, str],
+    custom_properties: dict[str, tuple[Callable, Callable]],
+    allow_nan: bool,
+    path_filter: Optional[PathFilter],
+    compact: bool = False,
+) -> str:
+    """
+    Hashes the options that change the decoded tree: the type hints, which
+    custom properties are decoded, allow_nan, the path filter and whether
+    properties are compact nodes.
+    """
+    options = (
+        CACHE_VERSION,
+        sorted(type_hints.items()),
+        sorted(custom_properties.keys()),
+        allow_nan,
+        (path_filter.include, path_filter.exclude) if path_filter else None,
+        compact,
+    )
+    return content_hash(repr(options).encode("utf-8"))
+
+
+class DecodeCache:
+    """
+    Caches decompressed GVAS data and decoded GvasFile trees on disk, keyed by
+    a hash of the .sav bytes (and, for trees, the decode options), so opening
+    a save that has not changed since it was last read skips decompressing
+    and decoding it. A BlobMemo per set of decode options is kept alongside,
+    so reading a save that did change only decodes the RawData blobs that
+    changed since an earlier version of it was read.
+
+    Trees are stored with pickle, only point this at a directory that no one
+    else can write to. Entries are evicted least recently used first once the
+    directory grows past max_size bytes.
+    """
+
+    cache_dir: str
+    max_size: int
+
+    def __init__(self, cache_dir: str, max_size: int = DEFAULT_CACHE_SIZE):
+        self.cache_dir = cache_dir
+        self.max_size = max_size
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def entry_path(self, name: str) -> str:
+        return os.path.join(self.cache_dir, name)
+
+    def load(self, name: str) -> Optional[bytes]:
+        path = self.entry_path(name)
+        try:
+            with open(path, "rb") as f:
+                payload = f.read()
+            # The modification time orders entries for eviction
+            os.utime(path)
+        except OSError:
+            return None
+        return payload
+
+    def store(self, name: str, payload: bytes) -> None:
+        if len(payload) > self.max_size:
+            return
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(payload)
+            os.replace(tmp_path, self.entry_path(name))
+        except OSError as e:
+            logger.warning("Could not write cache entry %s: %s", name, e)
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return
+        self.evict()
+
+    def remove(self, name: str) -> None:
+        try:
+            os.remove(self.entry_path(name))
+        except OSError:
+            pass
+
+    def evict(self) -> None:
+        entries = []
+        total_size = 0
+        with os.scandir(self.cache_dir) as it:
+            for dir_entry in it:
+                if not dir_entry.name.endswith(CACHE_SUFFIXES):
+                    continue
+                try:
+                    stat = dir_entry.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime_ns, stat.st_size, dir_entry.name))
+                total_size += stat.st_size
+        entries.sort()
+        for _, size, name in entries:
+            if total_size <= self.max_size:
+                break
+            logger.debug("Evicting cache entry %s (%d bytes)", name, size)
+            self.remove(name)
+            total_size -= size
+
+    def clear(self) -> None:
+        with os.scandir(self.cache_dir) as it:
+            for dir_entry in it:
+                if dir_entry.name.endswith(CACHE_SUFFIXES):
+                    self.remove(dir_entry.name)
+
+    def decompress(
+        self,
+        data: bytes,
+        sav_hash: Optional[str] = None,
+        zlib_workers: Optional[int] = None,
+    ) -> tuple[bytes, int]:
+        """Cached decompress_sav_to_gvas"""
+        # Imported here, a warm tree load should not require the compressors
+        from palworld_save_tools.palsav import decompress_sav_to_gvas
+
+        if sav_hash is None:
+            sav_hash = content_hash(data)
+        name = sav_hash + GVAS_SUFFIX
+        payload = self.load(name)
+        if payload is not None and len(payload) > 0:
+            logger.debug("GVAS cache hit for %s", sav_hash)
+            return payload[1:], payload[0]
+        logger.debug("GVAS cache miss for %s", sav_hash)
+        gvas, save_type = decompress_sav_to_gvas(data, zlib_workers=zlib_workers)
+        self.store(name, bytes([save_type]) + gvas)
+        return gvas, save_type
+
+    def read(
+        self,
+        data: bytes,
+        type_hints: dict[str, str] = {},
+        custom_properties: dict[str, tuple[Callable, Callable]] = {},
+        allow_nan: bool = True,
+        path_filter: Optional[PathFilter] = None,
+        specializer: Optional[StructSpecializer] = None,
+        compact: bool = False,
+        zlib_workers: Optional[int] = None,
+        progress: Optional[Progress] = None,
+    ) -> tuple[GvasFile, int]:
+        """
+        Cached decompress_sav_to_gvas followed by GvasFile.read. Returns the
+        decoded file and the save type. Progress is only reported when the
+        tree is not cached and GvasFile.read decodes it.
+        """
+        sav_hash = content_hash(data)
+        options = options_key(
+            type_hints, custom_properties, allow_nan, path_filter, compact
+        )
+        name = f"{sav_hash}-{options}{TREE_SUFFIX}"
+        payload = self.load(name)
+        if payload is not None:
+            tree = self.unpickle(payload)
+            if tree is not None:
+                logger.debug("Tree cache hit for %s", name)
+                return tree
+            self.remove(name)
+        logger.debug("Tree cache miss for %s", name)
+        gvas, save_type = self.decompress(data, sav_hash, zlib_workers)
+        memo_path = self.entry_path(options + MEMO_SUFFIX)
+        blob_memo = BlobMemo.load(memo_path, self.blob_memo_size())
+        gvas_file = GvasFile.read(
+            gvas,
+            type_hints,
+            custom_properties,
+            allow_nan,
+            path_filter=path_filter,
+            blob_memo=blob_memo,
+            progress=progress,
+            specializer=specializer,
+            compact=compact,
+        )
+        logger.debug("Blob memo: %d hits, %d misses", blob_memo.hits, blob_memo.misses)
+        self.store(name, pickle.dumps((gvas_file, save_type), pickle.HIGHEST_PROTOCOL))
+        if blob_memo.misses > 0:
+            try:
+                blob_memo.save(memo_path)
+            except OSError as e:
+                logger.warning("Could not write blob memo %s: %s", memo_path, e)
+            self.evict()
+        return gvas_file, save_type
+
+    def blob_memo_size(self) -> int:
+        return min(DEFAULT_BLOB_MEMO_SIZE, self.max_size // 4)
+
+    @staticmethod
+    def unpickle(payload: bytes) -> Optional[Any]:
+        # The tree is millions of small objects that are all still alive
+        # afterwards, collecting while they are created only slows loading
+        enabled = gc.isenabled()
+        gc.disable()
+        try:
+            return pickle.loads(payload)
+        except Exception as e:
+            logger.warning("Discarding unreadable cache entry: %s", e)
+            return None
+        finally:
+            if enabled:
+                gc.enable()
@@ -1,4 +1,10 @@
 from . import (
     convert,
+    diff,
+    export,
+    index,
+    memory,
+    patch,
+    probe,
     resave_test
 )
\ No newline at end of file
@@ -2,16 +2,36 @@
 
 import argparse
 import json
+import logging
 import os
+import sys
 
+from palworld_save_tools.cache import DEFAULT_CACHE_SIZE, DecodeCache
+from palworld_save_tools.compressor.zlib import (
+    ZLIB_PRESETS,
+    ZLIB_STRATEGIES,
+    ZlibOptions,
+)
 from palworld_save_tools.gvas import GvasFile
 from palworld_save_tools.json_tools import CustomEncoder
-from palworld_save_tools.palsav import compress_gvas_to_sav, decompress_sav_to_gvas
+from palworld_save_tools.palsav import (
+    compress_gvas_to_sav,
+    decompress_sav_to_buffer,
+    release_buffer,
+)
 from palworld_save_tools.paltypes import (
     DISABLED_PROPERTIES,
     PALWORLD_CUSTOM_PROPERTIES,
     PALWORLD_TYPE_HINTS,
 )
+from palworld_save_tools.path_filter import PathFilter
+from palworld_save_tools.profiler import SORT_KEYS, PropertyProfiler
+from palworld_save_tools.progress import DEFAULT_INTERVAL, Progress, ProgressBar
+from palworld_save_tools.specializer import StructSpecializer
+from palworld_save_tools.trace import TRACE_FORMATS, PropertyTracer
+
+# Seconds between progress lines when stderr is not a terminal, such as a log
+LOG_PROGRESS_INTERVAL = 5.0
 
 
 def main():
@@ -48,6 +68,48 @@ def main():
         default="libooz",
         help="Compression library used to convert JSON files to SAV files. 'zlib' for zlib compression, 'libooz' for libooz compression (default: libooz)",
     )
+    parser.add_argument(
+        "--zlib-preset",
+        choices=list(ZLIB_PRESETS.keys()),
+        default="default",
+        help="Level and strategy preset for the two zlib passes when writing zlib compressed SAV files. 'fast' uses level 1 for the outer pass over already-compressed data (default: default)",
+    )
+    parser.add_argument(
+        "--zlib-level",
+        type=int,
+        choices=range(-1, 10),
+        metavar="LEVEL",
+        help="Override the zlib level (0-9, -1 for zlib's default) of the inner pass",
+    )
+    parser.add_argument(
+        "--zlib-outer-level",
+        type=int,
+        choices=range(-1, 10),
+        metavar="LEVEL",
+        help="Override the zlib level (0-9, -1 for zlib's default) of the outer pass",
+    )
+    parser.add_argument(
+        "--zlib-strategy",
+        choices=list(ZLIB_STRATEGIES.keys()),
+        help="Override the zlib strategy of the inner pass",
+    )
+    parser.add_argument(
+        "--zlib-outer-strategy",
+        choices=list(ZLIB_STRATEGIES.keys()),
+        help="Override the zlib strategy of the outer pass",
+    )
+    parser.add_argument(
+        "--zlib-chunk-size",
+        type=int,
+        metavar="BYTES",
+        help="Compress each zlib pass in independent chunks of this many bytes on multiple threads. The output is still a standard zlib stream, slightly larger than unchunked output (default: unchunked)",
+    )
+    parser.add_argument(
+        "--zlib-workers",
+        type=int,
+        metavar="THREADS",
+        help="Number of threads used for chunked zlib compression and decompression (default: one per CPU)",
+    )
     parser.add_argument(
         "--convert-nan-to-null",
         action="store_true",
@@ -60,14 +122,116 @@ def main():
         help="Comma-separated list of custom properties to decode, or 'all' for all known properties. This can be used to speed up processing by excluding properties that are not of interest. (default: all)",
     )
 
+    parser.add_argument(
+        "--include",
+        action="append",
+        default=[],
+        metavar="GLOB",
+        help="Only decode properties matching this path glob, e.g. '.worldSaveData.CharacterSaveParameterMap.**'. '*' matches within a path segment, '**' across segments. Other properties are kept as raw bytes and written back unchanged. Can be repeated",
+    )
+    parser.add_argument(
+        "--exclude",
+        action="append",
+        default=[],
+        metavar="GLOB",
+        help="Do not decode properties matching this path glob, e.g. '.worldSaveData.FoliageGridSaveDataMap'. They are kept as raw bytes and written back unchanged. Can be repeated",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        metavar="DIR",
+        help="Cache decompressed and decoded saves in this directory, keyed by a hash of the SAV file and the decode options. Converting an unchanged save again loads it from the cache (default: no cache)",
+    )
+    parser.add_argument(
+        "--cache-size",
+        type=int,
+        default=DEFAULT_CACHE_SIZE // (1024 * 1024),
+        metavar="MB",
+        help="Size limit of --cache-dir, least recently used entries are evicted beyond it (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--specialize",
+        action="store_true",
+        help="Generate a reader for each struct path read many times with the same properties, such as the SaveParameter of each character, that reads them without looking up how to read each property. Structs with other properties are read as usual. Not used with --include, --exclude, --profile or --trace",
+    )
+    parser.add_argument(
+        "--compact",
+        action="store_true",
+        help="Hold each decoded property in a compact node with slots instead of a dict, which takes less memory while converting to JSON",
+    )
+    parser.add_argument(
+        "--profile",
+        choices=SORT_KEYS,
+        nargs="?",
+        const="tottime",
+        help="Time decoding or encoding by property path and print the slowest paths, sorted by this column (default: tottime)",
+    )
+    parser.add_argument(
+        "--profile-output",
+        metavar="FILE",
+        help="Time decoding or encoding by property path and write the times of all paths to this JSON file",
+    )
+    parser.add_argument(
+        "--trace",
+        metavar="FILE",
+        help="Record a span for each property path and decoder and write them to this file, for flamegraph or trace viewers",
+    )
+    parser.add_argument(
+        "--trace-format",
+        choices=TRACE_FORMATS,
+        help="Format of --trace: 'chrome' for Chrome trace JSON (chrome://tracing, Perfetto), 'folded' for folded stacks (flamegraph.pl, inferno, speedscope) (default: chrome for .json files, folded otherwise)",
+    )
+    parser.add_argument(
+        "--progress",
+        action="store_true",
+        default=None,
+        help="Show the stage, MB/s and ETA of decoding and encoding the GVAS properties on stderr. Decompressing, compressing and reading or writing the JSON are not shown, nor is a read the --cache-dir cache answers (default: when stderr is a terminal)",
+    )
+    parser.add_argument(
+        "--no-progress",
+        action="store_false",
+        dest="progress",
+        help="Do not show progress",
+    )
     parser.add_argument("--minify-json", action="store_true", help="Minify JSON output")
     parser.add_argument("--raw", action="store_true", help="Output raw GVAS file")
+    parser.add_argument(
+        "--log-level",
+        default="WARNING",
+        choices=["DEBUG", "INFO", "WARNING", "ERROR"],
+        type=str.upper,
+        help="Level of diagnostic messages from the compressors and decoders. DEBUG includes the details of each compression pass (default: WARNING)",
+    )
     args = parser.parse_args()
+    logging.basicConfig(
+        level=args.log_level, format="%(levelname)s %(name)s: %(message)s"
+    )
 
     if args.to_json and args.from_json:
         print("Cannot specify both --to-json and --from-json")
         exit(1)
 
+    if (args.profile or args.profile_output or args.trace) and args.cache_dir:
+        print("Cannot profile or trace with --cache-dir")
+        exit(1)
+    if args.trace:
+        profiler = PropertyTracer()
+    elif args.profile or args.profile_output:
+        profiler = PropertyProfiler()
+    else:
+        profiler = None
+
+    show_progress = args.progress
+    if show_progress is None:
+        show_progress = sys.stderr.isatty()
+    if show_progress:
+        bar = ProgressBar(sys.stderr)
+        # Lines are only redrawn in place on a terminal
+        progress = Progress(
+            bar, interval=DEFAULT_INTERVAL if bar.tty else LOG_PROGRESS_INTERVAL
+        )
+    else:
+        progress = None
+
     if not os.path.exists(args.filename):
         print(f"{args.filename} does not exist")
         exit(1)
@@ -88,6 +252,17 @@ def main():
             allow_nan=(not args.convert_nan_to_null),
             custom_properties_keys=args.custom_properties,
             raw=args.raw,
+            zlib_workers=args.zlib_workers,
+            path_filter=PathFilter(args.include, args.exclude),
+            cache=(
+                DecodeCache(args.cache_dir, args.cache_size * 1024 * 1024)
+                if args.cache_dir
+                else None
+            ),
+            profiler=profiler,
+            progress=progress,
+            specializer=StructSpecializer() if args.specialize else None,
+            compact=args.compact,
         )
 
     if args.from_json or args.filename.endswith(".json"):
@@ -95,10 +270,38 @@ def main():
             output_path = args.filename.replace(".json", "")
         else:
             output_path = args.output
+        zlib_options = ZlibOptions.preset(args.zlib_preset)
+        if args.zlib_level is not None:
+            zlib_options.level = args.zlib_level
+        if args.zlib_outer_level is not None:
+            zlib_options.outer_level = args.zlib_outer_level
+        if args.zlib_strategy is not None:
+            zlib_options.strategy = ZLIB_STRATEGIES[args.zlib_strategy]
+        if args.zlib_outer_strategy is not None:
+            zlib_options.outer_strategy = ZLIB_STRATEGIES[args.zlib_outer_strategy]
+        zlib_options.chunk_size = args.zlib_chunk_size
+        zlib_options.workers = args.zlib_workers
         convert_json_to_sav(
-            args.filename, output_path, force=args.force, zlib=(args.library == "zlib")
+            args.filename,
+            output_path,
+            force=args.force,
+            zlib=(args.library == "zlib"),
+            zlib_options=zlib_options,
+            profiler=profiler,
+            progress=progress,
         )
 
+    if profiler is not None:
+        if args.profile:
+            print(profiler.table(args.profile))
+        if args.profile_output:
+            profiler.write_json(args.profile_output)
+        if args.trace:
+            trace_format = args.trace_format or (
+                "chrome" if args.trace.endswith(".json") else "folded"
+            )
+            profiler.write_trace(args.trace, trace_format)
+
 
 def convert_sav_to_json(
     filename,
@@ -108,6 +311,13 @@ def convert_sav_to_json(
     allow_nan=True,
     custom_properties_keys=["all"],
     raw=False,
+    zlib_workers=None,
+    path_filter=None,
+    cache=None,
+    profiler=None,
+    progress=None,
+    specializer=None,
+    compact=False,
 ):
     print(f"Converting {filename} to JSON, saving to {output_path}")
     if os.path.exists(output_path):
@@ -118,7 +328,12 @@ def convert_sav_to_json(
     print(f"Decompressing sav file")
     with open(filename, "rb") as f:
         data = f.read()
-        raw_gvas, _ = decompress_sav_to_gvas(data)
+    if cache is None:
+        raw_gvas, _ = decompress_sav_to_buffer(
+            data, use_mmap=True, zlib_workers=zlib_workers
+        )
+    elif raw:
+        raw_gvas, _ = cache.decompress(data, zlib_workers=zlib_workers)
     if raw:
         output_dir = os.path.dirname(output_path)
         output_file = f"{os.path.basename(output_path)}.bin"
@@ -134,9 +349,35 @@ def convert_sav_to_json(
         for prop in PALWORLD_CUSTOM_PROPERTIES:
             if prop in custom_properties_keys:
                 custom_properties[prop] = PALWORLD_CUSTOM_PROPERTIES[prop]
-    gvas_file = GvasFile.read(
-        raw_gvas, PALWORLD_TYPE_HINTS, custom_properties, allow_nan=allow_nan
-    )
+    if cache is not None:
+        gvas_file, _ = cache.read(
+            data,
+            PALWORLD_TYPE_HINTS,
+            custom_properties,
+            allow_nan=allow_nan,
+            path_filter=path_filter,
+            specializer=specializer,
+            compact=compact,
+            zlib_workers=zlib_workers,
+            progress=progress,
+        )
+    else:
+        try:
+            gvas_file = GvasFile.read(
+                raw_gvas,
+                PALWORLD_TYPE_HINTS,
+                custom_properties,
+                allow_nan=allow_nan,
+                path_filter=path_filter,
+                profiler=profiler,
+                progress=progress,
+                specializer=specializer,
+                compact=compact,
+            )
+        finally:
+            # Nothing decoded refers to the buffer, free its mmap before
+            # dumping the JSON
+            release_buffer(raw_gvas)
     print(f"Writing JSON to {output_path}")
     with open(output_path, "w", encoding="utf8") as f:
         indent = None if minify else "\t"
@@ -145,7 +386,15 @@ def convert_sav_to_json(
         )
 
 
-def convert_json_to_sav(filename, output_path, force=False, zlib=False):
+def convert_json_to_sav(
+    filename,
+    output_path,
+    force=False,
+    zlib=False,
+    zlib_options=None,
+    profiler=None,
+    progress=None,
+):
     print(f"Converting {filename} to SAV, saving to {output_path}")
     if os.path.exists(output_path):
         print(f"{output_path} already exists, this will overwrite the file")
@@ -167,7 +416,12 @@ def convert_json_to_sav(filename, output_path, force=False, zlib=False):
     if zlib:
         save_type = 0x32  # Use double zlib compression
     sav_file = compress_gvas_to_sav(
-        gvas_file.write(PALWORLD_CUSTOM_PROPERTIES), save_type, zlib=zlib
+        gvas_file.write(
+            PALWORLD_CUSTOM_PROPERTIES, profiler=profiler, progress=progress
+        ),
+        save_type,
+        zlib=zlib,
+        zlib_options=zlib_options,
     )
     print(f"Writing SAV file to {output_path}")
     with open(output_path, "wb") as f:
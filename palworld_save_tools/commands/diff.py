@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+
+import argparse
+import json
+
+from palworld_save_tools.diff import diff_sav_files
+from palworld_save_tools.index import DEFAULT_INDEX_DEPTH
+from palworld_save_tools.json_tools import CustomEncoder
+from palworld_save_tools.paltypes import (
+    DISABLED_PROPERTIES,
+    PALWORLD_CUSTOM_PROPERTIES,
+    PALWORLD_TYPE_HINTS,
+)
+
+MAX_VALUE_LENGTH = 120
+
+
+def format_value(value, max_length=MAX_VALUE_LENGTH):
+    text = json.dumps(value, cls=CustomEncoder, ensure_ascii=False)
+    if len(text) > max_length:
+        text = text[: max_length - 3] + "..."
+    return text
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog="palworld-save-diff",
+        description="Lists the changes between two Palworld save files, keyed by property path",
+    )
+    parser.add_argument("old")
+    parser.add_argument("new")
+    parser.add_argument(
+        "--depth",
+        type=int,
+        default=DEFAULT_INDEX_DEPTH,
+        help=f"Number of property levels compared by their bytes before changed entries are decoded (default: {DEFAULT_INDEX_DEPTH})",
+    )
+    parser.add_argument(
+        "--custom-properties",
+        default=",".join(set(PALWORLD_CUSTOM_PROPERTIES.keys()) - DISABLED_PROPERTIES),
+        type=lambda t: [s.strip() for s in t.split(",")],
+        help="Comma-separated list of custom properties to decode, or 'all' for all known properties (default: all)",
+    )
+    parser.add_argument(
+        "--json",
+        action="store_true",
+        help="Print the changes as a JSON list",
+    )
+    args = parser.parse_args()
+
+    if len(args.custom_properties) > 0 and args.custom_properties[0] == "all":
+        custom_properties = PALWORLD_CUSTOM_PROPERTIES
+    else:
+        custom_properties = {
+            prop: PALWORLD_CUSTOM_PROPERTIES[prop]
+            for prop in PALWORLD_CUSTOM_PROPERTIES
+            if prop in args.custom_properties
+        }
+    changes = diff_sav_files(
+        args.old, args.new, PALWORLD_TYPE_HINTS, custom_properties, args.depth
+    )
+    if args.json:
+        print(json.dumps(changes, cls=CustomEncoder, indent="\t", ensure_ascii=False))
+        return
+    for change in changes:
+        if change["change"] == "added":
+            print(f"+ {change['path']}: {format_value(change['new'])}")
+        elif change["change"] == "removed":
+            print(f"- {change['path']}: {format_value(change['old'])}")
+        elif "old_size" in change:
+            print(
+                f"~ {change['path']}: {change['old_size']:,} bytes -> {change['new_size']:,} bytes"
+            )
+        else:
+            print(
+                f"~ {change['path']}: {format_value(change['old'])} -> {format_value(change['new'])}"
+            )
+    print(f"{len(changes)} change(s)")
+
+
+if __name__ == "__main__":
+    main()
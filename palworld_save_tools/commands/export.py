@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+
+import argparse
+import os
+
+from palworld_save_tools.commands.convert import confirm_prompt
+from palworld_save_tools.export.columnar import FORMATS, export_sav_to_columns
+from palworld_save_tools.export.sqlite import DEFAULT_BATCH_SIZE, export_sav_to_sqlite
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog="palworld-save-export",
+        description="Exports the contents of a Palworld world save (Level.sav) for analysis",
+    )
+    subparsers = parser.add_subparsers(dest="format", required=True)
+    sqlite_parser = subparsers.add_parser(
+        "sqlite",
+        help="Export characters, guilds, item containers, base camps and map objects into SQLite tables",
+    )
+    sqlite_parser.add_argument("filename")
+    sqlite_parser.add_argument(
+        "--output",
+        "-o",
+        help="Output database (default: <filename>.sqlite)",
+    )
+    sqlite_parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=DEFAULT_BATCH_SIZE,
+        help=f"Number of rows inserted at a time (default: {DEFAULT_BATCH_SIZE})",
+    )
+    sqlite_parser.add_argument(
+        "--force",
+        "-f",
+        action="store_true",
+        help="Replace the output database if it exists without prompting",
+    )
+    columnar_parser = subparsers.add_parser(
+        "columnar",
+        help="Export foliage instances, map model transforms and work bounds as one typed array file per field",
+    )
+    columnar_parser.add_argument("filename")
+    columnar_parser.add_argument(
+        "--output",
+        "-o",
+        help="Output directory (default: <filename>.columns)",
+    )
+    columnar_parser.add_argument(
+        "--file-format",
+        choices=FORMATS,
+        default=FORMATS[0],
+        help="Write NumPy .npy files, or headerless little-endian .bin files (default: npy)",
+    )
+    columnar_parser.add_argument(
+        "--force",
+        "-f",
+        action="store_true",
+        help="Write into the output directory if it exists without prompting",
+    )
+    args = parser.parse_args()
+
+    if not os.path.exists(args.filename):
+        print(f"{args.filename} does not exist")
+        exit(1)
+    if args.format == "columnar":
+        export_columnar(args)
+        return
+    output_path = args.output or args.filename + ".sqlite"
+    if os.path.exists(output_path):
+        if not args.force:
+            print(f"{output_path} already exists, this will replace the database")
+            if not confirm_prompt("Are you sure you want to continue?"):
+                exit(1)
+        os.remove(output_path)
+    counts = export_sav_to_sqlite(args.filename, output_path, args.batch_size)
+    print(f"Exported {args.filename} to {output_path}")
+    for table, count in counts.items():
+        print(f"  {table}: {count:,} rows")
+
+
+def export_columnar(args):
+    output_path = args.output or args.filename + ".columns"
+    if os.path.exists(output_path) and not args.force:
+        print(f"{output_path} already exists, files in it will be overwritten")
+        if not confirm_prompt("Are you sure you want to continue?"):
+            exit(1)
+    manifest = export_sav_to_columns(args.filename, output_path, args.file_format)
+    print(f"Exported {args.filename} to {output_path}")
+    for table, columns in manifest["tables"].items():
+        print(f"  {table}: {columns['rows']:,} rows")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+
+import argparse
+import json
+from collections import Counter
+
+from palworld_save_tools.index import (
+    DEFAULT_INDEX_DEPTH,
+    find_entries,
+    index_path,
+    index_sav_file,
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog="palworld-save-index",
+        description="Builds a byte offset index of the properties in a Palworld save file and stores it next to the file",
+    )
+    parser.add_argument("filename")
+    parser.add_argument(
+        "--depth",
+        type=int,
+        default=DEFAULT_INDEX_DEPTH,
+        help=f"Number of property levels to index, map entries and array elements count as a level (default: {DEFAULT_INDEX_DEPTH})",
+    )
+    parser.add_argument(
+        "--rebuild",
+        action="store_true",
+        help="Rebuild the index even if an up to date one exists",
+    )
+    parser.add_argument(
+        "--path",
+        help="Print the index entries at this property path, e.g. .worldSaveData.CharacterSaveParameterMap",
+    )
+    args = parser.parse_args()
+
+    index = index_sav_file(args.filename, args.depth, rebuild=args.rebuild)
+    if args.path:
+        for entry in find_entries(index, args.path):
+            print(json.dumps(entry))
+        return
+    print(f"Index of {args.filename} saved to {index_path(args.filename)}")
+    print(f"  GVAS size: {index['gvas_size']:,} bytes")
+    print(f"  Depth: {index['max_depth']}")
+    counts = Counter(entry["kind"] for entry in index["entries"])
+    for kind, count in sorted(counts.items()):
+        print(f"  {kind}: {count:,}")
+
+
+if __name__ == "__main__":
+    main()
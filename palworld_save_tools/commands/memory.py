@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+
+import argparse
+import json
+
+from palworld_save_tools.gvas import GvasFile
+from palworld_save_tools.memory import MEMORY_KINDS, TreeMemory, read_with_allocations
+from palworld_save_tools.palsav import decompress_sav_to_gvas
+from palworld_save_tools.paltypes import (
+    DISABLED_PROPERTIES,
+    PALWORLD_CUSTOM_PROPERTIES,
+    PALWORLD_TYPE_HINTS,
+)
+
+DEFAULT_ROWS = 30
+
+
+def format_bytes(size: int) -> str:
+    return f"{size / 1e6:.1f}MB" if size >= 100000 else f"{size / 1e3:.1f}KB"
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog="palworld-save-memory",
+        description="Reports where the memory of a decoded Palworld save goes, by property path and by the module that allocated it",
+    )
+    parser.add_argument("filename")
+    parser.add_argument(
+        "--rows",
+        type=int,
+        default=DEFAULT_ROWS,
+        help=f"Number of property paths to print, largest first (default: {DEFAULT_ROWS})",
+    )
+    parser.add_argument(
+        "--no-allocations",
+        action="store_true",
+        help="Do not trace allocations by module with tracemalloc, which slows reading down around a hundredfold",
+    )
+    parser.add_argument(
+        "--compact",
+        action="store_true",
+        help="Read properties into compact nodes instead of dicts, to compare what they take",
+    )
+    parser.add_argument(
+        "--custom-properties",
+        default=",".join(set(PALWORLD_CUSTOM_PROPERTIES.keys()) - DISABLED_PROPERTIES),
+        type=lambda t: [s.strip() for s in t.split(",")],
+        help="Comma-separated list of custom properties to decode, or 'all' for all known properties (default: all)",
+    )
+    parser.add_argument(
+        "--json", action="store_true", help="Print the full report as JSON"
+    )
+    args = parser.parse_args()
+
+    if len(args.custom_properties) > 0 and args.custom_properties[0] == "all":
+        custom_properties = PALWORLD_CUSTOM_PROPERTIES
+    else:
+        custom_properties = {
+            prop: PALWORLD_CUSTOM_PROPERTIES[prop]
+            for prop in PALWORLD_CUSTOM_PROPERTIES
+            if prop in args.custom_properties
+        }
+
+    with open(args.filename, "rb") as f:
+        gvas, _ = decompress_sav_to_gvas(f.read())
+
+    def read():
+        return GvasFile.read(
+            gvas,
+            PALWORLD_TYPE_HINTS,
+            custom_properties,
+            compact=args.compact,
+        )
+
+    if args.no_allocations:
+        gvas_file, modules = read(), None
+    else:
+        gvas_file, modules = read_with_allocations(read)
+    memory = TreeMemory()
+    memory.add_properties(gvas_file.properties)
+
+    if args.json:
+        print(
+            json.dumps(
+                {
+                    "gvas_size": len(gvas),
+                    "totals": memory.totals(),
+                    "paths": memory.paths,
+                    "modules": modules,
+                }
+            )
+        )
+        return
+    totals = memory.totals()
+    print(
+        f"{len(gvas):,} bytes of GVAS data decode to about "
+        f"{format_bytes(sum(totals.values()))} of objects"
+    )
+    print(
+        f"{'path':<72} {'total':>9} " + " ".join(f"{kind:>9}" for kind in MEMORY_KINDS)
+    )
+    rows = sorted(memory.paths.items(), key=lambda item: -sum(item[1].values()))
+    for path, counts in [("(all)", totals)] + rows[: args.rows]:
+        print(
+            f"{path[-72:]:<72} {format_bytes(sum(counts.values())):>9} "
+            + " ".join(f"{format_bytes(counts[kind]):>9}" for kind in MEMORY_KINDS)
+        )
+    if modules is not None:
+        print()
+        print(f"{'allocated by':<72} {'bytes':>9} {'blocks':>12}")
+        for module, counts in sorted(
+            modules.items(), key=lambda item: -item[1]["bytes"]
+        ):
+            print(
+                f"{module:<72} {format_bytes(counts['bytes']):>9} "
+                f"{counts['blocks']:>12,}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+
+import argparse
+import os
+
+from palworld_save_tools.commands.convert import confirm_prompt
+from palworld_save_tools.index import DEFAULT_INDEX_DEPTH
+from palworld_save_tools.patch import apply_sav_patch, decode_patch, make_sav_patch
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog="palworld-save-patch",
+        description="Creates a binary patch between two Palworld save files, or applies one to a save file without decoding it",
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    create_parser = subparsers.add_parser(
+        "create", help="Create a patch turning the old save into the new one"
+    )
+    create_parser.add_argument("old")
+    create_parser.add_argument("new")
+    create_parser.add_argument("patch", help="Path to write the patch to")
+    create_parser.add_argument(
+        "--depth",
+        type=int,
+        default=DEFAULT_INDEX_DEPTH,
+        help=f"Number of property levels compared by their bytes, deeper changes replace the whole entry at this level (default: {DEFAULT_INDEX_DEPTH})",
+    )
+    apply_parser = subparsers.add_parser("apply", help="Apply a patch to a save")
+    apply_parser.add_argument("filename")
+    apply_parser.add_argument("patch")
+    apply_parser.add_argument(
+        "--output",
+        "-o",
+        help="Output file (default: overwrite the save)",
+    )
+    apply_parser.add_argument(
+        "--force",
+        "-f",
+        action="store_true",
+        help="Overwrite output file if it exists without prompting",
+    )
+    args = parser.parse_args()
+
+    if args.command == "create":
+        patch = make_sav_patch(args.old, args.new, max_depth=args.depth)
+        with open(args.patch, "wb") as f:
+            f.write(patch)
+        print(
+            f"Patch with {len(decode_patch(patch)['ops'])} change(s) written to {args.patch} ({len(patch):,} bytes)"
+        )
+        return
+    output_path = args.output or args.filename
+    if os.path.exists(output_path) and not args.force:
+        print(f"{output_path} already exists, this will overwrite the file")
+        if not confirm_prompt("Are you sure you want to continue?"):
+            exit(1)
+    with open(args.patch, "rb") as f:
+        patch = f.read()
+    apply_sav_patch(args.filename, patch, output_path)
+    print(f"Patched save written to {output_path}")
+
+
+if __name__ == "__main__":
+    main()
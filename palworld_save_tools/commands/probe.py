@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+
+import argparse
+import json
+import os
+import sys
+
+from palworld_save_tools.probe import probe_sav_file
+
+
+def find_sav_files(paths: list[str]) -> list[str]:
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, names in os.walk(path):
+                files.extend(
+                    os.path.join(root, name)
+                    for name in sorted(names)
+                    if name.endswith(".sav")
+                )
+        else:
+            files.append(path)
+    return files
+
+
+def format_row(path: str, info: dict) -> str:
+    return (
+        f"{path}  0x{info['save_type']:02X} {info['compressed_size']:>12,} "
+        f"{info['uncompressed_size']:>12,}  {info['engine_version']}  "
+        f"{info['save_game_class_name']}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog="palworld-save-probe",
+        description="Prints the save type, sizes and GVAS header summary of Palworld save files without decompressing them in full",
+    )
+    parser.add_argument(
+        "paths", nargs="+", help=".sav files, or directories to search for them"
+    )
+    parser.add_argument(
+        "--json",
+        action="store_true",
+        help="Print one JSON object per file instead of a table",
+    )
+    args = parser.parse_args()
+
+    failed = False
+    for path in find_sav_files(args.paths):
+        try:
+            info = probe_sav_file(path)
+        except Exception as e:
+            print(f"{path}: {e}", file=sys.stderr)
+            failed = True
+            continue
+        if args.json:
+            print(json.dumps({"path": path, **info}))
+        else:
+            print(format_row(path, info))
+    if failed:
+        exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,12 @@
+import logging
 from typing import Tuple
 from palworld_save_tools.compressor.enums import SaveType, MagicBytes
 
+logger = logging.getLogger(__name__)
+
+# Number of leading compressed bytes included in debug logs
+HEX_DUMP_BYTES = 32
+
 
 class Compressor:
     def __init__(self):
@@ -57,7 +63,7 @@ class Compressor:
             case SaveType.CNK.value:
                 return SaveType.CNK
             case _:
-                print(f"Unknown save type: 0x{save_type:02X}")
+                logger.warning("Unknown save type: 0x%02X", save_type)
                 return None
 
     def check_sav_format(self, sav_data: bytes) -> SaveType | None:
@@ -69,7 +75,7 @@ class Compressor:
         if len(sav_data) < 12:
             return None
         magic = sav_data[8:11]
-        print(f"Checking SAV format, magic bytes: {magic!r}")
+        logger.debug("Checking SAV format, magic bytes: %r", magic)
 
         match magic:
             case MagicBytes.PLZ.value:
@@ -79,7 +85,7 @@ class Compressor:
             case MagicBytes.CNK.value:
                 return SaveType.CNK
             case _:
-                print(f"Unknown magic bytes: {magic!r}")
+                logger.warning("Unknown magic bytes: %r", magic)
                 return None
 
     def build_sav(
@@ -94,7 +100,6 @@ class Compressor:
         Build SAV file header.
         Returns: bytes with the header.
         """
-        print("Building .sav file...")
         result = bytearray()
         result.extend(uncompressed_len.to_bytes(4, "little"))
         result.extend(compressed_len.to_bytes(4, "little"))
@@ -102,5 +107,5 @@ class Compressor:
         result.extend(bytes([save_type]))
         result.extend(compressed_data)
 
-        print("Finished building .sav file.")
+        logger.debug("Built .sav file, %d bytes", len(result))
         return bytes(result)
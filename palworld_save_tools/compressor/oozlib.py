@@ -1,8 +1,18 @@
+import ctypes
+import logging
+import mmap
 import os
 import sys
 import platform
+from typing import Optional, Union
 
-from palworld_save_tools.compressor import Compressor, SaveType
+from palworld_save_tools.compressor import HEX_DUMP_BYTES, Compressor, SaveType
+from palworld_save_tools.ooz_lib import setup_ooz_decompress
+
+logger = logging.getLogger(__name__)
+
+# Shared libraries exporting the C API of ooz, looked up next to the ooz module
+OOZ_SHARED_LIBRARIES = ["libooz.so", "libooz.dll", "ooz.dll"]
 
 
 class OodleCompressor:
@@ -36,6 +46,8 @@ class OozLib(Compressor):
         OozLib is an open source library for compression and decompression using Oodle.
         """
         self.SAFE_SPACE_PADDING = 128
+        self.lib = None
+        self.__lib_loaded = False
         self.__load_ooz()
 
     def __load_ooz(self):
@@ -59,6 +71,7 @@ class OozLib(Compressor):
             raise Exception(f"Unsupported platform: {sys.platform}")
 
         local_ooz_path = os.path.join(os.path.dirname(__file__), "..", "lib", lib_path)
+        self.lib_dir = local_ooz_path
         if os.path.isdir(local_ooz_path):
             sys.path.insert(0, local_ooz_path)
 
@@ -71,9 +84,35 @@ class OozLib(Compressor):
 
         self.ooz = ooz
 
-    def compress(self, data: bytes, save_type: int) -> bytes:
-        print("\nStarting compression process with libooz...")
+    def __load_ooz_ctypes(self):
+        """
+        Load the C API of ooz through ctypes, which lets Ooz_Decompress write
+        straight into a caller supplied buffer. This is either exported by the
+        ooz module itself or by a separate shared library next to it. Returns
+        None if neither is available.
+        """
+        if self.__lib_loaded:
+            return self.lib
+        self.__lib_loaded = True
+        candidates = [getattr(self.ooz, "__file__", None)] + [
+            os.path.join(self.lib_dir, name) for name in OOZ_SHARED_LIBRARIES
+        ]
+        for candidate in candidates:
+            if not candidate or not os.path.isfile(candidate):
+                continue
+            try:
+                lib = ctypes.CDLL(candidate)
+            except OSError:
+                continue
+            if not hasattr(lib, "Ooz_Decompress"):
+                continue
+            setup_ooz_decompress(lib)
+            logger.debug("Using Ooz_Decompress from %s", candidate)
+            self.lib = lib
+            break
+        return self.lib
 
+    def compress(self, data: bytes, save_type: int) -> bytes:
         uncompressed_len = len(data)
         if uncompressed_len == 0:
             raise ValueError("Input data for compression must not be empty.")
@@ -83,8 +122,6 @@ class OozLib(Compressor):
                 f"Unhandled compression type: 0x{save_type:02X}, only 0x31 (PLM) is supported"
             )
 
-        print("Compressing data...")
-
         compressed_data = self.ooz.compress(
             OodleCompressor.Mermaid, OodleLevel.Normal, data, uncompressed_len
         )
@@ -97,14 +134,15 @@ class OozLib(Compressor):
         compressed_len = len(compressed_data)
         magic_bytes = self._get_magic(save_type)
 
-        print(f"Compression successful, compressed size: {compressed_len:,} bytes")
-
-        print(f"File information (Compress):")
-        print(f"  Magic bytes: {magic_bytes.decode('ascii', errors='ignore')}")
-        print(f"  Save type: 0x{save_type:02X}")
-        print(f"  Compressed size: {compressed_len:,} bytes")
-        print(f"  Uncompressed size: {uncompressed_len:,} bytes")
-        print(f"  Hex dump: {compressed_data.hex()[:64]}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Compressed with libooz: magic=%r save_type=0x%02X compressed_size=%d uncompressed_size=%d head=%s",
+                magic_bytes,
+                save_type,
+                compressed_len,
+                uncompressed_len,
+                compressed_data[:HEX_DUMP_BYTES].hex(),
+            )
 
         sav_data = self.build_sav(
             compressed_data, uncompressed_len, compressed_len, magic_bytes, save_type
@@ -113,8 +151,6 @@ class OozLib(Compressor):
         return sav_data
 
     def decompress(self, data: bytes) -> bytes:
-        print("\nStarting decompression process with libooz...")
-
         if not data:
             raise ValueError("SAV data cannot be empty")
 
@@ -130,13 +166,14 @@ class OozLib(Compressor):
             self._parse_sav_header(data)
         )
 
-        print(f"File information (Decompress):")
-        print(f"  Magic bytes: {magic.decode('ascii', errors='ignore')}")
-        print(f"  Save type: 0x{save_type:02X}")
-        print(f"  Compressed size: {compressed_len:,} bytes")
-        print(f"  Uncompressed size: {uncompressed_len:,} bytes")
-        print(f"  Data offset: {data_offset} bytes")
-        print("Detected PLM format (Oodle), starting decompression...")
+        logger.debug(
+            "Decompressing with libooz: magic=%r save_type=0x%02X compressed_size=%d uncompressed_size=%d data_offset=%d",
+            magic,
+            save_type,
+            compressed_len,
+            uncompressed_len,
+            data_offset,
+        )
 
         compressed_data = data[data_offset : data_offset + compressed_len]
         decompressed = self.ooz.decompress(compressed_data, uncompressed_len)
@@ -146,8 +183,94 @@ class OozLib(Compressor):
                 f"Decompressed data length {len(decompressed)} does not match expected uncompressed length {uncompressed_len}"
             )
 
-        print(
-            f"Decompression successful, decompressed size: {len(decompressed):,} bytes"
-        )
+        logger.debug("Decompressed %d bytes", len(decompressed))
 
         return decompressed, save_type
+
+    def decompress_into(
+        self,
+        data: bytes,
+        out: Optional[Union[bytearray, mmap.mmap]] = None,
+        use_mmap: bool = False,
+    ) -> tuple[memoryview, int]:
+        """
+        Decompresses a PLM save into a preallocated buffer and returns a
+        memoryview of the GVAS data inside it, along with the save type.
+
+        out must be writable and hold at least the uncompressed size plus
+        SAFE_SPACE_PADDING bytes, the padding is scratch space for the
+        decoder. Without out, a bytearray (or an anonymous mmap with
+        use_mmap) of the right size is allocated. A memoryview over an mmap
+        is read by FArchiveReader without copying it.
+
+        If the ooz C API cannot be loaded through ctypes, the data is
+        decompressed with the ooz module instead, and only copied if out was
+        given.
+        """
+        uncompressed_len, compressed_len, magic, save_type, data_offset = (
+            self._parse_sav_header(data)
+        )
+        if magic != b"PlM":
+            raise ValueError(
+                f"Detected {magic!r} format, this tool only supports PLM format (Oodle)"
+            )
+        if len(data) < data_offset + compressed_len:
+            raise ValueError(
+                f"File data is incomplete, expected {data_offset + compressed_len} bytes, actual {len(data)} bytes"
+            )
+
+        buffer_len = uncompressed_len + self.SAFE_SPACE_PADDING
+        if out is not None and len(out) < buffer_len:
+            raise ValueError(
+                f"Output buffer too small, expected at least {buffer_len} bytes, got {len(out)}"
+            )
+
+        compressed_data = data[data_offset : data_offset + compressed_len]
+        lib = self.__load_ooz_ctypes()
+        if lib is None:
+            decompressed = self.ooz.decompress(compressed_data, uncompressed_len)
+            if len(decompressed) != uncompressed_len:
+                raise ValueError(
+                    f"Decompressed data length {len(decompressed)} does not match expected uncompressed length {uncompressed_len}"
+                )
+            if out is None:
+                # Already a fresh bytes object, which is read without a copy
+                return memoryview(decompressed), save_type
+            out[:uncompressed_len] = decompressed
+        else:
+            if out is None:
+                out = mmap.mmap(-1, buffer_len) if use_mmap else bytearray(buffer_len)
+            dst = (ctypes.c_char * buffer_len).from_buffer(out)
+            try:
+                result_size = lib.Ooz_Decompress(
+                    compressed_data,
+                    compressed_len,
+                    ctypes.addressof(dst),
+                    uncompressed_len,
+                    0,
+                    0,
+                    0,
+                    None,
+                    0,
+                    None,
+                    None,
+                    None,
+                    0,
+                    0,
+                )
+            finally:
+                # Release the export so an mmap can still be closed or resized
+                del dst
+            if result_size < 0:
+                raise RuntimeError(
+                    f"Oodle decompression failed with error code: {result_size}"
+                )
+            if result_size < uncompressed_len:
+                raise RuntimeError(
+                    f"Decompressed size is smaller than expected. "
+                    f"Expected at least {uncompressed_len}, got {result_size}"
+                )
+
+        logger.debug("Decompressed %d bytes into a buffer", uncompressed_len)
+
+        return memoryview(out)[:uncompressed_len], save_type
@@ -1,34 +1,347 @@
+import logging
+import os
 import zlib
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Optional
 
-from palworld_save_tools.compressor import Compressor, SaveType
+from palworld_save_tools.compressor import HEX_DUMP_BYTES, Compressor, SaveType
+
+logger = logging.getLogger(__name__)
+
+
+class ZlibLevel:
+    Default = zlib.Z_DEFAULT_COMPRESSION
+    Fastest = zlib.Z_BEST_SPEED
+    Best = zlib.Z_BEST_COMPRESSION
+
+
+class ZlibStrategy:
+    Default = zlib.Z_DEFAULT_STRATEGY
+    Filtered = zlib.Z_FILTERED
+    HuffmanOnly = zlib.Z_HUFFMAN_ONLY
+    RLE = zlib.Z_RLE
+    Fixed = zlib.Z_FIXED
+
+
+ZLIB_STRATEGIES: dict[str, int] = {
+    "default": ZlibStrategy.Default,
+    "filtered": ZlibStrategy.Filtered,
+    "huffman": ZlibStrategy.HuffmanOnly,
+    "rle": ZlibStrategy.RLE,
+    "fixed": ZlibStrategy.Fixed,
+}
+
+
+class ZlibOptions:
+    """
+    Compression level and strategy for both passes of PLZ double compression.
+    Every combination produces a standard zlib stream, so the game loads the
+    output regardless of the settings chosen here.
+
+    When chunk_size is set, each pass splits its input into chunks of that
+    many bytes and compresses them independently on a thread pool of workers
+    threads (default: one per CPU).
+    """
+
+    __slots__ = (
+        "level",
+        "strategy",
+        "outer_level",
+        "outer_strategy",
+        "chunk_size",
+        "workers",
+    )
+    level: int
+    strategy: int
+    outer_level: int
+    outer_strategy: int
+    chunk_size: Optional[int]
+    workers: Optional[int]
+
+    def __init__(
+        self,
+        level: int = ZlibLevel.Default,
+        strategy: int = ZlibStrategy.Default,
+        outer_level: int = ZlibLevel.Default,
+        outer_strategy: int = ZlibStrategy.Default,
+        chunk_size: Optional[int] = None,
+        workers: Optional[int] = None,
+    ) -> None:
+        self.level = level
+        self.strategy = strategy
+        self.outer_level = outer_level
+        self.outer_strategy = outer_strategy
+        self.chunk_size = chunk_size
+        self.workers = workers
+
+    @staticmethod
+    def preset(name: str) -> "ZlibOptions":
+        if name not in ZLIB_PRESETS:
+            raise ValueError(
+                f"Unknown zlib preset: {name}, expected one of {', '.join(ZLIB_PRESETS)}"
+            )
+        return ZlibOptions(*ZLIB_PRESETS[name])
+
+    def __repr__(self) -> str:
+        return (
+            "ZlibOptions(level=%d, strategy=%d, outer_level=%d, outer_strategy=%d, chunk_size=%r, workers=%r)"
+            % (
+                self.level,
+                self.strategy,
+                self.outer_level,
+                self.outer_strategy,
+                self.chunk_size,
+                self.workers,
+            )
+        )
+
+
+# (level, strategy, outer_level, outer_strategy)
+ZLIB_PRESETS: dict[str, tuple[int, int, int, int]] = {
+    # Matches the output of previous versions byte for byte
+    "default": (
+        ZlibLevel.Default,
+        ZlibStrategy.Default,
+        ZlibLevel.Default,
+        ZlibStrategy.Default,
+    ),
+    # The outer pass runs over already-compressed data and gains almost nothing
+    # from searching for matches, so only spend effort on the inner pass
+    "fast": (
+        ZlibLevel.Default,
+        ZlibStrategy.Default,
+        ZlibLevel.Fastest,
+        ZlibStrategy.Default,
+    ),
+    "fastest": (
+        ZlibLevel.Fastest,
+        ZlibStrategy.Default,
+        ZlibLevel.Fastest,
+        ZlibStrategy.Default,
+    ),
+    "best": (
+        ZlibLevel.Best,
+        ZlibStrategy.Default,
+        ZlibLevel.Best,
+        ZlibStrategy.Default,
+    ),
+}
+
+
+def deflate(data: bytes, level: int, strategy: int) -> bytes:
+    if strategy == ZlibStrategy.Default:
+        return zlib.compress(data, level)
+    compressor = zlib.compressobj(
+        level, zlib.DEFLATED, zlib.MAX_WBITS, strategy=strategy
+    )
+    return compressor.compress(data) + compressor.flush()
+
+
+# Empty stored block emitted by a full flush, marks where a chunk ends
+SYNC_MARKER = b"\x00\x00\xff\xff"
+# Streams smaller than this are not worth splitting up for decompression
+MIN_PARALLEL_INFLATE_SIZE = 1 << 20
+ADLER_BASE = 65521
+
+
+def adler32_combine(adler1: int, adler2: int, len2: int) -> int:
+    """Combines the adler32 of two buffers, as zlib's adler32_combine"""
+    rem = len2 % ADLER_BASE
+    sum1 = ((adler1 & 0xFFFF) + (adler2 & 0xFFFF) + ADLER_BASE - 1) % ADLER_BASE
+    sum2 = (
+        rem * (adler1 & 0xFFFF)
+        + ((adler1 >> 16) & 0xFFFF)
+        + ((adler2 >> 16) & 0xFFFF)
+        + ADLER_BASE
+        - rem
+    ) % ADLER_BASE
+    return sum1 | (sum2 << 16)
+
+
+def zlib_header(level: int, strategy: int) -> bytes:
+    """The two byte header zlib writes for a 32K window, as in deflate.c"""
+    if level == ZlibLevel.Default:
+        level = 6
+    if strategy >= ZlibStrategy.HuffmanOnly or level < 2:
+        level_flags = 0
+    elif level < 6:
+        level_flags = 1
+    elif level == 6:
+        level_flags = 2
+    else:
+        level_flags = 3
+    header = (0x78 << 8) | (level_flags << 6)
+    header += 31 - (header % 31)
+    return header.to_bytes(2, "big")
+
+
+def deflate_chunk(
+    chunk: memoryview, level: int, strategy: int, last: bool
+) -> tuple[bytes, int]:
+    # A fresh compressor per chunk means no chunk refers back into the data of
+    # the one before it, so every chunk can also be inflated on its own
+    compressor = zlib.compressobj(
+        level, zlib.DEFLATED, -zlib.MAX_WBITS, strategy=strategy
+    )
+    compressed = compressor.compress(chunk) + compressor.flush(
+        zlib.Z_FINISH if last else zlib.Z_FULL_FLUSH
+    )
+    return compressed, zlib.adler32(chunk)
+
+
+def deflate_chunked(
+    data: bytes, level: int, strategy: int, chunk_size: int, executor: Executor
+) -> bytes:
+    """
+    Compresses data as independent chunks on the executor and stitches them
+    into one standard zlib stream. Every chunk but the last ends with a full
+    flush, so the result inflates like any other zlib stream.
+    """
+    if chunk_size <= 0:
+        raise ValueError(f"chunk_size must be positive, got {chunk_size}")
+    view = memoryview(data)
+    offsets = range(0, max(len(view), 1), chunk_size)
+    futures = [
+        executor.submit(
+            deflate_chunk,
+            view[offset : offset + chunk_size],
+            level,
+            strategy,
+            offset + chunk_size >= len(view),
+        )
+        for offset in offsets
+    ]
+    result = bytearray(zlib_header(level, strategy))
+    adler = 1
+    for offset, future in zip(offsets, futures):
+        compressed, chunk_adler = future.result()
+        result.extend(compressed)
+        adler = adler32_combine(adler, chunk_adler, min(chunk_size, len(view) - offset))
+    result.extend(adler.to_bytes(4, "big"))
+    return bytes(result)
+
+
+def inflate_range(data: memoryview, last: bool) -> tuple[bytes, int]:
+    decompressor = zlib.decompressobj(-zlib.MAX_WBITS)
+    inflated = decompressor.decompress(data)
+    if decompressor.eof != last or decompressor.unused_data:
+        raise zlib.error("chunk does not end on a chunk boundary")
+    return inflated, zlib.adler32(inflated)
+
+
+def inflate_chunked(
+    data: bytes, expected_len: int, executor: Executor, ranges: int
+) -> Optional[bytes]:
+    """
+    Inflates a zlib stream written by deflate_chunked by splitting it at the
+    full flush markers and inflating the pieces on the executor. Returns None
+    if the stream cannot be split, in which case it has to be inflated
+    serially. Markers can also occur by chance inside compressed data, so the
+    pieces are only trusted if the length and adler32 of the result match.
+    """
+    view = memoryview(data)
+    if len(view) < MIN_PARALLEL_INFLATE_SIZE or ranges < 2:
+        return None
+    if (view[0] & 0x0F) != zlib.DEFLATED or (view[1] & 0x20):
+        return None
+    start, end = 2, len(view) - 4
+    boundaries = []
+    position = data.find(SYNC_MARKER, start, end)
+    while position != -1:
+        boundaries.append(position + len(SYNC_MARKER))
+        position = data.find(SYNC_MARKER, position + len(SYNC_MARKER), end)
+    if not boundaries:
+        return None
+    # Group adjacent pieces so there are about as many ranges as requested
+    step = max(1, (len(boundaries) + 1) // ranges)
+    splits = [start] + boundaries[step - 1 :: step]
+    if splits[-1] >= end:
+        splits.pop()
+    splits.append(end)
+    futures = [
+        executor.submit(
+            inflate_range, view[splits[i] : splits[i + 1]], i == len(splits) - 2
+        )
+        for i in range(len(splits) - 1)
+    ]
+    result = bytearray()
+    adler = 1
+    try:
+        for future in futures:
+            inflated, range_adler = future.result()
+            result.extend(inflated)
+            adler = adler32_combine(adler, range_adler, len(inflated))
+    except zlib.error:
+        return None
+    if len(result) != expected_len or adler != int.from_bytes(view[end:], "big"):
+        return None
+    return bytes(result)
+
+
+def inflate(data: bytes, expected_len: int, workers: int) -> bytes:
+    # Only streams worth splitting get a thread pool, the rest are inflated
+    # inline
+    if workers > 1 and len(data) >= MIN_PARALLEL_INFLATE_SIZE:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            inflated = inflate_chunked(data, expected_len, executor, workers)
+        if inflated is not None:
+            return inflated
+    return zlib.decompress(data)
 
 
 class Zlib(Compressor):
     def __init__(self):
         """
-        OozLib is an open source library for compression and decompression using Oodle.
+        Zlib handles the double zlib (PLZ) compression used by Palworld saves.
         """
         self.SAFE_SPACE_PADDING = 128
 
-    def compress(self, data: bytes, save_type: int) -> bytes:
-        print("\nStarting compression process with zlib...")
+    def compress(
+        self, data: bytes, save_type: int, options: Optional[ZlibOptions] = None
+    ) -> bytes:
+        if options is None:
+            options = ZlibOptions()
 
-        uncompressed_len = len(data)
-        compressed_data = zlib.compress(data)
-        compressed_len = len(compressed_data)
         if save_type != 0x32:
             raise Exception(
                 f"Unhandled compression type: 0x{save_type:02X}, only 0x32 (double zlib) is supported"
             )
-        compressed_data = zlib.compress(compressed_data)
+        uncompressed_len = len(data)
+        if options.chunk_size is None:
+            compressed_data = deflate(data, options.level, options.strategy)
+            compressed_len = len(compressed_data)
+            compressed_data = deflate(
+                compressed_data, options.outer_level, options.outer_strategy
+            )
+        else:
+            with ThreadPoolExecutor(max_workers=options.workers) as executor:
+                compressed_data = deflate_chunked(
+                    data,
+                    options.level,
+                    options.strategy,
+                    options.chunk_size,
+                    executor,
+                )
+                compressed_len = len(compressed_data)
+                compressed_data = deflate_chunked(
+                    compressed_data,
+                    options.outer_level,
+                    options.outer_strategy,
+                    options.chunk_size,
+                    executor,
+                )
         magic_bytes = self._get_magic(save_type)
 
-        print(f"File information (Compress):")
-        print(f"  Magic bytes: {magic_bytes.decode('ascii', errors='ignore')}")
-        print(f"  Save type: 0x{save_type:02X}")
-        print(f"  Compressed size: {compressed_len:,} bytes")
-        print(f"  Uncompressed size: {uncompressed_len:,} bytes")
-        print(f"  Hex dump: {compressed_data.hex()[:64]}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Compressed with zlib: magic=%r save_type=0x%02X options=%r compressed_size=%d uncompressed_size=%d head=%s",
+                magic_bytes,
+                save_type,
+                options,
+                compressed_len,
+                uncompressed_len,
+                compressed_data[:HEX_DUMP_BYTES].hex(),
+            )
 
         sav_data = self.build_sav(
             compressed_data,
@@ -40,9 +353,12 @@ class Zlib(Compressor):
 
         return sav_data
 
-    def decompress(self, data: bytes) -> bytes:
-        print("\nStarting decompression process with zlib...")
-
+    def decompress(self, data: bytes, workers: Optional[int] = None) -> bytes:
+        """
+        Decompresses a PLZ save. Streams written in chunks are inflated on a
+        thread pool of workers threads (default: one per CPU), pass workers=1
+        to always inflate serially.
+        """
         format_result = self.check_sav_format(data)
 
         if format_result is None:
@@ -57,28 +373,30 @@ class Zlib(Compressor):
             self._parse_sav_header(data)
         )
 
-        print(f"File information (Decompress):")
-        print(f"  Magic bytes: {magic.decode('ascii', errors='ignore')}")
-        print(f"  Save type: 0x{save_type:02X}")
-        print(f"  Compressed size: {compressed_len:,} bytes")
-        print(f"  Uncompressed size: {uncompressed_len:,} bytes")
-        print("Detected PLZ format (Zlib), starting decompression...")
-
-        uncompressed_data = zlib.decompress(data[data_offset:])
+        logger.debug(
+            "Decompressing with zlib: magic=%r save_type=0x%02X compressed_size=%d uncompressed_size=%d",
+            magic,
+            save_type,
+            compressed_len,
+            uncompressed_len,
+        )
 
+        if workers is None:
+            workers = os.cpu_count() or 1
         if save_type == SaveType.PLZ.value:
+            uncompressed_data = inflate(data[data_offset:], compressed_len, workers)
             if compressed_len != len(uncompressed_data):
                 raise Exception(f"incorrect compressed length: {compressed_len}")
 
-            uncompressed_data = zlib.decompress(uncompressed_data)
+            uncompressed_data = inflate(uncompressed_data, uncompressed_len, workers)
+        else:
+            uncompressed_data = inflate(data[data_offset:], uncompressed_len, workers)
 
         if uncompressed_len != len(uncompressed_data):
             raise Exception(
                 f"incorrect uncompressed length: {uncompressed_len} != {len(uncompressed_data)}"
             )
 
-        print(
-            f"Decompression successful, decompressed size: {len(uncompressed_data):,} bytes"
-        )
+        logger.debug("Decompressed %d bytes", len(uncompressed_data))
 
         return uncompressed_data, save_type
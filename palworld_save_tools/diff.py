@@ -0,0 +1,405 @@
+import hashlib
+import logging
+import math
+from collections import defaultdict
+from difflib import SequenceMatcher
+from typing import Any, Callable, Optional
+
+from palworld_save_tools.archive import FArchiveReader
+from palworld_save_tools.gvas import GvasFile, GvasHeader
+from palworld_save_tools.index import DEFAULT_INDEX_DEPTH, IndexedGvas
+
+logger = logging.getLogger(__name__)
+
+
+def key_label(key: Any) -> str:
+    """
+    Formats a map key for a change path, e.g. the PlayerUId and InstanceId of
+    a CharacterSaveParameterMap key as PlayerUId=...,InstanceId=...
+    """
+    if isinstance(key, dict):
+        if all(isinstance(value, dict) and "value" in value for value in key.values()):
+            return ",".join(
+                f"{name}={key_label(value['value'])}" for name, value in key.items()
+            )
+        return ",".join(f"{name}={key_label(value)}" for name, value in key.items())
+    return str(key)
+
+
+def change(
+    path: str, kind: str, old: Any = None, new: Any = None, **extra: Any
+) -> dict[str, Any]:
+    entry = {"path": path, "change": kind}
+    if kind != "added":
+        entry["old"] = old
+    if kind != "removed":
+        entry["new"] = new
+    entry.update(extra)
+    return entry
+
+
+def values_equal(old: Any, new: Any) -> bool:
+    if isinstance(old, float) and isinstance(new, float):
+        return old == new or (math.isnan(old) and math.isnan(new))
+    return type(old) is type(new) and old == new
+
+
+def is_map_entries(values: list[Any]) -> bool:
+    return all(
+        isinstance(value, dict) and value.keys() == {"key", "value"} for value in values
+    )
+
+
+def diff_values(
+    old: Any, new: Any, path: str = "", changes: Optional[list[dict[str, Any]]] = None
+) -> list[dict[str, Any]]:
+    """
+    Compares two decoded values, such as the properties of two GvasFiles, and
+    returns the changes between them. Dict keys extend the path with .key,
+    list items with [index], and decoded map entries with [key].
+    """
+    if changes is None:
+        changes = []
+    if old is new:
+        return changes
+    if isinstance(old, dict) and isinstance(new, dict):
+        for key, old_value in old.items():
+            if key in new:
+                diff_values(old_value, new[key], f"{path}.{key}", changes)
+            else:
+                changes.append(change(f"{path}.{key}", "removed", old=old_value))
+        for key, new_value in new.items():
+            if key not in old:
+                changes.append(change(f"{path}.{key}", "added", new=new_value))
+    elif (
+        isinstance(old, list)
+        and isinstance(new, list)
+        and is_map_entries(old)
+        and is_map_entries(new)
+    ):
+        old_entries = {key_label(entry["key"]): entry for entry in old}
+        new_entries = {key_label(entry["key"]): entry for entry in new}
+        for label, old_entry in old_entries.items():
+            if label in new_entries:
+                diff_values(
+                    old_entry["value"],
+                    new_entries[label]["value"],
+                    f"{path}[{label}]",
+                    changes,
+                )
+            else:
+                changes.append(change(f"{path}[{label}]", "removed", old=old_entry))
+        for label, new_entry in new_entries.items():
+            if label not in old_entries:
+                changes.append(change(f"{path}[{label}]", "added", new=new_entry))
+    elif isinstance(old, (list, tuple)) and isinstance(new, (list, tuple)):
+        for i in range(min(len(old), len(new))):
+            diff_values(old[i], new[i], f"{path}[{i}]", changes)
+        for i in range(len(new), len(old)):
+            changes.append(change(f"{path}[{i}]", "removed", old=old[i]))
+        for i in range(len(old), len(new)):
+            changes.append(change(f"{path}[{i}]", "added", new=new[i]))
+    elif not values_equal(old, new):
+        changes.append(change(path, "changed", old, new))
+    return changes
+
+
+def diff_gvas_files(old: GvasFile, new: GvasFile) -> list[dict[str, Any]]:
+    """Compares two decoded GvasFiles"""
+    changes = diff_values(old.header.dump(), new.header.dump(), "header")
+    diff_values(old.properties, new.properties, "", changes)
+    diff_values(old.trailer, new.trailer, "trailer", changes)
+    return changes
+
+
+class GvasSide(IndexedGvas):
+    """One of the two GVAS files being compared"""
+
+    def try_decode(self, entry: dict[str, Any]) -> tuple[bool, Any]:
+        try:
+            return True, self.decode(entry)
+        except Exception as e:
+            logger.warning("Could not decode %s: %s", entry["path"], e)
+            return False, None
+
+
+class GvasDiff:
+    """
+    Compares two GVAS files using byte offset indexes of both (see
+    palworld_save_tools.index). Properties, map entries and array elements
+    whose bytes are equal are skipped without being decoded. Properties that
+    differ are descended into down to max_depth, and only the entries that
+    differ below that are decoded and compared value by value. Map entries
+    are matched by their key, array elements by aligning equal elements.
+    """
+
+    old: GvasSide
+    new: GvasSide
+    changes: list[dict[str, Any]]
+
+    def __init__(
+        self,
+        old: bytes,
+        new: bytes,
+        type_hints: dict[str, str] = {},
+        custom_properties: dict[str, tuple[Callable, Callable]] = {},
+        max_depth: int = DEFAULT_INDEX_DEPTH,
+    ):
+        self.old = GvasSide(old, type_hints, custom_properties, max_depth)
+        self.new = GvasSide(new, type_hints, custom_properties, max_depth)
+        self.changes = []
+
+    def diff(self) -> list[dict[str, Any]]:
+        old, new = self.old, self.new
+        if old.data[: old.index["header_size"]] != new.data[: new.index["header_size"]]:
+            self.header_changed()
+        self.diff_children(-1, -1)
+        # "None" and the trailer
+        if old.data[old.properties_end() :] != new.data[new.properties_end() :]:
+            self.trailer_changed()
+        return self.changes
+
+    def diff_children(self, old_parent: int, new_parent: int) -> None:
+        old_children = self.old.children.get(old_parent, [])
+        new_children = self.new.children.get(new_parent, [])
+        if len(old_children) == 0 and len(new_children) == 0:
+            return
+        kind = self.old.entries[old_children[0]]["kind"] if old_children else None
+        kind = kind or self.new.entries[new_children[0]]["kind"]
+        if kind == "array_element":
+            self.diff_elements(old_parent, old_children, new_children)
+        else:
+            self.diff_keyed(old_parent, new_parent, old_children, new_children)
+
+    def entry_key(self, side: GvasSide, entry: dict[str, Any]) -> Any:
+        if entry["kind"] == "map_entry":
+            return side.data[entry["key_offset"] : entry["key_end"]]
+        return entry["path"]
+
+    def keyed(self, side: GvasSide, children: list[int]) -> dict[Any, int]:
+        keyed: dict[Any, int] = {}
+        seen: dict[Any, int] = defaultdict(int)
+        for i in children:
+            key = self.entry_key(side, side.entries[i])
+            # Properties can repeat with an array index, keep them apart
+            keyed[(key, seen[key])] = i
+            seen[key] += 1
+        return keyed
+
+    def diff_keyed(
+        self,
+        old_parent: int,
+        new_parent: int,
+        old_children: list[int],
+        new_children: list[int],
+    ) -> None:
+        old_keyed = self.keyed(self.old, old_children)
+        new_keyed = self.keyed(self.new, new_children)
+        matched = [old_keyed[key] for key in new_keyed if key in old_keyed]
+        if any(a > b for a, b in zip(matched, matched[1:])) and self.reordered(
+            old_parent, new_parent
+        ):
+            return
+        for key, old_i in old_keyed.items():
+            new_i = new_keyed.get(key)
+            if new_i is None:
+                self.removed(old_i)
+            else:
+                self.diff_entries(old_i, new_i)
+        # Added entries go before the next entry that is in both
+        at = self.old.children_end(old_parent)
+        added = []
+        for key, new_i in reversed(new_keyed.items()):
+            old_i = old_keyed.get(key)
+            if old_i is None:
+                added.append((new_i, at))
+            else:
+                at = self.old.entries[old_i]["offset"]
+        for new_i, at in reversed(added):
+            self.added(new_i, old_parent, at)
+
+    def diff_elements(
+        self, old_parent: int, old_children: list[int], new_children: list[int]
+    ) -> None:
+        old_raw = [self.old.raw(self.old.entries[i]) for i in old_children]
+        new_raw = [self.new.raw(self.new.entries[i]) for i in new_children]
+        # Skip the common prefix and suffix before aligning what is left
+        start = 0
+        while (
+            start < len(old_raw)
+            and start < len(new_raw)
+            and old_raw[start] == new_raw[start]
+        ):
+            start += 1
+        old_end, new_end = len(old_raw), len(new_raw)
+        while (
+            old_end > start
+            and new_end > start
+            and old_raw[old_end - 1] == new_raw[new_end - 1]
+        ):
+            old_end -= 1
+            new_end -= 1
+        old_hashes = [
+            hashlib.blake2b(raw, digest_size=16).digest()
+            for raw in old_raw[start:old_end]
+        ]
+        new_hashes = [
+            hashlib.blake2b(raw, digest_size=16).digest()
+            for raw in new_raw[start:new_end]
+        ]
+        matcher = SequenceMatcher(None, old_hashes, new_hashes, autojunk=False)
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+            if tag == "equal":
+                continue
+            paired = min(i2 - i1, j2 - j1) if tag == "replace" else 0
+            for k in range(paired):
+                self.diff_entries(
+                    old_children[start + i1 + k], new_children[start + j1 + k]
+                )
+            for k in range(i1 + paired, i2):
+                self.removed(old_children[start + k])
+            if start + i2 < len(old_children):
+                at = self.old.entries[old_children[start + i2]]["offset"]
+            else:
+                at = self.old.children_end(old_parent)
+            for k in range(j1 + paired, j2):
+                self.added(new_children[start + k], old_parent, at)
+
+    def descends(self, old_i: int, new_i: int) -> bool:
+        old_entry = self.old.entries[old_i]
+        new_entry = self.new.entries[new_i]
+        if old_entry["kind"] != "property" or old_entry["type"] != new_entry["type"]:
+            return False
+        if not (self.old.children.get(old_i) or self.new.children.get(new_i)):
+            return False
+        # Map entries and array elements are decoded within a copy of their
+        # container, but a custom struct has to be decoded as a whole
+        return (
+            old_entry["type"] != "StructProperty"
+            or old_entry["path"] not in self.old.reader.custom_properties
+        )
+
+    def diff_entries(self, old_i: int, new_i: int) -> None:
+        old_entry = self.old.entries[old_i]
+        new_entry = self.new.entries[new_i]
+        if self.old.raw(old_entry) == self.new.raw(new_entry):
+            return
+        if self.descends(old_i, new_i):
+            self.diff_children(old_i, new_i)
+            return
+        self.changed(old_i, new_i)
+
+    def entry_path(
+        self, side: GvasSide, entry: dict[str, Any], value: Optional[Any] = None
+    ) -> str:
+        if entry["kind"] == "property":
+            return entry["path"]
+        parent_path = side.entries[entry["parent"]]["path"]
+        if entry["kind"] == "map_entry":
+            if value is None:
+                return f"{parent_path}[#{entry['index']}]"
+            return f"{parent_path}[{key_label(value['key'])}]"
+        return f"{parent_path}[{entry['index']}]"
+
+    # What to do with the differences found, overridden by PatchBuilder
+
+    def header_changed(self) -> None:
+        diff_values(
+            GvasHeader.read(FArchiveReader(self.old.header())).dump(),
+            GvasHeader.read(FArchiveReader(self.new.header())).dump(),
+            "header",
+            self.changes,
+        )
+
+    def trailer_changed(self) -> None:
+        self.changes.append(
+            change("trailer", "changed", self.old.trailer(), self.new.trailer())
+        )
+
+    def reordered(self, old_parent: int, new_parent: int) -> bool:
+        """
+        Called when entries in both files are in a different order, return
+        True to skip comparing the entries. The order does not matter for the
+        decoded values, so they are compared as usual.
+        """
+        return False
+
+    def changed(self, old_i: int, new_i: int) -> None:
+        old_entry = self.old.entries[old_i]
+        new_entry = self.new.entries[new_i]
+        old_ok, old_value = self.old.try_decode(old_entry)
+        new_ok, new_value = self.new.try_decode(new_entry)
+        path = self.entry_path(self.new, new_entry, new_value if new_ok else None)
+        if not old_ok or not new_ok:
+            self.changes.append(
+                change(
+                    path,
+                    "changed",
+                    old_size=old_entry["end"] - old_entry["offset"],
+                    new_size=new_entry["end"] - new_entry["offset"],
+                )
+            )
+            return
+        if old_entry["kind"] == "map_entry":
+            old_value = old_value["value"]
+            new_value = new_value["value"]
+        diff_values(old_value, new_value, path, self.changes)
+
+    def removed(self, old_i: int) -> None:
+        self.report(self.old, old_i, "removed")
+
+    def added(self, new_i: int, old_parent: int, at: int) -> None:
+        """Called for new entries, at is where they go in the old file"""
+        self.report(self.new, new_i, "added")
+
+    def report(self, side: GvasSide, i: int, kind: str) -> None:
+        entry = side.entries[i]
+        ok, value = side.try_decode(entry)
+        path = self.entry_path(side, entry, value if ok else None)
+        if not ok:
+            value = {"size": entry["end"] - entry["offset"]}
+        if kind == "removed":
+            self.changes.append(change(path, kind, old=value))
+        else:
+            self.changes.append(change(path, kind, new=value))
+
+
+def diff_gvas(
+    old: bytes,
+    new: bytes,
+    type_hints: dict[str, str] = {},
+    custom_properties: dict[str, tuple[Callable, Callable]] = {},
+    max_depth: int = DEFAULT_INDEX_DEPTH,
+) -> list[dict[str, Any]]:
+    """
+    Returns the changes between two decompressed GVAS files. Each change has
+    a path, a change kind ("added", "removed" or "changed") and the old
+    and/or new value.
+    """
+    return GvasDiff(old, new, type_hints, custom_properties, max_depth).diff()
+
+
+def diff_sav_files(
+    old_path: str,
+    new_path: str,
+    type_hints: Optional[dict[str, str]] = None,
+    custom_properties: dict[str, tuple[Callable, Callable]] = {},
+    max_depth: int = DEFAULT_INDEX_DEPTH,
+) -> list[dict[str, Any]]:
+    """Returns the changes between two .sav files"""
+    # Imported here, the diff of decompressed data should not require the
+    # compressors
+    from palworld_save_tools.palsav import decompress_sav_to_gvas
+    from palworld_save_tools.paltypes import PALWORLD_TYPE_HINTS
+
+    with open(old_path, "rb") as f:
+        old_gvas, _ = decompress_sav_to_gvas(f.read())
+    with open(new_path, "rb") as f:
+        new_gvas, _ = decompress_sav_to_gvas(f.read())
+    return diff_gvas(
+        old_gvas,
+        new_gvas,
+        PALWORLD_TYPE_HINTS if type_hints is None else type_hints,
+        custom_properties,
+        max_depth,
+    )
@@ -0,0 +1,86 @@
+import hashlib
+import io
+import pickle
+from typing import Any, Optional
+
+DEFAULT_ENCODE_CACHE_DEPTH = 2
+# Smaller properties encode about as fast as their snapshot is taken
+MIN_ENCODE_CACHE_SIZE = 64
+
+
+def snapshot(value: Any) -> bytes:
+    buf = io.BytesIO()
+    pickler = pickle.Pickler(buf, pickle.HIGHEST_PROTOCOL)
+    # Decoded trees have no cycles, so skip the memo of objects already seen,
+    # which takes a good part of the time otherwise
+    pickler.fast = True
+    pickler.dump(value)
+    return hashlib.blake2b(buf.getbuffer(), digest_size=16).digest()
+
+
+class EncodeCache:
+    """
+    Remembers the bytes properties were decoded from, so writing a file back
+    after a small change only encodes the properties that contain the change.
+
+    Pass the same cache to GvasFile.read and GvasFile.write. Properties from
+    the second level (such as .worldSaveData.CharacterSaveParameterMap) down
+    to max_depth path segments (.worldSaveData.GroupSaveDataMap.Value.RawData
+    is at depth 4), and all custom properties, are recorded. The top level is
+    not, its snapshot would take as long as all others combined and only pay
+    off if nothing changed at all.
+
+    Entries are keyed by the identity of the decoded value, and a hash of its
+    pickled form taken when it was read tells whether it was modified since.
+    A modified property is encoded as usual, which looks up the properties
+    inside it in turn. Values that replaced the decoded ones are encoded as
+    usual.
+
+    Taking a snapshot is several times faster than encoding the same
+    property, but not free: reads with a cache are slower, and writing a
+    file in which everything changed is slower than without one.
+    """
+
+    max_depth: int
+    # id(value) -> (value, snapshot, tag header and value bytes, size)
+    entries: dict[int, tuple[dict[str, Any], bytes, bytes, int]]
+    hits: int
+    misses: int
+
+    def __init__(self, max_depth: int = DEFAULT_ENCODE_CACHE_DEPTH):
+        self.max_depth = max_depth
+        self.entries = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def wants(self, path: str, custom: bool, raw_size: int) -> bool:
+        return raw_size >= MIN_ENCODE_CACHE_SIZE and (
+            custom or 2 <= path.count(".") <= self.max_depth
+        )
+
+    def record(self, value: dict[str, Any], raw: bytes, size: int) -> None:
+        # Holding on to value keeps its id from being reused
+        self.entries[id(value)] = (value, snapshot(value), raw, size)
+
+    def lookup(self, value: dict[str, Any]) -> Optional[tuple[bytes, int]]:
+        """
+        Returns the bytes and size value was decoded from if it is unchanged,
+        None if it was modified or not recorded.
+        """
+        entry = self.entries.get(id(value))
+        if entry is None or entry[0] is not value:
+            return None
+        if snapshot(value) != entry[1]:
+            # Encoders may modify the value as they go, so it is not compared
+            # against what was read again
+            del self.entries[id(value)]
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry[2], entry[3]
+
+    def clear(self) -> None:
+        self.entries.clear()
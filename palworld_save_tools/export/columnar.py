@@ -0,0 +1,371 @@
+import json
+import logging
+import math
+import os
+import sys
+from array import array
+from typing import Any, BinaryIO, Optional
+
+from palworld_save_tools.archive import UUID
+from palworld_save_tools.export.rows import RowFunction, Rows, blob, source_rows
+from palworld_save_tools.index import DEFAULT_INDEX_DEPTH, IndexedGvas
+from palworld_save_tools.rawdata import foliage_model_instance, map_model, work
+
+logger = logging.getLogger(__name__)
+
+COLUMNAR_VERSION = 1
+MANIFEST_NAME = "manifest.json"
+FORMATS = ("npy", "bin")
+
+# Rows buffered per column before they are appended to its file
+CHUNK_ROWS = 65536
+
+NPY_MAGIC = b"\x93NUMPY\x01\x00"
+# Fixed header size, so the header can be rewritten once the row count is known
+NPY_HEADER_SIZE = 128
+
+# Column kind -> (array typecode, NumPy dtype, values per row)
+COLUMN_KINDS: dict[str, tuple[str, str, int]] = {
+    "f4": ("f", "<f4", 1),
+    "f8": ("d", "<f8", 1),
+    "i4": ("i", "<i4", 1),
+    "i8": ("q", "<i8", 1),
+    "u1": ("B", "|u1", 1),
+    # The 16 bytes of uuid.UUID(...).bytes, a (rows, 16) array
+    "uuid": ("B", "|u1", 16),
+    # Strings stored as i4 indexes into the categories listed in the manifest
+    "category": ("i", "<i4", 1),
+}
+
+NULL_UUID = bytes(16)
+
+
+def uuid_bytes(value: Optional[UUID]) -> bytes:
+    """Returns the bytes of uuid.UUID(str(value)), without formatting it"""
+    if value is None:
+        return NULL_UUID
+    b = value.raw_bytes
+    return b[3::-1] + b[7:3:-1] + b[11:7:-1] + b[15:11:-1]
+
+
+def npy_header(dtype: str, shape: tuple[int, ...]) -> bytes:
+    header = repr({"descr": dtype, "fortran_order": False, "shape": shape})
+    header = header.ljust(NPY_HEADER_SIZE - len(NPY_MAGIC) - 3) + "\n"
+    return NPY_MAGIC + len(header).to_bytes(2, "little") + header.encode("latin1")
+
+
+class Column:
+    """
+    One field of a table, appended to its own file in chunks. In the npy
+    format the file starts with a NumPy header, written again with the final
+    shape when the column is closed, and can be loaded with numpy.load
+    without NumPy being needed to write it.
+    """
+
+    name: str
+    kind: str
+    file_name: str
+    rows: int
+    buffer: array
+    categories: dict[str, int]
+    npy: bool
+    f: BinaryIO
+
+    def __init__(self, directory: str, name: str, kind: str, format: str):
+        self.name = name
+        self.kind = kind
+        self.file_name = f"{name}.{format}"
+        self.rows = 0
+        self.buffer = array(COLUMN_KINDS[kind][0])
+        self.categories = {}
+        self.npy = format == "npy"
+        self.f = open(os.path.join(directory, self.file_name), "wb")
+        if self.npy:
+            self.f.write(bytes(NPY_HEADER_SIZE))
+
+    def append(self, value: Any) -> None:
+        if self.kind == "uuid":
+            self.buffer.frombytes(uuid_bytes(value))
+        elif self.kind == "category":
+            if value not in self.categories:
+                self.categories[value] = len(self.categories)
+            self.buffer.append(self.categories[value])
+        elif value is None:
+            self.buffer.append(math.nan if self.kind in ("f4", "f8") else 0)
+        else:
+            self.buffer.append(value)
+        self.rows += 1
+        if len(self.buffer) >= CHUNK_ROWS:
+            self.flush()
+
+    def flush(self) -> None:
+        if sys.byteorder == "big":
+            self.buffer.byteswap()
+        self.buffer.tofile(self.f)
+        del self.buffer[:]
+
+    def shape(self) -> tuple[int, ...]:
+        width = COLUMN_KINDS[self.kind][2]
+        return (self.rows,) if width == 1 else (self.rows, width)
+
+    def close(self) -> None:
+        self.flush()
+        if self.npy:
+            self.f.seek(0)
+            self.f.write(npy_header(COLUMN_KINDS[self.kind][1], self.shape()))
+        self.f.close()
+
+    def manifest(self) -> dict[str, Any]:
+        manifest = {
+            "name": self.name,
+            "kind": self.kind,
+            "file": self.file_name,
+            "dtype": COLUMN_KINDS[self.kind][1],
+            "shape": list(self.shape()),
+        }
+        if self.kind == "category":
+            manifest["categories"] = list(self.categories)
+        return manifest
+
+
+def vector(prefix: str) -> list[tuple[str, str]]:
+    return [(f"{prefix}_{axis}", "f8") for axis in "xyz"]
+
+
+def quat(prefix: str) -> list[tuple[str, str]]:
+    return [(f"{prefix}_{axis}", "f8") for axis in "xyzw"]
+
+
+# Table -> (name, kind) of each of its columns, in row order
+TABLES: dict[str, list[tuple[str, str]]] = {
+    "foliage_instances": [
+        ("grid_x", "i8"),
+        ("grid_y", "i8"),
+        ("grid_z", "i8"),
+        ("model_id", "category"),
+        ("instance_id", "uuid"),
+        ("model_instance_id", "uuid"),
+        ("pitch", "f4"),
+        ("yaw", "f4"),
+        ("roll", "f4"),
+        ("x", "f8"),
+        ("y", "f8"),
+        ("z", "f8"),
+        ("scale_x", "f4"),
+        ("hp", "i4"),
+    ],
+    "map_models": [
+        ("map_object_id", "category"),
+        ("instance_id", "uuid"),
+        ("concrete_model_instance_id", "uuid"),
+        ("base_camp_id", "uuid"),
+        ("group_id", "uuid"),
+        ("hp", "i4"),
+        ("max_hp", "i4"),
+        *quat("rotation"),
+        *vector("translation"),
+        *vector("scale3d"),
+        ("created_at", "i8"),
+    ],
+    "work_bounds": [
+        ("work_type", "category"),
+        ("id", "uuid"),
+        ("base_camp_id", "uuid"),
+        *vector("location"),
+        *quat("rotation"),
+        *vector("origin"),
+        *vector("box_extent"),
+        ("sphere_radius", "f8"),
+    ],
+}
+
+
+def foliage_rows(reader, entry: dict[str, Any]) -> Rows:
+    grid = tuple(entry["key"][axis]["value"] for axis in "XYZ")
+    models = []
+    instance_ids = []
+    blobs = []
+    for model in entry["value"]["ModelMap"]["value"]:
+        for instance in model["value"]["InstanceDataMap"]["value"]:
+            models.append(model["key"])
+            instance_ids.append(instance["key"]["Guid"]["value"])
+            blobs.append(instance["value"]["RawData"]["value"]["values"])
+    # All instances of a grid cell are decoded together
+    data = foliage_model_instance.decode_batch(reader, blobs)
+    columns = [data[field] for field in foliage_model_instance.BATCH_FIELDS]
+    for i, values in enumerate(zip(*columns)):
+        yield (
+            "foliage_instances",
+            grid + (models[i], instance_ids[i], data["model_instance_id"][i]) + values,
+        )
+
+
+def map_model_rows(reader, entry: dict[str, Any]) -> Rows:
+    data = map_model.decode_bytes(reader, blob(entry["Model"]["value"]["RawData"]))
+    transform = data["initital_transform_cache"]
+    yield (
+        "map_models",
+        (
+            entry["MapObjectId"]["value"],
+            data["instance_id"],
+            data["concrete_model_instance_id"],
+            data["base_camp_id_belong_to"],
+            data["group_id_belong_to"],
+            data["hp"]["current"],
+            data["hp"]["max"],
+            *transform["rotation"].values(),
+            *transform["translation"].values(),
+            *transform["scale3d"].values(),
+            data["created_at"],
+        ),
+    )
+
+
+def work_rows(reader, entry: dict[str, Any]) -> Rows:
+    work_type = entry["WorkableType"]["value"]["value"]
+    if work_type not in work.WORK_BASE_TYPES:
+        return
+    data = work.decode_bytes(reader, blob(entry["RawData"]), work_type)
+    bounds = data["workable_bounds"]
+    box_sphere_bounds = bounds["box_sphere_bounds"]
+    yield (
+        "work_bounds",
+        (
+            work_type,
+            data["id"],
+            data["base_camp_id_belong_to"],
+            *bounds["location"].values(),
+            *bounds["rotation"].values(),
+            *box_sphere_bounds["origin"].values(),
+            *box_sphere_bounds["box_extent"].values(),
+            box_sphere_bounds["sphere_radius"],
+        ),
+    )
+
+
+# Property path -> rows it adds to the columnar tables
+SOURCES: dict[str, RowFunction] = {
+    ".worldSaveData.FoliageGridSaveDataMap": foliage_rows,
+    ".worldSaveData.MapObjectSaveData": map_model_rows,
+    ".worldSaveData.WorkSaveData": work_rows,
+}
+
+
+class ColumnarExporter:
+    """
+    Writes foliage instances, map model transforms and work bounds of a world
+    save as typed arrays, one file per column under a directory per table,
+    along with a manifest.json describing the columns.
+
+    Like SqliteExporter, map entries and array elements are decoded one at a
+    time through an index of the save and only their RawData blobs are
+    decoded. Column values are buffered in array.array chunks, so memory use
+    does not grow with the number of rows. An entry that cannot be decoded
+    is skipped with a warning.
+    """
+
+    directory: str
+    format: str
+    columns: dict[str, list[Column]]
+    skipped: dict[str, int]
+
+    def __init__(self, directory: str, format: str = "npy"):
+        if format not in FORMATS:
+            raise Exception(f"Unknown columnar format {format}")
+        self.directory = directory
+        self.format = format
+        self.columns = {}
+        self.skipped = {}
+
+    def export(self, gvas: IndexedGvas) -> dict[str, Any]:
+        """Exports a world save, returns the manifest written next to it"""
+        for table, fields in TABLES.items():
+            table_directory = os.path.join(self.directory, table)
+            os.makedirs(table_directory, exist_ok=True)
+            self.columns[table] = [
+                Column(table_directory, name, kind, self.format)
+                for name, kind in fields
+            ]
+        try:
+            for path, rows in SOURCES.items():
+                self.export_source(gvas, path, rows)
+        finally:
+            for columns in self.columns.values():
+                for column in columns:
+                    column.close()
+        manifest = {
+            "version": COLUMNAR_VERSION,
+            "format": self.format,
+            "byte_order": "little",
+            "tables": {
+                table: {
+                    "rows": columns[0].rows,
+                    "columns": [column.manifest() for column in columns],
+                }
+                for table, columns in self.columns.items()
+            },
+        }
+        with open(os.path.join(self.directory, MANIFEST_NAME), "w") as f:
+            json.dump(manifest, f, indent=2)
+        return manifest
+
+    def export_source(self, gvas: IndexedGvas, path: str, rows: RowFunction) -> None:
+        for table, row in source_rows(gvas, path, rows, self.skipped, logger):
+            for column, value in zip(self.columns[table], row):
+                column.append(value)
+
+
+def export_gvas_to_columns(
+    gvas: bytes,
+    directory: str,
+    type_hints: dict[str, str] = {},
+    format: str = "npy",
+    index: Optional[dict[str, Any]] = None,
+) -> dict[str, Any]:
+    """
+    Exports the foliage instances, map models and work bounds of a
+    decompressed world save into directory, as .npy files or, with format
+    "bin", headerless little-endian arrays. Returns the manifest.
+    """
+    indexed = IndexedGvas(gvas, type_hints, {}, DEFAULT_INDEX_DEPTH, index)
+    os.makedirs(directory, exist_ok=True)
+    return ColumnarExporter(directory, format).export(indexed)
+
+
+def export_sav_to_columns(
+    sav_path: str, directory: str, format: str = "npy"
+) -> dict[str, Any]:
+    """Exports a Level.sav file into a directory of columns"""
+    from palworld_save_tools.palsav import decompress_sav_to_gvas
+    from palworld_save_tools.paltypes import PALWORLD_TYPE_HINTS
+
+    with open(sav_path, "rb") as f:
+        gvas, _ = decompress_sav_to_gvas(f.read())
+    return export_gvas_to_columns(gvas, directory, PALWORLD_TYPE_HINTS, format)
+
+
+def load_manifest(directory: str) -> dict[str, Any]:
+    with open(os.path.join(directory, MANIFEST_NAME)) as f:
+        return json.load(f)
+
+
+def read_column(directory: str, table: str, name: str) -> array:
+    """
+    Reads a column of a columnar export into an array.array, flattened for
+    uuid columns. With NumPy installed, numpy.load(path, mmap_mode="r") on
+    the .npy files maps them instead.
+    """
+    manifest = load_manifest(directory)
+    for column in manifest["tables"][table]["columns"]:
+        if column["name"] == name:
+            break
+    else:
+        raise Exception(f"No column {name} in table {table}")
+    values = array(COLUMN_KINDS[column["kind"]][0])
+    with open(os.path.join(directory, table, column["file"]), "rb") as f:
+        if manifest["format"] == "npy":
+            f.seek(NPY_HEADER_SIZE)
+        values.frombytes(f.read())
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values
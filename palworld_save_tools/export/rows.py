@@ -0,0 +1,50 @@
+import logging
+from typing import Any, Callable, Iterable, Iterator
+
+from palworld_save_tools.index import IndexedGvas
+
+# (table, row) pairs an exporter adds to its tables
+Rows = Iterable[tuple[str, tuple[Any, ...]]]
+
+# Function returning the rows of one map entry or array element, given the
+# reader its RawData blobs are decoded with
+RowFunction = Callable[[Any, dict[str, Any]], Rows]
+
+
+def blob(raw_data: dict[str, Any]) -> bytes:
+    return bytes(raw_data["value"]["values"])
+
+
+def source_rows(
+    gvas: IndexedGvas,
+    path: str,
+    rows: RowFunction,
+    skipped: dict[str, int],
+    logger: logging.Logger,
+) -> Iterator[tuple[str, tuple[Any, ...]]]:
+    """
+    Yields the rows of every map entry or array element of the property at
+    path, decoding one at a time through the index. An entry whose rows
+    cannot be built is counted in skipped[path] and logged to the exporter's
+    logger, the first time with its error and at the end with the number
+    skipped.
+    """
+    properties = [
+        i
+        for i, entry in enumerate(gvas.entries)
+        if entry["path"] == path and entry["kind"] == "property"
+    ]
+    for i in properties:
+        for child in gvas.children.get(i, []):
+            entry = gvas.entries[child]
+            try:
+                entry_rows = list(rows(gvas.reader, gvas.decode(entry)))
+            except Exception as e:
+                count = skipped.get(path, 0)
+                if count == 0:
+                    logger.warning("Skipping entries of %s: %s", path, e)
+                skipped[path] = count + 1
+                continue
+            yield from entry_rows
+    if path in skipped:
+        logger.warning("Skipped %d entries of %s", skipped[path], path)
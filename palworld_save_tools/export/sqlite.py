@@ -0,0 +1,415 @@
+import json
+import logging
+import sqlite3
+from typing import Any, Optional
+
+from palworld_save_tools.archive import UUID
+from palworld_save_tools.export.rows import RowFunction, Rows, blob, source_rows
+from palworld_save_tools.index import DEFAULT_INDEX_DEPTH, IndexedGvas
+from palworld_save_tools.json_tools import CustomEncoder
+from palworld_save_tools.rawdata import (
+    base_camp,
+    character,
+    group,
+    item_container_slots,
+    map_model,
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 1000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS characters (
+    player_uid TEXT,
+    instance_id TEXT,
+    is_player INTEGER,
+    nickname TEXT,
+    character_id TEXT,
+    level INTEGER,
+    exp INTEGER,
+    hp INTEGER,
+    gender TEXT,
+    owner_player_uid TEXT,
+    group_id TEXT,
+    container_id TEXT,
+    slot_index INTEGER,
+    save_parameter TEXT
+);
+CREATE INDEX IF NOT EXISTS characters_instance_id ON characters (instance_id);
+CREATE INDEX IF NOT EXISTS characters_player_uid ON characters (player_uid);
+CREATE INDEX IF NOT EXISTS characters_owner_player_uid ON characters (owner_player_uid);
+CREATE INDEX IF NOT EXISTS characters_group_id ON characters (group_id);
+CREATE INDEX IF NOT EXISTS characters_container_id ON characters (container_id);
+CREATE INDEX IF NOT EXISTS characters_character_id ON characters (character_id);
+
+CREATE TABLE IF NOT EXISTS guilds (
+    group_id TEXT,
+    group_type TEXT,
+    group_name TEXT,
+    guild_name TEXT,
+    base_camp_level INTEGER
+);
+CREATE INDEX IF NOT EXISTS guilds_group_id ON guilds (group_id);
+
+CREATE TABLE IF NOT EXISTS guild_players (
+    group_id TEXT,
+    player_uid TEXT,
+    player_name TEXT,
+    last_online_real_time INTEGER
+);
+CREATE INDEX IF NOT EXISTS guild_players_group_id ON guild_players (group_id);
+CREATE INDEX IF NOT EXISTS guild_players_player_uid ON guild_players (player_uid);
+
+CREATE TABLE IF NOT EXISTS guild_characters (
+    group_id TEXT,
+    player_uid TEXT,
+    instance_id TEXT
+);
+CREATE INDEX IF NOT EXISTS guild_characters_group_id ON guild_characters (group_id);
+CREATE INDEX IF NOT EXISTS guild_characters_instance_id ON guild_characters (instance_id);
+
+CREATE TABLE IF NOT EXISTS guild_base_camps (
+    group_id TEXT,
+    base_id TEXT
+);
+CREATE INDEX IF NOT EXISTS guild_base_camps_group_id ON guild_base_camps (group_id);
+CREATE INDEX IF NOT EXISTS guild_base_camps_base_id ON guild_base_camps (base_id);
+
+CREATE TABLE IF NOT EXISTS item_containers (
+    container_id TEXT,
+    group_id TEXT,
+    slot_count INTEGER
+);
+CREATE INDEX IF NOT EXISTS item_containers_container_id ON item_containers (container_id);
+CREATE INDEX IF NOT EXISTS item_containers_group_id ON item_containers (group_id);
+
+CREATE TABLE IF NOT EXISTS item_slots (
+    container_id TEXT,
+    slot_index INTEGER,
+    static_id TEXT,
+    count INTEGER,
+    created_world_id TEXT,
+    local_id_in_created_world TEXT
+);
+CREATE INDEX IF NOT EXISTS item_slots_container_id ON item_slots (container_id);
+CREATE INDEX IF NOT EXISTS item_slots_static_id ON item_slots (static_id);
+
+CREATE TABLE IF NOT EXISTS base_camps (
+    base_id TEXT,
+    name TEXT,
+    state INTEGER,
+    group_id TEXT,
+    x REAL,
+    y REAL,
+    z REAL,
+    area_range REAL,
+    owner_map_object_instance_id TEXT
+);
+CREATE INDEX IF NOT EXISTS base_camps_base_id ON base_camps (base_id);
+CREATE INDEX IF NOT EXISTS base_camps_group_id ON base_camps (group_id);
+
+CREATE TABLE IF NOT EXISTS map_objects (
+    instance_id TEXT,
+    concrete_model_instance_id TEXT,
+    map_object_id TEXT,
+    x REAL,
+    y REAL,
+    z REAL,
+    group_id TEXT,
+    base_camp_id TEXT,
+    build_player_uid TEXT,
+    hp INTEGER,
+    max_hp INTEGER
+);
+CREATE INDEX IF NOT EXISTS map_objects_instance_id ON map_objects (instance_id);
+CREATE INDEX IF NOT EXISTS map_objects_group_id ON map_objects (group_id);
+CREATE INDEX IF NOT EXISTS map_objects_base_camp_id ON map_objects (base_camp_id);
+CREATE INDEX IF NOT EXISTS map_objects_map_object_id ON map_objects (map_object_id);
+"""
+
+TABLE_COLUMNS = {
+    "characters": 14,
+    "guilds": 5,
+    "guild_players": 4,
+    "guild_characters": 3,
+    "guild_base_camps": 2,
+    "item_containers": 3,
+    "item_slots": 6,
+    "base_camps": 9,
+    "map_objects": 11,
+}
+
+
+def plain(value: Any) -> Any:
+    """
+    Unwraps a decoded property value into something SQLite can store: enums
+    and bytes to their value, FixedPoint64 structs to their integer and UUIDs
+    to strings
+    """
+    if isinstance(value, dict):
+        if value.keys() == {"type", "value"}:
+            return plain(value["value"])
+        if value.keys() == {"Value"}:
+            return plain(value["Value"]["value"])
+    if isinstance(value, UUID):
+        return str(value)
+    return value
+
+
+def prop(properties: Optional[dict[str, Any]], *names: str) -> Any:
+    """Follows nested properties by name, returns None if one is missing"""
+    value: Any = properties
+    for name in names:
+        if not isinstance(value, dict) or name not in value:
+            return None
+        value = value[name]["value"]
+    return plain(value)
+
+
+def uuid_str(value: Optional[UUID]) -> Optional[str]:
+    return None if value is None else str(value)
+
+
+def character_rows(reader, entry: dict[str, Any]) -> Rows:
+    data = character.decode_bytes(reader, blob(entry["value"]["RawData"]))
+    parameters = data["object"]["SaveParameter"]["value"]
+    yield (
+        "characters",
+        (
+            prop(entry["key"], "PlayerUId"),
+            prop(entry["key"], "InstanceId"),
+            bool(prop(parameters, "IsPlayer")),
+            prop(parameters, "NickName"),
+            prop(parameters, "CharacterID"),
+            prop(parameters, "Level") or 1,
+            prop(parameters, "Exp") or 0,
+            prop(parameters, "HP"),
+            prop(parameters, "Gender"),
+            prop(parameters, "OwnerPlayerUId"),
+            uuid_str(data["group_id"]),
+            prop(parameters, "SlotID", "ContainerId", "ID"),
+            prop(parameters, "SlotID", "SlotIndex"),
+            json.dumps(parameters, cls=CustomEncoder, ensure_ascii=False),
+        ),
+    )
+
+
+def guild_rows(reader, entry: dict[str, Any]) -> Rows:
+    value = entry["value"]
+    group_type = prop(value, "GroupType")
+    data = group.decode_bytes(reader, blob(value["RawData"]), group_type)
+    group_id = uuid_str(data["group_id"])
+    yield (
+        "guilds",
+        (
+            group_id,
+            group_type,
+            data["group_name"],
+            data.get("guild_name"),
+            data.get("base_camp_level"),
+        ),
+    )
+    for handle in data["individual_character_handle_ids"]:
+        yield (
+            "guild_characters",
+            (group_id, uuid_str(handle["guid"]), uuid_str(handle["instance_id"])),
+        )
+    for player in data.get("players", []):
+        yield (
+            "guild_players",
+            (
+                group_id,
+                uuid_str(player["player_uid"]),
+                player["player_info"]["player_name"],
+                player["player_info"]["last_online_real_time"],
+            ),
+        )
+    if "player_uid" in data:
+        yield (
+            "guild_players",
+            (
+                group_id,
+                uuid_str(data["player_uid"]),
+                data["player_info"]["player_name"],
+                data["player_info"]["last_online_real_time"],
+            ),
+        )
+    for base_id in data.get("base_ids", []):
+        yield ("guild_base_camps", (group_id, uuid_str(base_id)))
+
+
+def item_container_rows(reader, entry: dict[str, Any]) -> Rows:
+    container_id = prop(entry["key"], "ID")
+    value = entry["value"]
+    slots = value["Slots"]["value"]["values"]
+    yield (
+        "item_containers",
+        (container_id, prop(value, "BelongInfo", "GroupID"), len(slots)),
+    )
+    for slot in slots:
+        if "ItemId" in slot:
+            # Saves from before slots were stored in RawData
+            row = (
+                prop(slot, "SlotIndex"),
+                prop(slot, "ItemId", "StaticId"),
+                prop(slot, "StackCount"),
+                prop(slot, "ItemId", "DynamicId", "CreatedWorldId"),
+                prop(slot, "ItemId", "DynamicId", "LocalIdInCreatedWorld"),
+            )
+        else:
+            data = item_container_slots.decode_bytes(reader, blob(slot["RawData"]))
+            if data is None:
+                continue
+            dynamic_id = data["item"]["dynamic_id"]
+            row = (
+                data["slot_index"],
+                data["item"]["static_id"],
+                data["count"],
+                uuid_str(dynamic_id["created_world_id"]),
+                uuid_str(dynamic_id["local_id_in_created_world"]),
+            )
+        yield ("item_slots", (container_id,) + row)
+
+
+def base_camp_rows(reader, entry: dict[str, Any]) -> Rows:
+    data = base_camp.decode_bytes(reader, blob(entry["value"]["RawData"]))
+    location = data["transform"]["translation"]
+    yield (
+        "base_camps",
+        (
+            uuid_str(entry["key"]),
+            data["name"],
+            data["state"],
+            uuid_str(data["group_id_belong_to"]),
+            location["x"],
+            location["y"],
+            location["z"],
+            data["area_range"],
+            uuid_str(data["owner_map_object_instance_id"]),
+        ),
+    )
+
+
+def map_object_rows(reader, entry: dict[str, Any]) -> Rows:
+    model = map_model.decode_bytes(reader, blob(entry["Model"]["value"]["RawData"]))
+    location = prop(entry, "WorldLocation") or {}
+    yield (
+        "map_objects",
+        (
+            prop(entry, "MapObjectInstanceId"),
+            prop(entry, "MapObjectConcreteModelInstanceId"),
+            prop(entry, "MapObjectId"),
+            location.get("x"),
+            location.get("y"),
+            location.get("z"),
+            uuid_str(model["group_id_belong_to"]),
+            uuid_str(model["base_camp_id_belong_to"]),
+            uuid_str(model["build_player_uid"]),
+            model["hp"]["current"],
+            model["hp"]["max"],
+        ),
+    )
+
+
+# Property path -> rows it adds to the SQLite tables
+SOURCES: dict[str, RowFunction] = {
+    ".worldSaveData.CharacterSaveParameterMap": character_rows,
+    ".worldSaveData.GroupSaveDataMap": guild_rows,
+    ".worldSaveData.ItemContainerSaveData": item_container_rows,
+    ".worldSaveData.BaseCampSaveData": base_camp_rows,
+    ".worldSaveData.MapObjectSaveData": map_object_rows,
+}
+
+
+class SqliteExporter:
+    """
+    Writes the characters, guilds, item containers, base camps and map objects
+    of a world save into SQLite tables, with indexes on their UUID columns.
+
+    Map entries and array elements are decoded one at a time through an index
+    of the save, and only the RawData blobs the tables need are decoded, so
+    memory use does not grow with the size of the world. Rows are inserted
+    with executemany in batches, all in one transaction. An entry that cannot
+    be decoded is skipped with a warning.
+    """
+
+    connection: sqlite3.Connection
+    batch_size: int
+    pending: dict[str, list[tuple[Any, ...]]]
+    counts: dict[str, int]
+    skipped: dict[str, int]
+
+    def __init__(
+        self, connection: sqlite3.Connection, batch_size: int = DEFAULT_BATCH_SIZE
+    ):
+        self.connection = connection
+        self.batch_size = batch_size
+        self.pending = {table: [] for table in TABLE_COLUMNS}
+        self.counts = {table: 0 for table in TABLE_COLUMNS}
+        self.skipped = {}
+
+    def export(self, gvas: IndexedGvas) -> dict[str, int]:
+        """Exports a world save, returns the number of rows in each table"""
+        with self.connection:
+            self.connection.executescript("BEGIN;" + SCHEMA)
+            for path, rows in SOURCES.items():
+                self.export_source(gvas, path, rows)
+            for table in TABLE_COLUMNS:
+                self.flush(table)
+        return self.counts
+
+    def export_source(self, gvas: IndexedGvas, path: str, rows: RowFunction) -> None:
+        for table, row in source_rows(gvas, path, rows, self.skipped, logger):
+            self.add(table, row)
+
+    def add(self, table: str, row: tuple[Any, ...]) -> None:
+        pending = self.pending[table]
+        pending.append(row)
+        if len(pending) >= self.batch_size:
+            self.flush(table)
+
+    def flush(self, table: str) -> None:
+        pending = self.pending[table]
+        if len(pending) == 0:
+            return
+        placeholders = ", ".join("?" * TABLE_COLUMNS[table])
+        self.connection.executemany(
+            f"INSERT INTO {table} VALUES ({placeholders})", pending
+        )
+        self.counts[table] += len(pending)
+        pending.clear()
+
+
+def export_gvas_to_sqlite(
+    gvas: bytes,
+    database_path: str,
+    type_hints: dict[str, str] = {},
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    index: Optional[dict[str, Any]] = None,
+) -> dict[str, int]:
+    """
+    Exports a decompressed world save into the SQLite database at
+    database_path, creating its tables if needed. Returns the number of rows
+    inserted into each table.
+    """
+    indexed = IndexedGvas(gvas, type_hints, {}, DEFAULT_INDEX_DEPTH, index)
+    connection = sqlite3.connect(database_path)
+    try:
+        return SqliteExporter(connection, batch_size).export(indexed)
+    finally:
+        connection.close()
+
+
+def export_sav_to_sqlite(
+    sav_path: str,
+    database_path: str,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> dict[str, int]:
+    """Exports a Level.sav file into a SQLite database"""
+    from palworld_save_tools.palsav import decompress_sav_to_gvas
+    from palworld_save_tools.paltypes import PALWORLD_TYPE_HINTS
+
+    with open(sav_path, "rb") as f:
+        gvas, _ = decompress_sav_to_gvas(f.read())
+    return export_gvas_to_sqlite(gvas, database_path, PALWORLD_TYPE_HINTS, batch_size)
@@ -1,7 +1,17 @@
 import base64
-from typing import Any, Callable
+import gc
+import logging
+from typing import Any, Callable, Optional
 
 from palworld_save_tools.archive import FArchiveReader, FArchiveWriter
+from palworld_save_tools.blob_memo import BlobMemo
+from palworld_save_tools.encode_cache import EncodeCache
+from palworld_save_tools.path_filter import PathFilter
+from palworld_save_tools.profiler import PropertyProfiler
+from palworld_save_tools.progress import Progress
+from palworld_save_tools.specializer import StructSpecializer
+
+logger = logging.getLogger(__name__)
 
 
 def custom_version_reader(reader: FArchiveReader):
@@ -119,21 +129,51 @@ class GvasFile:
         type_hints: dict[str, str] = {},
         custom_properties: dict[str, tuple[Callable, Callable]] = {},
         allow_nan: bool = True,
+        path_filter: Optional[PathFilter] = None,
+        blob_memo: Optional[BlobMemo] = None,
+        encode_cache: Optional[EncodeCache] = None,
+        profiler: Optional[PropertyProfiler] = None,
+        progress: Optional[Progress] = None,
+        specializer: Optional[StructSpecializer] = None,
+        compact: bool = False,
     ) -> "GvasFile":
         gvas_file = GvasFile()
-        with FArchiveReader(
-            data,
-            type_hints=type_hints,
-            custom_properties=custom_properties,
-            allow_nan=allow_nan,
-        ) as reader:
-            gvas_file.header = GvasHeader.read(reader)
-            gvas_file.properties = reader.properties_until_end()
-            gvas_file.trailer = reader.read_to_end()
-            if gvas_file.trailer != b"\x00\x00\x00\x00":
-                print(
-                    f"{len(gvas_file.trailer)} bytes of trailer data, file may not have fully parsed"
-                )
+        # Nodes are tracked by the garbage collector even when they only hold
+        # numbers and strings, unlike such dicts, and all of them are still
+        # alive afterwards, so collecting while they are created only slows
+        # reading
+        paused = compact and gc.isenabled()
+        if paused:
+            gc.disable()
+        try:
+            with FArchiveReader(
+                data,
+                type_hints=type_hints,
+                custom_properties=custom_properties,
+                allow_nan=allow_nan,
+                path_filter=path_filter,
+                blob_memo=blob_memo,
+                encode_cache=encode_cache,
+                profiler=profiler,
+                progress=progress,
+                specializer=specializer,
+                compact=compact,
+            ) as reader:
+                if progress is not None:
+                    progress.start("read", reader.size)
+                gvas_file.header = GvasHeader.read(reader)
+                gvas_file.properties = reader.properties_until_end()
+                gvas_file.trailer = reader.read_to_end()
+                if progress is not None:
+                    progress.finish(reader.size)
+                if gvas_file.trailer != b"\x00\x00\x00\x00":
+                    logger.warning(
+                        "%d bytes of trailer data, file may not have fully parsed",
+                        len(gvas_file.trailer),
+                    )
+        finally:
+            if paused:
+                gc.enable()
         return gvas_file
 
     @staticmethod
@@ -152,10 +192,24 @@ class GvasFile:
         }
 
     def write(
-        self, custom_properties: dict[str, tuple[Callable, Callable]] = {}
+        self,
+        custom_properties: dict[str, tuple[Callable, Callable]] = {},
+        encode_cache: Optional[EncodeCache] = None,
+        profiler: Optional[PropertyProfiler] = None,
+        progress: Optional[Progress] = None,
     ) -> bytes:
-        writer = FArchiveWriter(custom_properties)
+        if progress is not None:
+            progress.start("write", progress.total)
+        writer = FArchiveWriter(
+            custom_properties,
+            encode_cache=encode_cache,
+            profiler=profiler,
+            progress=progress,
+        )
         self.header.write(writer)
         writer.properties(self.properties)
         writer.write(self.trailer)
-        return writer.bytes()
+        data = writer.bytes()
+        if progress is not None:
+            progress.finish(len(data))
+        return data
@@ -0,0 +1,437 @@
+import json
+import os
+from collections import defaultdict
+from typing import Any, Callable, Optional
+
+from palworld_save_tools.archive import FArchiveReader, FArchiveWriter
+from palworld_save_tools.gvas import GvasHeader
+
+INDEX_VERSION = 1
+DEFAULT_INDEX_DEPTH = 3
+# Struct types FArchiveReader.struct_value decodes as fixed layouts rather than
+# as a list of properties
+BUILTIN_STRUCT_TYPES = {"Vector", "DateTime", "Guid", "Quat", "LinearColor"}
+
+
+class IndexBuilder:
+    """
+    Walks a GVAS file once and records where each property starts and ends,
+    down to max_depth levels. Top-level properties are at depth 1, the
+    properties inside them at depth 2 and so on. Entries of a MapProperty and
+    elements of a struct ArrayProperty count as one level below the property
+    holding them. Below max_depth, properties are skipped using their size
+    without being decoded.
+
+    Every entry records:
+    - path: the property path, as used by type hints and custom properties
+    - kind: "property", "map_entry" or "array_element"
+    - depth, parent (index of the enclosing entry, -1 at the top level)
+    - offset, end: the byte range of the whole entry
+
+    Properties additionally record name, type, size_offset (the u64 size),
+    value_offset (the start of the value, after the tag header) and size, as
+    well as struct_type, array_type, key_type and value_type where relevant.
+    Map and array properties record count_offset (the u32 element count),
+    struct arrays also record inner_size_offset (the u64 size of all
+    elements). Map entries record key_offset, key_end and value_offset,
+    elements record their index.
+    """
+
+    reader: FArchiveReader
+    max_depth: int
+    entries: list[dict[str, Any]]
+
+    def __init__(
+        self,
+        data: bytes,
+        max_depth: int = DEFAULT_INDEX_DEPTH,
+        type_hints: dict[str, str] = {},
+    ):
+        self.reader = FArchiveReader(data, type_hints=type_hints)
+        self.max_depth = max_depth
+        self.entries = []
+
+    def build(self) -> dict[str, Any]:
+        reader = self.reader
+        GvasHeader.read(reader)
+        header_size = reader.data.tell()
+        self.properties("", 1, -1)
+        return {
+            "version": INDEX_VERSION,
+            "max_depth": self.max_depth,
+            "gvas_size": reader.size,
+            "header_size": header_size,
+            "entries": self.entries,
+        }
+
+    def add(self, entry: dict[str, Any]) -> int:
+        self.entries.append(entry)
+        return len(self.entries) - 1
+
+    def properties(self, path: str, depth: int, parent: int) -> None:
+        reader = self.reader
+        data = reader.data
+        if depth > self.max_depth:
+            # Only walked to find where the enclosing value ends
+            while reader.fstring() != "None":
+                type_name = reader.fstring()
+                size = reader.u64()
+                self.tag_header({"type": type_name})
+                data.seek(data.tell() + size)
+            return
+        while True:
+            offset = data.tell()
+            name = reader.fstring()
+            if name == "None":
+                break
+            type_name = reader.fstring()
+            size_offset = data.tell()
+            size = reader.u64()
+            entry: dict[str, Any] = {
+                "path": f"{path}.{name}",
+                "kind": "property",
+                "name": name,
+                "type": type_name,
+                "depth": depth,
+                "parent": parent,
+                "offset": offset,
+                "size_offset": size_offset,
+                "size": size,
+            }
+            self.tag_header(entry)
+            value_offset = data.tell()
+            entry["value_offset"] = value_offset
+            entry["end"] = value_offset + size
+            index = self.add(entry)
+            if depth < self.max_depth:
+                self.property_value(entry, depth, index)
+            data.seek(entry["end"])
+
+    def tag_header(self, entry: dict[str, Any]) -> None:
+        reader = self.reader
+        type_name = entry["type"]
+        if type_name == "StructProperty":
+            entry["struct_type"] = reader.fstring()
+            reader.skip(16)
+        elif type_name == "ArrayProperty":
+            entry["array_type"] = reader.fstring()
+        elif type_name == "SetProperty":
+            entry["set_type"] = reader.fstring()
+        elif type_name == "MapProperty":
+            entry["key_type"] = reader.fstring()
+            entry["value_type"] = reader.fstring()
+        elif type_name in ("EnumProperty", "ByteProperty"):
+            reader.fstring()
+        elif type_name == "BoolProperty":
+            reader.skip(1)
+        reader.optional_guid()
+
+    def property_value(self, entry: dict[str, Any], depth: int, index: int) -> None:
+        reader = self.reader
+        data = reader.data
+        path = entry["path"]
+        type_name = entry["type"]
+        if type_name == "StructProperty":
+            if entry["struct_type"] not in BUILTIN_STRUCT_TYPES:
+                self.properties(path, depth + 1, index)
+        elif type_name == "ArrayProperty" and entry["array_type"] == "StructProperty":
+            entry["count_offset"] = data.tell()
+            count = reader.u32()
+            prop_name = reader.fstring()
+            reader.fstring()
+            entry["inner_size_offset"] = data.tell()
+            reader.u64()
+            struct_type = reader.fstring()
+            reader.skip(17)
+            entry["struct_type"] = struct_type
+            element_path = f"{path}.{prop_name}"
+            for i in range(count):
+                offset = data.tell()
+                element_index = self.add(
+                    {
+                        "path": element_path,
+                        "kind": "array_element",
+                        "index": i,
+                        "depth": depth + 1,
+                        "parent": index,
+                        "offset": offset,
+                    }
+                )
+                self.value(
+                    "StructProperty",
+                    struct_type,
+                    element_path,
+                    depth + 1,
+                    element_index,
+                )
+                self.entries[element_index]["end"] = data.tell()
+        elif type_name == "ArrayProperty":
+            entry["count_offset"] = data.tell()
+        elif type_name == "MapProperty":
+            reader.u32()
+            entry["count_offset"] = data.tell()
+            count = reader.u32()
+            key_path = path + ".Key"
+            value_path = path + ".Value"
+            key_type = entry["key_type"]
+            value_type = entry["value_type"]
+            key_struct_type = (
+                self.struct_type(key_path, "Guid")
+                if key_type == "StructProperty"
+                else None
+            )
+            value_struct_type = (
+                self.struct_type(value_path, "StructProperty")
+                if value_type == "StructProperty"
+                else None
+            )
+            for i in range(count):
+                offset = data.tell()
+                entry_index = self.add(
+                    {
+                        "path": path,
+                        "kind": "map_entry",
+                        "index": i,
+                        "depth": depth + 1,
+                        "parent": index,
+                        "offset": offset,
+                        "key_offset": offset,
+                    }
+                )
+                map_entry = self.entries[entry_index]
+                self.value(key_type, key_struct_type, key_path, depth + 1, entry_index)
+                map_entry["key_end"] = map_entry["value_offset"] = data.tell()
+                self.value(
+                    value_type, value_struct_type, value_path, depth + 1, entry_index
+                )
+                map_entry["end"] = data.tell()
+
+    def struct_type(self, path: str, default: str) -> str:
+        return self.reader.type_hints.get(path, default)
+
+    def value(
+        self,
+        type_name: str,
+        struct_type: Optional[str],
+        path: str,
+        depth: int,
+        parent: int,
+    ) -> None:
+        if type_name == "StructProperty" and struct_type not in BUILTIN_STRUCT_TYPES:
+            # Properties inside a map entry or array element are only indexed
+            # if they are within max_depth, but always walked to find the end
+            self.properties(path, depth + 1, parent)
+        else:
+            self.reader.prop_value(type_name, struct_type, path)
+
+
+def build_index(
+    data: bytes,
+    max_depth: int = DEFAULT_INDEX_DEPTH,
+    type_hints: dict[str, str] = {},
+) -> dict[str, Any]:
+    """Builds a byte offset index of a decompressed GVAS file"""
+    return IndexBuilder(data, max_depth, type_hints).build()
+
+
+def index_path(sav_path: str) -> str:
+    return sav_path + ".idx.json"
+
+
+def save_index(index: dict[str, Any], sav_path: str) -> str:
+    """
+    Writes the index next to the save it was built from. The size and
+    modification time of the save are stored alongside it, so a stale index is
+    not loaded after the save changes.
+    """
+    stat = os.stat(sav_path)
+    index["source_size"] = stat.st_size
+    index["source_mtime_ns"] = stat.st_mtime_ns
+    output_path = index_path(sav_path)
+    with open(output_path, "w", encoding="utf8") as f:
+        json.dump(index, f, separators=(",", ":"))
+    return output_path
+
+
+def load_index(
+    sav_path: str, max_depth: Optional[int] = None
+) -> Optional[dict[str, Any]]:
+    """
+    Loads the index saved next to sav_path. Returns None if there is none, or
+    if it is out of date, from another version or shallower than max_depth.
+    """
+    try:
+        with open(index_path(sav_path), "r", encoding="utf8") as f:
+            index = json.load(f)
+        stat = os.stat(sav_path)
+    except (OSError, ValueError):
+        return None
+    if (
+        index.get("version") != INDEX_VERSION
+        or index.get("source_size") != stat.st_size
+        or index.get("source_mtime_ns") != stat.st_mtime_ns
+        or (max_depth is not None and index["max_depth"] < max_depth)
+    ):
+        return None
+    return index
+
+
+def index_sav_file(
+    sav_path: str,
+    max_depth: int = DEFAULT_INDEX_DEPTH,
+    type_hints: Optional[dict[str, str]] = None,
+    rebuild: bool = False,
+) -> dict[str, Any]:
+    """
+    Returns the index of a .sav file, loading it from next to the file if it is
+    up to date, or decompressing the save and building (and saving) it if not.
+    """
+    if not rebuild:
+        index = load_index(sav_path, max_depth)
+        if index is not None:
+            return index
+    # Imported here, loading an index should not require the compressors
+    from palworld_save_tools.palsav import decompress_sav_to_gvas
+    from palworld_save_tools.paltypes import PALWORLD_TYPE_HINTS
+
+    with open(sav_path, "rb") as f:
+        gvas, _ = decompress_sav_to_gvas(f.read())
+    index = build_index(
+        gvas, max_depth, PALWORLD_TYPE_HINTS if type_hints is None else type_hints
+    )
+    save_index(index, sav_path)
+    return index
+
+
+def find_entries(
+    index: dict[str, Any], path: str, kind: Optional[str] = None
+) -> list[dict[str, Any]]:
+    """Returns the entries at path, optionally only those of one kind"""
+    return [
+        entry
+        for entry in index["entries"]
+        if entry["path"] == path and (kind is None or entry["kind"] == kind)
+    ]
+
+
+def read_entry(gvas: bytes, entry: dict[str, Any]) -> bytes:
+    """Returns the bytes of an entry from the decompressed GVAS it indexes"""
+    return gvas[entry["offset"] : entry["end"]]
+
+
+def read_entry_value(gvas: bytes, entry: dict[str, Any]) -> bytes:
+    """
+    Returns the value bytes of a property (after its tag header) or map entry
+    (after its key)
+    """
+    return gvas[entry["value_offset"] : entry["end"]]
+
+
+class IndexedGvas:
+    """
+    A decompressed GVAS file with its index, to decode single properties, map
+    entries and array elements without decoding the rest of the file
+    """
+
+    data: bytes
+    index: dict[str, Any]
+    entries: list[dict[str, Any]]
+    children: dict[int, list[int]]
+    reader: FArchiveReader
+
+    def __init__(
+        self,
+        data: bytes,
+        type_hints: dict[str, str] = {},
+        custom_properties: dict[str, tuple[Callable, Callable]] = {},
+        max_depth: int = DEFAULT_INDEX_DEPTH,
+        index: Optional[dict[str, Any]] = None,
+    ):
+        self.data = data
+        if index is None:
+            index = IndexBuilder(data, max_depth, type_hints).build()
+        self.index = index
+        self.entries = self.index["entries"]
+        self.children = defaultdict(list)
+        for i, entry in enumerate(self.entries):
+            self.children[entry["parent"]].append(i)
+        self.reader = FArchiveReader(data, type_hints, custom_properties)
+
+    def raw(self, entry: dict[str, Any]) -> bytes:
+        return self.data[entry["offset"] : entry["end"]]
+
+    def header(self) -> bytes:
+        return self.data[: self.index["header_size"]]
+
+    def trailer(self) -> bytes:
+        return self.data[self.properties_end() :]
+
+    def properties_end(self) -> int:
+        return self.children_end(-1)
+
+    def elements_offset(self, array: dict[str, Any]) -> int:
+        """Returns where the elements of a struct array start"""
+        reader = self.reader
+        reader.data.seek(array["inner_size_offset"] + 8)
+        reader.fstring()
+        reader.skip(17)
+        return reader.data.tell()
+
+    def children_end(self, parent: int) -> int:
+        """Returns where an entry added at the end of parent would go"""
+        children = self.children.get(parent)
+        if children:
+            return self.entries[children[-1]]["end"]
+        if parent == -1:
+            return self.index["header_size"]
+        entry = self.entries[parent]
+        if entry["type"] == "MapProperty":
+            return entry["count_offset"] + 4
+        if entry["type"] == "ArrayProperty":
+            return self.elements_offset(entry)
+        return entry["value_offset"]
+
+    def decode_property(self, entry: dict[str, Any]) -> Any:
+        reader = self.reader
+        reader.data.seek(entry["offset"])
+        reader.fstring()
+        type_name = reader.fstring()
+        size = reader.u64()
+        return reader.property(type_name, size, entry["path"])
+
+    def decode_element(self, entry: dict[str, Any]) -> Any:
+        """
+        Decodes a single map entry or array element by wrapping it in a copy
+        of its container holding only that entry, so custom properties that
+        decode the whole container still apply.
+        """
+        parent = self.entries[entry["parent"]]
+        data = self.data
+        element = self.raw(entry)
+        payload = FArchiveWriter()
+        if parent["type"] == "MapProperty":
+            payload.write(data[parent["value_offset"] : parent["count_offset"]])
+            payload.u32(1)
+        else:
+            inner_size_offset = parent["inner_size_offset"]
+            payload.u32(1)
+            payload.write(data[parent["count_offset"] + 4 : inner_size_offset])
+            payload.u64(len(element))
+            payload.write(data[inner_size_offset + 8 : self.elements_offset(parent)])
+        payload.write(element)
+        payload_bytes = payload.bytes()
+        container = (
+            data[parent["size_offset"] + 8 : parent["value_offset"]] + payload_bytes
+        )
+        reader = self.reader.internal_copy(container, debug=False)
+        value = reader.property(parent["type"], len(payload_bytes), parent["path"])
+        values = value["value"]
+        if isinstance(values, dict):
+            values = values["values"]
+        return values[0]
+
+    def decode(self, entry: dict[str, Any]) -> Any:
+        """Decodes an entry, a property as its value dict"""
+        if entry["kind"] == "property":
+            return self.decode_property(entry)
+        return self.decode_element(entry)
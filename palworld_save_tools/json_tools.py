@@ -2,10 +2,14 @@ import json
 import uuid
 
 from palworld_save_tools.archive import UUID
+from palworld_save_tools.nodes import PropertyNode
 
 
 class CustomEncoder(json.JSONEncoder):
     def default(self, obj):
+        # Checked first as compact trees hold more nodes than anything else
+        if isinstance(obj, PropertyNode):
+            return obj.to_dict()
         if isinstance(obj, UUID):
             return str(obj)
         if isinstance(obj, uuid.UUID):
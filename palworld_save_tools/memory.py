@@ -0,0 +1,212 @@
+import os
+import sys
+import tracemalloc
+from typing import Any, Callable, Optional
+
+from palworld_save_tools.archive import UUID
+from palworld_save_tools.gvas import GvasFile
+from palworld_save_tools.nodes import PropertyNode
+
+MEMORY_KINDS = ("dict", "node", "list", "str", "int", "float", "UUID", "bytes", "other")
+# Frames kept per allocation, enough to reach the rawdata module that made it
+DEFAULT_TRACEBACK_FRAMES = 32
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+UUID_FIELDS = ("raw_bytes", "parsed_uuid", "parsed_str")
+
+
+def memory_kind(value: Any) -> str:
+    if isinstance(value, dict):
+        return "dict"
+    if isinstance(value, PropertyNode):
+        return "node"
+    if isinstance(value, (list, tuple)):
+        return "list"
+    if isinstance(value, str):
+        return "str"
+    if isinstance(value, bool):
+        return "other"
+    if isinstance(value, int):
+        return "int"
+    if isinstance(value, float):
+        return "float"
+    if isinstance(value, UUID):
+        return "UUID"
+    if isinstance(value, (bytes, bytearray)):
+        return "bytes"
+    return "other"
+
+
+def is_properties(value: Any) -> bool:
+    return (
+        isinstance(value, dict)
+        and len(value) > 0
+        and all(
+            isinstance(v, (dict, PropertyNode)) and "type" in v for v in value.values()
+        )
+    )
+
+
+class TreeMemory:
+    """
+    Adds up the size of every object in a decoded properties tree by the path
+    of the property that holds it, such as .worldSaveData.MapObjectSaveData,
+    and by kind of object. Map entries are counted under .Key and .Value and
+    the elements of struct arrays under the array path and element name, as
+    the paths of custom properties and type hints are. Everything within a
+    custom property, such as the decoded RawData, counts towards its path.
+
+    Sizes are from sys.getsizeof and objects referenced more than once, such
+    as interned strings and small ints, are only counted where they are met
+    first, so the totals approximate the memory the tree retains.
+    """
+
+    paths: dict[str, dict[str, int]]
+    seen: set[int]
+
+    def __init__(self) -> None:
+        self.paths = {}
+        self.seen = set()
+
+    def account(self, value: Any, path: str) -> None:
+        if id(value) in self.seen:
+            return
+        self.seen.add(id(value))
+        kind = memory_kind(value)
+        size = sys.getsizeof(value)
+        if kind == "UUID":
+            for field in UUID_FIELDS:
+                part = getattr(value, field, None)
+                if part is not None and id(part) not in self.seen:
+                    self.seen.add(id(part))
+                    size += sys.getsizeof(part)
+        counts = self.paths.get(path)
+        if counts is None:
+            counts = self.paths[path] = dict.fromkeys(MEMORY_KINDS, 0)
+        counts[kind] += size
+
+    def add_properties(self, properties: dict[str, Any], path: str = "") -> None:
+        self.account(properties, path)
+        for name, property in properties.items():
+            self.add_property(property, f"{path}.{name}")
+
+    def add_property(self, property: dict[str, Any], path: str) -> None:
+        self.account(property, path)
+        for key, field in property.items():
+            if key != "value":
+                self.add_value(key, path)
+                self.add_value(field, path)
+        value = property.get("value")
+        type_name = property.get("type")
+        if "custom_type" in property:
+            self.add_value(value, path)
+        elif type_name == "StructProperty":
+            self.add_struct(value, path)
+        elif type_name == "ArrayProperty" and property.get("array_type") == (
+            "StructProperty"
+        ):
+            self.account(value, path)
+            for key, field in value.items():
+                if key != "values":
+                    self.add_value(key, path)
+                    self.add_value(field, path)
+            element_path = f"{path}.{value['prop_name']}"
+            self.account(value["values"], path)
+            for element in value["values"]:
+                self.add_struct(element, element_path)
+        elif type_name == "MapProperty":
+            self.account(value, path)
+            for entry in value:
+                self.account(entry, path)
+                self.add_struct(entry["key"], path + ".Key")
+                self.add_struct(entry["value"], path + ".Value")
+        elif type_name == "SetProperty":
+            self.account(value, path)
+            # Set elements are read with paths starting from the root
+            for element in value:
+                self.add_properties(element)
+        else:
+            self.add_value(value, path)
+
+    def add_struct(self, value: Any, path: str) -> None:
+        if is_properties(value):
+            self.add_properties(value, path)
+        else:
+            self.add_value(value, path)
+
+    def add_value(self, value: Any, path: str) -> None:
+        self.account(value, path)
+        if isinstance(value, (dict, PropertyNode)):
+            for key, item in value.items():
+                self.add_value(key, path)
+                self.add_value(item, path)
+        elif isinstance(value, (list, tuple)):
+            for item in value:
+                self.add_value(item, path)
+
+    def totals(self) -> dict[str, int]:
+        totals = dict.fromkeys(MEMORY_KINDS, 0)
+        for counts in self.paths.values():
+            for kind, size in counts.items():
+                totals[kind] += size
+        return totals
+
+
+def tree_memory(properties: dict[str, Any]) -> dict[str, dict[str, int]]:
+    """Returns the approximate bytes of each kind of object held at each path"""
+    memory = TreeMemory()
+    memory.add_properties(properties)
+    return memory.paths
+
+
+def allocation_module(traceback: tracemalloc.Traceback) -> str:
+    """
+    Returns the module an allocation is attributed to: the most recent
+    rawdata module on its traceback, else the most recent module of this
+    package, else "other"
+    """
+    package_module = None
+    for frame in reversed(traceback):
+        if not frame.filename.startswith(PACKAGE_DIR):
+            continue
+        module = os.path.splitext(os.path.relpath(frame.filename, PACKAGE_DIR))[0]
+        module = "palworld_save_tools." + module.replace(os.sep, ".")
+        if module.startswith("palworld_save_tools.rawdata."):
+            return module
+        if package_module is None:
+            package_module = module
+    return package_module or "other"
+
+
+def allocations_by_module(snapshot: tracemalloc.Snapshot) -> dict[str, dict[str, int]]:
+    """Returns the bytes and number of blocks still allocated by each module"""
+    modules: dict[str, dict[str, int]] = {}
+    # Grouping by traceback first leaves only a few hundred to attribute
+    for statistic in snapshot.statistics("traceback"):
+        module = allocation_module(statistic.traceback)
+        counts = modules.get(module)
+        if counts is None:
+            counts = modules[module] = {"bytes": 0, "blocks": 0}
+        counts["bytes"] += statistic.size
+        counts["blocks"] += statistic.count
+    return modules
+
+
+def read_with_allocations(
+    read: Callable[[], GvasFile], frames: int = DEFAULT_TRACEBACK_FRAMES
+) -> tuple[GvasFile, Optional[dict[str, dict[str, int]]]]:
+    """
+    Calls read with tracemalloc tracing and returns what it returned with the
+    allocations it left behind by module. Tracing enough frames to reach the
+    rawdata modules slows reading down around a hundredfold. If tracemalloc
+    is already tracing, it is left as it is and no allocations are returned,
+    as they could not be told apart from earlier ones.
+    """
+    if tracemalloc.is_tracing():
+        return read(), None
+    tracemalloc.start(frames)
+    try:
+        gvas_file = read()
+        snapshot = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    return gvas_file, allocations_by_module(snapshot)
@@ -0,0 +1,164 @@
+from collections.abc import Mapping
+from operator import attrgetter
+from typing import Any, Callable, Iterator, Optional
+
+
+class PropertyNode(Mapping):
+    """
+    Base of the compact representation of decoded properties, produced by an
+    FArchiveReader with compact=True instead of a dict per property. A node
+    keeps its fields in __slots__, which takes a fraction of the memory of a
+    dict with the same keys, and behaves as a mapping of them in the order the
+    dict would have them, so the writer, the JSON encoder and custom property
+    decoders work on either. Fields can be replaced but not added or removed;
+    custom properties, which gain a custom_type, are dicts. Code that checks
+    for a dict, such as the diff, patch, index and export tools, needs
+    to_dict or a tree read without compact.
+    """
+
+    __slots__ = ()
+    FIELDS: tuple[str, ...] = ()
+    # Gets the values of FIELDS as a tuple, an attrgetter does not bind to
+    # instances so it is called as self.field_values(self)
+    field_values: Callable[["PropertyNode"], tuple[Any, ...]]
+
+    def __init_subclass__(cls) -> None:
+        super().__init_subclass__()
+        cls.FIELDS = cls.__slots__
+        cls.field_values = attrgetter(*cls.FIELDS)
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self.FIELDS:
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key not in self.FIELDS:
+            raise KeyError(f"{type(self).__name__} has no field {key}")
+        setattr(self, key, value)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.FIELDS
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.FIELDS)
+
+    def __len__(self) -> int:
+        return len(self.FIELDS)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key in self.FIELDS:
+            return getattr(self, key)
+        return default
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+    def __reduce__(self) -> tuple[type, tuple[Any, ...]]:
+        return (type(self), self.field_values(self))
+
+    def to_dict(self) -> dict[str, Any]:
+        """Returns the dict the reader would have returned, sharing the values"""
+        return dict(zip(self.FIELDS, self.field_values(self)))
+
+
+class ValueNode(PropertyNode):
+    """A property that is an optional Guid and a value, such as IntProperty"""
+
+    __slots__ = ("id", "value", "type")
+
+    def __init__(self, id: Any, value: Any, type: str) -> None:
+        self.id = id
+        self.value = value
+        self.type = type
+
+
+class BoolNode(PropertyNode):
+    __slots__ = ("value", "id", "type")
+
+    def __init__(self, value: bool, id: Any, type: str = "BoolProperty") -> None:
+        self.value = value
+        self.id = id
+        self.type = type
+
+
+class EnumValueNode(PropertyNode):
+    """The value of an EnumProperty or ByteProperty: its enum type and value"""
+
+    __slots__ = ("type", "value")
+
+    def __init__(self, type: str, value: Any) -> None:
+        self.type = type
+        self.value = value
+
+
+class StructNode(PropertyNode):
+    __slots__ = ("struct_type", "struct_id", "id", "value", "type")
+
+    def __init__(
+        self,
+        struct_type: str,
+        struct_id: Any,
+        id: Any,
+        value: Any,
+        type: str = "StructProperty",
+    ) -> None:
+        self.struct_type = struct_type
+        self.struct_id = struct_id
+        self.id = id
+        self.value = value
+        self.type = type
+
+
+class ArrayNode(PropertyNode):
+    __slots__ = ("array_type", "id", "value", "type")
+
+    def __init__(
+        self, array_type: str, id: Any, value: Any, type: str = "ArrayProperty"
+    ) -> None:
+        self.array_type = array_type
+        self.id = id
+        self.value = value
+        self.type = type
+
+
+class MapNode(PropertyNode):
+    __slots__ = (
+        "key_type",
+        "value_type",
+        "key_struct_type",
+        "value_struct_type",
+        "id",
+        "value",
+        "type",
+    )
+
+    def __init__(
+        self,
+        key_type: str,
+        value_type: str,
+        key_struct_type: Optional[str],
+        value_struct_type: Optional[str],
+        id: Any,
+        value: list[dict[str, Any]],
+        type: str = "MapProperty",
+    ) -> None:
+        self.key_type = key_type
+        self.value_type = value_type
+        self.key_struct_type = key_struct_type
+        self.value_struct_type = value_struct_type
+        self.id = id
+        self.value = value
+        self.type = type
+
+
+class SetNode(PropertyNode):
+    __slots__ = ("set_type", "id", "value", "type")
+
+    def __init__(
+        self, set_type: str, id: Any, value: list[Any], type: str = "SetProperty"
+    ) -> None:
+        self.set_type = set_type
+        self.id = id
+        self.value = value
+        self.type = type
@@ -1,3 +1,4 @@
+import logging
 import os
 import sys
 import zlib
@@ -5,9 +6,47 @@ import struct
 import ctypes
 from typing import Tuple
 
+from palworld_save_tools.compressor import HEX_DUMP_BYTES
+
 OODLE_COMPRESSOR_ID = 9  # mermaid
 OODLE_LEVEL = 4  # normal
 
+logger = logging.getLogger(__name__)
+
+
+def setup_ooz_decompress(lib) -> None:
+    """Sets up the Ooz_Decompress function signature based on community findings."""
+    lib.Ooz_Decompress.restype = ctypes.c_int
+    lib.Ooz_Decompress.argtypes = [
+        ctypes.c_void_p,  # src_buf
+        ctypes.c_size_t,  # src_len
+        ctypes.c_void_p,  # dst_buf
+        ctypes.c_size_t,  # dst_size
+        ctypes.c_int,  # fuzzSafe
+        ctypes.c_int,  # checkCRC
+        ctypes.c_int,  # verbosity
+        ctypes.c_void_p,  # decBufBase
+        ctypes.c_size_t,  # decBufSize
+        ctypes.c_void_p,  # fpCallback
+        ctypes.c_void_p,  # cbUserdata
+        ctypes.c_void_p,  # scratch
+        ctypes.c_size_t,  # scratchSize
+        ctypes.c_int,  # threadPhase
+    ]
+
+
+def setup_ooz_compress(lib) -> None:
+    """Sets up the Ooz_Compress function signature."""
+    lib.Ooz_Compress.restype = ctypes.c_int
+    lib.Ooz_Compress.argtypes = [
+        ctypes.c_int,  # compressor
+        ctypes.c_void_p,  # src_buf
+        ctypes.c_int,  # src_len
+        ctypes.c_void_p,  # dst_buf
+        ctypes.c_size_t,  # dst_capacity
+        ctypes.c_int,  # level
+    ]
+
 
 class OozLib:
     """
@@ -49,34 +88,9 @@ class OozLib:
             )
 
     def _setup_ooz_functions(self):
-        """Sets up the Ooz_Decompress function signature based on community findings."""
-        self.lib.Ooz_Decompress.restype = ctypes.c_int
-        self.lib.Ooz_Decompress.argtypes = [
-            ctypes.c_void_p,  # src_buf
-            ctypes.c_size_t,  # src_len
-            ctypes.c_void_p,  # dst_buf
-            ctypes.c_size_t,  # dst_size
-            ctypes.c_int,  # fuzzSafe
-            ctypes.c_int,  # checkCRC
-            ctypes.c_int,  # verbosity
-            ctypes.c_void_p,  # decBufBase
-            ctypes.c_size_t,  # decBufSize
-            ctypes.c_void_p,  # fpCallback
-            ctypes.c_void_p,  # cbUserdata
-            ctypes.c_void_p,  # scratch
-            ctypes.c_size_t,  # scratchSize
-            ctypes.c_int,  # threadPhase
-        ]
-
-        self.lib.Ooz_Compress.restype = ctypes.c_int
-        self.lib.Ooz_Compress.argtypes = [
-            ctypes.c_int,  # compressor
-            ctypes.c_void_p,  # src_buf
-            ctypes.c_int,  # src_len
-            ctypes.c_void_p,  # dst_buf
-            ctypes.c_size_t,  # dst_capacity
-            ctypes.c_int,  # level
-        ]
+        """Sets up the Ooz_Decompress and Ooz_Compress function signatures."""
+        setup_ooz_decompress(self.lib)
+        setup_ooz_compress(self.lib)
 
     def _parse_sav_header(self, sav_data: bytes) -> Tuple[int, int, bytes, int, int]:
         """
@@ -115,7 +129,7 @@ class OozLib:
         if len(sav_data) < 12:
             return -1
         magic = sav_data[8:11]
-        print(f"Checking SAV format, magic bytes: {magic!r}")
+        logger.debug("Checking SAV format, magic bytes: %r", magic)
         if magic == b"PlM":
             return 1
         elif magic == b"PlZ":
@@ -151,8 +165,6 @@ class OozLib:
         """
         Decodes .sav file using libooz.dll with correct buffer padding.
         """
-        print("\nStarting decompression process with libooz.dll...")
-
         if not sav_data:
             raise ValueError("SAV data cannot be empty")
 
@@ -164,18 +176,18 @@ class OozLib:
         elif format_result == -1:
             raise ValueError("Unknown SAV file format")
 
-        print("Detected PLM format (Oodle), starting decompression...")
-
         uncompressed_len, compressed_len, magic, save_type, data_offset = (
             self._parse_sav_header(sav_data)
         )
 
-        print(f"File information (Decompress):")
-        print(f"  Magic bytes: {magic.decode('ascii', errors='ignore')}")
-        print(f"  Save type: 0x{save_type:02X}")
-        print(f"  Compressed size: {compressed_len:,} bytes")
-        print(f"  Uncompressed size: {uncompressed_len:,} bytes")
-        print(f"  Data offset: {data_offset} bytes")
+        logger.debug(
+            "Decompressing with libooz: magic=%r save_type=0x%02X compressed_size=%d uncompressed_size=%d data_offset=%d",
+            magic,
+            save_type,
+            compressed_len,
+            uncompressed_len,
+            data_offset,
+        )
 
         if len(sav_data) < data_offset + compressed_len:
             raise ValueError(
@@ -187,7 +199,6 @@ class OozLib:
             uncompressed_len + self.SAFE_SPACE_PADDING
         )
 
-        print("Calling Ooz_Decompress...")
         result_size = self.lib.Ooz_Decompress(
             compressed_data,
             compressed_len,
@@ -218,29 +229,26 @@ class OozLib:
                 f"Expected at least {uncompressed_len}, got {result_size}"
             )
 
-        print(
-            f"Ooz_Decompress function reported writing {result_size} bytes (including padding)."
+        logger.debug(
+            "Ooz_Decompress reported writing %d bytes (including padding)", result_size
         )
         # =================================================================
 
         # Slice the result to get clean GVAS data (this is correct)
         gvas_data = gvas_buffer.raw[:uncompressed_len]
 
-        print("Decompression successful!")
         return gvas_data, save_type
 
     def compress_gvas_to_sav(self, gvas_data: bytes, save_type: int) -> bytes:
         """
         Compresses GVAS data using libooz.dll (Ooz_Compress).
         """
-        print("\nStarting compression process with libooz.dll (memory method)...")
-
         src_len = len(gvas_data)
         if src_len == 0:
             raise ValueError("Input data for compression must not be empty.")
 
         if save_type == 0x32:
-            print("Force Zlib Compression")
+            logger.debug("Force Zlib Compression")
             compressed_data = zlib.compress(gvas_data)
             compressed_len = len(compressed_data)
             compressed_data = zlib.compress(compressed_data)
@@ -252,7 +260,6 @@ class OozLib:
             dst_buf = ctypes.create_string_buffer(dst_capacity + 8)
 
             # === Call Ooz_Compress ===
-            print("Calling Ooz_Compress...")
             result = self.lib.Ooz_Compress(
                 OODLE_COMPRESSOR_ID,  # e.g. 8 for Kraken
                 ctypes.cast(src_buf, ctypes.c_void_p),
@@ -271,17 +278,17 @@ class OozLib:
             compressed_len = len(compressed_data)
             magic_bytes = b"PlM"
 
-        print(f"Compression successful, compressed size: {compressed_len:,} bytes")
-
-        print(f"File information (Compress):")
-        print(f"  Magic bytes: {magic_bytes.decode('ascii', errors='ignore')}")
-        print(f"  Save type: 0x{save_type:02X}")
-        print(f"  Compressed size: {compressed_len:,} bytes")
-        print(f"  Uncompressed size: {src_len:,} bytes")
-        print(f"  Hex dump: {compressed_data.hex()[:64]}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Compressed with libooz: magic=%r save_type=0x%02X compressed_size=%d uncompressed_size=%d head=%s",
+                magic_bytes,
+                save_type,
+                compressed_len,
+                src_len,
+                compressed_data[:HEX_DUMP_BYTES].hex(),
+            )
 
         # === Build .sav file header ===
-        print("Building .sav file...")
         result = bytearray()
         result.extend(src_len.to_bytes(4, "little"))
         result.extend(compressed_len.to_bytes(4, "little"))
@@ -289,7 +296,6 @@ class OozLib:
         result.extend(bytes([save_type]))
         result.extend(compressed_data)
 
-        print("Finished building .sav file.")
         return bytes(result)
 
 
@@ -1,14 +1,19 @@
+import mmap
+from typing import Optional
+
 from palworld_save_tools.compressor import Compressor
-from palworld_save_tools.compressor.oozlib import OozLib
-from palworld_save_tools.compressor.zlib import Zlib
 from palworld_save_tools.compressor.enums import SaveType
+from palworld_save_tools.compressor.oozlib import OozLib
+from palworld_save_tools.compressor.zlib import Zlib, ZlibOptions
 
 compressor = Compressor()
 oozlib = OozLib()
 z_lib = Zlib()
 
 
-def decompress_sav_to_gvas(data: bytes, zlib: bool = False) -> tuple[bytes, int]:
+def decompress_sav_to_gvas(
+    data: bytes, zlib: bool = False, zlib_workers: Optional[int] = None
+) -> tuple[bytes, int]:
     format = compressor.check_sav_format(data)
 
     if format is None:
@@ -16,14 +21,53 @@ def decompress_sav_to_gvas(data: bytes, zlib: bool = False) -> tuple[bytes, int]
 
     match format:
         case SaveType.PLZ | SaveType.CNK:
-            return z_lib.decompress(data)
+            return z_lib.decompress(data, zlib_workers)
         case SaveType.PLM:
             return oozlib.decompress(data)
         case _:
             raise Exception("Unknown save format")
 
 
-def compress_gvas_to_sav(data: bytes, save_type: int, zlib: bool = False) -> bytes:
+def decompress_sav_to_buffer(
+    data: bytes, use_mmap: bool = False, zlib_workers: Optional[int] = None
+) -> tuple[memoryview, int]:
+    """
+    Like decompress_sav_to_gvas, but returns a memoryview of the GVAS data.
+    PLM saves are decompressed by Oodle straight into a preallocated buffer,
+    an anonymous mmap with use_mmap or a bytearray otherwise. GvasFile.read
+    parses views of an mmap and of whole bytes objects in place, and copies
+    views of a bytearray. Pass the view to release_buffer once it has been
+    read, to free an mmap behind it.
+    """
+    format = compressor.check_sav_format(data)
+
+    if format is None:
+        raise Exception("Unknown save format")
+
+    match format:
+        case SaveType.PLZ | SaveType.CNK:
+            gvas, save_type = z_lib.decompress(data, zlib_workers)
+            return memoryview(gvas), save_type
+        case SaveType.PLM:
+            return oozlib.decompress_into(data, use_mmap=use_mmap)
+        case _:
+            raise Exception("Unknown save format")
+
+
+def release_buffer(buffer: memoryview) -> None:
+    """Releases a view returned by decompress_sav_to_buffer and closes its mmap"""
+    owner = buffer.obj
+    buffer.release()
+    if isinstance(owner, mmap.mmap):
+        owner.close()
+
+
+def compress_gvas_to_sav(
+    data: bytes,
+    save_type: int,
+    zlib: bool = False,
+    zlib_options: Optional[ZlibOptions] = None,
+) -> bytes:
     format = compressor.check_savtype_format(save_type)
 
     if format is None:
@@ -31,6 +75,6 @@ def compress_gvas_to_sav(data: bytes, save_type: int, zlib: bool = False) -> byt
 
     match format:
         case SaveType.PLZ | SaveType.CNK:
-            return z_lib.compress(data, save_type)
+            return z_lib.compress(data, save_type, zlib_options)
         case SaveType.PLM:
             return oozlib.compress(data, save_type)
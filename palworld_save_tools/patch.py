@@ -0,0 +1,312 @@
+import hashlib
+import struct
+from typing import Any, Optional
+
+from palworld_save_tools.archive import FArchiveReader, FArchiveWriter
+from palworld_save_tools.diff import GvasDiff
+from palworld_save_tools.index import DEFAULT_INDEX_DEPTH
+
+PATCH_MAGIC = b"PSTP"
+PATCH_VERSION = 1
+
+OP_REPLACE = 0
+OP_INSERT = 1
+OP_DELETE = 2
+
+
+def range_hash(data: bytes) -> bytes:
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+class PatchBuilder(GvasDiff):
+    """
+    Finds the differences between two GVAS files like GvasDiff, but records
+    the bytes of each differing entry instead of decoding it. Besides the
+    byte range to replace, every operation lists the u64 sizes of the
+    properties enclosing it and the u32 count of the container it is added
+    to or removed from, which apply_patch fixes up.
+
+    Entries in a different order in the new file are replaced along with
+    their container, so applying the patch reproduces the new file exactly.
+    """
+
+    ops: list[dict[str, Any]]
+
+    def __init__(
+        self,
+        old: bytes,
+        new: bytes,
+        type_hints: dict[str, str] = {},
+        max_depth: int = DEFAULT_INDEX_DEPTH,
+    ):
+        super().__init__(old, new, type_hints, {}, max_depth)
+        self.ops = []
+
+    def build(self) -> dict[str, Any]:
+        self.diff()
+        return {
+            "old_size": len(self.old.data),
+            "new_size": len(self.new.data),
+            "ops": sorted(self.ops, key=lambda op: (op["offset"], op["end"])),
+        }
+
+    def size_offsets(self, parent: int) -> list[int]:
+        offsets = []
+        while parent != -1:
+            entry = self.old.entries[parent]
+            if entry["kind"] == "property":
+                offsets.append(entry["size_offset"])
+                if "inner_size_offset" in entry:
+                    offsets.append(entry["inner_size_offset"])
+            parent = entry["parent"]
+        return offsets
+
+    def count_offset(self, parent: int) -> Optional[int]:
+        if parent == -1:
+            return None
+        return self.old.entries[parent].get("count_offset")
+
+    def add_op(
+        self,
+        op: int,
+        path: str,
+        offset: int,
+        end: int,
+        data: bytes,
+        parent: int = -1,
+    ) -> None:
+        self.ops.append(
+            {
+                "op": op,
+                "path": path,
+                "offset": offset,
+                "end": end,
+                "old_hash": range_hash(self.old.data[offset:end]),
+                "size_offsets": self.size_offsets(parent),
+                "count_offset": (
+                    self.count_offset(parent) if op != OP_REPLACE else None
+                ),
+                "data": data,
+            }
+        )
+
+    def header_changed(self) -> None:
+        self.add_op(
+            OP_REPLACE,
+            "header",
+            0,
+            self.old.index["header_size"],
+            self.new.header(),
+        )
+
+    def trailer_changed(self) -> None:
+        self.add_op(
+            OP_REPLACE,
+            "trailer",
+            self.old.properties_end(),
+            len(self.old.data),
+            self.new.trailer(),
+        )
+
+    def reordered(self, old_parent: int, new_parent: int) -> bool:
+        if old_parent == -1:
+            self.add_op(
+                OP_REPLACE,
+                "",
+                self.old.index["header_size"],
+                self.old.properties_end(),
+                self.new.data[
+                    self.new.index["header_size"] : self.new.properties_end()
+                ],
+            )
+        else:
+            self.changed(old_parent, new_parent)
+        return True
+
+    def changed(self, old_i: int, new_i: int) -> None:
+        old_entry = self.old.entries[old_i]
+        self.add_op(
+            OP_REPLACE,
+            self.entry_path(self.old, old_entry),
+            old_entry["offset"],
+            old_entry["end"],
+            self.new.raw(self.new.entries[new_i]),
+            old_entry["parent"],
+        )
+
+    def removed(self, old_i: int) -> None:
+        old_entry = self.old.entries[old_i]
+        self.add_op(
+            OP_DELETE,
+            self.entry_path(self.old, old_entry),
+            old_entry["offset"],
+            old_entry["end"],
+            b"",
+            old_entry["parent"],
+        )
+
+    def added(self, new_i: int, old_parent: int, at: int) -> None:
+        new_entry = self.new.entries[new_i]
+        self.add_op(
+            OP_INSERT,
+            self.entry_path(self.new, new_entry),
+            at,
+            at,
+            self.new.raw(new_entry),
+            old_parent,
+        )
+
+
+def make_patch(
+    old: bytes,
+    new: bytes,
+    type_hints: dict[str, str] = {},
+    max_depth: int = DEFAULT_INDEX_DEPTH,
+) -> dict[str, Any]:
+    """
+    Returns a patch turning the decompressed GVAS file old into new. Entries
+    are compared down to max_depth levels, a deeper change replaces the
+    whole entry at max_depth that contains it.
+    """
+    return PatchBuilder(old, new, type_hints, max_depth).build()
+
+
+def encode_patch(patch: dict[str, Any]) -> bytes:
+    writer = FArchiveWriter()
+    writer.write(PATCH_MAGIC)
+    writer.u32(PATCH_VERSION)
+    writer.u64(patch["old_size"])
+    writer.u64(patch["new_size"])
+    writer.u32(len(patch["ops"]))
+    for op in patch["ops"]:
+        writer.byte(op["op"])
+        writer.fstring(op["path"])
+        writer.u64(op["offset"])
+        writer.u64(op["end"])
+        writer.write(op["old_hash"])
+        writer.u32(len(op["size_offsets"]))
+        for offset in op["size_offsets"]:
+            writer.u64(offset)
+        count_offset = op["count_offset"]
+        writer.i64(-1 if count_offset is None else count_offset)
+        writer.u64(len(op["data"]))
+        writer.write(op["data"])
+    return writer.bytes()
+
+
+def decode_patch(data: bytes) -> dict[str, Any]:
+    reader = FArchiveReader(data)
+    magic = reader.read(len(PATCH_MAGIC))
+    if magic != PATCH_MAGIC:
+        raise Exception(f"Not a save patch, magic is {magic!r}")
+    version = reader.u32()
+    if version != PATCH_VERSION:
+        raise Exception(f"Unsupported save patch version {version}")
+    patch: dict[str, Any] = {
+        "old_size": reader.u64(),
+        "new_size": reader.u64(),
+        "ops": [],
+    }
+    for _ in range(reader.u32()):
+        op: dict[str, Any] = {
+            "op": reader.byte(),
+            "path": reader.fstring(),
+            "offset": reader.u64(),
+            "end": reader.u64(),
+            "old_hash": reader.read(16),
+        }
+        op["size_offsets"] = [reader.u64() for _ in range(reader.u32())]
+        count_offset = reader.i64()
+        op["count_offset"] = None if count_offset == -1 else count_offset
+        op["data"] = reader.read(reader.u64())
+        patch["ops"].append(op)
+    return patch
+
+
+def apply_patch(gvas: bytes, patch: Any) -> bytes:
+    """
+    Applies a patch from make_patch, or encoded with encode_patch, to a
+    decompressed GVAS file. Only the patched byte ranges and the size and
+    count fields enclosing them are touched, nothing is decoded. Raises an
+    exception if the file is not the one the patch was made from.
+    """
+    if isinstance(patch, (bytes, bytearray, memoryview)):
+        patch = decode_patch(bytes(patch))
+    if len(gvas) != patch["old_size"]:
+        raise Exception(
+            f"Patch is for a GVAS file of {patch['old_size']} bytes, got {len(gvas)}"
+        )
+    ops = patch["ops"]
+    fields: dict[int, tuple[str, int]] = {}
+    previous_end = 0
+    for op in ops:
+        offset, end = op["offset"], op["end"]
+        if offset < previous_end or end < offset or end > len(gvas):
+            raise Exception(f"Invalid patch range {offset}-{end} for {op['path']}")
+        previous_end = end
+        if range_hash(gvas[offset:end]) != op["old_hash"]:
+            raise Exception(f"Patch does not apply, {op['path']} has changed")
+        delta = len(op["data"]) - (end - offset)
+        for size_offset in op["size_offsets"]:
+            _, size_delta = fields.get(size_offset, ("<Q", 0))
+            fields[size_offset] = ("<Q", size_delta + delta)
+        if op["count_offset"] is not None:
+            _, count_delta = fields.get(op["count_offset"], ("<I", 0))
+            count_delta += 1 if op["op"] == OP_INSERT else -1
+            fields[op["count_offset"]] = ("<I", count_delta)
+    patched = bytearray(gvas)
+    for offset, (fmt, delta) in fields.items():
+        (value,) = struct.unpack_from(fmt, patched, offset)
+        struct.pack_into(fmt, patched, offset, value + delta)
+    view = memoryview(patched)
+    chunks = []
+    position = 0
+    for op in ops:
+        chunks.append(view[position : op["offset"]])
+        chunks.append(op["data"])
+        position = op["end"]
+    chunks.append(view[position:])
+    result = b"".join(chunks)
+    if len(result) != patch["new_size"]:
+        raise Exception(
+            f"Patched GVAS file is {len(result)} bytes, expected {patch['new_size']}"
+        )
+    return result
+
+
+def make_sav_patch(
+    old_path: str,
+    new_path: str,
+    type_hints: Optional[dict[str, str]] = None,
+    max_depth: int = DEFAULT_INDEX_DEPTH,
+) -> bytes:
+    """Returns the encoded patch turning one .sav file into another"""
+    from palworld_save_tools.palsav import decompress_sav_to_gvas
+    from palworld_save_tools.paltypes import PALWORLD_TYPE_HINTS
+
+    with open(old_path, "rb") as f:
+        old_gvas, _ = decompress_sav_to_gvas(f.read())
+    with open(new_path, "rb") as f:
+        new_gvas, _ = decompress_sav_to_gvas(f.read())
+    return encode_patch(
+        make_patch(
+            old_gvas,
+            new_gvas,
+            PALWORLD_TYPE_HINTS if type_hints is None else type_hints,
+            max_depth,
+        )
+    )
+
+
+def apply_sav_patch(sav_path: str, patch: bytes, output_path: str) -> None:
+    """
+    Applies an encoded patch to a .sav file and writes the result, compressed
+    like the original, to output_path
+    """
+    from palworld_save_tools.palsav import compress_gvas_to_sav, decompress_sav_to_gvas
+
+    with open(sav_path, "rb") as f:
+        gvas, save_type = decompress_sav_to_gvas(f.read())
+    patched = apply_patch(gvas, patch)
+    with open(output_path, "wb") as f:
+        f.write(compress_gvas_to_sav(patched, save_type))
@@ -0,0 +1,88 @@
+from fnmatch import fnmatchcase
+from typing import Sequence
+
+
+def _split(path: str) -> list[str]:
+    return path[1:].split(".") if path.startswith(".") else path.split(".")
+
+
+class PathFilter:
+    """
+    Decides which properties FArchiveReader decodes, based on include and
+    exclude globs over property paths such as
+    .worldSaveData.CharacterSaveParameterMap.Value.RawData.
+
+    In a glob, * matches within one path segment and ** matches any number of
+    segments. A property is decoded if it (or one of its ancestors) matches an
+    include glob, or if it is an ancestor of something an include glob could
+    match. Without include globs everything is included. Properties matching
+    an exclude glob, and everything below them, are never decoded.
+    """
+
+    __slots__ = ("include", "exclude", "cache")
+    include: list[list[str]]
+    exclude: list[list[str]]
+    cache: dict[str, bool]
+
+    def __init__(self, include: Sequence[str] = (), exclude: Sequence[str] = ()):
+        self.include = [_split(pattern) for pattern in include]
+        self.exclude = [_split(pattern) for pattern in exclude]
+        self.cache = {}
+
+    def __bool__(self) -> bool:
+        return bool(self.include or self.exclude)
+
+    @staticmethod
+    def match(pattern: list[str], segments: list[str]) -> tuple[bool, bool]:
+        """
+        Returns whether the pattern matches the segments or one of their
+        prefixes, and whether the segments could be extended to a match.
+        """
+        end = len(pattern)
+
+        def expand(states: set[int]) -> set[int]:
+            # ** also matches zero segments
+            for state in sorted(states):
+                while state < end and pattern[state] == "**":
+                    state += 1
+                    states.add(state)
+            return states
+
+        states = expand({0})
+        if end in states:
+            return True, False
+        for segment in segments:
+            next_states = set()
+            for state in states:
+                if state == end:
+                    continue
+                if pattern[state] == "**":
+                    next_states.add(state)
+                elif fnmatchcase(segment, pattern[state]):
+                    next_states.add(state + 1)
+            states = expand(next_states)
+            if end in states:
+                return True, False
+            if not states:
+                return False, False
+        return False, True
+
+    def wants(self, path: str) -> bool:
+        """Whether the property at path should be decoded"""
+        cached = self.cache.get(path)
+        if cached is not None:
+            return cached
+        segments = _split(path)
+        wanted = not self.include
+        for pattern in self.include:
+            matched, partial = PathFilter.match(pattern, segments)
+            if matched or partial:
+                wanted = True
+                break
+        if wanted:
+            for pattern in self.exclude:
+                if PathFilter.match(pattern, segments)[0]:
+                    wanted = False
+                    break
+        self.cache[path] = wanted
+        return wanted
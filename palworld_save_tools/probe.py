@@ -0,0 +1,130 @@
+import os
+import zlib
+from typing import Any, Optional
+
+from palworld_save_tools.archive import FArchiveReader
+from palworld_save_tools.compressor import Compressor
+from palworld_save_tools.compressor.enums import MagicBytes, SaveType
+from palworld_save_tools.gvas import GvasHeader
+
+# Compressed bytes read from a file before the first probe attempt, this
+# comfortably covers the GVAS header of every save seen so far
+PROBE_PREFIX_SIZE = 16 * 1024
+# Compressed bytes fed to the inflaters between attempts to parse the header
+PROBE_STEP_SIZE = 4 * 1024
+# Oodle decodes in blocks of this size, the header is always in the first one
+OODLE_BLOCK_SIZE = 0x40000
+
+compressor = Compressor()
+
+
+def _read_header(gvas_prefix: bytes) -> Optional[GvasHeader]:
+    """
+    Parses the GVAS header from the start of a GVAS file. Returns None if the
+    prefix ends before the header does.
+    """
+    reader = FArchiveReader(gvas_prefix)
+    try:
+        header = GvasHeader.read(reader)
+    except Exception:
+        return None
+    # Short reads at the end of the prefix can still parse into truncated
+    # strings, so the header must end before the prefix does
+    if reader.data.tell() >= reader.size:
+        return None
+    return header
+
+
+def _inflate_header(compressed: bytes, double: bool) -> Optional[GvasHeader]:
+    outer = zlib.decompressobj()
+    inner = zlib.decompressobj() if double else None
+    gvas_prefix = b""
+    for offset in range(0, len(compressed), PROBE_STEP_SIZE):
+        chunk = outer.decompress(compressed[offset : offset + PROBE_STEP_SIZE])
+        if inner is not None:
+            chunk = inner.decompress(chunk)
+        gvas_prefix += chunk
+        header = _read_header(gvas_prefix)
+        if header is not None:
+            return header
+        if outer.eof and (inner is None or inner.eof):
+            break
+    return None
+
+
+def _oodle_header(compressed: bytes, uncompressed_len: int) -> Optional[GvasHeader]:
+    # Imported lazily, probing zlib saves should not require the ooz library
+    from palworld_save_tools.palsav import oozlib
+
+    try:
+        gvas_prefix = oozlib.ooz.decompress(
+            compressed, min(uncompressed_len, OODLE_BLOCK_SIZE)
+        )
+    except Exception:
+        return None
+    return _read_header(gvas_prefix)
+
+
+def _probe(data: bytes) -> tuple[dict[str, Any], Optional[GvasHeader]]:
+    uncompressed_len, compressed_len, magic, save_type, data_offset = (
+        compressor._parse_sav_header(data)
+    )
+    info: dict[str, Any] = {
+        "magic": magic.decode("ascii"),
+        "save_type": save_type,
+        "compressed_size": compressed_len,
+        "uncompressed_size": uncompressed_len,
+    }
+    compressed = data[data_offset:]
+    if magic == MagicBytes.PLM.value:
+        header = _oodle_header(compressed[:compressed_len], uncompressed_len)
+    else:
+        header = _inflate_header(compressed, save_type == SaveType.PLZ.value)
+    return info, header
+
+
+def _header_info(header: GvasHeader) -> dict[str, Any]:
+    return {
+        "save_game_class_name": header.save_game_class_name,
+        "save_game_version": header.save_game_version,
+        "package_file_version_ue4": header.package_file_version_ue4,
+        "package_file_version_ue5": header.package_file_version_ue5,
+        "engine_version": f"{header.engine_version_major}.{header.engine_version_minor}.{header.engine_version_patch}-{header.engine_version_changelist}+{header.engine_version_branch}",
+    }
+
+
+def probe_sav(data: bytes) -> dict[str, Any]:
+    """
+    Returns the save type, sizes and GVAS header summary of a .sav file,
+    decompressing only as much of it as is needed to parse the GVAS header.
+    data can be a prefix of the file, as long as it contains the header.
+    """
+    info, header = _probe(data)
+    if header is None:
+        raise ValueError("Could not parse the GVAS header from the save data")
+    info.update(_header_info(header))
+    return info
+
+
+def probe_sav_file(path: str, prefix_size: int = PROBE_PREFIX_SIZE) -> dict[str, Any]:
+    """
+    Probes a .sav file, reading only the start of it. The prefix is doubled
+    until the GVAS header can be parsed or the whole file has been read.
+    """
+    file_size = os.path.getsize(path)
+    with open(path, "rb") as f:
+        data = f.read(prefix_size)
+        if compressor._parse_sav_header(data)[2] == MagicBytes.PLM.value:
+            # Oodle cannot decode a truncated block, so read the compressed
+            # data in full and only limit how much of it is decoded
+            data += f.read()
+        while True:
+            info, header = _probe(data)
+            if header is not None:
+                break
+            if len(data) >= file_size:
+                raise ValueError(f"Could not parse the GVAS header of {path}")
+            data += f.read(len(data))
+    info.update(_header_info(header))
+    info["file_size"] = file_size
+    return info
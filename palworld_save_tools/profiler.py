@@ -0,0 +1,162 @@
+import json
+import time
+from typing import Any, Optional
+
+SORT_KEYS = ("tottime", "cumtime", "calls", "bytes")
+DEFAULT_TABLE_ROWS = 30
+
+
+class PathStats:
+    __slots__ = ("calls", "tottime", "cumtime", "bytes", "custom")
+    calls: int
+    tottime: float
+    cumtime: float
+    bytes: int
+    custom: bool
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.tottime = 0.0
+        self.cumtime = 0.0
+        self.bytes = 0
+        self.custom = False
+
+    def dump(self) -> dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "tottime": self.tottime,
+            "cumtime": self.cumtime,
+            "bytes": self.bytes,
+            "custom": self.custom,
+        }
+
+
+class PropertyProfiler:
+    """
+    Aggregates the time, bytes and number of calls spent reading and writing
+    properties by path, such as .worldSaveData.MapObjectSaveData. Paths are
+    the ones custom properties and type hints are keyed by, so each map or
+    array entry is counted under the path of its map or array.
+
+    Pass it to GvasFile.read and GvasFile.write. Readers and writers without
+    one skip all of this, apart from checking whether they have one.
+
+    As in cProfile, the cumulative time (cumtime) of a path includes the
+    paths inside it and the total time (tottime) does not. A path nested in
+    itself, such as a custom property reading its raw value with
+    reader.property, is counted once at its outermost call. Writers do not
+    know the path of their properties, it is rebuilt from the names of the
+    properties being written. Properties read and written inside custom
+    decoders and encoders count towards the custom property, and the rawdata
+    decode_bytes functions a custom decoder calls are counted under their own
+    name, such as map_concrete_model.decode_bytes (ItemBooth).
+    """
+
+    stats: dict[str, dict[str, PathStats]]
+    # path, operation, start time, start position, time spent in nested paths
+    stack: list[list[Any]]
+    active: set[tuple[str, str]]
+    paths: list[str]
+
+    def __init__(self) -> None:
+        self.stats = {"read": {}, "write": {}}
+        self.stack = []
+        self.active = set()
+        self.paths = [""]
+
+    def enter(self, operation: str, path: str, position: int) -> Optional[int]:
+        """
+        Starts timing path, returns a token for leave or None if path is
+        already being timed
+        """
+        key = (operation, path)
+        if key in self.active:
+            return None
+        self.active.add(key)
+        self.stack.append([path, operation, time.perf_counter(), position, 0.0])
+        return len(self.stack)
+
+    def leave(self, token: Optional[int], position: int, custom: bool = False) -> None:
+        if token is None:
+            return
+        now = time.perf_counter()
+        # Entries left behind by exceptions caught on the way back are dropped
+        while len(self.stack) > token:
+            path, operation = self.stack.pop()[:2]
+            self.active.discard((operation, path))
+        path, operation, start, start_position, nested = self.stack.pop()
+        self.active.discard((operation, path))
+        elapsed = now - start
+        self.record(
+            operation, path, start, elapsed, nested, position - start_position, custom
+        )
+        if self.stack:
+            self.stack[-1][4] += elapsed
+
+    def record(
+        self,
+        operation: str,
+        path: str,
+        start: float,
+        elapsed: float,
+        nested: float,
+        size: int,
+        custom: bool,
+    ) -> None:
+        """Called as each timed path ends, with the stack holding the paths around it"""
+        stats = self.stats[operation].get(path)
+        if stats is None:
+            stats = self.stats[operation][path] = PathStats()
+        stats.calls += 1
+        stats.tottime += elapsed - nested
+        stats.cumtime += elapsed
+        stats.bytes += size
+        stats.custom = stats.custom or custom
+
+    def push_path(self, path: str) -> None:
+        self.paths.append(path)
+
+    def pop_path(self) -> None:
+        self.paths.pop()
+
+    def rows(
+        self, operation: str, sort: str = "tottime"
+    ) -> list[tuple[str, PathStats]]:
+        if sort not in SORT_KEYS:
+            raise Exception(f"Unknown sort key: {sort}, expected one of {SORT_KEYS}")
+        return sorted(
+            self.stats[operation].items(),
+            key=lambda item: getattr(item[1], sort),
+            reverse=True,
+        )
+
+    def table(
+        self, sort: str = "tottime", limit: Optional[int] = DEFAULT_TABLE_ROWS
+    ) -> str:
+        """Returns the paths of each operation that took longest as a table"""
+        lines = []
+        for operation in self.stats:
+            rows = self.rows(operation, sort)
+            if not rows:
+                continue
+            lines.append(
+                f"{operation:<72} {'calls':>10} {'tottime':>10} {'cumtime':>10} {'bytes':>14}"
+            )
+            for path, stats in rows[:limit]:
+                name = f"{path} (custom)" if stats.custom else path
+                lines.append(
+                    f"{name[-72:]:<72} {stats.calls:>10,} "
+                    f"{stats.tottime * 1000:>8.1f}ms {stats.cumtime * 1000:>8.1f}ms "
+                    f"{stats.bytes:>14,}"
+                )
+        return "\n".join(lines)
+
+    def dump(self) -> dict[str, Any]:
+        return {
+            operation: {path: stats.dump() for path, stats in stats_by_path.items()}
+            for operation, stats_by_path in self.stats.items()
+        }
+
+    def write_json(self, path: str) -> None:
+        with open(path, "w") as f:
+            json.dump(self.dump(), f, indent=2)
@@ -0,0 +1,157 @@
+import sys
+import time
+from typing import Any, Callable, Optional, TextIO
+
+# Properties read or written between looks at the clock
+DEFAULT_CHECK_EVERY = 256
+DEFAULT_INTERVAL = 0.2
+
+
+class Progress:
+    """
+    Reports how far GvasFile.read and GvasFile.write have got, by byte
+    position against the size of the data, to callback(progress) at most
+    every interval seconds.
+
+    Readers and writers count down one per property and only look at the
+    clock and their position every check_every properties, so reporting
+    does not slow them down. Positions are those of the outermost reader: the
+    RawData blobs custom properties decode are not counted until they are
+    read. Writers do not know the size of what they write, GvasFile.write
+    keeps the total the progress already has, such as the size of the save
+    it just read, or None.
+    """
+
+    callback: Callable[["Progress"], Any]
+    interval: float
+    check_every: int
+    countdown: int
+    stage: str
+    position: int
+    total: Optional[int]
+    start_time: float
+    last_report: float
+    # Writers still being written to, their bytes are not yet in the writer
+    # that created them
+    writers: list[Any]
+
+    def __init__(
+        self,
+        callback: Callable[["Progress"], Any],
+        interval: float = DEFAULT_INTERVAL,
+        check_every: int = DEFAULT_CHECK_EVERY,
+    ):
+        self.callback = callback
+        self.interval = interval
+        self.check_every = check_every
+        self.countdown = check_every
+        self.stage = ""
+        self.position = 0
+        self.total = None
+        self.start_time = time.perf_counter()
+        self.last_report = self.start_time
+        self.writers = []
+
+    def start(self, stage: str, total: Optional[int] = None) -> None:
+        self.stage = stage
+        self.position = 0
+        self.total = total
+        self.countdown = self.check_every
+        self.start_time = time.perf_counter()
+        self.last_report = self.start_time
+        self.writers = []
+        self.callback(self)
+
+    def update(self, position: int) -> None:
+        self.countdown = self.check_every
+        now = time.perf_counter()
+        if now - self.last_report < self.interval:
+            return
+        self.last_report = now
+        self.position = position
+        self.callback(self)
+
+    def finish(self, position: int) -> None:
+        self.position = position
+        if self.total is None:
+            self.total = position
+        self.last_report = time.perf_counter()
+        self.callback(self)
+
+    def written(self) -> int:
+        return sum(writer.data.tell() for writer in self.writers)
+
+    def release(self, writer: Any) -> None:
+        for i in range(len(self.writers) - 1, -1, -1):
+            if self.writers[i] is writer:
+                del self.writers[i]
+                return
+
+    @property
+    def elapsed(self) -> float:
+        return self.last_report - self.start_time
+
+    @property
+    def done(self) -> bool:
+        return self.total is not None and self.position >= self.total
+
+    def rate(self) -> Optional[float]:
+        """Returns the bytes per second so far"""
+        return self.position / self.elapsed if self.elapsed > 0 else None
+
+    def eta(self) -> Optional[float]:
+        """Returns the seconds left at the rate so far"""
+        rate = self.rate()
+        if self.total is None or not rate:
+            return None
+        return max(0, self.total - self.position) / rate
+
+
+def format_duration(seconds: float) -> str:
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    if hours:
+        return f"{hours}:{minutes:02}:{seconds:02}"
+    return f"{minutes}:{seconds:02}"
+
+
+class ProgressBar:
+    """
+    Progress callback that draws a bar with the stage, MB done, MB/s and ETA.
+    On a terminal the bar is redrawn in place, elsewhere each report is
+    written on a line of its own.
+    """
+
+    stream: TextIO
+    width: int
+    tty: bool
+
+    def __init__(self, stream: TextIO = sys.stderr, width: int = 30):
+        self.stream = stream
+        self.width = width
+        self.tty = stream.isatty()
+
+    def __call__(self, progress: Progress) -> None:
+        line = f"{progress.stage:<8}"
+        if progress.total:
+            fraction = min(1.0, progress.position / progress.total)
+            filled = int(fraction * self.width)
+            line += f" [{'#' * filled}{'.' * (self.width - filled)}] {fraction:>4.0%}"
+            line += f" {progress.position / 1e6:.1f}/{progress.total / 1e6:.1f}MB"
+        else:
+            line += f" {progress.position / 1e6:.1f}MB"
+        rate = progress.rate()
+        if rate is not None:
+            line += f" {rate / 1e6:.1f}MB/s"
+        eta = progress.eta()
+        if progress.done:
+            line += f" in {format_duration(progress.elapsed)}"
+        elif eta is not None:
+            line += f" ETA {format_duration(eta)}"
+        if self.tty:
+            self.stream.write(f"\r{line}\033[K")
+            if progress.done:
+                self.stream.write("\n")
+        else:
+            self.stream.write(line + "\n")
+        self.stream.flush()
@@ -1,11 +1,15 @@
+import logging
 from typing import Any, Sequence
 
 from palworld_save_tools.archive import *
+from palworld_save_tools.blob_memo import memoize_blob
 from palworld_save_tools.rawdata.common import (
     pal_item_and_num_read,
     pal_item_and_slot_writer,
 )
 
+logger = logging.getLogger(__name__)
+
 NO_OP_TYPES = [
     "EPalBaseCampModuleType::Energy",
     "EPalBaseCampModuleType::Medical",
@@ -64,6 +68,7 @@ def module_passive_effect_reader(reader: FArchiveReader) -> dict[str, Any]:
     return data
 
 
+@memoize_blob
 def decode_bytes(
     parent_reader: FArchiveReader, b_bytes: Sequence[int], module_type: str
 ) -> dict[str, Any]:
@@ -78,8 +83,10 @@ def decode_bytes(
             )
             data["trailing_bytes"] = reader.byte_list(4)
         except Exception as e:
-            print(
-                f"Warning: Failed to decode transport item director, please report this: {e} ({bytes(b_bytes)!r})"
+            logger.warning(
+                "Failed to decode transport item director, please report this: %s (%r)",
+                e,
+                bytes(b_bytes),
             )
             return {"values": b_bytes}
     elif module_type == "EPalBaseCampModuleType::PassiveEffect":
@@ -87,18 +94,20 @@ def decode_bytes(
             data["passive_effects"] = reader.tarray(module_passive_effect_reader)
         except Exception as e:
             reader.data.seek(0)
-            print(
-                f"Warning: Failed to decode passive effect, please report this: {e} ({bytes(b_bytes)!r})"
+            logger.warning(
+                "Failed to decode passive effect, please report this: %s (%r)",
+                e,
+                bytes(b_bytes),
             )
             return {"values": b_bytes}
     else:
-        print(
-            f"Warning: Unknown base camp module type {module_type}, falling back to raw bytes"
+        logger.warning(
+            "Unknown base camp module type %s, falling back to raw bytes", module_type
         )
         return {"values": b_bytes}
 
     if not reader.eof():
-        print(f"Warning: EOF not reached for {module_type}, falling back to raw bytes")
+        logger.warning("EOF not reached for %s, falling back to raw bytes", module_type)
         return {"values": b_bytes}
 
     return data
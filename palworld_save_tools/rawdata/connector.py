@@ -1,6 +1,7 @@
 from typing import Any, Sequence
 
 from palworld_save_tools.archive import *
+from palworld_save_tools.blob_memo import memoize_blob
 
 
 def decode(
@@ -26,6 +27,7 @@ def connect_info_item_writer(writer: FArchiveWriter, properties: dict[str, Any])
     writer.byte(properties["index"])
 
 
+@memoize_blob
 def decode_bytes(
     parent_reader: FArchiveReader, c_bytes: Sequence[int]
 ) -> Optional[dict[str, Any]]:
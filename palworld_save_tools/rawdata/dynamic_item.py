@@ -1,6 +1,10 @@
+import logging
 from typing import Any, Sequence
 
 from palworld_save_tools.archive import *
+from palworld_save_tools.blob_memo import memoize_blob
+
+logger = logging.getLogger(__name__)
 
 
 def decode(
@@ -14,6 +18,7 @@ def decode(
     return value
 
 
+@memoize_blob
 def decode_bytes(
     parent_reader: FArchiveReader, c_bytes: Sequence[int]
 ) -> Optional[dict[str, Any]]:
@@ -50,8 +55,8 @@ def decode_bytes(
                 raise Exception("Warning: EOF not reached")
             data |= temp_data
         except Exception as e:
-            print(
-                f"Warning: Failed to parse weapon data, continuing as raw data {buf!r}: {e}"
+            logger.warning(
+                "Failed to parse weapon data, continuing as raw data %r: %s", buf, e
             )
             reader.data.seek(cur_pos)
             data["trailer"] = [int(b) for b in reader.read_to_end()]
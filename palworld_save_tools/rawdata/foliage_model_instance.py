@@ -1,6 +1,29 @@
+import os
+import struct
 from typing import Any, Sequence
 
 from palworld_save_tools.archive import *
+from palworld_save_tools.blob_memo import memoize_blob
+
+try:
+    import numpy
+except ImportError:
+    numpy = None  # type: ignore[assignment]
+
+if os.getenv("FORCE_STDLIB_ONLY"):
+    numpy = None  # type: ignore[assignment]
+
+# Columns returned by decode_batch, in the order they are read
+BATCH_FIELDS = ("pitch", "yaw", "roll", "x", "y", "z", "scale_x", "hp")
+ROTATOR_SCALE = 360.0 / 65536.0
+# decode_bytes reads the location with packed_vector(1)
+LOCATION_SCALE_FACTOR = 1
+
+unpack_u16 = struct.Struct("<H").unpack_from
+unpack_u32 = struct.Struct("<I").unpack_from
+unpack_float_i32 = struct.Struct("<fi").unpack_from
+unpack_vector_float = struct.Struct("<3f").unpack_from
+unpack_vector_double = struct.Struct("<3d").unpack_from
 
 
 def decode(
@@ -14,6 +37,7 @@ def decode(
     return value
 
 
+@memoize_blob
 def decode_bytes(
     parent_reader: FArchiveReader, b_bytes: Sequence[int]
 ) -> dict[str, Any]:
@@ -42,6 +66,157 @@ def decode_bytes(
     return data
 
 
+def decode_batch(
+    parent_reader: FArchiveReader,
+    blobs: Sequence[Sequence[int]],
+    use_numpy: Optional[bool] = None,
+) -> dict[str, Any]:
+    """
+    Decodes the RawData of many foliage instances, such as all instances of a
+    grid cell, into one column per field instead of one dict per instance.
+    Returns model_instance_id as a list of UUIDs, the fields in BATCH_FIELDS
+    as lists, and unknown_data mapping the position of any instance with
+    trailing bytes to those bytes. Values are the same as decode_bytes.
+
+    With NumPy installed and use_numpy not False, the BATCH_FIELDS columns
+    are NumPy arrays (float64, and int32 for hp) decoded for all instances at
+    once; instances with an uncompressed location or trailing bytes are
+    decoded one at a time.
+    """
+    blobs = [bytes(b) for b in blobs]
+    if use_numpy is None:
+        use_numpy = numpy is not None
+    elif use_numpy and numpy is None:
+        raise Exception("NumPy is not installed")
+    if use_numpy and len(blobs) > 0:
+        return _decode_batch_numpy(parent_reader, blobs)
+    data: dict[str, Any] = {"model_instance_id": []}
+    for field in BATCH_FIELDS:
+        data[field] = []
+    data["unknown_data"] = {}
+    for i, b in enumerate(blobs):
+        _decode_batch_row(parent_reader, b, i, data)
+    return data
+
+
+def _decode_batch_row(
+    parent_reader: FArchiveReader, b: bytes, i: int, data: dict[str, Any]
+) -> None:
+    # Same reads as compressed_short_rotator, packed_vector and
+    # serializeint, with offsets into the blob instead of a reader
+    data["model_instance_id"].append(UUID(b[:16]))
+    offset = 16
+    for field in ("pitch", "yaw", "roll"):
+        short = 0
+        if b[offset] > 0:
+            (short,) = unpack_u16(b, offset + 1)
+            offset += 2
+        offset += 1
+        data[field].append(short * ROTATOR_SCALE)
+    (component_bit_count_and_extra_info,) = unpack_u32(b, offset)
+    offset += 4
+    component_bit_count = component_bit_count_and_extra_info & 63
+    extra_info = component_bit_count_and_extra_info >> 6
+    if component_bit_count > 0:
+        size = (component_bit_count + 7) // 8
+        mask = (1 << component_bit_count) - 1
+        sign_bit = 1 << (component_bit_count - 1)
+        for field in ("x", "y", "z"):
+            if offset + size > len(b):
+                raise Exception(f"Foliage instance {i} is truncated")
+            value = int.from_bytes(b[offset : offset + size], "little") & mask
+            value = (value & (sign_bit - 1)) - (value & sign_bit)
+            offset += size
+            data[field].append(value / LOCATION_SCALE_FACTOR if extra_info else value)
+    else:
+        if extra_info:
+            vector = unpack_vector_double(b, offset)
+            offset += 24
+        else:
+            vector = unpack_vector_float(b, offset)
+            offset += 12
+        for field, value in zip(("x", "y", "z"), vector):
+            data[field].append(_checked_float(parent_reader, value))
+    scale_x, hp = unpack_float_i32(b, offset)
+    offset += 8
+    data["scale_x"].append(_checked_float(parent_reader, scale_x))
+    data["hp"].append(hp)
+    if offset < len(b):
+        data["unknown_data"][i] = [int(c) for c in b[offset:]]
+
+
+def _checked_float(reader: FArchiveReader, value: float) -> Optional[float]:
+    if reader.allow_nan or value not in (math.inf, -math.inf):
+        return value
+    return None
+
+
+def _gather(rows: Any, offsets: Any, size: int) -> Any:
+    return rows[numpy.arange(len(rows))[:, None], offsets[:, None] + numpy.arange(size)]
+
+
+def _decode_batch_numpy(
+    parent_reader: FArchiveReader, blobs: list[bytes]
+) -> dict[str, Any]:
+    count = len(blobs)
+    lengths = numpy.fromiter((len(b) for b in blobs), dtype=numpy.int64, count=count)
+    # Pad every blob to the same length, with room for the widest reads past
+    # the end of a short blob, so every field is a gather from a 2D array
+    width = int(lengths.max()) + 64
+    rows = numpy.frombuffer(
+        b"".join(b.ljust(width, b"\0") for b in blobs), dtype=numpy.uint8
+    ).reshape(count, width)
+    data: dict[str, Any] = {
+        "model_instance_id": [UUID(b[:16]) for b in blobs],
+        "unknown_data": {},
+    }
+    offsets = numpy.full(count, 16, dtype=numpy.int64)
+    for field in ("pitch", "yaw", "roll"):
+        present = _gather(rows, offsets, 1)[:, 0] > 0
+        short = _gather(rows, offsets + 1, 2).copy().view("<u2")[:, 0]
+        data[field] = numpy.where(present, short, 0) * ROTATOR_SCALE
+        offsets += 1 + 2 * present
+    info = _gather(rows, offsets, 4).copy().view("<u4")[:, 0].astype(numpy.int64)
+    offsets += 4
+    component_bit_count = info & 63
+    packed = component_bit_count > 0
+    size = (component_bit_count + 7) // 8
+    bits = numpy.uint64(1) << component_bit_count.astype(numpy.uint64)
+    shifts = numpy.arange(8, dtype=numpy.uint64) * numpy.uint64(8)
+    for field in ("x", "y", "z"):
+        raw = _gather(rows, offsets, 8).astype(numpy.uint64)
+        raw[numpy.arange(8)[None, :] >= size[:, None]] = 0
+        value = numpy.bitwise_or.reduce(raw << shifts, axis=1)
+        value &= bits - numpy.uint64(1)
+        sign = numpy.where(packed, bits >> numpy.uint64(1), 0).astype(numpy.uint64)
+        data[field] = (value & (sign - numpy.uint64(1))).astype(numpy.int64) - (
+            value & sign
+        ).astype(numpy.int64)
+        data[field] = data[field].astype(numpy.float64)
+        offsets += size
+    scale_x = _gather(rows, offsets, 4).copy().view("<f4")[:, 0].astype(numpy.float64)
+    if not parent_reader.allow_nan:
+        # None in the stdlib path, which is NaN in a float column
+        scale_x = numpy.where(numpy.isinf(scale_x), math.nan, scale_x)
+    data["scale_x"] = scale_x
+    data["hp"] = _gather(rows, offsets + 4, 4).copy().view("<i4")[:, 0]
+    offsets += 8
+    # Uncompressed locations, trailing or missing bytes go through the
+    # per-instance path, which also raises for truncated instances
+    fallback = numpy.nonzero(~packed | (offsets != lengths))[0]
+    for i in fallback.tolist():
+        row: dict[str, Any] = {"model_instance_id": []}
+        for field in BATCH_FIELDS:
+            row[field] = []
+        row["unknown_data"] = {}
+        _decode_batch_row(parent_reader, blobs[i], i, row)
+        for field in BATCH_FIELDS:
+            value = row[field][0]
+            data[field][i] = math.nan if value is None else value
+        data["unknown_data"].update(row["unknown_data"])
+    return data
+
+
 def encode(
     writer: FArchiveWriter, property_type: str, properties: dict[str, Any]
 ) -> int:
@@ -1,22 +1,72 @@
 from typing import Sequence
 
 from palworld_save_tools.archive import *
+from palworld_save_tools.blob_memo import memoize_blob
+from palworld_save_tools.rawdata.schema import ByteList, Param, Schema, TArray, When
 
+PLAYER_INFO = [
+    ("player_uid", "guid"),
+    (
+        "player_info",
+        [("last_online_real_time", "i64"), ("player_name", "fstring")],
+    ),
+]
 
-def player_info_reader(reader: FArchiveReader) -> dict[str, Any]:
-    return {
-        "player_uid": reader.guid(),
-        "player_info": {
-            "last_online_real_time": reader.i64(),
-            "player_name": reader.fstring(),
-        },
-    }
-
-
-def player_info_writer(writer: FArchiveWriter, p: dict[str, Any]) -> None:
-    writer.guid(p["player_uid"])
-    writer.i64(p["player_info"]["last_online_real_time"])
-    writer.fstring(p["player_info"]["player_name"])
+GROUP = Schema(
+    "group",
+    [
+        ("group_type", Param()),
+        ("group_id", "guid"),
+        ("group_name", "fstring"),
+        (
+            "individual_character_handle_ids",
+            TArray([("guid", "guid"), ("instance_id", "guid")]),
+        ),
+        When(
+            "group_type",
+            [
+                "EPalGroupType::Guild",
+                "EPalGroupType::IndependentGuild",
+                "EPalGroupType::Organization",
+            ],
+            [("org_type", "byte")],
+        ),
+        When(
+            "group_type",
+            "EPalGroupType::Organization",
+            [("trailing_bytes", ByteList(12))],
+        ),
+        When(
+            "group_type",
+            "EPalGroupType::Guild",
+            [
+                ("leading_bytes", ByteList(4)),
+                ("base_ids", TArray("guid")),
+                ("unknown_1", "i32"),
+                ("base_camp_level", "i32"),
+                ("map_object_instance_ids_base_camp_points", TArray("guid")),
+                ("guild_name", "fstring"),
+                ("last_guild_name_modifier_player_uid", "guid"),
+                ("unknown_2", ByteList(20)),
+                ("players", TArray(PLAYER_INFO)),
+                ("trailing_bytes", ByteList(4)),
+            ],
+        ),
+        When(
+            "group_type",
+            "EPalGroupType::IndependentGuild",
+            [
+                ("base_camp_level", "i32"),
+                ("map_object_instance_ids_base_camp_points", TArray("guid")),
+                ("guild_name", "fstring"),
+            ]
+            + PLAYER_INFO[:1]
+            + [("guild_name_2", "fstring")]
+            + PLAYER_INFO[1:],
+        ),
+    ],
+    params=["group_type"],
+)
 
 
 def decode(
@@ -36,55 +86,12 @@ def decode(
     return value
 
 
+@memoize_blob
 def decode_bytes(
     parent_reader: FArchiveReader, group_bytes: Sequence[int], group_type: str
 ) -> dict[str, Any]:
     reader = parent_reader.internal_copy(bytes(group_bytes), debug=False)
-    group_data = {
-        "group_type": group_type,
-        "group_id": reader.guid(),
-        "group_name": reader.fstring(),
-        "individual_character_handle_ids": reader.tarray(instance_id_reader),
-    }
-    if group_type in [
-        "EPalGroupType::Guild",
-        "EPalGroupType::IndependentGuild",
-        "EPalGroupType::Organization",
-    ]:
-        group_data |= {"org_type": reader.byte()}
-    if group_type == "EPalGroupType::Organization":
-        group_data |= {"trailing_bytes": reader.byte_list(12)}
-
-    if group_type == "EPalGroupType::Guild":
-        guild: dict[str, Any] = {
-            "leading_bytes": reader.byte_list(4),
-            "base_ids": reader.tarray(uuid_reader),
-            "unknown_1": reader.i32(),
-            "base_camp_level": reader.i32(),
-            "map_object_instance_ids_base_camp_points": reader.tarray(uuid_reader),
-            "guild_name": reader.fstring(),
-            "last_guild_name_modifier_player_uid": reader.guid(),
-            "unknown_2": reader.byte_list(20),
-            "players": reader.tarray(player_info_reader),
-            "trailing_bytes": reader.byte_list(4),
-        }
-        group_data |= guild
-    if group_type == "EPalGroupType::IndependentGuild":
-        guild: dict[str, Any] = {
-            "base_camp_level": reader.i32(),
-            "map_object_instance_ids_base_camp_points": reader.tarray(uuid_reader),
-            "guild_name": reader.fstring(),
-        }
-        group_data |= guild
-        indie = {
-            "player_uid": reader.guid(),
-            "guild_name_2": reader.fstring(),
-            "player_info": {
-                "last_online_real_time": reader.i64(),
-                "player_name": reader.fstring(),
-            },
-        }
-        group_data |= indie
+    group_data = GROUP.read(reader, group_type)
     if not reader.eof():
         raise Exception("Warning: EOF not reached")
     return group_data
@@ -108,32 +115,6 @@ def encode(
 
 def encode_bytes(p: dict[str, Any]) -> bytes:
     writer = FArchiveWriter()
-    writer.guid(p["group_id"])
-    writer.fstring(p["group_name"])
-    writer.tarray(instance_id_writer, p["individual_character_handle_ids"])
-    if p["group_type"] in [
-        "EPalGroupType::Guild",
-        "EPalGroupType::IndependentGuild",
-        "EPalGroupType::Organization",
-    ]:
-        writer.byte(p["org_type"])
-    if p["group_type"] == "EPalGroupType::Organization":
-        writer.write(bytes(p["trailing_bytes"]))
-    if p["group_type"] == "EPalGroupType::IndependentGuild":
-        writer.guid(p["player_uid"])
-        writer.fstring(p["guild_name_2"])
-        writer.i64(p["player_info"]["last_online_real_time"])
-        writer.fstring(p["player_info"]["player_name"])
-    if p["group_type"] == "EPalGroupType::Guild":
-        writer.write(bytes(p["leading_bytes"]))
-        writer.tarray(uuid_writer, p["base_ids"])
-        writer.i32(p["unknown_1"])
-        writer.i32(p["base_camp_level"])
-        writer.tarray(uuid_writer, p["map_object_instance_ids_base_camp_points"])
-        writer.fstring(p["guild_name"])
-        writer.guid(p["last_guild_name_modifier_player_uid"])
-        writer.write(bytes(p["unknown_2"]))
-        writer.tarray(player_info_writer, p["players"])
-        writer.write(bytes(p["trailing_bytes"]))
+    GROUP.write(writer, p, p["group_type"])
     encoded_bytes = writer.bytes()
     return encoded_bytes
@@ -1,5 +1,6 @@
 from typing import Any, Optional, Sequence
 from palworld_save_tools.archive import FArchiveReader, FArchiveWriter
+from palworld_save_tools.blob_memo import memoize_blob
 
 # decode函数用于解码一个ArrayProperty类型的属性
 # 它接受一个FArchiveReader对象、属性类型名称、属性大小以及属性路径作为参数
@@ -24,6 +25,7 @@ def decode(
     return value
 
 # decode_bytes函数用于解码一个字节序列，并返回一个包含解码后数据的字典
+@memoize_blob
 def decode_bytes(
     parent_reader: FArchiveReader, m_bytes: Sequence[int]
 ) -> dict[str, Any]:
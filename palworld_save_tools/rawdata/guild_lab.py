@@ -1,5 +1,6 @@
 from typing import Any, Optional, Sequence
 from palworld_save_tools.archive import FArchiveReader, FArchiveWriter
+from palworld_save_tools.blob_memo import memoize_blob
 from palworld_save_tools.rawdata.common import (
     lab_research_rep_info_read,  # 用于读取实验室研究报告信息的函数
     lab_research_rep_info_writer,  # 用于写入实验室研究报告信息的函数
@@ -32,6 +33,7 @@ def decode(
 # decode_bytes函数用于解码一个字节序列，该字节序列包含实验室研究报告的信息
 # 它接受一个FArchiveReader对象和一个字节序列作为参数
 # 并返回一个包含解码后实验室研究报告信息的字典
+@memoize_blob
 def decode_bytes(
     parent_reader: FArchiveReader, m_bytes: Sequence[int]
 ) -> dict[str, Any]:
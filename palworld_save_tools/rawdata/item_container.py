@@ -1,6 +1,7 @@
 from typing import Any, Sequence
 
 from palworld_save_tools.archive import *
+from palworld_save_tools.blob_memo import memoize_blob
 
 
 def decode(
@@ -14,6 +15,7 @@ def decode(
     return value
 
 
+@memoize_blob
 def decode_bytes(
     parent_reader: FArchiveReader, c_bytes: Sequence[int]
 ) -> Optional[dict[str, Any]]:
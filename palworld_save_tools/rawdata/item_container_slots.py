@@ -1,6 +1,30 @@
 from typing import Any, Sequence
 
 from palworld_save_tools.archive import *
+from palworld_save_tools.blob_memo import memoize_blob
+from palworld_save_tools.rawdata.schema import Rest, Schema
+
+ITEM_CONTAINER_SLOT = Schema(
+    "item_container_slots",
+    [
+        ("slot_index", "i32"),
+        ("count", "i32"),
+        (
+            "item",
+            [
+                ("static_id", "fstring"),
+                (
+                    "dynamic_id",
+                    [
+                        ("created_world_id", "guid"),
+                        ("local_id_in_created_world", "guid"),
+                    ],
+                ),
+            ],
+        ),
+        ("trailing_bytes", Rest()),
+    ],
+)
 
 
 def decode(
@@ -14,25 +38,14 @@ def decode(
     return value
 
 
+@memoize_blob
 def decode_bytes(
     parent_reader: FArchiveReader, c_bytes: Sequence[int]
 ) -> Optional[dict[str, Any]]:
     if len(c_bytes) == 0:
         return None
     reader = parent_reader.internal_copy(bytes(c_bytes), debug=False)
-    data = {
-        "slot_index": reader.i32(),
-        "count": reader.i32(),
-        "item": {
-            "static_id": reader.fstring(),
-            "dynamic_id": {
-                "created_world_id": reader.guid(),
-                "local_id_in_created_world": reader.guid(),
-            },
-        },
-        "trailing_bytes": [int(b) for b in reader.read_to_end()],
-    }
-    return data
+    return ITEM_CONTAINER_SLOT.read(reader)
 
 
 def encode(
@@ -50,20 +63,6 @@ def encode_bytes(p: dict[str, Any]) -> bytes:
     if p is None:
         return bytes()
     writer = FArchiveWriter()
-    # 从输入字典中读取槽位索引（slot_index），并使用writer对象的i32方法将其编码为字节序列
-    writer.i32(p["slot_index"])
-    
-    # 从输入字典中读取数量（count），并使用writer对象的i32方法将其编码为字节序列
-    writer.i32(p["count"])
-    
-    # 从输入字典中读取物品的静态ID（static_id），并使用writer对象的fstring方法将其编码为字节序列
-    writer.fstring(p["item"]["static_id"])
-    
-    # 从输入字典中读取创建世界的ID（created_world_id），并使用writer对象的guid方法将其编码为字节序列
-    writer.guid(p["item"]["dynamic_id"]["created_world_id"])
-    
-    # 从输入字典中读取在创建世界中的本地ID（local_id_in_created_world），并使用writer对象的guid方法将其编码为字节序列
-    writer.guid(p["item"]["dynamic_id"]["local_id_in_created_world"])
-    writer.write(bytes(p["trailing_bytes"]))
+    ITEM_CONTAINER_SLOT.write(writer, p)
     encoded_bytes = writer.bytes()
     return encoded_bytes
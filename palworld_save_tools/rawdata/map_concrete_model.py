@@ -1,7 +1,9 @@
 import json
+import logging
 from typing import Any, Sequence
 
 from palworld_save_tools.archive import *
+from palworld_save_tools.blob_memo import memoize_blob
 from palworld_save_tools.json_tools import CustomEncoder
 from palworld_save_tools.rawdata.common import (
     pal_item_and_num_read,
@@ -10,6 +12,8 @@ from palworld_save_tools.rawdata.common import (
     pal_item_booth_trade_info_writer,
 )
 
+logger = logging.getLogger(__name__)
+
 
 def pal_instance_id_reader(reader: FArchiveReader) -> dict[str, Any]:
     return {
@@ -391,6 +395,7 @@ MAP_OBJECT_NAME_TO_CONCRETE_MODEL_CLASS: dict[str, str] = {
 }
 
 
+@memoize_blob
 def decode_bytes(
     parent_reader: FArchiveReader, m_bytes: Sequence[int], object_id: str
 ) -> Optional[dict[str, Any]]:
@@ -400,7 +405,7 @@ def decode_bytes(
     data: dict[str, Any] = {}
 
     if object_id.lower() not in MAP_OBJECT_NAME_TO_CONCRETE_MODEL_CLASS:
-        print(f"Warning: Map object '{object_id}' not in database, skipping")
+        logger.warning("Map object '%s' not in database, skipping", object_id)
         return {"values": m_bytes}
 
     # Base handling
@@ -576,8 +581,9 @@ def decode_bytes(
         ):
             data["trailing_bytes"] = reader.byte_list(4)
         case _:
-            print(
-                f"Warning: Unknown map object concrete model {map_object_concrete_model}, skipping"
+            logger.warning(
+                "Unknown map object concrete model %s, skipping",
+                map_object_concrete_model,
             )
             return {"values": m_bytes}
 
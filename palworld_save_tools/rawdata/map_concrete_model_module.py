@@ -2,6 +2,7 @@ import json
 from typing import Any, Sequence
 
 from palworld_save_tools.archive import *
+from palworld_save_tools.blob_memo import memoize_blob
 from palworld_save_tools.json_tools import CustomEncoder
 
 # EPalMapObjectConcreteModelModuleType::None = 0,
@@ -32,6 +33,7 @@ def player_lock_info_reader(reader: FArchiveReader) -> dict[str, Any]:
     }
 
 
+@memoize_blob
 def decode_bytes(
     parent_reader: FArchiveReader, m_bytes: Sequence[int], module_type: str
 ) -> Optional[dict[str, Any]]:
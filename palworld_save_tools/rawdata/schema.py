@@ -0,0 +1,490 @@
+from typing import Any, Callable, Optional, Sequence, Union
+
+from palworld_save_tools.archive import (
+    UUID,
+    FixedLayout,
+    uuid_bytes,
+    uuid_reader,
+    uuid_writer,
+)
+
+
+class Kind:
+    """
+    A field read and written by one reader and writer call, such as a Guid.
+    Kinds with a struct format are fixed size, runs of them are read with one
+    FixedLayout read, converting each unpacked value with decode and encode.
+    Bytes kinds that are exact raise in such a run when the data is short,
+    others take what is left as reader.guid does.
+    """
+
+    __slots__ = ("name", "format", "read", "write", "decode", "encode", "exact")
+    name: str
+    format: Optional[str]
+    read: str
+    write: str
+    decode: str
+    encode: str
+    exact: bool
+
+    def __init__(
+        self,
+        name: str,
+        format: Optional[str],
+        read: str,
+        write: str,
+        decode: str = "{}",
+        encode: str = "{}",
+        exact: bool = False,
+    ) -> None:
+        self.name = name
+        self.format = format
+        self.read = read
+        self.write = write
+        self.decode = decode
+        self.encode = encode
+        self.exact = exact
+
+    def __repr__(self) -> str:
+        return f"Kind({self.name!r})"
+
+
+KINDS = {
+    kind.name: kind
+    for kind in [
+        Kind("byte", "B", "reader.byte()", "writer.byte({})"),
+        Kind("bool", "B", "reader.bool()", "writer.bool({})", "{} > 0", "bool({})"),
+        Kind("i16", "h", "reader.i16()", "writer.i16({})"),
+        Kind("u16", "H", "reader.u16()", "writer.u16({})"),
+        Kind("i32", "i", "reader.i32()", "writer.i32({})"),
+        Kind("u32", "I", "reader.u32()", "writer.u32({})"),
+        Kind("i64", "q", "reader.i64()", "writer.i64({})"),
+        Kind("u64", "Q", "reader.u64()", "writer.u64({})"),
+        Kind("float", "f", "reader.float()", "writer.float({})"),
+        Kind("double", "d", "reader.double()", "writer.double({})"),
+        # u32 flags, read as booleans
+        Kind(
+            "bool32",
+            "I",
+            "reader.u32() > 0",
+            "writer.u32(1 if {} else 0)",
+            "{} > 0",
+            "1 if {} else 0",
+        ),
+        Kind(
+            "guid",
+            "16s",
+            "reader.guid()",
+            "writer.guid({})",
+            "UUID({})",
+            "uuid_bytes({})",
+        ),
+        Kind(
+            "optional_guid", None, "reader.optional_guid()", "writer.optional_guid({})"
+        ),
+        Kind("fstring", None, "reader.fstring()", "writer.fstring({})"),
+    ]
+}
+
+
+def ByteList(size: int) -> Kind:
+    """size bytes, read as a tuple of ints as reader.byte_list does"""
+    return Kind(
+        f"byte_list({size})",
+        f"{size}s",
+        f"reader.byte_list({size})",
+        "writer.write(bytes({}))",
+        "tuple({})",
+        "bytes({})",
+        exact=True,
+    )
+
+
+class TArray:
+    """A u32 count followed by that many items, each a kind or a record"""
+
+    __slots__ = ("item",)
+    item: Any
+
+    def __init__(self, item: Any) -> None:
+        self.item = item
+
+
+class Rest:
+    """
+    The bytes up to the end of the data, as a list of ints. If optional, the
+    field is left out when there are none, and only written when present.
+    """
+
+    __slots__ = ("optional",)
+    optional: bool
+
+    def __init__(self, optional: bool = False) -> None:
+        self.optional = optional
+
+
+class Param:
+    """
+    Stores the schema parameter of the same name, such as group_type, in the
+    record. Nothing is read or written for it.
+    """
+
+    __slots__ = ()
+
+
+class When:
+    """Fields only present when a schema parameter has one of values"""
+
+    __slots__ = ("param", "values", "fields")
+    param: str
+    values: frozenset[str]
+    fields: list[Any]
+
+    def __init__(
+        self, param: str, values: Union[str, Sequence[str]], fields: list[Any]
+    ) -> None:
+        self.param = param
+        self.values = frozenset([values] if isinstance(values, str) else values)
+        self.fields = fields
+
+
+VECTOR = [("x", "double"), ("y", "double"), ("z", "double")]
+QUAT = [("x", "double"), ("y", "double"), ("z", "double"), ("w", "double")]
+FTRANSFORM = [("rotation", QUAT), ("translation", VECTOR), ("scale3d", VECTOR)]
+
+
+class Schema:
+    """
+    A declared rawdata record, compiled once into a decode function that reads
+    it from an FArchiveReader into a dict and an encode function that writes
+    such a dict back, as the hand-written decode_bytes and encode_bytes
+    functions of the rawdata modules do.
+
+    Fields are (key, spec) pairs or When entries. A spec is the name of a
+    kind in KINDS, a Kind such as ByteList(4), a list of fields for a nested
+    dict, a TArray, Rest or Param. Parameters, such as the group_type of
+    groups, are passed to read and write after the reader or writer and can
+    be tested with When.
+
+    Each schema is generated as Python source, kept in .source, with the
+    fixed size fields in a row read and written in one FixedLayout call, so
+    reading a map object model is one unpack.
+    """
+
+    name: str
+    fields: list[Any]
+    params: tuple[str, ...]
+    source: str
+    read: Callable[..., dict[str, Any]]
+    write: Callable[..., None]
+
+    def __init__(
+        self, name: str, fields: list[Any], params: Sequence[str] = ()
+    ) -> None:
+        self.name = name
+        self.fields = fields
+        self.params = tuple(params)
+        generator = SchemaGenerator(name, self.params)
+        generator.record("read", "write", fields, self.params)
+        self.source = "\n".join(generator.lines) + "\n"
+        namespace = generator.namespace
+        exec(compile(self.source, f"<schema {name}>", "exec"), namespace)
+        self.read = namespace["read"]
+        self.write = namespace["write"]
+
+
+def resolve(spec: Any) -> Any:
+    if isinstance(spec, str):
+        if spec not in KINDS:
+            raise Exception(f"Unknown field kind: {spec}")
+        return KINDS[spec]
+    return spec
+
+
+class SchemaGenerator:
+    """Generates the source of the functions of a Schema"""
+
+    name: str
+    params: tuple[str, ...]
+    lines: list[str]
+    namespace: dict[str, Any]
+    counter: int
+    # Reader and writer names of the TArray items generated so far, by id
+    items: dict[int, tuple[str, str]]
+
+    def __init__(self, name: str, params: tuple[str, ...]) -> None:
+        self.name = name
+        self.params = params
+        self.lines = []
+        self.namespace = {
+            "UUID": UUID,
+            "uuid_bytes": uuid_bytes,
+            "uuid_reader": uuid_reader,
+            "uuid_writer": uuid_writer,
+        }
+        self.counter = 0
+        self.items = {}
+
+    def unique(self, prefix: str) -> str:
+        self.counter += 1
+        return f"_{prefix}{self.counter}"
+
+    def constant(self, prefix: str, value: Any) -> str:
+        name = self.unique(prefix)
+        self.namespace[name] = value
+        return name
+
+    def record(
+        self,
+        read_name: str,
+        write_name: str,
+        fields: list[Any],
+        params: tuple[str, ...],
+    ) -> None:
+        """Generates read_name(reader, *params) and write_name(writer, p, *params)"""
+        args = "".join(f", {param}" for param in params)
+        read_lines = ["    " + line for line in self.read_block(fields, params)]
+        write_lines = ["    " + line for line in self.write_block(fields, params)]
+        self.lines.append(f"def {read_name}(reader{args}):")
+        self.lines.extend(read_lines)
+        self.lines.append("    return data")
+        self.lines.append("")
+        self.lines.append(f"def {write_name}(writer, p{args}):")
+        self.lines.extend(write_lines or ["    pass"])
+        self.lines.append("")
+
+    def item_functions(self, item: Any) -> tuple[str, str]:
+        """Returns the names of the reader and writer of a TArray item"""
+        if id(item) not in self.items:
+            self.items[id(item)] = self.generate_item(resolve(item))
+        return self.items[id(item)]
+
+    def generate_item(self, item: Any) -> tuple[str, str]:
+        if isinstance(item, Kind):
+            if item.name == "guid":
+                return "uuid_reader", "uuid_writer"
+            read_name = self.unique("read_item")
+            write_name = self.unique("write_item")
+            self.lines.append(f"def {read_name}(reader):")
+            self.lines.append(f"    return {item.read}")
+            self.lines.append("")
+            self.lines.append(f"def {write_name}(writer, value):")
+            self.lines.append(f"    {item.write.format('value')}")
+            self.lines.append("")
+            return read_name, write_name
+        if isinstance(item, list):
+            read_name = self.unique("read_item")
+            write_name = self.unique("write_item")
+            self.record(read_name, write_name, item, ())
+            return read_name, write_name
+        raise Exception(f"Unsupported TArray item in schema {self.name}: {item!r}")
+
+    def leaves(
+        self, fields: list[Any], path: tuple[str, ...]
+    ) -> list[tuple[tuple[str, ...], Any]]:
+        """Flattens nested dicts into the fields they hold, in order"""
+        leaves = []
+        for entry in fields:
+            if isinstance(entry, When):
+                raise Exception(
+                    f"When is only supported at the top of schema {self.name}"
+                )
+            key, spec = entry
+            spec = resolve(spec)
+            if isinstance(spec, list):
+                leaves.extend(self.leaves(spec, path + (key,)))
+            else:
+                leaves.append((path + (key,), spec))
+        return leaves
+
+    def layout(self, run: list[tuple[tuple[str, ...], Any]]) -> FixedLayout:
+        # Byte lists raise on short data, as reader.byte_list does
+        exact = [".".join(path) for path, spec in run if spec.exact]
+        return FixedLayout([(".".join(path), spec.format) for path, spec in run], exact)
+
+    def runs(
+        self, leaves: list[tuple[tuple[str, ...], Any]], split_guids: bool = False
+    ) -> list[list[tuple[tuple[str, ...], Any]]]:
+        """Splits leaves into runs of fixed size kinds and single fields"""
+
+        def fixed(spec: Any) -> bool:
+            return (
+                isinstance(spec, Kind)
+                and spec.format is not None
+                and not (split_guids and spec.name == "guid")
+            )
+
+        runs: list[list[tuple[tuple[str, ...], Any]]] = []
+        for leaf in leaves:
+            if fixed(leaf[1]) and runs and fixed(runs[-1][-1][1]):
+                runs[-1].append(leaf)
+            else:
+                runs.append([leaf])
+        return runs
+
+    def check_param(self, param: str, params: tuple[str, ...]) -> None:
+        if param not in params:
+            raise Exception(f"Unknown parameter {param} in schema {self.name}")
+
+    def read_block(
+        self, fields: list[Any], params: tuple[str, ...], created: bool = False
+    ) -> list[str]:
+        """Returns the statements reading fields into data, creating it if not created"""
+        lines: list[str] = []
+        pending: list[Any] = []
+
+        def flush() -> None:
+            nonlocal created
+            if not pending:
+                return
+            values = self.read_fields(pending, params, lines)
+            if not created:
+                lines.append(f"data = {render(values)}")
+                created = True
+            else:
+                for key, value in values.items():
+                    lines.append(f"data[{key!r}] = {render(value)}")
+            pending.clear()
+
+        for entry in fields:
+            if isinstance(entry, When) or (
+                isinstance(entry, tuple)
+                and isinstance(entry[1], Rest)
+                and entry[1].optional
+            ):
+                flush()
+                if not created:
+                    lines.append("data = {}")
+                    created = True
+                if isinstance(entry, When):
+                    self.check_param(entry.param, params)
+                    values = self.constant("values", entry.values)
+                    lines.append(f"if {entry.param} in {values}:")
+                    block = self.read_block(entry.fields, params, created=True)
+                    lines.extend("    " + line for line in block or ["pass"])
+                else:
+                    lines.append("if not reader.eof():")
+                    lines.append(
+                        f"    data[{entry[0]!r}] = "
+                        "[int(b) for b in reader.read_to_end()]"
+                    )
+            else:
+                pending.append(entry)
+        flush()
+        if not created:
+            lines.append("data = {}")
+        return lines
+
+    def read_fields(
+        self, fields: list[Any], params: tuple[str, ...], lines: list[str]
+    ) -> dict[str, Any]:
+        """
+        Appends the statements reading fields to lines and returns the nested
+        dict of the expressions of their values
+        """
+        values: dict[str, Any] = {}
+        for run in self.runs(self.leaves(fields, ())):
+            names = []
+            for path, spec in run:
+                name = self.unique("v")
+                names.append(name)
+                target = values
+                for key in path[:-1]:
+                    target = target.setdefault(key, {})
+                if len(run) > 1:
+                    target[path[-1]] = spec.decode.format(name)
+                    continue
+                target[path[-1]] = name
+                if isinstance(spec, Kind):
+                    lines.append(f"{name} = {spec.read}")
+                elif isinstance(spec, TArray):
+                    read_item, _ = self.item_functions(spec.item)
+                    lines.append(f"{name} = reader.tarray({read_item})")
+                elif isinstance(spec, Rest):
+                    lines.append(f"{name} = [int(b) for b in reader.read_to_end()]")
+                elif isinstance(spec, Param):
+                    self.check_param(path[-1], params)
+                    target[path[-1]] = path[-1]
+                else:
+                    raise Exception(
+                        f"Unsupported field {path[-1]} in schema {self.name}: {spec!r}"
+                    )
+            if len(run) > 1:
+                layout = self.layout(run)
+                if layout.has_floats:
+                    # reader.fixed applies allow_nan
+                    name = self.constant("layout", layout)
+                    lines.append(f"{', '.join(names)} = reader.fixed({name})")
+                else:
+                    name = self.constant("layout", layout)
+                    unpack = self.constant("unpack", layout.unpack)
+                    data = self.unique("data")
+                    lines.append(f"{data} = reader.data.read({layout.size})")
+                    lines.append(
+                        f"{', '.join(names)} = {unpack}({data}) "
+                        f"if len({data}) == {layout.size} "
+                        f"else {name}.unpack_short({data})"
+                    )
+        return values
+
+    def write_block(self, fields: list[Any], params: tuple[str, ...]) -> list[str]:
+        lines: list[str] = []
+        pending: list[Any] = []
+        for entry in fields:
+            if isinstance(entry, When) or (
+                isinstance(entry, tuple)
+                and isinstance(entry[1], Rest)
+                and entry[1].optional
+            ):
+                self.write_fields(pending, lines)
+                pending.clear()
+                if isinstance(entry, When):
+                    self.check_param(entry.param, params)
+                    values = self.constant("values", entry.values)
+                    lines.append(f"if {entry.param} in {values}:")
+                    block = self.write_block(entry.fields, params)
+                    lines.extend("    " + line for line in block or ["pass"])
+                else:
+                    lines.append(f"if {entry[0]!r} in p:")
+                    lines.append(f"    writer.write(bytes(p[{entry[0]!r}]))")
+            else:
+                pending.append(entry)
+        self.write_fields(pending, lines)
+        return lines
+
+    def write_fields(self, fields: list[Any], lines: list[str]) -> None:
+        # Guids are written on their own, as ones read short from drifted data
+        # are written back as short as they were
+        for run in self.runs(self.leaves(fields, ()), split_guids=True):
+            if len(run) > 1:
+                layout = self.layout(run)
+                values = ", ".join(
+                    spec.encode.format(access(path)) for path, spec in run
+                )
+                if layout.has_floats:
+                    # writer.fixed writes None as NaN
+                    name = self.constant("layout", layout)
+                    lines.append(f"writer.fixed({name}, ({values}))")
+                else:
+                    pack = self.constant("pack", layout.pack)
+                    lines.append(f"writer.data.write({pack}({values}))")
+                continue
+            path, spec = run[0]
+            if isinstance(spec, Kind):
+                lines.append(spec.write.format(access(path)))
+            elif isinstance(spec, TArray):
+                _, write_item = self.item_functions(spec.item)
+                lines.append(f"writer.tarray({write_item}, {access(path)})")
+            elif isinstance(spec, Rest):
+                lines.append(f"writer.write(bytes({access(path)}))")
+
+
+def access(path: tuple[str, ...]) -> str:
+    return "p" + "".join(f"[{key!r}]" for key in path)
+
+
+def render(value: Any) -> str:
+    if isinstance(value, dict):
+        items = ", ".join(f"{key!r}: {render(item)}" for key, item in value.items())
+        return "{" + items + "}"
+    return value
@@ -1,6 +1,10 @@
+import logging
 from typing import Any, Sequence
 
 from palworld_save_tools.archive import *
+from palworld_save_tools.blob_memo import memoize_blob
+
+logger = logging.getLogger(__name__)
 
 WORK_BASE_TYPES = set(
     [
@@ -23,6 +27,20 @@ WORK_BASE_TYPES = set(
     ]
 )
 
+WORKABLE_BOUNDS_LAYOUT = FixedLayout(
+    [(f"location.{name}", code) for name, code in VECTOR_LAYOUT.fields]
+    + [(f"rotation.{name}", code) for name, code in QUAT_LAYOUT.fields]
+    + [
+        (f"box_sphere_bounds.origin.{name}", code)
+        for name, code in VECTOR_LAYOUT.fields
+    ]
+    + [
+        (f"box_sphere_bounds.box_extent.{name}", code)
+        for name, code in VECTOR_LAYOUT.fields
+    ]
+    + [("box_sphere_bounds.sphere_radius", "d")]
+)
+
 
 def decode(
     reader: FArchiveReader, type_name: str, size: int, path: str
@@ -42,6 +60,7 @@ def decode(
     return value
 
 
+@memoize_blob
 def decode_bytes(
     parent_reader: FArchiveReader, b_bytes: Sequence[int], work_type: str
 ) -> dict[str, Any]:
@@ -50,13 +69,16 @@ def decode_bytes(
     # Handle base serialization
     if work_type in WORK_BASE_TYPES:
         data["id"] = reader.guid()
+        lx, ly, lz, rx, ry, rz, rw, ox, oy, oz, ex, ey, ez, radius = reader.fixed(
+            WORKABLE_BOUNDS_LAYOUT
+        )
         data["workable_bounds"] = {
-            "location": reader.vector_dict(),
-            "rotation": reader.quat_dict(),
+            "location": {"x": lx, "y": ly, "z": lz},
+            "rotation": {"x": rx, "y": ry, "z": rz, "w": rw},
             "box_sphere_bounds": {
-                "origin": reader.vector_dict(),
-                "box_extent": reader.vector_dict(),
-                "sphere_radius": reader.double(),
+                "origin": {"x": ox, "y": oy, "z": oz},
+                "box_extent": {"x": ex, "y": ey, "z": ez},
+                "sphere_radius": radius,
             },
         }
         data["base_camp_id_belong_to"] = reader.guid()
@@ -119,7 +141,7 @@ def decode_bytes(
             data["target_map_object_model_id"] = reader.guid()
 
     if len(data.keys()) == 0:
-        print(f"Warning, unable to parse {work_type}, falling back to raw bytes")
+        logger.warning("Unable to parse %s, falling back to raw bytes", work_type)
         return {"values": b_bytes}
     # UPalWorkProgressTransformBase->SerializeProperties
     transform_type = reader.byte()
@@ -195,11 +217,29 @@ def encode_bytes(p: dict[str, Any], work_type: str) -> bytes:
     # Handle base serialization
     if work_type in WORK_BASE_TYPES:
         writer.guid(p["id"])
-        writer.vector_dict(p["workable_bounds"]["location"])
-        writer.quat_dict(p["workable_bounds"]["rotation"])
-        writer.vector_dict(p["workable_bounds"]["box_sphere_bounds"]["origin"])
-        writer.vector_dict(p["workable_bounds"]["box_sphere_bounds"]["box_extent"])
-        writer.double(p["workable_bounds"]["box_sphere_bounds"]["sphere_radius"])
+        location = p["workable_bounds"]["location"]
+        rotation = p["workable_bounds"]["rotation"]
+        origin = p["workable_bounds"]["box_sphere_bounds"]["origin"]
+        box_extent = p["workable_bounds"]["box_sphere_bounds"]["box_extent"]
+        writer.fixed(
+            WORKABLE_BOUNDS_LAYOUT,
+            (
+                location["x"],
+                location["y"],
+                location["z"],
+                rotation["x"],
+                rotation["y"],
+                rotation["z"],
+                rotation["w"],
+                origin["x"],
+                origin["y"],
+                origin["z"],
+                box_extent["x"],
+                box_extent["y"],
+                box_extent["z"],
+                p["workable_bounds"]["box_sphere_bounds"]["sphere_radius"],
+            ),
+        )
         writer.guid(p["base_camp_id_belong_to"])
         writer.guid(p["owner_map_object_model_id"])
         writer.guid(p["owner_map_object_concrete_model_id"])
@@ -0,0 +1,416 @@
+import math
+import struct
+from collections import Counter
+from typing import Any, Callable, Iterable, Optional
+
+from palworld_save_tools.nodes import BoolNode, EnumValueNode, StructNode, ValueNode
+
+# Reads of a struct path observed before a reader is generated for it.
+# Generating a reader takes about as long as reading its struct 25 times, so
+# only paths read many more times than that are worth it.
+DEFAULT_THRESHOLD = 64
+
+# The (name, type, header) of each property of a struct, in order. The header
+# is the struct type of a StructProperty, the enum type of an EnumProperty or
+# ByteProperty and None for other types.
+Layout = tuple[tuple[str, str, Optional[str]], ...]
+
+# Properties read in full by specialized readers, with the format of their value
+VALUE_FORMATS = {
+    "IntProperty": "i",
+    "UInt16Property": "H",
+    "UInt32Property": "I",
+    "UInt64Property": "Q",
+    "Int64Property": "q",
+    "FixedPoint64Property": "i",
+    "FloatProperty": "f",
+}
+STRING_PROPERTIES = ("StrProperty", "NameProperty")
+# Struct types with a fixed size value, as (field names, format). Values
+# without field names are a single number or Guid.
+STRUCT_FORMATS: dict[str, tuple[Optional[tuple[str, ...]], str]] = {
+    "Vector": (("x", "y", "z"), "ddd"),
+    "Quat": (("x", "y", "z", "w"), "dddd"),
+    "LinearColor": (("r", "g", "b", "a"), "ffff"),
+    "DateTime": (None, "Q"),
+    "Guid": (None, "16s"),
+}
+NONE_TAG = b"\x05\x00\x00\x00None\x00"
+
+
+def property_layout(properties: dict[str, Any]) -> Layout:
+    """Returns the layout of the decoded properties of a struct"""
+    layout = []
+    for name, value in properties.items():
+        type_name = value["type"]
+        header = None
+        if "custom_type" not in value:
+            if type_name == "StructProperty":
+                header = value["struct_type"]
+            elif type_name in ("EnumProperty", "ByteProperty"):
+                header = value["value"]["type"]
+        layout.append((name, type_name, header))
+    return tuple(layout)
+
+
+def finite(value: Optional[float]) -> Optional[float]:
+    if value == math.inf or value == -math.inf:
+        return None
+    return value
+
+
+def render_tuple(names: list[str]) -> str:
+    return names[0] + "," if len(names) == 1 else ", ".join(names)
+
+
+def generic_reader(path: str) -> Callable[[Any], dict[str, Any]]:
+    def read(reader) -> dict[str, Any]:
+        return reader.remaining_properties(path, {})
+
+    return read
+
+
+class StructSpecializer:
+    """
+    Generates readers for the properties of structs at paths that are read
+    many times with the same layout, such as the SaveParameter of each
+    character, that read that exact sequence of properties without looking
+    up how to read each one.
+
+    Each generated reader compares the name, type and header of its
+    properties with the bytes read in one read per run of fixed size
+    properties, and falls back to the generic FArchiveReader path from the
+    first property that does not match, so structs with another layout are
+    read as usual. Arrays, maps, sets and custom properties are read by
+    FArchiveReader.property as usual.
+
+    Layouts can be given for paths up front, otherwise the first threshold
+    reads of a path are observed and a reader is generated for the most common
+    layout when at least half of them had it. Only paths in paths are observed,
+    all paths if None. Paths inside RawData blobs start again from the blob,
+    so the SaveParameter of a character is at .SaveParameter.
+
+    Pass a specializer to GvasFile.read. Like a BlobMemo, it should only be
+    shared between reads with the same custom properties and compact setting,
+    as generated readers return dicts or nodes like the reader they were
+    generated for. Readers that skip, profile or record properties for an
+    EncodeCache do not use it.
+    """
+
+    threshold: int
+    paths: Optional[set[str]]
+    layouts: dict[str, Layout]
+    readers: dict[str, Callable[[Any], dict[str, Any]]]
+    sources: dict[str, str]
+    observed: dict[str, Counter[Layout]]
+    fallbacks: Counter[str]
+
+    def __init__(
+        self,
+        layouts: dict[str, Layout] = {},
+        paths: Optional[Iterable[str]] = None,
+        threshold: int = DEFAULT_THRESHOLD,
+    ):
+        self.threshold = threshold
+        self.paths = set(paths) if paths is not None else None
+        self.layouts = dict(layouts)
+        self.readers = {}
+        self.sources = {}
+        self.observed = {}
+        self.fallbacks = Counter()
+
+    def read(self, reader, path: str) -> dict[str, Any]:
+        read = self.readers.get(path)
+        if read is None:
+            return self.observe(reader, path)
+        return read(reader)
+
+    def observe(self, reader, path: str) -> dict[str, Any]:
+        if path in self.layouts:
+            read = self.specialize(reader, path, self.layouts[path])
+            return read(reader)
+        properties = reader.remaining_properties(path, {})
+        if self.paths is not None and path not in self.paths:
+            self.readers[path] = generic_reader(path)
+            return properties
+        layouts = self.observed.setdefault(path, Counter())
+        layouts[property_layout(properties)] += 1
+        if sum(layouts.values()) >= self.threshold:
+            del self.observed[path]
+            layout, count = layouts.most_common(1)[0]
+            if count * 2 >= self.threshold:
+                self.layouts[path] = layout
+                self.specialize(reader, path, layout)
+            else:
+                self.readers[path] = generic_reader(path)
+        return properties
+
+    def specialize(
+        self, reader, path: str, layout: Layout
+    ) -> Callable[[Any], dict[str, Any]]:
+        """Generates, compiles and installs the reader of layout at path"""
+        generator = ReaderGenerator(
+            path, reader.custom_properties, self.fallback, reader.compact
+        )
+        source = generator.generate(layout)
+        namespace = generator.namespace
+        exec(compile(source, f"<specialized {path}>", "exec"), namespace)
+        self.sources[path] = source
+        self.readers[path] = namespace["read"]
+        return namespace["read"]
+
+    def fallback(self, reader, path: str, properties: dict[str, Any]):
+        self.fallbacks[path] += 1
+        return reader.remaining_properties(path, properties)
+
+    def specialized_paths(self) -> list[str]:
+        return sorted(self.sources)
+
+
+class ReaderGenerator:
+    """Generates the source of the reader of a StructSpecializer layout"""
+
+    path: str
+    custom_properties: dict[str, Any]
+    compact: bool
+    namespace: dict[str, Any]
+    lines: list[str]
+    counter: int
+    # The run of fixed size fields read next: struct formats, the names they
+    # are unpacked into, the constants they are compared with and the float
+    # names among them
+    formats: list[str]
+    names: list[str]
+    checked: list[tuple[str, Any]]
+    floats: list[str]
+    statements: list[str]
+
+    def __init__(
+        self,
+        path: str,
+        custom_properties: dict[str, Any],
+        fallback: Callable,
+        compact: bool = False,
+    ) -> None:
+        from palworld_save_tools.archive import UUID
+
+        self.path = path
+        self.custom_properties = custom_properties
+        self.compact = compact
+        self.namespace = {
+            "UUID": UUID,
+            "BoolNode": BoolNode,
+            "EnumValueNode": EnumValueNode,
+            "StructNode": StructNode,
+            "ValueNode": ValueNode,
+            "_finite": finite,
+            "_fallback": fallback,
+            "_path": path,
+        }
+        self.lines = []
+        self.counter = 0
+        self.formats = []
+        self.names = []
+        self.checked = []
+        self.floats = []
+        self.statements = []
+
+    def unique(self, prefix: str) -> str:
+        self.counter += 1
+        return f"_{prefix}{self.counter}"
+
+    def constant(self, prefix: str, value: Any) -> str:
+        name = self.unique(prefix)
+        self.namespace[name] = value
+        return name
+
+    def field(self, code: str) -> str:
+        name = self.unique("v")
+        self.formats.append(code)
+        self.names.append(name)
+        if code in ("f", "d"):
+            self.floats.append(name)
+        return name
+
+    def check(self, code: str, value: Any) -> None:
+        self.checked.append((self.field(code), value))
+
+    def fstring(self, value: str) -> None:
+        from palworld_save_tools.archive import FArchiveWriter
+
+        writer = FArchiveWriter()
+        writer.fstring(value)
+        data = writer.bytes()
+        if (
+            self.checked
+            and self.checked[-1][0] == self.names[-1]
+            and isinstance(self.checked[-1][1], bytes)
+            and self.formats[-1].endswith("s")
+        ):
+            # Compare strings in a row, such as a name and type, as one
+            name, previous = self.checked[-1]
+            data = previous + data
+            self.formats[-1] = f"{len(data)}s"
+            self.checked[-1] = (name, data)
+        else:
+            self.check(f"{len(data)}s", data)
+
+    def generate(self, layout: Layout) -> str:
+        inline = 0
+        for name, type_name, header in layout:
+            if self.property(name, type_name, header):
+                inline += 1
+        self.check(f"{len(NONE_TAG)}s", NONE_TAG)
+        self.flush()
+        lines = [
+            "def read(reader):",
+            "    data = reader.data",
+            "    read = data.read",
+        ]
+        if inline:
+            # Properties read inline do not go through reader.property, which
+            # counts down to the next progress update
+            lines += [
+                "    progress = reader.progress",
+                "    if progress is not None:",
+                f"        progress.countdown -= {inline}",
+                "        if progress.countdown <= 0:",
+                "            progress.update(data.tell())",
+            ]
+        lines.append("    properties = {}")
+        lines += ["    " + line for line in self.lines]
+        lines.append("    return properties")
+        return "\n".join(lines) + "\n"
+
+    def property(self, name: str, type_name: str, header: Optional[str]) -> bool:
+        """
+        Adds the fields and statements reading a property, and reads the run of
+        fields so far if its value is not fixed size. Returns whether it is
+        read inline, rather than by reader.property.
+        """
+        path = f"{self.path}.{name}"
+        target = f"properties[{name!r}]"
+        self.fstring(name)
+        self.fstring(type_name)
+        if path in self.custom_properties or (
+            type_name not in VALUE_FORMATS
+            and type_name not in STRING_PROPERTIES
+            and type_name
+            not in ("BoolProperty", "EnumProperty", "ByteProperty", "StructProperty")
+        ):
+            size = self.field("Q")
+            self.statements.append(
+                f"{target} = reader.property({type_name!r}, {size}, {path!r})"
+            )
+            self.flush()
+            return False
+        self.formats.append("8x")
+        if type_name in ("StructProperty", "EnumProperty", "ByteProperty"):
+            if header is None:
+                raise Exception(f"No {type_name} type in the layout of {path}")
+            self.fstring(header)
+        if type_name == "StructProperty":
+            struct_id = self.field("16s")
+        if type_name == "BoolProperty":
+            value = self.field("B") + " > 0"
+            self.check("B", 0)
+            if self.compact:
+                self.statements.append(f"{target} = BoolNode({value}, None)")
+            else:
+                self.statements.append(
+                    f"{target} = {{'value': {value}, 'id': None, "
+                    f"'type': {type_name!r}}}"
+                )
+            return True
+        self.check("B", 0)
+        fixed = True
+        if type_name in VALUE_FORMATS:
+            value = self.field(VALUE_FORMATS[type_name])
+        elif type_name in STRING_PROPERTIES:
+            value = "reader.fstring()"
+            fixed = False
+        elif type_name in ("EnumProperty", "ByteProperty"):
+            if type_name == "ByteProperty" and header == "None":
+                enum_value = self.field("B")
+            else:
+                enum_value = "reader.fstring()"
+                fixed = False
+            if self.compact:
+                value = f"EnumValueNode({header!r}, {enum_value})"
+            else:
+                value = f"{{'type': {header!r}, 'value': {enum_value}}}"
+        elif header in STRUCT_FORMATS:
+            keys, codes = STRUCT_FORMATS[header]
+            if keys is None:
+                value = self.field(codes)
+                if header == "Guid":
+                    value = f"UUID({value})"
+            else:
+                value = (
+                    "{"
+                    + ", ".join(
+                        f"{key!r}: {self.field(code)}" for key, code in zip(keys, codes)
+                    )
+                    + "}"
+                )
+        else:
+            value = f"reader.properties_until_end({path!r})"
+            fixed = False
+        if type_name == "StructProperty" and self.compact:
+            self.statements.append(
+                f"{target} = StructNode({header!r}, UUID({struct_id}), None, {value})"
+            )
+        elif self.compact:
+            self.statements.append(
+                f"{target} = ValueNode(None, {value}, {type_name!r})"
+            )
+        elif type_name == "StructProperty":
+            self.statements.append(
+                f"{target} = {{'struct_type': {header!r}, "
+                f"'struct_id': UUID({struct_id}), 'id': None, "
+                f"'value': {value}, 'type': {type_name!r}}}"
+            )
+        else:
+            self.statements.append(
+                f"{target} = {{'id': None, 'value': {value}, 'type': {type_name!r}}}"
+            )
+        if not fixed:
+            self.flush()
+        return True
+
+    def flush(self) -> None:
+        """Adds the read of the current run of fixed size fields and its statements"""
+        if not self.formats:
+            return
+        packer = struct.Struct("<" + "".join(self.formats))
+        fallback = [
+            "    data.seek(-len(_data), 1)",
+            "    return _fallback(reader, _path, properties)",
+        ]
+        self.lines.append(f"_data = read({packer.size})")
+        if len(self.checked) == 1 and len(self.formats) == 1:
+            # Only the end of the struct, or a name and type, compare the bytes
+            expected = self.constant("expected", self.checked[0][1])
+            self.lines.append(f"if _data != {expected}:")
+            self.lines += fallback
+        else:
+            unpack = self.constant("unpack", packer.unpack)
+            expected = self.constant(
+                "expected", tuple(value for _, value in self.checked)
+            )
+            self.lines.append(f"if len(_data) != {packer.size}:")
+            self.lines += fallback
+            self.lines.append(f"{render_tuple(self.names)} = {unpack}(_data)")
+            checked = render_tuple([name for name, _ in self.checked])
+            self.lines.append(f"if ({checked}) != {expected}:")
+            self.lines += fallback
+        if self.floats:
+            self.lines.append("if not reader.allow_nan:")
+            for name in self.floats:
+                self.lines.append(f"    {name} = _finite({name})")
+        self.lines += self.statements
+        self.formats = []
+        self.names = []
+        self.checked = []
+        self.floats = []
+        self.statements = []
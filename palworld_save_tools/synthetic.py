@@ -0,0 +1,544 @@
+import random
+import uuid
+from typing import Any, Optional
+
+from palworld_save_tools.archive import UUID
+from palworld_save_tools.gvas import GvasFile, GvasHeader
+from palworld_save_tools.rawdata import (
+    build_process,
+    character,
+    foliage_model,
+    foliage_model_instance,
+    group,
+    item_container,
+    item_container_slots,
+    map_concrete_model,
+    map_model,
+)
+
+# Header of a world save, without the engine's custom versions
+WORLD_HEADER: dict[str, Any] = {
+    "magic": 0x53415647,
+    "save_game_version": 3,
+    "package_file_version_ue4": 522,
+    "package_file_version_ue5": 1008,
+    "engine_version_major": 5,
+    "engine_version_minor": 1,
+    "engine_version_patch": 1,
+    "engine_version_changelist": 0,
+    "engine_version_branch": "++UE5+Release-5.1",
+    "custom_version_format": 3,
+    "custom_versions": [],
+    "save_game_class_name": "/Script/Pal.PalWorldSaveGame",
+}
+
+NULL_UUID = UUID(bytes(16))
+
+PAL_IDS = ("SheepBall", "PinkCat", "ChickenPal", "Kitsunebi", "Penguin", "Carbunclo")
+ITEM_IDS = ("Stone", "Wood", "Fiber", "Berries", "PalSphere", "Arrow")
+MAP_OBJECT_IDS = ("PickupItem_Stone", "PickupItem_Log", "PickupItem_RedBerry")
+FOLIAGE_MODELS = ("tree_Spruce_Norway_Desktop_1_Forest", "rock_Boulder_1", "bush_01")
+
+
+class WorldSize:
+    """
+    Number of each kind of entry in a synthetic world save. The defaults are
+    about the size of a small world with a handful of players.
+    """
+
+    __slots__ = (
+        "players",
+        "pals_per_player",
+        "guilds",
+        "map_objects",
+        "foliage_cells",
+        "foliage_instances_per_cell",
+        "containers",
+        "slots_per_container",
+    )
+    players: int
+    pals_per_player: int
+    guilds: int
+    map_objects: int
+    foliage_cells: int
+    foliage_instances_per_cell: int
+    containers: int
+    slots_per_container: int
+
+    def __init__(
+        self,
+        players: int = 4,
+        pals_per_player: int = 25,
+        guilds: int = 2,
+        map_objects: int = 600,
+        foliage_cells: int = 44,
+        foliage_instances_per_cell: int = 80,
+        containers: int = 500,
+        slots_per_container: int = 10,
+    ) -> None:
+        self.players = players
+        self.pals_per_player = pals_per_player
+        self.guilds = guilds
+        self.map_objects = map_objects
+        self.foliage_cells = foliage_cells
+        self.foliage_instances_per_cell = foliage_instances_per_cell
+        self.containers = containers
+        self.slots_per_container = slots_per_container
+
+    def scaled(self, factor: float) -> "WorldSize":
+        """
+        Returns a world with factor times as many players, guilds, map objects,
+        foliage cells and containers. Per-player and per-entry counts are kept.
+        """
+        return WorldSize(
+            players=max(1, round(self.players * factor)),
+            pals_per_player=self.pals_per_player,
+            guilds=max(1, round(self.guilds * factor)),
+            map_objects=round(self.map_objects * factor),
+            foliage_cells=round(self.foliage_cells * factor),
+            foliage_instances_per_cell=self.foliage_instances_per_cell,
+            containers=round(self.containers * factor),
+            slots_per_container=self.slots_per_container,
+        )
+
+    def __repr__(self) -> str:
+        return "WorldSize(%s)" % ", ".join(
+            f"{name}={getattr(self, name)}" for name in self.__slots__
+        )
+
+
+def struct(struct_type: str, value: Any) -> dict[str, Any]:
+    return {
+        "struct_type": struct_type,
+        "struct_id": NULL_UUID,
+        "id": None,
+        "value": value,
+        "type": "StructProperty",
+    }
+
+
+def simple(type_name: str, value: Any) -> dict[str, Any]:
+    return {"id": None, "value": value, "type": type_name}
+
+
+def enum(enum_type: str, value: str) -> dict[str, Any]:
+    return {
+        "id": None,
+        "value": {"type": enum_type, "value": value},
+        "type": "EnumProperty",
+    }
+
+
+def raw_data(data: bytes) -> dict[str, Any]:
+    return {
+        "array_type": "ByteProperty",
+        "id": None,
+        "value": {"values": data},
+        "type": "ArrayProperty",
+    }
+
+
+def map_property(
+    key_type: str,
+    value_type: str,
+    entries: list[dict[str, Any]],
+    key_struct_type: Optional[str] = None,
+    value_struct_type: Optional[str] = "StructProperty",
+) -> dict[str, Any]:
+    return {
+        "key_type": key_type,
+        "value_type": value_type,
+        "key_struct_type": key_struct_type,
+        "value_struct_type": value_struct_type,
+        "id": None,
+        "value": entries,
+        "type": "MapProperty",
+    }
+
+
+def struct_array(prop_name: str, type_name: str, values: list[Any]) -> dict[str, Any]:
+    return {
+        "array_type": "StructProperty",
+        "id": None,
+        "value": {
+            "prop_name": prop_name,
+            "prop_type": "StructProperty",
+            "values": values,
+            "type_name": type_name,
+            "id": NULL_UUID,
+        },
+        "type": "ArrayProperty",
+    }
+
+
+def vector(x: float, y: float, z: float) -> dict[str, float]:
+    return {"x": x, "y": y, "z": z}
+
+
+def transform(x: float, y: float, z: float) -> dict[str, dict[str, float]]:
+    return {
+        "rotation": {"x": 0.0, "y": 0.0, "z": 0.0, "w": 1.0},
+        "translation": vector(x, y, z),
+        "scale3d": vector(1.0, 1.0, 1.0),
+    }
+
+
+class WorldGenerator:
+    """
+    Builds the properties of a world save of a given size, in the form
+    GvasFile.read returns without custom properties. Every RawData blob is
+    produced by the encode_bytes function of its rawdata module, so reading
+    the written save with PALWORLD_CUSTOM_PROPERTIES decodes all of them.
+
+    Values are drawn from a random.Random seeded with seed, so the same size
+    and seed always produce the same save.
+    """
+
+    size: WorldSize
+    random: random.Random
+    world_id: UUID
+
+    def __init__(self, size: WorldSize, seed: int = 0):
+        self.size = size
+        self.random = random.Random(seed)
+        self.world_id = self.uuid()
+
+    def uuid(self) -> UUID:
+        return UUID.from_str(str(uuid.UUID(int=self.random.getrandbits(128))))
+
+    def location(self) -> tuple[float, float, float]:
+        return (
+            self.random.uniform(-500000.0, 500000.0),
+            self.random.uniform(-500000.0, 500000.0),
+            self.random.uniform(-2000.0, 8000.0),
+        )
+
+    def generate(self) -> GvasFile:
+        gvas_file = GvasFile()
+        gvas_file.header = GvasHeader.load(WORLD_HEADER)
+        gvas_file.properties = {
+            "Version": simple("IntProperty", 100),
+            "Timestamp": struct("DateTime", 638400000000000000),
+            "worldSaveData": struct("PalWorldSaveData", self.world_save_data()),
+        }
+        gvas_file.trailer = b"\x00\x00\x00\x00"
+        return gvas_file
+
+    def world_save_data(self) -> dict[str, Any]:
+        guild_ids = [self.uuid() for _ in range(self.size.guilds)]
+        characters = []
+        members: dict[UUID, list[tuple[UUID, UUID, str]]] = {g: [] for g in guild_ids}
+        handles: dict[UUID, list[dict[str, UUID]]] = {g: [] for g in guild_ids}
+        for i in range(self.size.players):
+            guild_id = guild_ids[i % len(guild_ids)]
+            player_uid = self.uuid()
+            name = f"Player{i}"
+            instance_id = self.uuid()
+            characters.append(self.player(player_uid, instance_id, name, guild_id))
+            members[guild_id].append((player_uid, instance_id, name))
+            handles[guild_id].append({"guid": player_uid, "instance_id": instance_id})
+            for _ in range(self.size.pals_per_player):
+                pal_instance_id = self.uuid()
+                characters.append(self.pal(player_uid, pal_instance_id, guild_id))
+                handles[guild_id].append(
+                    {"guid": NULL_UUID, "instance_id": pal_instance_id}
+                )
+        guilds = [
+            self.guild(i, guild_id, members[guild_id], handles[guild_id])
+            for i, guild_id in enumerate(guild_ids)
+        ]
+        return {
+            "CharacterSaveParameterMap": map_property(
+                "StructProperty", "StructProperty", characters, "StructProperty"
+            ),
+            "GroupSaveDataMap": map_property(
+                "StructProperty", "StructProperty", guilds, "Guid"
+            ),
+            "ItemContainerSaveData": map_property(
+                "StructProperty",
+                "StructProperty",
+                [self.container() for _ in range(self.size.containers)],
+                "StructProperty",
+            ),
+            "MapObjectSaveData": struct_array(
+                "MapObjectSaveData",
+                "PalMapObjectSaveData",
+                [self.map_object(guild_ids) for _ in range(self.size.map_objects)],
+            ),
+            "FoliageGridSaveDataMap": map_property(
+                "StructProperty",
+                "StructProperty",
+                [self.foliage_cell(i) for i in range(self.size.foliage_cells)],
+                "StructProperty",
+            ),
+        }
+
+    def character(
+        self,
+        player_uid: UUID,
+        instance_id: UUID,
+        group_id: UUID,
+        save_parameter: dict[str, Any],
+    ) -> dict[str, Any]:
+        data = character.encode_bytes(
+            {
+                "object": {
+                    "SaveParameter": struct(
+                        "PalIndividualCharacterSaveParameter", save_parameter
+                    )
+                },
+                "unknown_bytes": [0, 0, 0, 0],
+                "group_id": group_id,
+                "trailing_bytes": [0, 0, 0, 0],
+            }
+        )
+        return {
+            "key": {
+                "PlayerUId": struct("Guid", player_uid),
+                "InstanceId": struct("Guid", instance_id),
+                "DebugName": simple("StrProperty", ""),
+            },
+            "value": {"RawData": raw_data(data)},
+        }
+
+    def player(
+        self, player_uid: UUID, instance_id: UUID, name: str, group_id: UUID
+    ) -> dict[str, Any]:
+        return self.character(
+            player_uid,
+            instance_id,
+            group_id,
+            {
+                "Level": simple("IntProperty", self.random.randint(1, 50)),
+                "Exp": simple("IntProperty", self.random.randint(0, 1000000)),
+                "NickName": simple("StrProperty", name),
+                "IsPlayer": simple("BoolProperty", True),
+            },
+        )
+
+    def pal(self, owner_uid: UUID, instance_id: UUID, group_id: UUID) -> dict[str, Any]:
+        return self.character(
+            NULL_UUID,
+            instance_id,
+            group_id,
+            {
+                "CharacterID": simple("NameProperty", self.random.choice(PAL_IDS)),
+                "Level": simple("IntProperty", self.random.randint(1, 50)),
+                "Exp": simple("IntProperty", self.random.randint(0, 100000)),
+                "OwnerPlayerUId": struct("Guid", owner_uid),
+            },
+        )
+
+    def guild(
+        self,
+        i: int,
+        group_id: UUID,
+        members: list[tuple[UUID, UUID, str]],
+        handles: list[dict[str, UUID]],
+    ) -> dict[str, Any]:
+        data = group.encode_bytes(
+            {
+                "group_type": "EPalGroupType::Guild",
+                "group_id": group_id,
+                "group_name": str(group_id),
+                "individual_character_handle_ids": handles,
+                "org_type": 0,
+                "leading_bytes": [0, 0, 0, 0],
+                "base_ids": [],
+                "unknown_1": 0,
+                "base_camp_level": self.random.randint(1, 20),
+                "map_object_instance_ids_base_camp_points": [],
+                "guild_name": f"Guild{i}",
+                "last_guild_name_modifier_player_uid": (
+                    members[0][0] if members else NULL_UUID
+                ),
+                "unknown_2": [0] * 20,
+                "players": [
+                    {
+                        "player_uid": player_uid,
+                        "player_info": {
+                            "last_online_real_time": self.random.getrandbits(40),
+                            "player_name": name,
+                        },
+                    }
+                    for player_uid, _, name in members
+                ],
+                "trailing_bytes": [0, 0, 0, 0],
+            }
+        )
+        return {
+            "key": group_id,
+            "value": {
+                "GroupType": enum("EPalGroupType", "EPalGroupType::Guild"),
+                "RawData": raw_data(data),
+            },
+        }
+
+    def container(self) -> dict[str, Any]:
+        slots = []
+        for slot_index in range(self.size.slots_per_container):
+            data = item_container_slots.encode_bytes(
+                {
+                    "slot_index": slot_index,
+                    "count": self.random.randint(1, 999),
+                    "item": {
+                        "static_id": self.random.choice(ITEM_IDS),
+                        "dynamic_id": {
+                            "created_world_id": NULL_UUID,
+                            "local_id_in_created_world": NULL_UUID,
+                        },
+                    },
+                    "trailing_bytes": [0, 0, 0, 0],
+                }
+            )
+            slots.append({"RawData": raw_data(data)})
+        permission = item_container.encode_bytes(
+            {"permission": {"type_a": [], "type_b": [], "item_static_ids": []}}
+        )
+        return {
+            "key": {"ID": struct("Guid", self.uuid())},
+            "value": {
+                "BelongInfo": struct(
+                    "PalItemContainerBelongInfo", {"GroupID": struct("Guid", NULL_UUID)}
+                ),
+                "Slots": struct_array("Slots", "PalItemSlotSaveData", slots),
+                "RawData": raw_data(permission),
+            },
+        }
+
+    def map_object(self, guild_ids: list[UUID]) -> dict[str, Any]:
+        map_object_id = self.random.choice(MAP_OBJECT_IDS)
+        instance_id = self.uuid()
+        concrete_model_instance_id = self.uuid()
+        x, y, z = self.location()
+        model = map_model.encode_bytes(
+            {
+                "instance_id": instance_id,
+                "concrete_model_instance_id": concrete_model_instance_id,
+                "base_camp_id_belong_to": NULL_UUID,
+                "group_id_belong_to": self.random.choice(guild_ids),
+                "hp": {"current": 100, "max": 100},
+                "initital_transform_cache": transform(x, y, z),
+                "repair_work_id": NULL_UUID,
+                "owner_spawner_level_object_instance_id": NULL_UUID,
+                "owner_instance_id": NULL_UUID,
+                "build_player_uid": NULL_UUID,
+                "interact_restrict_type": 0,
+                "stage_instance_id_belong_to": {"id": NULL_UUID, "valid": False},
+                "created_at": self.random.getrandbits(40),
+            }
+        )
+        concrete_model = map_concrete_model.encode_bytes(
+            {
+                "concrete_model_type": "PalMapObjectPickupItemOnLevelModel",
+                "instance_id": concrete_model_instance_id,
+                "model_instance_id": instance_id,
+                "auto_picked_up": False,
+            }
+        )
+        build = build_process.encode_bytes(
+            {"state": 1, "id": NULL_UUID, "trailing_bytes": [0, 0, 0, 0]}
+        )
+        return {
+            "WorldLocation": struct("Vector", vector(x, y, z)),
+            "WorldRotation": struct("Quat", {"x": 0.0, "y": 0.0, "z": 0.0, "w": 1.0}),
+            "WorldScale3D": struct("Vector", vector(1.0, 1.0, 1.0)),
+            "MapObjectId": simple("NameProperty", map_object_id),
+            "MapObjectInstanceId": struct("Guid", instance_id),
+            "MapObjectConcreteModelInstanceId": struct(
+                "Guid", concrete_model_instance_id
+            ),
+            "Model": struct(
+                "PalMapObjectModelSaveData",
+                {
+                    "BuildProcess": struct(
+                        "PalMapObjectBuildProcessSaveData", {"RawData": raw_data(build)}
+                    ),
+                    "Connector": struct(
+                        "PalMapObjectConnectorSaveData", {"RawData": raw_data(b"")}
+                    ),
+                    "EffectMap": map_property("EnumProperty", "StructProperty", []),
+                    "RawData": raw_data(model),
+                },
+            ),
+            "ConcreteModel": struct(
+                "PalMapObjectConcreteModelSaveData",
+                {
+                    "ModuleMap": map_property("EnumProperty", "StructProperty", []),
+                    "RawData": raw_data(concrete_model),
+                },
+            ),
+        }
+
+    def foliage_cell(self, i: int) -> dict[str, Any]:
+        # Cells are laid out on a square grid
+        side = max(1, round(self.size.foliage_cells**0.5))
+        cell = {"x": i % side, "y": i // side, "z": 0}
+        models: dict[str, list[dict[str, Any]]] = {}
+        for _ in range(self.size.foliage_instances_per_cell):
+            model_id = self.random.choice(FOLIAGE_MODELS)
+            x, y, z = self.location()
+            data = foliage_model_instance.encode_bytes(
+                {
+                    "model_instance_id": self.uuid(),
+                    "world_transform": {
+                        "rotator": {
+                            "pitch": 0.0,
+                            "yaw": self.random.randrange(65536) * (360.0 / 65536.0),
+                            "roll": 0.0,
+                        },
+                        "location": {"x": round(x), "y": round(y), "z": round(z)},
+                        "scale_x": self.random.uniform(0.5, 2.0),
+                    },
+                    "hp": 1000,
+                }
+            )
+            models.setdefault(model_id, []).append(
+                {
+                    "key": {"Guid": struct("Guid", self.uuid())},
+                    "value": {"RawData": raw_data(data)},
+                }
+            )
+        model_map = []
+        for model_id, instances in models.items():
+            data = foliage_model.encode_bytes(
+                {
+                    "model_id": model_id,
+                    "foliage_preset_type": 1,
+                    "cell_coord": cell,
+                    "trailing_bytes": [0, 0, 0, 0],
+                }
+            )
+            model_map.append(
+                {
+                    "key": f"[{cell['x']}_{cell['y']}_{cell['z']}]_{model_id}",
+                    "value": {
+                        "InstanceDataMap": map_property(
+                            "StructProperty",
+                            "StructProperty",
+                            instances,
+                            "StructProperty",
+                        ),
+                        "RawData": raw_data(data),
+                    },
+                }
+            )
+        return {
+            "key": {
+                axis.upper(): simple("Int64Property", value)
+                for axis, value in cell.items()
+            },
+            "value": {
+                "ModelMap": map_property("NameProperty", "StructProperty", model_map)
+            },
+        }
+
+
+def generate_world(size: Optional[WorldSize] = None, seed: int = 0) -> GvasFile:
+    """Returns a synthetic world save with size entries (default: WorldSize())"""
+    return WorldGenerator(size or WorldSize(), seed).generate()
+
+
+def generate_gvas(size: Optional[WorldSize] = None, seed: int = 0) -> bytes:
+    """Returns the decompressed GVAS data of a synthetic world save"""
+    return generate_world(size, seed).write()
@@ -0,0 +1,104 @@
+import json
+import os
+import time
+from typing import Any
+
+from palworld_save_tools.profiler import PropertyProfiler
+
+TRACE_FORMATS = ("chrome", "folded")
+# Shorter spans are left out of Chrome traces, which would otherwise hold an
+# event for every property of a world save
+DEFAULT_MIN_SPAN_DURATION = 0.00002
+
+
+class PropertyTracer(PropertyProfiler):
+    """
+    Records a span for each property path and rawdata decoder while reading or
+    writing, on top of the totals a PropertyProfiler keeps. Pass it to
+    GvasFile.read and GvasFile.write as the profiler.
+
+    Spans are written as folded stacks, one line of semicolon separated frames
+    and microseconds per stack as consumed by flamegraph.pl, inferno or
+    speedscope, or as Chrome trace events for chrome://tracing or Perfetto.
+    Frames of folded stacks only name the part of their path below the frame
+    around them, such as .MapObjectSaveData under .worldSaveData.
+    Folded stacks add up every span; Chrome traces keep spans of at least
+    min_duration seconds, as there would be one for every property otherwise.
+    """
+
+    min_duration: float
+    origin: float
+    folded: dict[str, float]
+    # name, operation, start, duration, bytes, custom
+    events: list[tuple[str, str, float, float, int, bool]]
+
+    def __init__(self, min_duration: float = DEFAULT_MIN_SPAN_DURATION) -> None:
+        super().__init__()
+        self.min_duration = min_duration
+        self.origin = time.perf_counter()
+        self.folded = {}
+        self.events = []
+
+    def record(
+        self,
+        operation: str,
+        path: str,
+        start: float,
+        elapsed: float,
+        nested: float,
+        size: int,
+        custom: bool,
+    ) -> None:
+        super().record(operation, path, start, elapsed, nested, size, custom)
+        # Each frame is named by the part of its path below the frame around it
+        names = [entry[0] for entry in self.stack if entry[1] == operation]
+        names.append(path)
+        frames = [operation]
+        parent = ""
+        for name in names:
+            frames.append(name[len(parent) :] if name.startswith(parent) else name)
+            parent = name
+        stack = ";".join(frame.replace(";", ",") for frame in frames)
+        self.folded[stack] = self.folded.get(stack, 0.0) + elapsed - nested
+        if elapsed >= self.min_duration:
+            self.events.append((path, operation, start, elapsed, size, custom))
+
+    def folded_stacks(self) -> list[str]:
+        lines = []
+        for stack, seconds in self.folded.items():
+            microseconds = round(seconds * 1e6)
+            if microseconds > 0:
+                lines.append(f"{stack} {microseconds}")
+        return lines
+
+    def chrome_trace(self) -> dict[str, Any]:
+        pid = os.getpid()
+        return {
+            "traceEvents": [
+                {
+                    "name": name,
+                    "cat": f"{operation},custom" if custom else operation,
+                    "ph": "X",
+                    "ts": (start - self.origin) * 1e6,
+                    "dur": elapsed * 1e6,
+                    "pid": pid,
+                    "tid": 1,
+                    "args": {"bytes": size},
+                }
+                for name, operation, start, elapsed, size, custom in self.events
+            ],
+            "displayTimeUnit": "ms",
+        }
+
+    def write_trace(self, path: str, format: str = "chrome") -> None:
+        if format == "folded":
+            with open(path, "w") as f:
+                for line in self.folded_stacks():
+                    f.write(line + "\n")
+        elif format == "chrome":
+            with open(path, "w") as f:
+                json.dump(self.chrome_trace(), f)
+        else:
+            raise Exception(
+                f"Unknown trace format: {format}, expected one of {TRACE_FORMATS}"
+            )
@@ -0,0 +1,18 @@
+from palworld_save_tools.palsav import decompress_sav_to_gvas
+from palworld_save_tools.paltypes import PALWORLD_CUSTOM_PROPERTIES
+
+# Only the item container decoders, which read the test saves whose other
+# RawData blobs the current decoders cannot
+ITEM_CONTAINER_PROPERTIES = {
+    path: PALWORLD_CUSTOM_PROPERTIES[path]
+    for path in [
+        ".worldSaveData.ItemContainerSaveData.Value.RawData",
+        ".worldSaveData.ItemContainerSaveData.Value.Slots.Slots.RawData",
+    ]
+}
+
+
+def read_gvas(file_name: str = "Level-tricky-unicode-player-name.sav") -> bytes:
+    """Returns the decompressed GVAS data of a save in tests/testdata"""
+    with open("tests/testdata/" + file_name, "rb") as f:
+        return decompress_sav_to_gvas(f.read())[0]
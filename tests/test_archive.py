@@ -1,9 +1,18 @@
+import math
+import mmap
+import struct
 import unittest
 import uuid
 
 from parameterized import parameterized
 
-from palworld_save_tools.archive import UUID, FArchiveReader, FArchiveWriter
+from palworld_save_tools.archive import (
+    FTRANSFORM_LAYOUT,
+    UUID,
+    FArchiveReader,
+    FArchiveWriter,
+    FixedLayout,
+)
 
 
 class TestArchive(unittest.TestCase):
@@ -93,3 +102,70 @@ class TestArchive(unittest.TestCase):
         wrapper = UUID.from_str(test_uuid)
         wrapper2 = UUID.from_str(test_uuid)
         self.assertEqual(hash(wrapper), hash(wrapper2))
+
+    def test_reader_mmap_view_in_place(self):
+        writer = FArchiveWriter()
+        writer.fstring("hello")
+        writer.u32(42)
+        data = writer.bytes()
+        buffer = mmap.mmap(-1, len(data) + 128)
+        buffer[: len(data)] = data
+        with FArchiveReader(memoryview(buffer)[: len(data)]) as reader:
+            self.assertIs(reader.data, buffer)
+            self.assertEqual(reader.size, len(data))
+            self.assertEqual(reader.fstring(), "hello")
+            self.assertEqual(reader.u32(), 42)
+            self.assertTrue(reader.eof())
+        self.assertFalse(buffer.closed)
+
+    def test_reader_offset_view(self):
+        writer = FArchiveWriter()
+        writer.u32(42)
+        buffer = mmap.mmap(-1, 16)
+        buffer[4:8] = writer.bytes()
+        reader = FArchiveReader(memoryview(buffer)[4:8])
+        self.assertIsNot(reader.data, buffer)
+        self.assertEqual(reader.u32(), 42)
+        self.assertTrue(reader.eof())
+
+    def test_ftransform_layout(self):
+        values = [0.5, -0.5, 0.25, 1.0, 100.0, -200.0, 300.5, 1.0, 2.0, 3.0]
+        data = b"".join(struct.pack("d", value) for value in values)
+        self.assertEqual(FTRANSFORM_LAYOUT.size, 80)
+        transform = FArchiveReader(data).ftransform()
+        self.assertEqual(
+            transform,
+            {
+                "rotation": {"x": 0.5, "y": -0.5, "z": 0.25, "w": 1.0},
+                "translation": {"x": 100.0, "y": -200.0, "z": 300.5},
+                "scale3d": {"x": 1.0, "y": 2.0, "z": 3.0},
+            },
+        )
+        writer = FArchiveWriter()
+        writer.ftransform(transform)
+        self.assertEqual(writer.bytes(), data)
+
+    def test_fixed_layout(self):
+        layout = FixedLayout([("id", "16s"), ("count", "i"), ("x", "d"), ("flag", "B")])
+        self.assertEqual(layout.size, 29)
+        self.assertEqual(layout.names, ("id", "count", "x", "flag"))
+        guid = bytes(range(16))
+        writer = FArchiveWriter()
+        writer.fixed(layout, (guid, -3, None, 1))
+        writer.fixed(layout, (guid, 7, math.inf, 0))
+        data = writer.bytes()
+        reader = FArchiveReader(data)
+        first = reader.fixed_dict(layout)
+        self.assertEqual(first["id"], guid)
+        self.assertTrue(math.isnan(first["x"]))
+        self.assertEqual(reader.fixed(layout), (guid, 7, math.inf, 0))
+        self.assertTrue(reader.eof())
+        # As with double, infinities are read as None without allow_nan
+        reader = FArchiveReader(data[29:], allow_nan=False)
+        self.assertEqual(reader.fixed(layout), (guid, 7, None, 0))
+        # Short bytes fields take what is left, unless they are exact
+        self.assertEqual(
+            FixedLayout([("id", "16s")]).unpack_short(guid[:4]), (guid[:4],)
+        )
+        with self.assertRaises(struct.error):
+            FixedLayout([("id", "16s")], exact=["id"]).unpack_short(guid[:4])
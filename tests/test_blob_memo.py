@@ -0,0 +1,130 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from palworld_save_tools.archive import FArchiveReader, FArchiveWriter
+from palworld_save_tools.blob_memo import MIN_MEMO_BLOB_SIZE, BlobMemo, memoize_blob
+from palworld_save_tools.gvas import GvasFile
+from palworld_save_tools.json_tools import CustomEncoder
+from palworld_save_tools.palsav import decompress_sav_to_gvas
+from palworld_save_tools.paltypes import PALWORLD_CUSTOM_PROPERTIES, PALWORLD_TYPE_HINTS
+from palworld_save_tools.rawdata import base_camp_module
+
+DYNAMIC_ITEM_PROPERTIES = {
+    path: PALWORLD_CUSTOM_PROPERTIES[path]
+    for path in [".worldSaveData.DynamicItemSaveData.DynamicItemSaveData.RawData"]
+}
+
+
+@memoize_blob
+def decode_length(parent_reader, blob, offset):
+    decode_length.calls += 1
+    return {"length": len(blob) + offset}
+
+
+decode_length.calls = 0
+
+
+class TestBlobMemo(unittest.TestCase):
+    def setUp(self):
+        decode_length.calls = 0
+
+    def test_world_reread(self):
+        with open("tests/testdata/unicode-saves/Level.sav", "rb") as f:
+            gvas_data, _ = decompress_sav_to_gvas(f.read())
+        memo = BlobMemo()
+        first = GvasFile.read(
+            gvas_data, PALWORLD_TYPE_HINTS, DYNAMIC_ITEM_PROPERTIES, blob_memo=memo
+        )
+        self.assertGreater(memo.misses, 0)
+        self.assertEqual(memo.hits, 0)
+        second = GvasFile.read(
+            gvas_data, PALWORLD_TYPE_HINTS, DYNAMIC_ITEM_PROPERTIES, blob_memo=memo
+        )
+        self.assertEqual(memo.hits, memo.misses)
+        self.assertEqual(second.dump(), first.dump())
+        self.assertEqual(second.write(DYNAMIC_ITEM_PROPERTIES), gvas_data)
+
+    def test_hits_are_copies(self):
+        reader = FArchiveReader(b"", blob_memo=BlobMemo())
+        blob = bytes(MIN_MEMO_BLOB_SIZE)
+        first = decode_length(reader, blob, 1)
+        first["length"] = 0
+        self.assertEqual(decode_length(reader, blob, 1), {"length": 65})
+        self.assertEqual(decode_length(reader, list(blob), 1), {"length": 65})
+        self.assertEqual(decode_length.calls, 1)
+        # Extra arguments are part of the key
+        self.assertEqual(decode_length(reader, blob, 2), {"length": 66})
+        self.assertEqual(decode_length.calls, 2)
+
+    def test_raw_fallback(self):
+        # Undecodable blobs are kept as the values they were read as, with or
+        # without a memo, so their JSON converts back
+        blob = tuple(range(MIN_MEMO_BLOB_SIZE))
+        module_type = "EPalBaseCampModuleType::Unknown"
+        expected = json.dumps({"values": list(blob)})
+        memo = BlobMemo()
+        for reader in (FArchiveReader(b""), FArchiveReader(b"", blob_memo=memo)):
+            with self.assertLogs("palworld_save_tools.rawdata", "WARNING"):
+                value = base_camp_module.decode_bytes(reader, blob, module_type)
+            self.assertEqual(json.dumps(value, cls=CustomEncoder), expected)
+        # and as the memo returns them
+        value = base_camp_module.decode_bytes(reader, blob, module_type)
+        self.assertEqual(memo.hits, 1)
+        self.assertEqual(json.dumps(value, cls=CustomEncoder), expected)
+        values = json.loads(json.dumps(value, cls=CustomEncoder))["values"]
+        writer = FArchiveWriter()
+        writer.array_value("ByteProperty", len(values), values)
+        self.assertEqual(writer.bytes(), bytes(blob))
+
+    def test_small_blobs_and_no_memo(self):
+        memo = BlobMemo()
+        small = bytes(MIN_MEMO_BLOB_SIZE - 1)
+        decode_length(FArchiveReader(b"", blob_memo=memo), small, 0)
+        decode_length(FArchiveReader(b"", blob_memo=memo), small, 0)
+        decode_length(FArchiveReader(b""), bytes(MIN_MEMO_BLOB_SIZE), 0)
+        self.assertEqual(decode_length.calls, 3)
+        self.assertEqual(len(memo), 0)
+
+    def test_eviction(self):
+        memo = BlobMemo()
+        reader = FArchiveReader(b"", blob_memo=memo)
+        decode_length(reader, bytes(MIN_MEMO_BLOB_SIZE), 0)
+        memo.max_size = memo.size * 2
+        decode_length(reader, bytes(MIN_MEMO_BLOB_SIZE + 1), 0)
+        # Using the first entry makes the second the least recently used
+        decode_length(reader, bytes(MIN_MEMO_BLOB_SIZE), 0)
+        decode_length(reader, bytes(MIN_MEMO_BLOB_SIZE + 2), 0)
+        self.assertEqual(len(memo), 2)
+        self.assertLessEqual(memo.size, memo.max_size)
+        self.assertEqual(decode_length.calls, 3)
+        decode_length(reader, bytes(MIN_MEMO_BLOB_SIZE), 0)
+        self.assertEqual(decode_length.calls, 3)
+        decode_length(reader, bytes(MIN_MEMO_BLOB_SIZE + 1), 0)
+        self.assertEqual(decode_length.calls, 4)
+
+    def test_save_and_load(self):
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            path = os.path.join(tmp_dir, "blobs.memo")
+            self.assertEqual(len(BlobMemo.load(path)), 0)
+            memo = BlobMemo()
+            reader = FArchiveReader(b"", blob_memo=memo)
+            decode_length(reader, bytes(MIN_MEMO_BLOB_SIZE), 0)
+            decode_length(reader, bytes(MIN_MEMO_BLOB_SIZE + 1), 0)
+            memo.save(path)
+            loaded = BlobMemo.load(path)
+            self.assertEqual(loaded.size, memo.size)
+            reader = FArchiveReader(b"", blob_memo=loaded)
+            decode_length(reader, bytes(MIN_MEMO_BLOB_SIZE), 0)
+            self.assertEqual(decode_length.calls, 2)
+            # Loading into a smaller memo keeps the most recently used entries
+            self.assertEqual(len(BlobMemo.load(path, memo.size - 1)), 1)
+            with open(path, "wb") as f:
+                f.write(b"not a pickle")
+            with self.assertLogs("palworld_save_tools.blob_memo", "WARNING"):
+                self.assertEqual(len(BlobMemo.load(path)), 0)
+        finally:
+            shutil.rmtree(tmp_dir)
@@ -0,0 +1,141 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from palworld_save_tools.cache import DecodeCache
+from palworld_save_tools.compressor.zlib import ZlibOptions
+from palworld_save_tools.palsav import compress_gvas_to_sav, decompress_sav_to_gvas
+from palworld_save_tools.paltypes import PALWORLD_CUSTOM_PROPERTIES, PALWORLD_TYPE_HINTS
+from palworld_save_tools.path_filter import PathFilter
+from palworld_save_tools.progress import Progress
+
+
+def read_sav(file_name):
+    with open("tests/testdata/" + file_name, "rb") as f:
+        return f.read()
+
+
+class TestDecodeCache(unittest.TestCase):
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir)
+
+    def cache_entries(self):
+        return sorted(os.listdir(self.cache_dir))
+
+    def test_warm_read(self):
+        data = read_sav("Level.sav")
+        gvas_data, save_type = decompress_sav_to_gvas(data)
+        cache = DecodeCache(self.cache_dir)
+        with self.assertLogs("palworld_save_tools.cache", "DEBUG") as logs:
+            cold, cold_save_type = cache.read(data, PALWORLD_TYPE_HINTS)
+        self.assertIn("Tree cache miss", "\n".join(logs.output))
+        self.assertEqual(len(self.cache_entries()), 2)
+        with self.assertLogs("palworld_save_tools.cache", "DEBUG") as logs:
+            warm, warm_save_type = cache.read(data, PALWORLD_TYPE_HINTS)
+        self.assertIn("Tree cache hit", "\n".join(logs.output))
+        self.assertEqual(cold_save_type, save_type)
+        self.assertEqual(warm_save_type, save_type)
+        self.assertEqual(cold.write({}), gvas_data)
+        self.assertEqual(warm.write({}), gvas_data)
+
+    def test_options_are_part_of_the_key(self):
+        data = read_sav("Level.sav")
+        cache = DecodeCache(self.cache_dir)
+        cache.read(data, PALWORLD_TYPE_HINTS)
+        path_filter = PathFilter(exclude=[".worldSaveData.CharacterSaveParameterMap"])
+        gvas_file, _ = cache.read(data, PALWORLD_TYPE_HINTS, path_filter=path_filter)
+        world = gvas_file.properties["worldSaveData"]["value"]
+        self.assertIn("skipped_bytes", world["CharacterSaveParameterMap"])
+        # One decompressed GVAS shared by two trees
+        self.assertEqual(len(self.cache_entries()), 3)
+
+    def test_blob_memo_across_saves(self):
+        data = read_sav("unicode-saves/Level.sav")
+        gvas_data, save_type = decompress_sav_to_gvas(data)
+        # Same GVAS, different .sav bytes
+        recompressed = compress_gvas_to_sav(
+            gvas_data, save_type, zlib=True, zlib_options=ZlibOptions(level=1)
+        )
+        self.assertNotEqual(recompressed, data)
+        custom_properties = {
+            path: PALWORLD_CUSTOM_PROPERTIES[path]
+            for path in [
+                ".worldSaveData.DynamicItemSaveData.DynamicItemSaveData.RawData"
+            ]
+        }
+        cache = DecodeCache(self.cache_dir)
+        cache.read(data, PALWORLD_TYPE_HINTS, custom_properties)
+        self.assertEqual(
+            len([name for name in self.cache_entries() if name.endswith(".memo")]), 1
+        )
+        with self.assertLogs("palworld_save_tools.cache", "DEBUG") as logs:
+            gvas_file, _ = cache.read(
+                recompressed, PALWORLD_TYPE_HINTS, custom_properties
+            )
+        output = "\n".join(logs.output)
+        self.assertIn("Tree cache miss", output)
+        self.assertRegex(output, r"Blob memo: [1-9]\d* hits, 0 misses")
+        self.assertEqual(gvas_file.write(custom_properties), gvas_data)
+
+    def test_decompress(self):
+        data = read_sav("LevelMeta.sav")
+        cache = DecodeCache(self.cache_dir)
+        expected = decompress_sav_to_gvas(data)
+        self.assertEqual(cache.decompress(data), expected)
+        self.assertEqual(cache.decompress(data), expected)
+
+    def test_zlib_workers(self):
+        data = read_sav("LevelMeta.sav")
+        cache = DecodeCache(self.cache_dir)
+        with mock.patch(
+            "palworld_save_tools.palsav.decompress_sav_to_gvas",
+            wraps=decompress_sav_to_gvas,
+        ) as decompress:
+            cache.read(data, PALWORLD_TYPE_HINTS, zlib_workers=2)
+        decompress.assert_called_once_with(data, zlib_workers=2)
+
+    def test_progress(self):
+        data = read_sav("LevelMeta.sav")
+        cache = DecodeCache(self.cache_dir)
+        stages = []
+        progress = Progress(lambda p: stages.append(p.stage), interval=0)
+        cache.read(data, PALWORLD_TYPE_HINTS, progress=progress)
+        self.assertIn("read", stages)
+        self.assertTrue(progress.done)
+        # A cached tree is not decoded, so there is nothing to report
+        stages.clear()
+        cache.read(data, PALWORLD_TYPE_HINTS, progress=progress)
+        self.assertEqual(stages, [])
+
+    def test_eviction(self):
+        cache = DecodeCache(self.cache_dir, max_size=300)
+        cache.store("a.gvas", bytes(100))
+        cache.store("b.gvas", bytes(100))
+        os.utime(os.path.join(self.cache_dir, "a.gvas"), ns=(1, 1))
+        os.utime(os.path.join(self.cache_dir, "b.gvas"), ns=(2, 2))
+        # Loading a makes b the least recently used entry
+        self.assertEqual(cache.load("a.gvas"), bytes(100))
+        cache.store("c.gvas", bytes(150))
+        self.assertEqual(self.cache_entries(), ["a.gvas", "c.gvas"])
+        # Entries larger than the whole cache are not stored
+        cache.store("d.gvas", bytes(301))
+        self.assertEqual(self.cache_entries(), ["a.gvas", "c.gvas"])
+        cache.clear()
+        self.assertEqual(self.cache_entries(), [])
+
+    def test_unreadable_entry(self):
+        data = read_sav("LevelMeta.sav")
+        cache = DecodeCache(self.cache_dir)
+        cache.read(data, PALWORLD_TYPE_HINTS)
+        for name in self.cache_entries():
+            if name.endswith(".pickle"):
+                with open(os.path.join(self.cache_dir, name), "wb") as f:
+                    f.write(b"not a pickle")
+        with self.assertLogs("palworld_save_tools.cache", "WARNING"):
+            gvas_file, _ = cache.read(data, PALWORLD_TYPE_HINTS)
+        self.assertEqual(gvas_file.write({}), decompress_sav_to_gvas(data)[0])
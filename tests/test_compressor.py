@@ -0,0 +1,118 @@
+import contextlib
+import io
+import random
+import unittest
+import zlib
+from unittest import mock
+
+from parameterized import parameterized
+
+from palworld_save_tools.compressor import SaveType
+from palworld_save_tools.compressor.zlib import (
+    SYNC_MARKER,
+    ZLIB_PRESETS,
+    Zlib,
+    ZlibOptions,
+    ZlibStrategy,
+)
+
+
+def sample_gvas(size):
+    words = [bytes(random.Random(i).randbytes(8)) for i in range(512)]
+    rng = random.Random(0)
+    return b"".join(rng.choice(words) for _ in range(size // 8))
+
+
+class TestZlib(unittest.TestCase):
+    def test_default_options_match_original(self):
+        with open("tests/testdata/Level.sav", "rb") as f:
+            data = f.read()
+        z_lib = Zlib()
+        gvas, save_type = z_lib.decompress(data)
+        self.assertEqual(save_type, SaveType.PLZ.value)
+        self.assertEqual(z_lib.compress(gvas, save_type), data)
+        self.assertEqual(
+            z_lib.compress(gvas, save_type, ZlibOptions.preset("default")), data
+        )
+
+    @parameterized.expand([(preset,) for preset in ZLIB_PRESETS])
+    def test_preset_roundtrip(self, preset):
+        with open("tests/testdata/LocalData.sav", "rb") as f:
+            data = f.read()
+        z_lib = Zlib()
+        gvas, save_type = z_lib.decompress(data)
+        sav = z_lib.compress(gvas, save_type, ZlibOptions.preset(preset))
+        roundtrip, roundtrip_save_type = z_lib.decompress(sav)
+        self.assertEqual(roundtrip, gvas)
+        self.assertEqual(roundtrip_save_type, save_type)
+
+    def test_strategy_roundtrip(self):
+        gvas = bytes(range(256)) * 64
+        z_lib = Zlib()
+        options = ZlibOptions(
+            strategy=ZlibStrategy.Filtered, outer_strategy=ZlibStrategy.HuffmanOnly
+        )
+        sav = z_lib.compress(gvas, SaveType.PLZ.value, options)
+        roundtrip, _ = z_lib.decompress(sav)
+        self.assertEqual(roundtrip, gvas)
+
+    def test_unknown_preset(self):
+        with self.assertRaises(ValueError):
+            ZlibOptions.preset("unknown")
+
+    @parameterized.expand([(1,), (4,)])
+    def test_chunked_roundtrip(self, workers):
+        gvas = sample_gvas(4 * 1024 * 1024)
+        z_lib = Zlib()
+        options = ZlibOptions(chunk_size=256 * 1024, workers=workers)
+        sav = z_lib.compress(gvas, SaveType.PLZ.value, options)
+        roundtrip, _ = z_lib.decompress(sav, workers=workers)
+        self.assertEqual(roundtrip, gvas)
+        # Chunked output is a standard zlib stream
+        self.assertEqual(zlib.decompress(zlib.decompress(sav[12:])), gvas)
+
+    def test_chunked_tail(self):
+        gvas = sample_gvas(1000) + b"tail"
+        z_lib = Zlib()
+        options = ZlibOptions(chunk_size=100, workers=2)
+        sav = z_lib.compress(gvas, SaveType.PLZ.value, options)
+        roundtrip, _ = z_lib.decompress(sav)
+        self.assertEqual(roundtrip, gvas)
+
+    def test_small_decompress_inline(self):
+        gvas = sample_gvas(4096)
+        z_lib = Zlib()
+        sav = z_lib.compress(gvas, SaveType.PLZ.value, ZlibOptions(chunk_size=1024))
+        with mock.patch(
+            "palworld_save_tools.compressor.zlib.ThreadPoolExecutor"
+        ) as executor:
+            roundtrip, _ = z_lib.decompress(sav, workers=4)
+        self.assertEqual(roundtrip, gvas)
+        executor.assert_not_called()
+
+    def test_parallel_decompress_false_markers(self):
+        # Stored blocks hold the marker bytes verbatim, so the parallel split
+        # is wrong and decompression has to fall back to a serial inflate
+        gvas = (SYNC_MARKER + bytes(range(256))) * 8192
+        z_lib = Zlib()
+        sav = z_lib.compress(
+            gvas, SaveType.PLZ.value, ZlibOptions(level=0, outer_level=0)
+        )
+        roundtrip, _ = z_lib.decompress(sav, workers=4)
+        self.assertEqual(roundtrip, gvas)
+
+    def test_silent_by_default(self):
+        gvas = sample_gvas(4096)
+        z_lib = Zlib()
+        stdout, stderr = io.StringIO(), io.StringIO()
+        with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+            z_lib.decompress(z_lib.compress(gvas, SaveType.PLZ.value))
+        self.assertEqual(stdout.getvalue(), "")
+        self.assertEqual(stderr.getvalue(), "")
+
+    def test_debug_logging(self):
+        gvas = sample_gvas(4096)
+        z_lib = Zlib()
+        with self.assertLogs("palworld_save_tools.compressor", "DEBUG") as logs:
+            sav = z_lib.compress(gvas, SaveType.PLZ.value)
+        self.assertIn(f"head={sav[12:44].hex()}", "\n".join(logs.output))
@@ -0,0 +1,98 @@
+import math
+import unittest
+
+from palworld_save_tools.diff import diff_gvas, diff_values
+from palworld_save_tools.gvas import GvasFile
+from palworld_save_tools.paltypes import PALWORLD_TYPE_HINTS
+from tests.helpers import ITEM_CONTAINER_PROPERTIES, read_gvas
+
+
+class TestDiff(unittest.TestCase):
+    def test_identical(self):
+        gvas_data = read_gvas()
+        self.assertEqual(
+            diff_gvas(
+                gvas_data, gvas_data, PALWORLD_TYPE_HINTS, ITEM_CONTAINER_PROPERTIES
+            ),
+            [],
+        )
+
+    def test_changes(self):
+        gvas_data = read_gvas()
+        gvas_file = GvasFile.read(
+            gvas_data, PALWORLD_TYPE_HINTS, ITEM_CONTAINER_PROPERTIES
+        )
+        world = gvas_file.properties["worldSaveData"]["value"]
+        world["GameTimeSaveData"]["value"]["RealDateTimeTicks"]["value"] += 5
+        container = world["ItemContainerSaveData"]["value"][0]
+        container_id = container["key"]["ID"]["value"]
+        container["value"]["Slots"]["value"]["values"][0]["RawData"]["value"][
+            "count"
+        ] += 1
+        del world["DynamicItemSaveData"]["value"]["values"][1]
+        modified = gvas_file.write(ITEM_CONTAINER_PROPERTIES)
+        changes = diff_gvas(
+            gvas_data, modified, PALWORLD_TYPE_HINTS, ITEM_CONTAINER_PROPERTIES
+        )
+        self.assertEqual(
+            [(c["path"], c["change"]) for c in changes],
+            [
+                (
+                    f".worldSaveData.ItemContainerSaveData[ID={container_id}]"
+                    ".Slots.value.values[0].RawData.value.count",
+                    "changed",
+                ),
+                (".worldSaveData.DynamicItemSaveData[1]", "removed"),
+                (
+                    ".worldSaveData.GameTimeSaveData.RealDateTimeTicks.value",
+                    "changed",
+                ),
+            ],
+        )
+        self.assertEqual(changes[2]["new"], changes[2]["old"] + 5)
+        # The same changes, the other way around
+        reverse = diff_gvas(
+            modified, gvas_data, PALWORLD_TYPE_HINTS, ITEM_CONTAINER_PROPERTIES
+        )
+        self.assertEqual(
+            [c["change"] for c in reverse], ["changed", "added", "changed"]
+        )
+
+    def test_map_entry_removed(self):
+        gvas_data = read_gvas()
+        gvas_file = GvasFile.read(gvas_data, PALWORLD_TYPE_HINTS)
+        characters = gvas_file.properties["worldSaveData"]["value"][
+            "CharacterSaveParameterMap"
+        ]["value"]
+        removed = characters.pop(0)
+        changes = diff_gvas(gvas_data, gvas_file.write(), PALWORLD_TYPE_HINTS)
+        self.assertEqual(len(changes), 1)
+        self.assertEqual(changes[0]["change"], "removed")
+        self.assertIn(
+            f"InstanceId={removed['key']['InstanceId']['value']}", changes[0]["path"]
+        )
+        self.assertEqual(changes[0]["old"]["key"], removed["key"])
+
+    def test_diff_values(self):
+        old = {
+            "a": 1,
+            "b": [1, 2],
+            "c": math.nan,
+            "map": [{"key": "x", "value": 1}, {"key": "y", "value": 2}],
+        }
+        new = {
+            "a": 1.0,
+            "b": [1],
+            "c": math.nan,
+            "d": None,
+            "map": [{"key": "y", "value": 3}, {"key": "x", "value": 1}],
+        }
+        self.assertEqual(
+            diff_values(old, new),
+            [
+                {"path": ".a", "change": "changed", "old": 1, "new": 1.0},
+                {"path": ".b[1]", "change": "removed", "old": 2},
+                {"path": ".map[y]", "change": "changed", "old": 2, "new": 3},
+                {"path": ".d", "change": "added", "new": None},
+            ],
+        )
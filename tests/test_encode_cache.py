@@ -0,0 +1,82 @@
+import unittest
+
+from palworld_save_tools.encode_cache import EncodeCache
+from palworld_save_tools.gvas import GvasFile
+from palworld_save_tools.paltypes import PALWORLD_TYPE_HINTS
+from tests.helpers import ITEM_CONTAINER_PROPERTIES, read_gvas
+
+
+def first_item_slot(gvas_file):
+    containers = gvas_file.properties["worldSaveData"]["value"][
+        "ItemContainerSaveData"
+    ]["value"]
+    for container in containers:
+        for slot in container["value"]["Slots"]["value"]["values"]:
+            if slot["RawData"]["value"] is not None:
+                return slot["RawData"]["value"]
+
+
+class TestEncodeCache(unittest.TestCase):
+    def test_unchanged(self):
+        gvas_data = read_gvas()
+        cache = EncodeCache()
+        gvas_file = GvasFile.read(
+            gvas_data,
+            PALWORLD_TYPE_HINTS,
+            ITEM_CONTAINER_PROPERTIES,
+            encode_cache=cache,
+        )
+        self.assertGreater(len(cache), 0)
+        self.assertEqual(gvas_file.write(ITEM_CONTAINER_PROPERTIES, cache), gvas_data)
+        self.assertGreater(cache.hits, 0)
+        self.assertEqual(cache.misses, 0)
+        # The tree is not consumed by the custom encoders, so it can be written
+        # again
+        self.assertEqual(gvas_file.write(ITEM_CONTAINER_PROPERTIES, cache), gvas_data)
+
+    def test_modified(self):
+        gvas_data = read_gvas()
+        expected_file = GvasFile.read(
+            gvas_data, PALWORLD_TYPE_HINTS, ITEM_CONTAINER_PROPERTIES
+        )
+        first_item_slot(expected_file)["count"] += 1
+        expected = expected_file.write(ITEM_CONTAINER_PROPERTIES)
+        self.assertNotEqual(expected, gvas_data)
+        cache = EncodeCache()
+        gvas_file = GvasFile.read(
+            gvas_data,
+            PALWORLD_TYPE_HINTS,
+            ITEM_CONTAINER_PROPERTIES,
+            encode_cache=cache,
+        )
+        first_item_slot(gvas_file)["count"] += 1
+        self.assertEqual(gvas_file.write(ITEM_CONTAINER_PROPERTIES, cache), expected)
+        # Only ItemContainerSaveData, slots are too small to be recorded
+        self.assertEqual(cache.misses, 1)
+        self.assertGreater(cache.hits, 0)
+
+    def test_replaced(self):
+        gvas_data = read_gvas()
+        cache = EncodeCache()
+        gvas_file = GvasFile.read(
+            gvas_data,
+            PALWORLD_TYPE_HINTS,
+            ITEM_CONTAINER_PROPERTIES,
+            encode_cache=cache,
+        )
+        world = gvas_file.properties["worldSaveData"]["value"]
+        world["ItemContainerSaveData"] = dict(world["ItemContainerSaveData"])
+        self.assertEqual(gvas_file.write(ITEM_CONTAINER_PROPERTIES, cache), gvas_data)
+        self.assertEqual(cache.misses, 0)
+
+    def test_max_depth(self):
+        gvas_data = read_gvas()
+        shallow = EncodeCache(max_depth=1)
+        GvasFile.read(gvas_data, PALWORLD_TYPE_HINTS, {}, encode_cache=shallow)
+        self.assertEqual(len(shallow), 0)
+        default = EncodeCache()
+        GvasFile.read(gvas_data, PALWORLD_TYPE_HINTS, {}, encode_cache=default)
+        self.assertGreater(len(default), 0)
+        deep = EncodeCache(max_depth=4)
+        GvasFile.read(gvas_data, PALWORLD_TYPE_HINTS, {}, encode_cache=deep)
+        self.assertGreater(len(deep), len(default))
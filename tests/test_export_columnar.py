@@ -0,0 +1,77 @@
+import ast
+import json
+import os
+import shutil
+import struct
+import tempfile
+import unittest
+import uuid
+
+from palworld_save_tools.archive import UUID
+from palworld_save_tools.export.columnar import (
+    NPY_HEADER_SIZE,
+    export_sav_to_columns,
+    load_manifest,
+    read_column,
+    uuid_bytes,
+)
+
+
+class TestExportColumnar(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_export(self):
+        with self.assertLogs("palworld_save_tools.export.columnar", "WARNING"):
+            manifest = export_sav_to_columns("tests/testdata/Level.sav", self.tmp_dir)
+        self.assertEqual(manifest, load_manifest(self.tmp_dir))
+        tables = manifest["tables"]
+        self.assertEqual(tables["foliage_instances"]["rows"], 3669)
+        self.assertEqual(tables["map_models"]["rows"], 592)
+        for table in tables.values():
+            for column in table["columns"]:
+                self.assertEqual(column["shape"][0], table["rows"])
+        x = read_column(self.tmp_dir, "foliage_instances", "x")
+        self.assertEqual(len(x), 3669)
+        self.assertEqual(x[0], -350790.0)
+        ids = read_column(self.tmp_dir, "map_models", "map_object_id")
+        categories = tables["map_models"]["columns"][0]["categories"]
+        self.assertEqual(categories[ids[0]], "PickupItem_Stone")
+        instance_ids = read_column(self.tmp_dir, "map_models", "instance_id")
+        self.assertEqual(len(instance_ids), 592 * 16)
+
+    def test_npy_header(self):
+        export_sav_to_columns("tests/testdata/Level.sav", self.tmp_dir)
+        path = os.path.join(self.tmp_dir, "map_models", "instance_id.npy")
+        with open(path, "rb") as f:
+            data = f.read()
+        self.assertEqual(data[:8], b"\x93NUMPY\x01\x00")
+        (header_len,) = struct.unpack_from("<H", data, 8)
+        self.assertEqual(10 + header_len, NPY_HEADER_SIZE)
+        self.assertEqual(NPY_HEADER_SIZE % 64, 0)
+        header = ast.literal_eval(data[10:NPY_HEADER_SIZE].decode("latin1"))
+        self.assertEqual(
+            header, {"descr": "|u1", "fortran_order": False, "shape": (592, 16)}
+        )
+        self.assertEqual(len(data), NPY_HEADER_SIZE + 592 * 16)
+
+    def test_bin_format(self):
+        manifest = export_sav_to_columns(
+            "tests/testdata/Level.sav", self.tmp_dir, "bin"
+        )
+        path = os.path.join(self.tmp_dir, "foliage_instances", "hp.bin")
+        self.assertEqual(os.path.getsize(path), 3669 * 4)
+        with open(os.path.join(self.tmp_dir, "manifest.json")) as f:
+            self.assertEqual(json.load(f)["format"], "bin")
+        self.assertEqual(
+            len(read_column(self.tmp_dir, "foliage_instances", "hp")),
+            manifest["tables"]["foliage_instances"]["rows"],
+        )
+
+    def test_uuid_bytes(self):
+        value = "4ae156a3-487e-3049-fe81-3abf6ac0014e"
+        self.assertEqual(uuid_bytes(UUID.from_str(value)), uuid.UUID(value).bytes)
+        self.assertEqual(uuid_bytes(None), bytes(16))
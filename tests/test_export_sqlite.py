@@ -0,0 +1,140 @@
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+
+from palworld_save_tools.archive import UUID, FArchiveReader
+from palworld_save_tools.export.sqlite import (
+    character_rows,
+    export_sav_to_sqlite,
+    guild_rows,
+)
+from palworld_save_tools.gvas import GvasFile
+from palworld_save_tools.palsav import decompress_sav_to_gvas
+from palworld_save_tools.paltypes import PALWORLD_TYPE_HINTS
+from palworld_save_tools.rawdata import character, group
+
+GROUP_ID = UUID.from_str("11111111-2222-3333-4444-555555555555")
+PLAYER_UID = UUID.from_str("00000000-0000-0000-0000-000000000001")
+
+
+def raw_data(blob):
+    return {"value": {"values": list(blob)}}
+
+
+class TestExportSqlite(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.database = os.path.join(self.tmp_dir, "Level.sqlite")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_export(self):
+        with self.assertLogs("palworld_save_tools.export.sqlite", "WARNING"):
+            counts = export_sav_to_sqlite(
+                "tests/testdata/Level.sav", self.database, batch_size=100
+            )
+        self.assertEqual(counts["item_containers"], 500)
+        self.assertEqual(counts["map_objects"], 592)
+        self.assertGreater(counts["item_slots"], 0)
+        connection = sqlite3.connect(self.database)
+        try:
+            for table, count in counts.items():
+                self.assertEqual(
+                    connection.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0],
+                    count,
+                )
+            stones = connection.execute(
+                "SELECT SUM(count) FROM item_slots WHERE static_id = 'Stone'"
+            ).fetchone()[0]
+            self.assertGreater(stones, 0)
+            plan = connection.execute(
+                "EXPLAIN QUERY PLAN SELECT * FROM map_objects WHERE instance_id = ?",
+                ("a270412d-4453-e56e-48ff-51ae8a3a7086",),
+            ).fetchall()
+            self.assertIn("map_objects_instance_id", str(plan))
+        finally:
+            connection.close()
+
+    def test_character_rows(self):
+        with open("tests/testdata/Level.sav", "rb") as f:
+            gvas_data, _ = decompress_sav_to_gvas(f.read())
+        gvas_file = GvasFile.read(gvas_data, PALWORLD_TYPE_HINTS)
+        entry = gvas_file.properties["worldSaveData"]["value"][
+            "CharacterSaveParameterMap"
+        ]["value"][0]
+        reader = FArchiveReader(
+            bytes(entry["value"]["RawData"]["value"]["values"]), PALWORLD_TYPE_HINTS
+        )
+        blob = character.encode_bytes(
+            {
+                "object": reader.properties_until_end(),
+                "unknown_bytes": [0] * 4,
+                "group_id": GROUP_ID,
+                "trailing_bytes": [0] * 4,
+            }
+        )
+        entry["value"]["RawData"] = raw_data(blob)
+        [(table, row)] = list(character_rows(FArchiveReader(b""), entry))
+        self.assertEqual(table, "characters")
+        self.assertEqual(row[0], str(PLAYER_UID))
+        self.assertEqual(row[1], str(entry["key"]["InstanceId"]["value"]))
+        self.assertTrue(row[2])
+        self.assertEqual(row[5], 3)
+        self.assertEqual(row[10], str(GROUP_ID))
+        self.assertIn('"HP"', row[13])
+
+    def test_guild_rows(self):
+        blob = group.encode_bytes(
+            {
+                "group_type": "EPalGroupType::Guild",
+                "group_id": GROUP_ID,
+                "group_name": "Group",
+                "individual_character_handle_ids": [
+                    {"guid": PLAYER_UID, "instance_id": GROUP_ID}
+                ],
+                "org_type": 0,
+                "leading_bytes": [0] * 4,
+                "base_ids": [GROUP_ID],
+                "unknown_1": 0,
+                "base_camp_level": 3,
+                "map_object_instance_ids_base_camp_points": [],
+                "guild_name": "Guild",
+                "last_guild_name_modifier_player_uid": PLAYER_UID,
+                "unknown_2": [0] * 20,
+                "players": [
+                    {
+                        "player_uid": PLAYER_UID,
+                        "player_info": {
+                            "last_online_real_time": 42,
+                            "player_name": "Player",
+                        },
+                    }
+                ],
+                "trailing_bytes": [0] * 4,
+            }
+        )
+        entry = {
+            "key": GROUP_ID,
+            "value": {
+                "GroupType": {
+                    "value": {"type": "EPalGroupType", "value": "EPalGroupType::Guild"}
+                },
+                "RawData": raw_data(blob),
+            },
+        }
+        group_id = str(GROUP_ID)
+        self.assertEqual(
+            list(guild_rows(FArchiveReader(b""), entry)),
+            [
+                (
+                    "guilds",
+                    (group_id, "EPalGroupType::Guild", "Group", "Guild", 3),
+                ),
+                ("guild_characters", (group_id, str(PLAYER_UID), group_id)),
+                ("guild_players", (group_id, str(PLAYER_UID), "Player", 42)),
+                ("guild_base_camps", (group_id, group_id)),
+            ],
+        )
@@ -1,5 +1,6 @@
 import base64
 import json
+import mmap
 import unittest
 
 from parameterized import parameterized
@@ -7,8 +8,13 @@ from parameterized import parameterized
 from palworld_save_tools.archive import UUID, FArchiveReader, FArchiveWriter
 from palworld_save_tools.gvas import GvasFile, GvasHeader
 from palworld_save_tools.json_tools import CustomEncoder
-from palworld_save_tools.palsav import decompress_sav_to_gvas
+from palworld_save_tools.palsav import (
+    decompress_sav_to_buffer,
+    decompress_sav_to_gvas,
+    release_buffer,
+)
 from palworld_save_tools.paltypes import PALWORLD_CUSTOM_PROPERTIES, PALWORLD_TYPE_HINTS
+from palworld_save_tools.path_filter import PathFilter
 
 
 class TestGvas(unittest.TestCase):
@@ -160,3 +166,60 @@ class TestGvas(unittest.TestCase):
             new_gvas_data,
             "sav does not match expected after roundtrip",
         )
+
+    def test_sav_buffer(self):
+        with open("tests/testdata/LevelMeta.sav", "rb") as f:
+            data = f.read()
+        gvas_data, save_type = decompress_sav_to_gvas(data)
+        buffer, buffer_save_type = decompress_sav_to_buffer(data)
+        self.assertIsInstance(buffer, memoryview)
+        self.assertEqual(buffer_save_type, save_type)
+        self.assertEqual(buffer, gvas_data)
+        gvas_file = GvasFile.read(
+            buffer, PALWORLD_TYPE_HINTS, PALWORLD_CUSTOM_PROPERTIES
+        )
+        self.assertEqual(
+            gvas_file.write(PALWORLD_CUSTOM_PROPERTIES),
+            gvas_data,
+            "sav does not match expected after roundtrip",
+        )
+        # An mmap is closed once the view of it, as returned for PLM saves,
+        # has been read and released
+        owner = mmap.mmap(-1, len(gvas_data) + 64)
+        owner[: len(gvas_data)] = gvas_data
+        buffer = memoryview(owner)[: len(gvas_data)]
+        gvas_file = GvasFile.read(
+            buffer, PALWORLD_TYPE_HINTS, PALWORLD_CUSTOM_PROPERTIES
+        )
+        release_buffer(buffer)
+        self.assertTrue(owner.closed)
+        self.assertEqual(gvas_file.write(PALWORLD_CUSTOM_PROPERTIES), gvas_data)
+
+    @parameterized.expand(
+        [
+            ([".worldSaveData.CharacterSaveParameterMap.**"], []),
+            ([], [".worldSaveData.FoliageGridSaveDataMap", ".**.RawData"]),
+            ([".worldSaveData.GroupSaveDataMap"], [".**.RawData"]),
+        ]
+    )
+    def test_path_filter_roundtrip(self, include, exclude):
+        with open("tests/testdata/Level.sav", "rb") as f:
+            data = f.read()
+        gvas_data, _ = decompress_sav_to_gvas(data)
+        gvas_file = GvasFile.read(
+            gvas_data, PALWORLD_TYPE_HINTS, {}, path_filter=PathFilter(include, exclude)
+        )
+        world = gvas_file.properties["worldSaveData"]["value"]
+        for name, prop in world.items():
+            skipped = "skipped_bytes" in prop
+            self.assertEqual(
+                skipped,
+                not PathFilter(include, exclude).wants(f".worldSaveData.{name}"),
+                name,
+            )
+        js = json.loads(json.dumps(gvas_file.dump(), cls=CustomEncoder))
+        self.assertEqual(
+            GvasFile.load(js).write({}),
+            gvas_data,
+            "sav does not match expected after roundtrip",
+        )
@@ -0,0 +1,97 @@
+import os
+import shutil
+import tempfile
+import unittest
+from collections import defaultdict
+
+from parameterized import parameterized
+
+from palworld_save_tools.archive import FArchiveReader, FArchiveWriter
+from palworld_save_tools.gvas import GvasFile
+from palworld_save_tools.index import (
+    build_index,
+    find_entries,
+    index_path,
+    index_sav_file,
+    load_index,
+    read_entry,
+    read_entry_value,
+)
+from palworld_save_tools.palsav import decompress_sav_to_gvas
+from palworld_save_tools.paltypes import PALWORLD_TYPE_HINTS
+
+
+def read_gvas(file_name):
+    with open("tests/testdata/" + file_name, "rb") as f:
+        return decompress_sav_to_gvas(f.read())[0]
+
+
+class TestIndex(unittest.TestCase):
+    @parameterized.expand([(1,), (3,), (5,)])
+    def test_entries_are_contiguous(self, max_depth):
+        gvas = read_gvas("Level.sav")
+        index = build_index(gvas, max_depth, PALWORLD_TYPE_HINTS)
+        entries = index["entries"]
+        self.assertTrue(all(entry["depth"] <= max_depth for entry in entries))
+        top_level = [entry for entry in entries if entry["parent"] == -1]
+        self.assertEqual(top_level[0]["offset"], index["header_size"])
+        children_of = defaultdict(list)
+        for entry in entries:
+            children_of[entry["parent"]].append(entry)
+        for parent, children in children_of.items():
+            for previous, entry in zip(children, children[1:]):
+                # Siblings are in order, and entries of the same kind
+                # follow each other directly, except for the properties of a
+                # map key and value that are separated by a None terminator
+                self.assertLessEqual(previous["end"], entry["offset"])
+                if entry["kind"] != "property":
+                    self.assertEqual(previous["end"], entry["offset"])
+            for entry in children:
+                if parent != -1:
+                    self.assertGreaterEqual(entry["offset"], entries[parent]["offset"])
+                    self.assertLessEqual(entry["end"], entries[parent]["end"])
+
+    def test_read_entry(self):
+        gvas = read_gvas("Level.sav")
+        index = build_index(gvas, 3, PALWORLD_TYPE_HINTS)
+        gvas_file = GvasFile.read(gvas, PALWORLD_TYPE_HINTS, {})
+        world = gvas_file.properties["worldSaveData"]["value"]
+        for entry in find_entries(index, ".worldSaveData.GroupSaveDataMap", "property"):
+            # A property entry holds its name and value, so it can be decoded
+            # on its own as a list of properties
+            reader = FArchiveReader(
+                read_entry(gvas, entry) + b"\x05\x00\x00\x00None\x00",
+                PALWORLD_TYPE_HINTS,
+            )
+            properties = reader.properties_until_end(".worldSaveData")
+            self.assertEqual(properties["GroupSaveDataMap"], world["GroupSaveDataMap"])
+        map_entries = find_entries(
+            index, ".worldSaveData.CharacterSaveParameterMap", "map_entry"
+        )
+        expected = world["CharacterSaveParameterMap"]["value"]
+        self.assertEqual(len(map_entries), len(expected))
+        for entry, expected_entry in zip(map_entries, expected):
+            reader = FArchiveReader(read_entry_value(gvas, entry), PALWORLD_TYPE_HINTS)
+            self.assertEqual(
+                reader.properties_until_end(
+                    ".worldSaveData.CharacterSaveParameterMap.Value"
+                ),
+                expected_entry["value"],
+            )
+            self.assertTrue(reader.eof())
+
+    def test_persisted_index(self):
+        with tempfile.TemporaryDirectory() as directory:
+            sav_path = os.path.join(directory, "Level.sav")
+            shutil.copy("tests/testdata/Level.sav", sav_path)
+            self.assertIsNone(load_index(sav_path))
+            index = index_sav_file(sav_path, 2)
+            self.assertTrue(os.path.exists(index_path(sav_path)))
+            self.assertEqual(load_index(sav_path), index)
+            # A deeper index than the saved one has to be rebuilt
+            self.assertIsNone(load_index(sav_path, 3))
+            self.assertEqual(index_sav_file(sav_path, 3)["max_depth"], 3)
+            # As does an index of a save that changed since
+            with open(sav_path, "ab") as f:
+                f.write(b"\x00")
+            self.assertIsNone(load_index(sav_path))
@@ -0,0 +1,61 @@
+import sys
+import unittest
+
+from palworld_save_tools.gvas import GvasFile
+from palworld_save_tools.memory import (
+    MEMORY_KINDS,
+    TreeMemory,
+    read_with_allocations,
+    tree_memory,
+)
+from palworld_save_tools.paltypes import PALWORLD_CUSTOM_PROPERTIES, PALWORLD_TYPE_HINTS
+from palworld_save_tools.synthetic import WorldSize, generate_gvas
+
+
+class TestMemory(unittest.TestCase):
+    def setUp(self):
+        self.gvas = generate_gvas(
+            WorldSize(
+                players=2,
+                pals_per_player=2,
+                guilds=1,
+                map_objects=3,
+                foliage_cells=1,
+                foliage_instances_per_cell=4,
+                containers=2,
+                slots_per_container=3,
+            )
+        )
+
+    def read(self):
+        return GvasFile.read(self.gvas, PALWORLD_TYPE_HINTS, PALWORLD_CUSTOM_PROPERTIES)
+
+    def test_tree_memory(self):
+        properties = self.read().properties
+        paths = tree_memory(properties)
+        for counts in paths.values():
+            self.assertEqual(tuple(counts), MEMORY_KINDS)
+        self.assertNotIn(".", paths)
+        self.assertEqual(paths[""]["dict"], sys.getsizeof(properties))
+        slots = paths[".worldSaveData.ItemContainerSaveData.Value.Slots.Slots.RawData"]
+        self.assertGreater(slots["dict"], 0)
+        self.assertGreater(slots["str"], 0)
+        self.assertGreater(
+            paths[".worldSaveData.FoliageGridSaveDataMap.Key.X"]["dict"], 0
+        )
+        self.assertIn(".worldSaveData.MapObjectSaveData", paths)
+        self.assertGreater(paths[".worldSaveData.MapObjectSaveData"]["UUID"], 0)
+        # Objects reachable twice are counted once
+        memory = TreeMemory()
+        memory.add_properties(properties)
+        total = sum(memory.totals().values())
+        memory.add_properties(properties)
+        self.assertEqual(sum(memory.totals().values()), total)
+
+    def test_allocations(self):
+        gvas_file, modules = read_with_allocations(self.read)
+        self.assertIn("worldSaveData", gvas_file.properties)
+        self.assertIn("palworld_save_tools.rawdata.item_container_slots", modules)
+        self.assertIn("palworld_save_tools.rawdata.map_object", modules)
+        for counts in modules.values():
+            self.assertGreater(counts["blocks"], 0)
@@ -0,0 +1,70 @@
+import json
+import pickle
+import unittest
+
+from palworld_save_tools.archive import UUID
+from palworld_save_tools.gvas import GvasFile
+from palworld_save_tools.json_tools import CustomEncoder
+from palworld_save_tools.memory import tree_memory
+from palworld_save_tools.nodes import StructNode, ValueNode
+from palworld_save_tools.paltypes import PALWORLD_CUSTOM_PROPERTIES, PALWORLD_TYPE_HINTS
+from palworld_save_tools.specializer import StructSpecializer
+from palworld_save_tools.synthetic import WorldSize, generate_gvas
+
+
+def dump(gvas_file):
+    return json.dumps(gvas_file.dump(), cls=CustomEncoder)
+
+
+class TestNodes(unittest.TestCase):
+    def setUp(self):
+        self.gvas = generate_gvas(WorldSize(players=2, pals_per_player=10, guilds=1))
+
+    def read(self, **kwargs):
+        return GvasFile.read(
+            self.gvas, PALWORLD_TYPE_HINTS, PALWORLD_CUSTOM_PROPERTIES, **kwargs
+        )
+
+    def test_node(self):
+        node = ValueNode(None, 5, "IntProperty")
+        self.assertEqual(list(node), ["id", "value", "type"])
+        self.assertEqual(node, {"id": None, "value": 5, "type": "IntProperty"})
+        self.assertIn("value", node)
+        self.assertNotIn("custom_type", node)
+        self.assertEqual(node.get("id", 1), None)
+        self.assertEqual(node.get("custom_type"), None)
+        node["value"] = 6
+        self.assertEqual(node["value"], 6)
+        with self.assertRaises(KeyError):
+            node["array_type"]
+        with self.assertRaises(KeyError):
+            node["custom_type"] = "path"
+        guid = UUID(bytes(range(16)))
+        struct = StructNode("Guid", guid, None, guid)
+        self.assertEqual(struct.to_dict()["type"], "StructProperty")
+        self.assertEqual(pickle.loads(pickle.dumps(struct)), struct)
+
+    def test_compact(self):
+        expected = dump(self.read())
+        gvas_file = self.read(compact=True)
+        properties = gvas_file.properties["worldSaveData"]["value"]
+        self.assertIsInstance(gvas_file.properties["worldSaveData"], StructNode)
+        # Custom properties stay dicts, as their encoders add and remove keys
+        entry = properties["CharacterSaveParameterMap"]["value"][0]
+        self.assertIsInstance(entry["value"]["RawData"], dict)
+        self.assertEqual(dump(gvas_file), expected)
+        self.assertEqual(dump(pickle.loads(pickle.dumps(gvas_file))), expected)
+        self.assertGreater(
+            tree_memory(gvas_file.properties)[".worldSaveData"]["node"], 0
+        )
+        self.assertEqual(gvas_file.write(PALWORLD_CUSTOM_PROPERTIES), self.gvas)
+
+    def test_specialized(self):
+        expected = dump(self.read())
+        specializer = StructSpecializer(threshold=4)
+        for _ in range(2):
+            gvas_file = self.read(compact=True, specializer=specializer)
+            self.assertEqual(dump(gvas_file), expected)
+            self.assertEqual(gvas_file.write(PALWORLD_CUSTOM_PROPERTIES), self.gvas)
+        self.assertIn(".SaveParameter", specializer.specialized_paths())
+        self.assertIn("ValueNode(", specializer.sources[".SaveParameter"])
@@ -0,0 +1,85 @@
+import copy
+import unittest
+
+from palworld_save_tools.gvas import GvasFile
+from palworld_save_tools.paltypes import PALWORLD_TYPE_HINTS
+from palworld_save_tools.patch import (
+    OP_DELETE,
+    OP_INSERT,
+    OP_REPLACE,
+    apply_patch,
+    decode_patch,
+    encode_patch,
+    make_patch,
+)
+from tests.helpers import read_gvas
+
+
+class TestPatch(unittest.TestCase):
+    def test_round_trip(self):
+        gvas_data = read_gvas("Level.sav")
+        gvas_file = GvasFile.read(gvas_data, PALWORLD_TYPE_HINTS)
+        world = gvas_file.properties["worldSaveData"]["value"]
+        world["GameTimeSaveData"]["value"]["RealDateTimeTicks"]["value"] += 5
+        containers = world["ItemContainerSaveData"]["value"]
+        del containers[2]
+        containers.append(copy.deepcopy(containers[0]))
+        items = world["DynamicItemSaveData"]["value"]["values"]
+        items.insert(1, copy.deepcopy(items[4]))
+        modified = gvas_file.write()
+        patch = make_patch(gvas_data, modified, PALWORLD_TYPE_HINTS)
+        self.assertEqual(
+            [(op["op"], op["path"]) for op in patch["ops"]],
+            [
+                (OP_DELETE, ".worldSaveData.ItemContainerSaveData[#2]"),
+                (OP_INSERT, ".worldSaveData.ItemContainerSaveData[#499]"),
+                (OP_INSERT, ".worldSaveData.DynamicItemSaveData[1]"),
+                (OP_REPLACE, ".worldSaveData.GameTimeSaveData.RealDateTimeTicks"),
+            ],
+        )
+        encoded = encode_patch(patch)
+        self.assertLess(len(encoded), 4096)
+        self.assertEqual(decode_patch(encoded), patch)
+        self.assertEqual(apply_patch(gvas_data, encoded), modified)
+        # The other way around
+        self.assertEqual(
+            apply_patch(modified, make_patch(modified, gvas_data, PALWORLD_TYPE_HINTS)),
+            gvas_data,
+        )
+
+    def test_reordered(self):
+        gvas_data = read_gvas("Level.sav")
+        gvas_file = GvasFile.read(gvas_data, PALWORLD_TYPE_HINTS)
+        characters = gvas_file.properties["worldSaveData"]["value"][
+            "CharacterSaveParameterMap"
+        ]["value"]
+        characters.insert(3, characters.pop(0))
+        modified = gvas_file.write()
+        patch = make_patch(gvas_data, modified, PALWORLD_TYPE_HINTS)
+        self.assertEqual(
+            [(op["op"], op["path"]) for op in patch["ops"]],
+            [(OP_REPLACE, ".worldSaveData.CharacterSaveParameterMap")],
+        )
+        self.assertEqual(apply_patch(gvas_data, patch), modified)
+
+    def test_identical(self):
+        gvas_data = read_gvas("Level.sav")
+        patch = make_patch(gvas_data, gvas_data, PALWORLD_TYPE_HINTS)
+        self.assertEqual(patch["ops"], [])
+        self.assertEqual(apply_patch(gvas_data, encode_patch(patch)), gvas_data)
+
+    def test_mismatch(self):
+        gvas_data = read_gvas("Level.sav")
+        gvas_file = GvasFile.read(gvas_data, PALWORLD_TYPE_HINTS)
+        ticks = gvas_file.properties["worldSaveData"]["value"]["GameTimeSaveData"][
+            "value"
+        ]["RealDateTimeTicks"]
+        ticks["value"] += 5
+        patch = make_patch(gvas_data, gvas_file.write(), PALWORLD_TYPE_HINTS)
+        ticks["value"] += 5
+        with self.assertRaisesRegex(Exception, "RealDateTimeTicks has changed"):
+            apply_patch(gvas_file.write(), patch)
+        with self.assertRaisesRegex(Exception, "bytes, got"):
+            apply_patch(gvas_data[:-1], patch)
+        with self.assertRaisesRegex(Exception, "Not a save patch"):
+            apply_patch(gvas_data, b"not a patch")
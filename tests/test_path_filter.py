@@ -0,0 +1,70 @@
+import unittest
+
+from parameterized import parameterized
+
+from palworld_save_tools.path_filter import PathFilter
+
+
+class TestPathFilter(unittest.TestCase):
+    @parameterized.expand(
+        [
+            # Matches, descendants and ancestors of include globs are decoded
+            (".worldSaveData.CharacterSaveParameterMap.**", ".worldSaveData", True),
+            (
+                ".worldSaveData.CharacterSaveParameterMap.**",
+                ".worldSaveData.CharacterSaveParameterMap.Value.RawData",
+                True,
+            ),
+            (
+                ".worldSaveData.CharacterSaveParameterMap.**",
+                ".worldSaveData.GroupSaveDataMap",
+                False,
+            ),
+            (
+                ".worldSaveData.CharacterSaveParameterMap",
+                ".worldSaveData.CharacterSaveParameterMap.Value.RawData",
+                True,
+            ),
+            (".worldSaveData.*Map", ".worldSaveData.GroupSaveDataMap", True),
+            (".worldSaveData.*Map", ".worldSaveData.MapObjectSaveData", False),
+            (".**.RawData", ".worldSaveData.GroupSaveDataMap.Value.RawData", True),
+            (".**.RawData", ".worldSaveData.GroupSaveDataMap.Value.Other", True),
+            (".**.RawData", ".version", True),
+            (".worldSaveData.*.Value.RawData", ".timestamp", False),
+        ]
+    )
+    def test_include(self, pattern, path, expected):
+        self.assertEqual(PathFilter(include=[pattern]).wants(path), expected)
+
+    @parameterized.expand(
+        [
+            (".worldSaveData.FoliageGridSaveDataMap", ".worldSaveData", True),
+            (
+                ".worldSaveData.FoliageGridSaveDataMap",
+                ".worldSaveData.FoliageGridSaveDataMap",
+                False,
+            ),
+            (
+                ".worldSaveData.FoliageGridSaveDataMap",
+                ".worldSaveData.FoliageGridSaveDataMap.Value.ModelMap",
+                False,
+            ),
+            (".**.RawData", ".worldSaveData.GroupSaveDataMap.Value.RawData", False),
+            (".**.RawData", ".worldSaveData.GroupSaveDataMap.Value.Other", True),
+        ]
+    )
+    def test_exclude(self, pattern, path, expected):
+        self.assertEqual(PathFilter(exclude=[pattern]).wants(path), expected)
+
+    def test_exclude_wins(self):
+        path_filter = PathFilter(
+            include=[".worldSaveData.**"],
+            exclude=[".worldSaveData.FoliageGridSaveDataMap"],
+        )
+        self.assertTrue(path_filter.wants(".worldSaveData.GroupSaveDataMap"))
+        self.assertFalse(path_filter.wants(".worldSaveData.FoliageGridSaveDataMap"))
+        self.assertFalse(path_filter.wants(".timestamp"))
+
+    def test_empty(self):
+        self.assertFalse(PathFilter())
+        self.assertTrue(PathFilter().wants(".worldSaveData"))
@@ -0,0 +1,70 @@
+import os
+import tempfile
+import unittest
+import zlib
+
+from parameterized import parameterized
+
+from palworld_save_tools.archive import FArchiveReader
+from palworld_save_tools.gvas import GvasHeader
+from palworld_save_tools.palsav import decompress_sav_to_gvas
+from palworld_save_tools.probe import probe_sav, probe_sav_file
+
+
+class TestProbe(unittest.TestCase):
+    @parameterized.expand(
+        [
+            ("Level.sav",),
+            ("LevelMeta.sav",),
+            ("LocalData.sav",),
+            ("WorldOption.sav",),
+            ("00000000000000000000000000000001.sav",),
+            ("unicode-saves/Level.sav",),
+        ]
+    )
+    def test_probe_matches_full_decode(self, file_name):
+        path = "tests/testdata/" + file_name
+        with open(path, "rb") as f:
+            data = f.read()
+        gvas_data, save_type = decompress_sav_to_gvas(data)
+        header = GvasHeader.read(FArchiveReader(gvas_data))
+        info = probe_sav_file(path, prefix_size=64)
+        self.assertEqual(info["save_type"], save_type)
+        self.assertEqual(info["uncompressed_size"], len(gvas_data))
+        self.assertEqual(info["file_size"], len(data))
+        self.assertEqual(info["save_game_class_name"], header.save_game_class_name)
+        self.assertEqual(
+            info["engine_version"],
+            f"{header.engine_version_major}.{header.engine_version_minor}."
+            f"{header.engine_version_patch}-{header.engine_version_changelist}"
+            f"+{header.engine_version_branch}",
+        )
+        self.assertEqual(
+            probe_sav(data), {k: v for k, v in info.items() if k != "file_size"}
+        )
+
+    def test_probe_truncated(self):
+        with open("tests/testdata/Level.sav", "rb") as f:
+            data = f.read()
+        self.assertEqual(
+            probe_sav(data[:8192])["save_game_class_name"],
+            "/Script/Pal.PalWorldSaveGame",
+        )
+        with self.assertRaises(ValueError):
+            probe_sav(data[:40])
+
+    def test_probe_file_not_gvas(self):
+        payload = b"not a gvas file" * 1000
+        compressed = zlib.compress(payload)
+        data = (
+            len(payload).to_bytes(4, "little")
+            + len(compressed).to_bytes(4, "little")
+            + b"PlZ\x32"
+            + zlib.compress(compressed)
+        )
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "broken.sav")
+            with open(path, "wb") as f:
+                f.write(data)
+            with self.assertRaises(ValueError):
+                probe_sav_file(path, prefix_size=64)
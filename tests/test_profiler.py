@@ -0,0 +1,64 @@
+import json
+import unittest
+
+from palworld_save_tools.gvas import GvasFile
+from palworld_save_tools.paltypes import PALWORLD_CUSTOM_PROPERTIES, PALWORLD_TYPE_HINTS
+from palworld_save_tools.profiler import PropertyProfiler
+from palworld_save_tools.synthetic import WorldSize, generate_gvas
+
+
+class TestProfiler(unittest.TestCase):
+    def test_read_write(self):
+        gvas = generate_gvas(
+            WorldSize(
+                players=2,
+                pals_per_player=3,
+                guilds=1,
+                map_objects=4,
+                foliage_cells=2,
+                foliage_instances_per_cell=5,
+                containers=3,
+                slots_per_container=2,
+            )
+        )
+        profiler = PropertyProfiler()
+        gvas_file = GvasFile.read(
+            gvas, PALWORLD_TYPE_HINTS, PALWORLD_CUSTOM_PROPERTIES, profiler=profiler
+        )
+        written = gvas_file.write(PALWORLD_CUSTOM_PROPERTIES, profiler=profiler)
+        self.assertEqual(written, gvas)
+        self.assertEqual(profiler.stack, [])
+        self.assertEqual(profiler.paths, [""])
+        for operation in ("read", "write"):
+            stats = profiler.stats[operation]
+            characters = stats[".worldSaveData.CharacterSaveParameterMap.Value.RawData"]
+            # The raw value read by the custom decoder is not counted again
+            self.assertEqual(characters.calls, 8)
+            self.assertTrue(characters.custom)
+            slots = stats[
+                ".worldSaveData.ItemContainerSaveData.Value.Slots.Slots.RawData"
+            ]
+            self.assertEqual(slots.calls, 6)
+            world = stats[".worldSaveData"]
+            self.assertEqual(world.calls, 1)
+            self.assertFalse(world.custom)
+            self.assertLessEqual(world.tottime, world.cumtime)
+            self.assertAlmostEqual(
+                sum(s.tottime for s in stats.values()),
+                sum(
+                    stats[p].cumtime
+                    for p in (".Version", ".Timestamp", ".worldSaveData")
+                ),
+            )
+        for path, stats in profiler.stats["write"].items():
+            self.assertEqual(stats.bytes, profiler.stats["read"][path].bytes, path)
+        decoder = profiler.stats["read"]["character.decode_bytes"]
+        self.assertEqual(decoder.calls, 8)
+        self.assertTrue(decoder.custom)
+        table = profiler.table("calls", limit=3)
+        self.assertEqual(len(table.splitlines()), 8)
+        self.assertIn("InstanceDataMap.Value.RawData (custom)", table)
+        dump = json.loads(json.dumps(profiler.dump()))
+        self.assertEqual(dump["read"][".worldSaveData"]["calls"], 1)
+        with self.assertRaises(Exception):
+            profiler.table("unknown")
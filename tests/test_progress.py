@@ -0,0 +1,73 @@
+import io
+import unittest
+
+from palworld_save_tools.gvas import GvasFile
+from palworld_save_tools.paltypes import PALWORLD_CUSTOM_PROPERTIES, PALWORLD_TYPE_HINTS
+from palworld_save_tools.progress import Progress, ProgressBar, format_duration
+from palworld_save_tools.synthetic import WorldSize, generate_gvas
+
+
+class TestProgress(unittest.TestCase):
+    def test_read_write(self):
+        gvas = generate_gvas(
+            WorldSize(
+                players=2,
+                pals_per_player=3,
+                guilds=1,
+                map_objects=4,
+                foliage_cells=2,
+                foliage_instances_per_cell=5,
+                containers=3,
+                slots_per_container=2,
+            )
+        )
+        reports = []
+        progress = Progress(
+            lambda p: reports.append((p.stage, p.position, p.total)),
+            interval=0,
+            check_every=1,
+        )
+        gvas_file = GvasFile.read(
+            gvas, PALWORLD_TYPE_HINTS, PALWORLD_CUSTOM_PROPERTIES, progress=progress
+        )
+        written = gvas_file.write(PALWORLD_CUSTOM_PROPERTIES, progress=progress)
+        self.assertEqual(written, gvas)
+        self.assertEqual(progress.writers, [])
+        for stage in ("read", "write"):
+            positions = [p for s, p, _ in reports if s == stage]
+            self.assertGreater(len(positions), 10)
+            self.assertEqual(positions, sorted(positions))
+            self.assertEqual(positions[0], 0)
+            self.assertEqual(positions[-1], len(gvas))
+        # The write keeps the size of the save read as its total
+        self.assertEqual({t for _, _, t in reports}, {len(gvas)})
+        self.assertTrue(progress.done)
+        self.assertEqual(progress.eta(), 0)
+
+    def test_throttled(self):
+        reports = []
+        progress = Progress(reports.append, interval=3600, check_every=4)
+        progress.start("read", 100)
+        for position in range(10):
+            progress.countdown -= 1
+            if progress.countdown <= 0:
+                progress.update(position)
+        self.assertEqual(progress.countdown, 2)
+        progress.finish(100)
+        self.assertEqual(len(reports), 2)
+
+    def test_progress_bar(self):
+        stream = io.StringIO()
+        bar = ProgressBar(stream, width=10)
+        progress = Progress(bar, interval=0)
+        progress.start("read", 2000000)
+        progress.start_time -= 2
+        progress.update(1000000)
+        progress.start("write")
+        lines = stream.getvalue().splitlines()
+        self.assertEqual(lines[0], "read     [..........]   0% 0.0/2.0MB")
+        self.assertEqual(
+            lines[1], "read     [#####.....]  50% 1.0/2.0MB 0.5MB/s ETA 0:02"
+        )
+        self.assertEqual(lines[2], "write    0.0MB")
+        self.assertEqual(format_duration(3725), "1:02:05")
@@ -1,12 +1,14 @@
 import base64
 import json
+import math
+import struct
 import unittest
 
 from parameterized import parameterized
 
 from palworld_save_tools.archive import FArchiveReader
 from palworld_save_tools.json_tools import CustomEncoder
-from palworld_save_tools.rawdata import character, foliage_model_instance, group
+from palworld_save_tools.rawdata import character, foliage_model_instance, group, work
 
 
 class TestRawData(unittest.TestCase):
@@ -73,3 +75,99 @@ class TestRawData(unittest.TestCase):
         reparsed_properties = json.loads(json_str)
         reconverted_data = foliage_model_instance.encode_bytes(reparsed_properties)
         self.assertEqual(test_data, reconverted_data)
+
+    def test_foliage_model_instance_batch(self):
+        blobs = [
+            base64.b64decode(test_base64)
+            for test_base64 in [
+                "MU3+sPafPE2sV9dUbyBGsgH7/gE2hQGr+lQAAABE7v+bJga7OQAAAIA/6AMAAA==",
+                "iaUtjCpXgUK+rzl270FLJgABfjQAVAAAACny/wkpBqw5AKCANj/oAwAA",
+                "LnyQHlPRt0apn4KAPLlMwwEvBgHzmgGK+lQAAAAlzv8IHwaTOwAAAIA/MgAAAA==",
+                "hBhgfhCg8UObz9lwvgNdvwEgBgGa1wGr/FQAAABj6/ioDv+D+f9of4A/MgAAAA==",
+                "DofBUL77wk2bQOkJ3Ayh/wABEXkATwAAAGfjOjleGHWqgD/oAwAA",
+            ]
+        ]
+        guid = bytes(range(16))
+        # Trailing bytes, and locations stored as floats and as doubles
+        blobs.append(blobs[0] + b"\x01\x02")
+        blobs.append(guid + b"\x00\x00\x00" + struct.pack("<I3ffi", 0, 1, 2, 3, 1, 50))
+        blobs.append(
+            guid + b"\x00\x00\x00" + struct.pack("<I3dfi", 1 << 6, 1, 2, 3, 1, 50)
+        )
+        reader = FArchiveReader(b"")
+        expected = [foliage_model_instance.decode_bytes(reader, b) for b in blobs]
+        use_numpy = [False]
+        if foliage_model_instance.numpy is not None:
+            use_numpy.append(True)
+        for numpy in use_numpy:
+            batch = foliage_model_instance.decode_batch(reader, blobs, numpy)
+            for i, properties in enumerate(expected):
+                transform = properties["world_transform"]
+                self.assertEqual(
+                    [batch[field][i] for field in foliage_model_instance.BATCH_FIELDS],
+                    [
+                        *transform["rotator"].values(),
+                        *transform["location"].values(),
+                        transform["scale_x"],
+                        properties["hp"],
+                    ],
+                )
+                self.assertEqual(
+                    batch["model_instance_id"][i], properties["model_instance_id"]
+                )
+                self.assertEqual(
+                    batch["unknown_data"].get(i), properties.get("unknown_data")
+                )
+
+    def test_foliage_model_instance_batch_infinite_scale(self):
+        packed = base64.b64decode(
+            "iaUtjCpXgUK+rzl270FLJgABfjQAVAAAACny/wkpBqw5AKCANj/oAwAA"
+        )
+        guid = bytes(range(16))
+        blobs = [
+            packed[:-8] + struct.pack("<fi", math.inf, 1000),
+            packed[:-8] + struct.pack("<fi", 2, 1000),
+            guid + b"\x00\x00\x00" + struct.pack("<I3ffi", 0, 1, 2, 3, -math.inf, 50),
+        ]
+        reader = FArchiveReader(b"", allow_nan=False)
+        expected = [
+            foliage_model_instance.decode_bytes(reader, b)["world_transform"]["scale_x"]
+            for b in blobs
+        ]
+        self.assertEqual(expected, [None, 2, None])
+        batch = foliage_model_instance.decode_batch(reader, blobs, use_numpy=False)
+        self.assertEqual(batch["scale_x"], expected)
+        if foliage_model_instance.numpy is not None:
+            batch = foliage_model_instance.decode_batch(reader, blobs, use_numpy=True)
+            self.assertEqual(
+                [None if math.isnan(x) else x for x in batch["scale_x"].tolist()],
+                expected,
+            )
+
+    def test_work_round_trip(self):
+        guid = bytes(range(16))
+        test_data = (
+            guid
+            + struct.pack("<14d", *[i / 4 for i in range(14)])
+            + guid * 3
+            + b"\x01"
+            + struct.pack("<I6d", 1, 1.5, 2.5, 3.5, 0.0, 1.0, 0.0)
+            + b"\x02"
+            + struct.pack("<i", 5)
+            + b"Work\x00"
+            + b"\x00\x01"
+            + struct.pack("<3If", 1, 0, 1, 100.0)
+            + b"\x00"
+        )
+        properties = work.decode_bytes(
+            FArchiveReader(b""), test_data, "EPalWorkableType::Booth"
+        )
+        bounds = properties["workable_bounds"]
+        self.assertEqual(bounds["rotation"], {"x": 0.75, "y": 1.0, "z": 1.25, "w": 1.5})
+        self.assertEqual(bounds["box_sphere_bounds"]["sphere_radius"], 3.25)
+        self.assertEqual(properties["required_work_amount"], 100.0)
+        json_str = json.dumps(properties, cls=CustomEncoder)
+        reconverted_data = work.encode_bytes(
+            json.loads(json_str), "EPalWorkableType::Booth"
+        )
+        self.assertEqual(test_data, reconverted_data)
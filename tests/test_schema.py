@@ -0,0 +1,240 @@
+import json
+import math
+import struct
+import unittest
+
+from palworld_save_tools.archive import UUID, FArchiveReader, FArchiveWriter
+from palworld_save_tools.json_tools import CustomEncoder
+from palworld_save_tools.rawdata import group, item_container_slots, map_model
+from palworld_save_tools.rawdata.schema import (
+    FTRANSFORM,
+    ByteList,
+    Param,
+    Rest,
+    Schema,
+    TArray,
+    When,
+)
+
+GUID = UUID(bytes(range(16)))
+OTHER_GUID = UUID(bytes(range(16, 32)))
+
+
+def round_trip(test, decode_bytes, encode_bytes, data, *params):
+    properties = decode_bytes(FArchiveReader(b""), data, *params)
+    reparsed = json.loads(json.dumps(properties, cls=CustomEncoder))
+    test.assertEqual(encode_bytes(reparsed), data)
+    return properties
+
+
+class TestSchema(unittest.TestCase):
+    def test_fixed_runs(self):
+        schema = Schema(
+            "test",
+            [
+                ("id", "guid"),
+                ("hp", [("current", "i32"), ("max", "i32")]),
+                ("name", "fstring"),
+                ("transform", FTRANSFORM),
+                ("flag", "bool32"),
+                ("rest", Rest()),
+            ],
+        )
+        # The Guid and ints are read in one unpack, as are the transform and flag
+        self.assertEqual(schema.source.count("reader.fixed("), 1)
+        self.assertEqual(schema.source.count("_unpack"), 1)
+        writer = FArchiveWriter()
+        writer.guid(GUID)
+        writer.i32(5)
+        writer.i32(10)
+        writer.fstring("name")
+        for value in range(10):
+            writer.double(value)
+        writer.u32(1)
+        writer.write(b"\x01\x02")
+        data = writer.bytes()
+        value = schema.read(FArchiveReader(data))
+        self.assertEqual(
+            list(value),
+            ["id", "hp", "name", "transform", "flag", "rest"],
+        )
+        self.assertEqual(value["id"], GUID)
+        self.assertEqual(value["hp"], {"current": 5, "max": 10})
+        self.assertEqual(value["transform"]["scale3d"], {"x": 7, "y": 8, "z": 9})
+        self.assertIs(value["flag"], True)
+        self.assertEqual(value["rest"], [1, 2])
+        writer = FArchiveWriter()
+        schema.write(writer, json.loads(json.dumps(value, cls=CustomEncoder)))
+        self.assertEqual(writer.bytes(), data)
+
+    def test_when(self):
+        schema = Schema(
+            "test",
+            [
+                When("kind", "A", [("a", "byte")]),
+                ("kind", Param()),
+                ("ids", TArray("guid")),
+                When("kind", ["A", "B"], [("ab", ByteList(2)), ("x", "double")]),
+                ("extra", Rest(optional=True)),
+            ],
+            params=["kind"],
+        )
+        data = struct.pack("<BI16s2sd", 7, 1, GUID.raw_bytes, b"\x03\x04", math.inf)
+        value = schema.read(FArchiveReader(data), "A")
+        self.assertEqual(
+            value,
+            {"a": 7, "kind": "A", "ids": [GUID], "ab": (3, 4), "x": math.inf},
+        )
+        writer = FArchiveWriter()
+        schema.write(writer, value, "A")
+        self.assertEqual(writer.bytes(), data)
+        # As with double, infinities are read as None without allow_nan
+        value = schema.read(FArchiveReader(data[1:] + b"\x05", allow_nan=False), "B")
+        self.assertEqual(value["x"], None)
+        self.assertEqual(value["extra"], [5])
+        self.assertEqual(
+            schema.read(FArchiveReader(struct.pack("<I", 0)), "C"),
+            {"kind": "C", "ids": []},
+        )
+
+    def test_invalid(self):
+        with self.assertRaises(Exception):
+            Schema("test", [("id", "uuid")])
+        with self.assertRaises(Exception):
+            Schema("test", [When("kind", "A", [("a", "byte")])])
+        with self.assertRaises(Exception):
+            Schema("test", [("a", [When("kind", "A", [])])], params=["kind"])
+
+    def test_map_model(self):
+        value = {
+            "instance_id": GUID,
+            "concrete_model_instance_id": OTHER_GUID,
+            "base_camp_id_belong_to": GUID,
+            "group_id_belong_to": OTHER_GUID,
+            "hp": {"current": 50, "max": 100},
+            "initital_transform_cache": {
+                "rotation": {"x": 0.0, "y": 0.0, "z": 0.5, "w": 1.0},
+                "translation": {"x": 1.5, "y": -2.5, "z": 3.5},
+                "scale3d": {"x": 1.0, "y": 1.0, "z": 1.0},
+            },
+            "repair_work_id": GUID,
+            "owner_spawner_level_object_instance_id": OTHER_GUID,
+            "owner_instance_id": GUID,
+            "build_player_uid": OTHER_GUID,
+            "interact_restrict_type": 2,
+            "stage_instance_id_belong_to": {"id": GUID, "valid": True},
+            "created_at": 638400000000000000,
+        }
+        data = map_model.encode_bytes(value)
+        self.assertEqual(len(data), 16 * 4 + 8 + 80 + 16 * 4 + 1 + 20 + 8)
+        for trailing in (b"", b"\x01\x02\x03"):
+            properties = round_trip(
+                self, map_model.decode_bytes, map_model.encode_bytes, data + trailing
+            )
+            self.assertEqual(properties.get("unknown_data", []), list(trailing))
+
+    def test_short_byte_list(self):
+        schema = Schema("test", [("id", "guid"), ("data", ByteList(4))])
+        self.assertEqual(schema.source.count("_unpack"), 1)
+        data = GUID.raw_bytes + b"\x01\x02\x03\x04"
+        self.assertEqual(
+            schema.read(FArchiveReader(data)), {"id": GUID, "data": (1, 2, 3, 4)}
+        )
+        # Truncated byte lists raise, as reader.byte_list does
+        with self.assertRaises(struct.error):
+            schema.read(FArchiveReader(data[:-2]))
+        # while Guids cut short are read as they are
+        schema = Schema("test", [("data", ByteList(4)), ("id", "guid")])
+        value = schema.read(FArchiveReader(b"\x01\x02\x03\x04" + bytes(10)))
+        self.assertEqual(value["id"].raw_bytes, bytes(10))
+        with self.assertRaises(struct.error):
+            schema.read(FArchiveReader(b"\x01\x02"))
+
+    def test_item_container_slot(self):
+        writer = FArchiveWriter()
+        writer.i32(3)
+        writer.i32(99)
+        writer.fstring("Stone")
+        writer.guid(GUID)
+        writer.guid(OTHER_GUID)
+        writer.write(b"\x00\x00\x00\x00")
+        properties = round_trip(
+            self,
+            item_container_slots.decode_bytes,
+            item_container_slots.encode_bytes,
+            writer.bytes(),
+        )
+        self.assertEqual(properties["item"]["static_id"], "Stone")
+        self.assertEqual(properties["trailing_bytes"], [0, 0, 0, 0])
+        # Guids cut short by newer formats are read and written back as they are
+        short = writer.bytes()[:-12]
+        properties = item_container_slots.decode_bytes(FArchiveReader(b""), short)
+        self.assertEqual(properties["trailing_bytes"], [])
+        self.assertEqual(item_container_slots.encode_bytes(properties), short)
+
+    def test_groups(self):
+        def group_header(writer):
+            writer.guid(GUID)
+            writer.fstring("Group")
+            writer.u32(1)
+            writer.guid(OTHER_GUID)
+            writer.guid(GUID)
+
+        def player(writer, name):
+            writer.guid(OTHER_GUID)
+            writer.i64(638400000000000000)
+            writer.fstring(name)
+
+        writer = FArchiveWriter()
+        group_header(writer)
+        writer.byte(1)
+        writer.write(bytes(range(12)))
+        organization = writer.bytes()
+
+        writer = FArchiveWriter()
+        group_header(writer)
+        writer.byte(0)
+        writer.write(b"\x00" * 4)
+        writer.tarray(lambda w, u: w.guid(u), [GUID])
+        writer.i32(0)
+        writer.i32(7)
+        writer.tarray(lambda w, u: w.guid(u), [OTHER_GUID, GUID])
+        writer.fstring("Guild")
+        writer.guid(OTHER_GUID)
+        writer.write(b"\x00" * 20)
+        writer.tarray(player, ["One", "Two"])
+        writer.write(b"\x00" * 4)
+        guild = writer.bytes()
+
+        writer = FArchiveWriter()
+        group_header(writer)
+        writer.byte(2)
+        writer.i32(3)
+        writer.tarray(lambda w, u: w.guid(u), [])
+        writer.fstring("Independent")
+        writer.guid(OTHER_GUID)
+        writer.fstring("Independent 2")
+        writer.i64(638400000000000000)
+        writer.fstring("Player")
+        independent_guild = writer.bytes()
+
+        for group_type, data in [
+            ("EPalGroupType::Organization", organization),
+            ("EPalGroupType::Guild", guild),
+            ("EPalGroupType::IndependentGuild", independent_guild),
+        ]:
+            properties = round_trip(
+                self, group.decode_bytes, group.encode_bytes, data, group_type
+            )
+            self.assertEqual(properties["group_type"], group_type)
+            self.assertEqual(
+                properties["individual_character_handle_ids"],
+                [{"guid": OTHER_GUID, "instance_id": GUID}],
+            )
+        self.assertEqual(properties["player_info"]["player_name"], "Player")
+        with self.assertRaises(Exception):
+            group.decode_bytes(
+                FArchiveReader(b""),
+                organization + b"\x00",
+                "EPalGroupType::Organization",
+            )
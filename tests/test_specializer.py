@@ -0,0 +1,138 @@
+import json
+import math
+import unittest
+
+from palworld_save_tools.archive import UUID, FArchiveReader, FArchiveWriter
+from palworld_save_tools.gvas import GvasFile
+from palworld_save_tools.json_tools import CustomEncoder
+from palworld_save_tools.paltypes import PALWORLD_CUSTOM_PROPERTIES, PALWORLD_TYPE_HINTS
+from palworld_save_tools.specializer import StructSpecializer, property_layout
+from palworld_save_tools.synthetic import (
+    WorldSize,
+    enum,
+    generate_gvas,
+    raw_data,
+    simple,
+    struct,
+)
+
+GUID = UUID(bytes(range(16)))
+
+
+def properties_bytes(properties):
+    writer = FArchiveWriter()
+    writer.properties(properties)
+    return writer.bytes()
+
+
+def save_parameter(**overrides):
+    properties = {
+        "Level": simple("IntProperty", 12),
+        "Rank": simple("UInt16Property", 3),
+        "Talent": simple("UInt32Property", 70),
+        "Exp": simple("Int64Property", 1234567890123),
+        "Ticks": simple("UInt64Property", 2**63),
+        "Point": simple("FixedPoint64Property", -5),
+        "Hp": simple("FloatProperty", math.inf),
+        "NickName": simple("StrProperty", "Lamball"),
+        "CharacterID": simple("NameProperty", "SheepBall"),
+        "Gender": enum("EPalGenderType", "EPalGenderType::Female"),
+        "IsRare": simple("BoolProperty", True),
+        "Hunger": {
+            "id": None,
+            "value": {"type": "None", "value": 7},
+            "type": "ByteProperty",
+        },
+        "Status": {
+            "id": None,
+            "value": {"type": "EPalStatus", "value": "EPalStatus::Hungry"},
+            "type": "ByteProperty",
+        },
+        "Location": struct("Vector", {"x": 1.5, "y": -2.0, "z": math.inf}),
+        "Rotation": struct("Quat", {"x": 0.0, "y": 0.0, "z": 0.5, "w": 1.0}),
+        "Color": struct("LinearColor", {"r": 1.0, "g": 0.5, "b": 0.25, "a": 1.0}),
+        "CreatedAt": struct("DateTime", 638400000000000000),
+        "OwnerPlayerUId": struct("Guid", GUID),
+        "Skills": struct(
+            "PalSkills",
+            {"Count": simple("IntProperty", 2), "Name": simple("StrProperty", "Á")},
+        ),
+        "RawData": raw_data(b"\x01\x02\x03"),
+    }
+    properties.update(overrides)
+    return {key: value for key, value in properties.items() if value is not None}
+
+
+def read(data, specializer=None, allow_nan=True):
+    reader = FArchiveReader(data, allow_nan=allow_nan, specializer=specializer)
+    properties = reader.properties_until_end(".SaveParameter")
+    if not reader.eof():
+        raise Exception("Warning: EOF not reached")
+    return properties
+
+
+class TestSpecializer(unittest.TestCase):
+    def test_layout(self):
+        data = properties_bytes(save_parameter())
+        generic = read(data)
+        specializer = StructSpecializer({".SaveParameter": property_layout(generic)})
+        for allow_nan in (True, False):
+            expected = read(data, allow_nan=allow_nan)
+            self.assertEqual(read(data, specializer, allow_nan), expected)
+        self.assertEqual(read(data, allow_nan=False)["Hp"]["value"], None)
+        self.assertEqual(specializer.specialized_paths(), [".SaveParameter"])
+        self.assertEqual(specializer.fallbacks, {})
+        source = specializer.sources[".SaveParameter"]
+        self.assertIn("reader.properties_until_end('.SaveParameter.Skills')", source)
+        self.assertIn("reader.property('ArrayProperty'", source)
+
+        # Other layouts are read by the generic path from where they differ
+        id_property = simple("IntProperty", 1)
+        id_property["id"] = GUID
+        for other in [
+            save_parameter(Extra=simple("IntProperty", 5)),
+            save_parameter(RawData=None),
+            save_parameter(Level=None),
+            save_parameter(Level=simple("Int64Property", 12)),
+            save_parameter(Gender=enum("EPalOtherType", "EPalOtherType::A")),
+            save_parameter(Location=struct("Quat", {"x": 0, "y": 0, "z": 0, "w": 1})),
+            save_parameter(Talent=id_property),
+            {"Level": simple("IntProperty", 12)},
+            {},
+        ]:
+            data = properties_bytes(other)
+            self.assertEqual(
+                json.dumps(read(data, specializer), cls=CustomEncoder),
+                json.dumps(read(data), cls=CustomEncoder),
+            )
+        self.assertEqual(specializer.fallbacks[".SaveParameter"], 9)
+
+    def test_observed(self):
+        gvas = generate_gvas(WorldSize(players=2, pals_per_player=10, guilds=1))
+        specializer = StructSpecializer(threshold=4)
+        specialized = GvasFile.read(
+            gvas,
+            PALWORLD_TYPE_HINTS,
+            PALWORLD_CUSTOM_PROPERTIES,
+            specializer=specializer,
+        )
+        generic = GvasFile.read(gvas, PALWORLD_TYPE_HINTS, PALWORLD_CUSTOM_PROPERTIES)
+        self.assertEqual(
+            json.dumps(specialized.dump(), cls=CustomEncoder),
+            json.dumps(generic.dump(), cls=CustomEncoder),
+        )
+        self.assertEqual(specialized.write(PALWORLD_CUSTOM_PROPERTIES), gvas)
+        # Pals outnumber players, whose SaveParameter has other properties and
+        # falls back when read after the reader for pals is generated
+        self.assertIn(".SaveParameter", specializer.specialized_paths())
+        self.assertIn(specializer.fallbacks[".SaveParameter"], (1, 2))
+
+        # Only the paths given are observed
+        specializer = StructSpecializer(paths=[".SaveParameter"], threshold=4)
+        GvasFile.read(
+            gvas,
+            PALWORLD_TYPE_HINTS,
+            PALWORLD_CUSTOM_PROPERTIES,
+            specializer=specializer,
+        )
+        self.assertEqual(specializer.specialized_paths(), [".SaveParameter"])
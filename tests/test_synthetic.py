@@ -0,0 +1,50 @@
+import unittest
+
+from palworld_save_tools.gvas import GvasFile
+from palworld_save_tools.paltypes import PALWORLD_CUSTOM_PROPERTIES, PALWORLD_TYPE_HINTS
+from palworld_save_tools.synthetic import WorldSize, generate_gvas
+
+
+class TestSynthetic(unittest.TestCase):
+    def test_round_trip(self):
+        size = WorldSize(
+            players=3,
+            pals_per_player=2,
+            guilds=2,
+            map_objects=5,
+            foliage_cells=4,
+            foliage_instances_per_cell=6,
+            containers=3,
+            slots_per_container=2,
+        )
+        gvas = generate_gvas(size)
+        self.assertEqual(gvas, generate_gvas(size))
+        gvas_file = GvasFile.read(gvas, PALWORLD_TYPE_HINTS, PALWORLD_CUSTOM_PROPERTIES)
+        world = gvas_file.properties["worldSaveData"]["value"]
+        self.assertEqual(len(world["CharacterSaveParameterMap"]["value"]), 9)
+        guilds = world["GroupSaveDataMap"]["value"]
+        self.assertEqual(len(guilds), 2)
+        self.assertEqual(
+            sum(len(g["value"]["RawData"]["value"]["players"]) for g in guilds), 3
+        )
+        containers = world["ItemContainerSaveData"]["value"]
+        self.assertEqual(len(containers), 3)
+        self.assertEqual(len(containers[0]["value"]["Slots"]["value"]["values"]), 2)
+        self.assertEqual(len(world["MapObjectSaveData"]["value"]["values"]), 5)
+        cells = world["FoliageGridSaveDataMap"]["value"]
+        self.assertEqual(len(cells), 4)
+        self.assertEqual(
+            sum(
+                len(model["value"]["InstanceDataMap"]["value"])
+                for model in cells[0]["value"]["ModelMap"]["value"]
+            ),
+            6,
+        )
+        self.assertEqual(gvas_file.write(PALWORLD_CUSTOM_PROPERTIES), gvas)
+
+    def test_scaled(self):
+        size = WorldSize().scaled(10)
+        self.assertEqual(size.players, 40)
+        self.assertEqual(size.pals_per_player, 25)
+        self.assertEqual(size.map_objects, 6000)
+        self.assertEqual(WorldSize().scaled(0.01).guilds, 1)
@@ -0,0 +1,78 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from palworld_save_tools.gvas import GvasFile
+from palworld_save_tools.paltypes import PALWORLD_CUSTOM_PROPERTIES, PALWORLD_TYPE_HINTS
+from palworld_save_tools.synthetic import WorldSize, generate_gvas
+from palworld_save_tools.trace import PropertyTracer
+
+
+class TestTrace(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        gvas = generate_gvas(
+            WorldSize(
+                players=1,
+                pals_per_player=2,
+                guilds=1,
+                map_objects=3,
+                foliage_cells=1,
+                foliage_instances_per_cell=4,
+                containers=2,
+                slots_per_container=2,
+            )
+        )
+        self.tracer = PropertyTracer(min_duration=0)
+        gvas_file = GvasFile.read(
+            gvas, PALWORLD_TYPE_HINTS, PALWORLD_CUSTOM_PROPERTIES, profiler=self.tracer
+        )
+        gvas_file.write(PALWORLD_CUSTOM_PROPERTIES, profiler=self.tracer)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_folded(self):
+        path = os.path.join(self.tmp_dir, "trace.folded")
+        self.tracer.write_trace(path, "folded")
+        with open(path) as f:
+            lines = f.read().splitlines()
+        stacks = {}
+        for line in lines:
+            stack, microseconds = line.rsplit(" ", 1)
+            stacks[stack] = int(microseconds)
+        self.assertIn(
+            "read;.worldSaveData;.MapObjectSaveData;"
+            "map_concrete_model.decode_bytes (PickupItem_Stone)",
+            stacks,
+        )
+        self.assertIn(
+            "write;.worldSaveData;.ItemContainerSaveData;.Value.Slots;.Slots.RawData",
+            stacks,
+        )
+        for stack in stacks:
+            self.assertIn(stack.split(";")[0], ("read", "write"))
+
+    def test_chrome(self):
+        path = os.path.join(self.tmp_dir, "trace.json")
+        self.tracer.write_trace(path, "chrome")
+        with open(path) as f:
+            events = json.load(f)["traceEvents"]
+        calls = sum(
+            stats.calls
+            for stats_by_path in self.tracer.stats.values()
+            for stats in stats_by_path.values()
+        )
+        self.assertEqual(len(events), calls)
+        world = [e for e in events if e["name"] == ".worldSaveData"]
+        self.assertEqual([e["cat"] for e in world], ["read", "write"])
+        read = world[0]
+        for event in events:
+            self.assertEqual(event["ph"], "X")
+            if event["name"] == ".worldSaveData.MapObjectSaveData":
+                self.assertEqual(event["cat"].split(",")[1], "custom")
+                self.assertGreaterEqual(event["ts"], read["ts"])
+        with self.assertRaises(Exception):
+            self.tracer.write_trace(path, "svg")